@@ -3,14 +3,24 @@ EigenScript: A geometric programming language modeling computation
 as flow in semantic spacetime.
 
 This package contains the core interpreter and runtime for EigenScript.
+
+The public classes below are imported on first use, so that importing the
+package (for example to read ``__version__`` or start the CLI) does not
+load NumPy and the interpreter until they are needed.
 """
 
 __version__ = "0.3.0"
 __author__ = "J. McReynolds"
 
-from eigenscript.lexer import Tokenizer, Token, TokenType
-from eigenscript.parser import Parser, ASTNode
-from eigenscript.evaluator import Interpreter
+# Public name -> module that defines it
+_LAZY_EXPORTS = {
+    "Tokenizer": "eigenscript.lexer",
+    "Token": "eigenscript.lexer",
+    "TokenType": "eigenscript.lexer",
+    "Parser": "eigenscript.parser",
+    "ASTNode": "eigenscript.parser",
+    "Interpreter": "eigenscript.evaluator",
+}
 
 __all__ = [
     "Tokenizer",
@@ -20,3 +30,19 @@ __all__ = [
     "ASTNode",
     "Interpreter",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'eigenscript' has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -2,16 +2,15 @@
 Main entry point for EigenScript interpreter.
 
 Run as: python -m eigenscript [file.eigs]
+
+Subsystems are imported inside the functions that use them, so that
+``--version``, ``--help`` and short scripts only pay for what they need.
 """
 
+import os
 import sys
 import argparse
-from pathlib import Path
 from eigenscript import __version__
-from eigenscript.lexer import Tokenizer
-from eigenscript.parser import Parser
-from eigenscript.evaluator import Interpreter
-from eigenscript.benchmark import Benchmark
 
 
 def run_file(
@@ -19,6 +18,10 @@ def run_file(
     verbose: bool = False,
     show_fs: bool = False,
     benchmark: bool = False,
+    use_cache: bool = True,
+    load_snapshot: str | None = None,
+    save_snapshot: str | None = None,
+    jit: bool = False,
 ) -> int:
     """
     Execute an EigenScript file.
@@ -28,10 +31,21 @@ def run_file(
         verbose: Print execution details
         show_fs: Show Framework Strength metrics after execution
         benchmark: Measure and display performance metrics
+        use_cache: Reuse/store the parsed AST in the parse cache
+        load_snapshot: Restore interpreter state from this snapshot first
+        save_snapshot: Save the interpreter state to this snapshot afterwards
+        jit: Compile the program with the LLVM JIT and run it natively
 
     Returns:
         Exit code (0 for success, 1 for error)
     """
+    from eigenscript.evaluator import Interpreter
+    from eigenscript.parser.cache import (
+        load_cached_program,
+        parse_source,
+        store_cached_program,
+    )
+
     bench_ctx = None
 
     try:
@@ -45,26 +59,49 @@ def run_file(
 
         # Start benchmarking if requested
         if benchmark:
+            from eigenscript.benchmark import Benchmark
+
             bench_ctx = Benchmark(track_memory=True)
             bench_ctx.__enter__()
 
-        # Tokenize
-        tokenizer = Tokenizer(source)
-        tokens = tokenizer.tokenize()
-
-        # Parse
-        parser = Parser(tokens)
-        ast = parser.parse()
+        # Load the AST from the parse cache, or tokenize and parse
+        ast = load_cached_program(file_path, source) if use_cache else None
+        token_count = None
+        if ast is None:
+            ast, token_count = parse_source(source)
+            if use_cache:
+                store_cached_program(file_path, source, ast)
+
+        if jit:
+            from eigenscript.compiler.codegen.jit import run_jit
+
+            exit_code = run_jit(file_path, ast)
+            if benchmark and bench_ctx:
+                bench_ctx.add_metadata("file", file_path)
+                bench_ctx.add_metadata("mode", "jit")
+                bench_ctx.__exit__(None, None, None)
+                print(f"\n{bench_ctx.get_result()}")
+            return exit_code
 
         # Interpret
-        interpreter = Interpreter(dimension=768)
+        # Imported modules are looked up next to the script first
+        interpreter = Interpreter(
+            dimension=768, module_root=os.path.dirname(os.path.abspath(file_path))
+        )
+        if load_snapshot:
+            interpreter.load_snapshot(load_snapshot)
         result = interpreter.evaluate(ast)
+        if save_snapshot:
+            interpreter.save_snapshot(save_snapshot)
 
         # Stop benchmarking
         if benchmark and bench_ctx:
             bench_ctx.add_metadata("file", file_path)
             bench_ctx.add_metadata("source_lines", source.count("\n") + 1)
-            bench_ctx.add_metadata("tokens", len(tokens))
+            if token_count is None:
+                bench_ctx.add_metadata("parse_cache", "hit")
+            else:
+                bench_ctx.add_metadata("tokens", token_count)
             bench_ctx.__exit__(None, None, None)
             bench_result = bench_ctx.get_result()
             print(f"\n{bench_result}")
@@ -140,6 +177,10 @@ def run_repl(verbose: bool = False) -> int:
     Returns:
         Exit code (0 for success)
     """
+    from eigenscript.lexer import Tokenizer
+    from eigenscript.parser import Parser
+    from eigenscript.evaluator import Interpreter
+
     print(f"EigenScript {__version__}")
     print("Type 'exit' or press Ctrl+D to quit")
     print("Use blank line to complete multi-line blocks")
@@ -225,8 +266,13 @@ def run_repl(verbose: bool = False) -> int:
                 traceback.print_exc()
 
 
-def main():
-    """Main entry point for the EigenScript interpreter."""
+def main(argv: list[str] | None = None):
+    """
+    Main entry point for the EigenScript interpreter.
+
+    Args:
+        argv: Command-line arguments (defaults to ``sys.argv[1:]``)
+    """
     parser = argparse.ArgumentParser(
         description="EigenScript: A geometric programming language"
     )
@@ -251,22 +297,77 @@ def main():
         action="store_true",
         help="Measure and display performance metrics (time, memory)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the parse cache (__eigscache__)",
+    )
+    parser.add_argument(
+        "--load-snapshot",
+        metavar="SNAPSHOT",
+        help="Restore globals and functions from a snapshot before running",
+    )
+    parser.add_argument(
+        "--save-snapshot",
+        metavar="SNAPSHOT",
+        help="Save globals and functions to a snapshot after running",
+    )
+    parser.add_argument(
+        "--jit",
+        action="store_true",
+        help="Compile to native code with the LLVM JIT and run it in-process",
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Report time spent importing modules (like python -X importtime)",
+    )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const="",
+        metavar="SOCKET",
+        help="Run a persistent session server on a Unix socket ('-' for "
+        "stdin/stdout); see eigenscript.client",
+    )
 
-    if args.interactive:
-        return run_repl(verbose=args.verbose)
+    args = parser.parse_args(argv)
 
-    if args.file:
-        return run_file(
-            args.file,
-            verbose=args.verbose,
-            show_fs=args.show_fs,
-            benchmark=args.benchmark,
-        )
-    else:
-        parser.print_help()
-        return 0
+    if args.serve is not None:
+        from eigenscript.server import serve
+
+        return serve(args.serve or None)
+
+    timer = None
+    if args.startup_report:
+        from eigenscript.startup import ImportTimer
+
+        timer = ImportTimer()
+        timer.install()
+
+    try:
+        if args.interactive:
+            return run_repl(verbose=args.verbose)
+
+        if args.file:
+            return run_file(
+                args.file,
+                verbose=args.verbose,
+                show_fs=args.show_fs,
+                benchmark=args.benchmark,
+                use_cache=not args.no_cache,
+                load_snapshot=args.load_snapshot,
+                save_snapshot=args.save_snapshot,
+                jit=args.jit,
+            )
+        else:
+            parser.print_help()
+            return 0
+    finally:
+        if timer is not None:
+            timer.uninstall()
+            print(timer.format_report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
@@ -7,30 +7,30 @@ Provides standard library functions like print, input, len, etc.
 import sys
 import math
 import os
-import json
 import time
-from datetime import datetime
 import numpy as np
-from typing import Callable, Any, Union, TYPE_CHECKING
+from types import MappingProxyType
+from typing import Callable, Any, Mapping, Optional, Union, TYPE_CHECKING
 from dataclasses import dataclass
-from eigenscript.semantic.lrvm import LRVMVector, LRVMSpace
+from eigenscript.semantic.lrvm import LRVMVector, LRVMSpace, LazyStringVector
 
 if TYPE_CHECKING:
-    from eigenscript.evaluator.interpreter import EigenList
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
 
 # Type alias for values that can flow through the interpreter
 # Must match the Value type in interpreter.py
-Value = Union[LRVMVector, "EigenList"]
+Value = Union[LRVMVector, "EigenList", "EigenMap"]
 
 
-@dataclass
+@dataclass(frozen=True)
 class BuiltinFunction:
     """
     Represents a built-in function implemented in Python.
 
     Built-in functions are native code that can be called from EigenScript.
     They receive Values (LRVM vectors or lists) and context (space + metric)
-    and return Values.
+    and return Values. Instances are immutable because a single table of
+    them is shared by every interpreter.
     """
 
     name: str
@@ -54,7 +54,7 @@ def builtin_print(arg, space: LRVMSpace, metric: Any = None) -> LRVMVector:
         Null vector (prints have no meaningful return value)
     """
     # Import here to avoid circular dependency
-    from eigenscript.evaluator.interpreter import EigenList
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
 
     # Handle EigenList
     if isinstance(arg, EigenList):
@@ -66,6 +66,13 @@ def builtin_print(arg, space: LRVMSpace, metric: Any = None) -> LRVMVector:
             for elem in arg.elements:
                 decoded_elems.append(decode_vector(elem, space, metric))
             print(f"[{', '.join(str(e) for e in decoded_elems)}]")
+    elif isinstance(arg, EigenMap):
+        # Print map as {key: value, ...} (handles empty maps)
+        items = [
+            f"{key}: {decode_vector(value, space, metric)}"
+            for key, value in arg.entries.items()
+        ]
+        print(f"{{{', '.join(items)}}}")
     else:
         # Regular vector
         value = decode_vector(arg, space, metric)
@@ -109,11 +116,13 @@ def builtin_len(arg, space: LRVMSpace, metric: Any = None) -> LRVMVector:
         Length as LRVM vector
     """
     # Import here to avoid circular dependency
-    from eigenscript.evaluator.interpreter import EigenList
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
 
     # Handle EigenList
     if isinstance(arg, EigenList):
         return space.embed(float(len(arg.elements)))
+    elif isinstance(arg, EigenMap):
+        return space.embed(float(len(arg.entries)))
     else:
         # For vectors, return the Euclidean norm
         norm_value = np.linalg.norm(arg.coords)
@@ -133,11 +142,13 @@ def builtin_type(arg, space: LRVMSpace, metric: Any = None) -> LRVMVector:
         Type name as LRVM vector
     """
     # Import here to avoid circular dependency
-    from eigenscript.evaluator.interpreter import EigenList
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
 
     # Handle EigenList
     if isinstance(arg, EigenList):
         return space.embed("list")
+    elif isinstance(arg, EigenMap):
+        return space.embed("map")
     else:
         value = decode_vector(arg, space, metric)
         type_name = type(value).__name__
@@ -218,13 +229,20 @@ def decode_vector(vector: Value, space: LRVMSpace, metric: Any = None) -> Any:
         Decoded Python value (str, float, list, or vector representation)
     """
     # Import here to avoid circular dependency
-    from eigenscript.evaluator.interpreter import EigenList
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
 
     # Handle EigenList - return the list itself
     if isinstance(vector, EigenList):
         # Decode each element in the list recursively
         return [decode_vector(elem, space, metric) for elem in vector.elements]
 
+    # Handle EigenMap - keys are already native, decode the values
+    if isinstance(vector, EigenMap):
+        return {
+            key: decode_vector(value, space, metric)
+            for key, value in vector.entries.items()
+        }
+
     # Check for string metadata first (strings preserve their original value)
     if "string_value" in vector.metadata:
         return vector.metadata["string_value"]
@@ -279,6 +297,36 @@ def decode_vector(vector: Value, space: LRVMSpace, metric: Any = None) -> Any:
     return f"Vector(norm={norm_value:.3f})"
 
 
+def decode_map_key(key: Value, space: LRVMSpace, metric: Any = None) -> Any:
+    """
+    Convert a Value into the native hashable key used by EigenMap.
+
+    Strings are read straight from their metadata, so string lookups never
+    go through the heuristic numeric decoder.
+
+    Args:
+        key: LRVM vector holding a string or number
+        space: LRVM space for context
+        metric: Metric tensor (optional)
+
+    Returns:
+        Native key (str, int, or float)
+
+    Raises:
+        TypeError: If the key is a list, map, or non-scalar vector
+    """
+    if isinstance(key, LRVMVector):
+        string_value = key.metadata.get("string_value")
+        if string_value is not None:
+            return string_value
+
+        decoded = decode_vector(key, space, metric)
+        if isinstance(decoded, (int, float)):
+            return decoded
+
+    raise TypeError("Map keys must be strings or numbers")
+
+
 def builtin_upper(arg: LRVMVector, space: LRVMSpace, metric: Any = None) -> LRVMVector:
     """
     Convert string to uppercase.
@@ -334,17 +382,33 @@ def builtin_join(arg, space: LRVMSpace, metric: Any = None) -> LRVMVector:
     """
     Join list of strings into a single string.
 
+    Joins on a single space by default. Pass [delimiter, list] to join
+    with a different delimiter.
+
     Example:
         join of ["hello", "world"]  -> "hello world"
+        join of [", ", ["a", "b", "c"]]  -> "a, b, c"
     """
     from eigenscript.evaluator.interpreter import EigenList
 
     if not isinstance(arg, EigenList):
         raise TypeError(f"join requires a list argument")
 
+    # [delimiter, list] form: a string followed by a nested list
+    separator = " "
+    items = arg
+    if (
+        len(arg.elements) == 2
+        and isinstance(arg.elements[0], LRVMVector)
+        and "string_value" in arg.elements[0].metadata
+        and isinstance(arg.elements[1], EigenList)
+    ):
+        separator = arg.elements[0].metadata["string_value"]
+        items = arg.elements[1]
+
     # Decode each element as a string
     strings = []
-    for elem in arg.elements:
+    for elem in items.elements:
         decoded = decode_vector(elem, space, metric)
         if isinstance(decoded, str):
             strings.append(decoded)
@@ -352,9 +416,9 @@ def builtin_join(arg, space: LRVMSpace, metric: Any = None) -> LRVMVector:
             # Convert to string representation
             strings.append(str(decoded))
 
-    # Join with space separator
-    result = " ".join(strings)
-    return space.embed_string(result)
+    # Embedding is deferred until the joined string is actually compared
+    result = separator.join(strings)
+    return LazyStringVector(space, [result], 1, len(result))
 
 
 def builtin_append(list_and_value, space: LRVMSpace, metric: Any = None) -> LRVMVector:
@@ -391,6 +455,26 @@ def builtin_append(list_and_value, space: LRVMSpace, metric: Any = None) -> LRVM
     return space.zero_vector()
 
 
+def _sort_keys(elements, space: LRVMSpace, metric: Any = None):
+    """
+    Decode the ordering key of every element in a single pass.
+
+    Returns a float64 array when every key is numeric, so callers can hand
+    it straight to numpy; otherwise returns the decoded keys as a list.
+    """
+    keys = [decode_vector(elem, space, metric) for elem in elements]
+    if all(isinstance(key, (int, float)) for key in keys):
+        return np.fromiter(keys, dtype=np.float64, count=len(keys))
+    return keys
+
+
+def _argsort_keys(keys) -> Any:
+    """Return the indices that stably sort keys from _sort_keys."""
+    if isinstance(keys, np.ndarray):
+        return np.argsort(keys, kind="stable")
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
 def builtin_min(target_list, space: LRVMSpace, metric: Any = None) -> LRVMVector:
     """
     Find the minimum value in a list.
@@ -412,17 +496,13 @@ def builtin_min(target_list, space: LRVMSpace, metric: Any = None) -> LRVMVector
     if len(target_list.elements) == 0:
         raise ValueError("min of empty list is undefined")
 
-    # Find minimum by decoding values and comparing
-    min_elem = target_list.elements[0]
-    min_value = decode_vector(min_elem, space, metric)
-
-    for elem in target_list.elements[1:]:
-        value = decode_vector(elem, space, metric)
-        if value < min_value:
-            min_value = value
-            min_elem = elem
+    keys = _sort_keys(target_list.elements, space, metric)
+    if isinstance(keys, np.ndarray):
+        index = int(np.argmin(keys))
+    else:
+        index = min(range(len(keys)), key=keys.__getitem__)
 
-    return min_elem
+    return target_list.elements[index]
 
 
 def builtin_max(target_list, space: LRVMSpace, metric: Any = None) -> LRVMVector:
@@ -446,17 +526,13 @@ def builtin_max(target_list, space: LRVMSpace, metric: Any = None) -> LRVMVector
     if len(target_list.elements) == 0:
         raise ValueError("max of empty list is undefined")
 
-    # Find maximum by decoding values and comparing
-    max_elem = target_list.elements[0]
-    max_value = decode_vector(max_elem, space, metric)
-
-    for elem in target_list.elements[1:]:
-        value = decode_vector(elem, space, metric)
-        if value > max_value:
-            max_value = value
-            max_elem = elem
+    keys = _sort_keys(target_list.elements, space, metric)
+    if isinstance(keys, np.ndarray):
+        index = int(np.argmax(keys))
+    else:
+        index = max(range(len(keys)), key=keys.__getitem__)
 
-    return max_elem
+    return target_list.elements[index]
 
 
 def builtin_sort(target_list, space: LRVMSpace, metric: Any = None):
@@ -480,19 +556,148 @@ def builtin_sort(target_list, space: LRVMSpace, metric: Any = None):
     if len(target_list.elements) == 0:
         return EigenList([])
 
-    # Create list of (decoded_value, original_vector) pairs for sorting
-    pairs = []
+    keys = _sort_keys(target_list.elements, space, metric)
+    elements = target_list.elements
+    return EigenList([elements[i] for i in _argsort_keys(keys)])
+
+
+def builtin_sort_by(args, space: LRVMSpace, metric: Any = None):
+    """
+    Sort a list by the value a key function returns for each element.
+
+    The key function is called once per element; the list is then ordered
+    by those keys (ties keep their original order).
+
+    Example:
+        define negate as:
+            return 0 - arg
+
+        descending is sort_by of [negate, [3, 1, 2]]
+        # descending = [3, 2, 1]
+
+    Args:
+        args: Two-element list [key_function, target_list]
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        A new EigenList sorted by key
+    """
+    from eigenscript.evaluator.interpreter import EigenList, Function, BuiltinFunction
+
+    if not isinstance(args, EigenList):
+        raise TypeError("sort_by requires a function and a list")
+
+    if len(args.elements) != 2:
+        raise TypeError("sort_by requires exactly 2 arguments: function and list")
+
+    key_func = args.elements[0]
+    target_list = args.elements[1]
+
+    if not isinstance(key_func, (Function, BuiltinFunction)):
+        raise TypeError("First argument to sort_by must be a function")
+
+    if not isinstance(target_list, EigenList):
+        raise TypeError("Second argument to sort_by must be a list")
+
+    # Compute every key up front
+    key_values = []
     for elem in target_list.elements:
-        value = decode_vector(elem, space, metric)
-        pairs.append((value, elem))
+        if isinstance(key_func, Function):
+            if key_func.interpreter is None:
+                raise RuntimeError(
+                    "Cannot call user-defined function from sort_by without interpreter context"
+                )
+            key = key_func.interpreter._call_function_with_value(key_func, elem)
+        else:
+            key = key_func.func(elem, space, metric)
+        key_values.append(key)
+
+    keys = _sort_keys(key_values, space, metric)
+    elements = target_list.elements
+    return EigenList([elements[i] for i in _argsort_keys(keys)])
+
+
+def _select_k(args, name: str, largest: bool, space: LRVMSpace, metric: Any = None):
+    """Shared implementation of nsmallest and nlargest."""
+    from eigenscript.evaluator.interpreter import EigenList
+
+    if not isinstance(args, EigenList) or len(args.elements) != 2:
+        raise TypeError(f"{name} requires exactly 2 arguments: list and count")
+
+    target_list = args.elements[0]
+    if not isinstance(target_list, EigenList):
+        raise TypeError(f"First argument to {name} must be a list")
+
+    count = decode_vector(args.elements[1], space, metric)
+    if not isinstance(count, (int, float)):
+        raise TypeError(f"Second argument to {name} must be a number")
 
-    # Sort by the decoded values
-    sorted_pairs = sorted(pairs, key=lambda x: x[0])
+    elements = target_list.elements
+    k = min(max(int(count), 0), len(elements))
+    if k == 0:
+        return EigenList([])
+
+    keys = _sort_keys(elements, space, metric)
+    if isinstance(keys, np.ndarray):
+        if largest:
+            keys = -keys
+        if k < len(keys):
+            # Partial selection: O(n) to find the k winners, then sort only those
+            candidates = np.argpartition(keys, k - 1)[:k]
+        else:
+            candidates = np.arange(len(keys))
+        # Order winners by key, breaking ties by original position
+        indices = candidates[np.lexsort((candidates, keys[candidates]))]
+    else:
+        import heapq
 
-    # Extract the sorted vectors
-    sorted_elements = [pair[1] for pair in sorted_pairs]
+        select = heapq.nlargest if largest else heapq.nsmallest
+        indices = select(k, range(len(keys)), key=keys.__getitem__)
 
-    return EigenList(sorted_elements)
+    return EigenList([elements[i] for i in indices])
+
+
+def builtin_nsmallest(args, space: LRVMSpace, metric: Any = None):
+    """
+    Return the k smallest elements of a list in ascending order.
+
+    Uses partial selection, so only the k winners are fully sorted.
+
+    Example:
+        lowest is nsmallest of [[5, 1, 4, 2, 3], 2]
+        # lowest = [1, 2]
+
+    Args:
+        args: Two-element list [target_list, k]
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        A new EigenList with at most k elements
+    """
+    return _select_k(args, "nsmallest", False, space, metric)
+
+
+def builtin_nlargest(args, space: LRVMSpace, metric: Any = None):
+    """
+    Return the k largest elements of a list in descending order.
+
+    Uses partial selection, so only the k winners are fully sorted.
+
+    Example:
+        highest is nlargest of [[5, 1, 4, 2, 3], 2]
+        # highest = [5, 4]
+
+    Args:
+        args: Two-element list [target_list, k]
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        A new EigenList with at most k elements
+    """
+    return _select_k(args, "nlargest", True, space, metric)
 
 
 def builtin_pop(target_list, space: LRVMSpace, metric: Any = None) -> LRVMVector:
@@ -1367,6 +1572,7 @@ def builtin_json_parse(json_str: LRVMVector, space: LRVMSpace, metric: Any = Non
     Example:
         data is json_parse of '{"name": "Alice", "age": 30}'
     """
+    import json
     from eigenscript.evaluator.interpreter import EigenList
 
     json_string = decode_vector(json_str, space, metric)
@@ -1399,6 +1605,7 @@ def builtin_json_stringify(args, space: LRVMSpace, metric: Any = None) -> LRVMVe
         json_str is json_stringify of data
         pretty_json is json_stringify of [data, 2]
     """
+    import json
     from eigenscript.evaluator.interpreter import EigenList
 
     # Handle both single value and [value, indent] formats
@@ -1438,9 +1645,108 @@ def builtin_json_stringify(args, space: LRVMSpace, metric: Any = None) -> LRVMVe
         raise RuntimeError(f"Error stringifying JSON: {str(e)}")
 
 
+def builtin_json_read_line(handle: Any, space: LRVMSpace, metric: Any = None):
+    """
+    Read the next record from a JSON Lines file.
+
+    Reads one line at a time, so only the current record is held in
+    memory. Blank lines are skipped. The end of the file is signalled
+    separately from the record, since a line may hold a JSON null.
+
+    Args:
+        handle: File handle from file_open
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        [1, record] with the parsed record, or [0, null] once the end of
+        the file is reached
+
+    Example:
+        handle is file_open of ["events.jsonl", "r"]
+        next is json_read_line of handle
+        loop while next[0]:
+            print of next[1]["id"]
+            next is json_read_line of handle
+        file_close of handle
+    """
+    import json
+    from eigenscript.evaluator.interpreter import EigenList
+
+    if not isinstance(handle, LRVMVector) or "file_object" not in handle.metadata:
+        raise TypeError("json_read_line requires a valid file handle")
+
+    file_obj = handle.metadata["file_object"]
+
+    while True:
+        try:
+            line = file_obj.readline()
+        except Exception as e:
+            raise RuntimeError(f"Error reading file: {str(e)}")
+
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line:
+            return EigenList([space.embed(0.0), space.zero_vector()])
+        if line.strip():
+            break
+
+    try:
+        record = _python_to_eigenscript(json.loads(line), space)
+        return EigenList([space.embed(1.0), record])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {str(e)}")
+
+
+def builtin_json_write_line(args, space: LRVMSpace, metric: Any = None) -> LRVMVector:
+    """
+    Append one record to a JSON Lines file.
+
+    The record is serialized compactly and terminated with a newline.
+    Unlike file_write, the handle is not flushed after every record;
+    buffered output is written when the handle is closed.
+
+    Args:
+        args: Two-element list [handle, value]
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        Null vector
+
+    Example:
+        handle is file_open of ["events.jsonl", "w"]
+        json_write_line of [handle, record]
+        file_close of handle
+    """
+    import json
+    from eigenscript.evaluator.interpreter import EigenList
+
+    if not isinstance(args, EigenList):
+        raise TypeError("json_write_line requires a list of [handle, value]")
+
+    if len(args.elements) != 2:
+        raise TypeError(
+            "json_write_line requires exactly 2 arguments: handle and value"
+        )
+
+    handle = args.elements[0]
+    if not isinstance(handle, LRVMVector) or "file_object" not in handle.metadata:
+        raise TypeError("json_write_line requires a valid file handle")
+
+    file_obj = handle.metadata["file_object"]
+
+    try:
+        python_obj = _eigenscript_to_python(args.elements[1], space, metric)
+        file_obj.write(json.dumps(python_obj, separators=(",", ":")) + "\n")
+        return space.zero_vector()
+    except Exception as e:
+        raise RuntimeError(f"Error writing JSON line: {str(e)}")
+
+
 def _python_to_eigenscript(obj: Any, space: LRVMSpace):
     """Convert Python objects to EigenScript values."""
-    from eigenscript.evaluator.interpreter import EigenList
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
 
     if obj is None:
         return space.zero_vector()
@@ -1454,52 +1760,25 @@ def _python_to_eigenscript(obj: Any, space: LRVMSpace):
         elements = [_python_to_eigenscript(item, space) for item in obj]
         return EigenList(elements)
     elif isinstance(obj, dict):
-        # For now, store dict as a list of [key, value] pairs
-        # Future: implement proper dict type
-        pairs = []
-        for key, value in obj.items():
-            key_vec = space.embed_string(str(key))
-            value_vec = _python_to_eigenscript(value, space)
-            pairs.append(EigenList([key_vec, value_vec]))
-        return EigenList(pairs)
+        # JSON object keys are always strings, so they hash directly
+        entries = {
+            str(key): _python_to_eigenscript(value, space) for key, value in obj.items()
+        }
+        return EigenMap(entries)
     else:
         raise TypeError(f"Cannot convert Python type {type(obj)} to EigenScript")
 
 
 def _eigenscript_to_python(value: Any, space: LRVMSpace, metric: Any = None) -> Any:
     """Convert EigenScript values to Python objects."""
-    from eigenscript.evaluator.interpreter import EigenList
-
-    if isinstance(value, EigenList):
-        # Check if it's a dict representation (list of [key, value] pairs)
-        # A dict should have string keys (not numeric), so we need to check more carefully
-        if len(value.elements) > 0:
-            # Try to detect dict format: all elements are 2-element lists with string keys
-            is_dict = all(
-                isinstance(elem, EigenList) and len(elem.elements) == 2
-                for elem in value.elements
-            )
-
-            if is_dict:
-                # Check if first element of each pair is a string (dict keys should be strings)
-                try:
-                    first_keys_are_strings = all(
-                        isinstance(decode_vector(elem.elements[0], space, metric), str)
-                        for elem in value.elements
-                    )
-                except Exception:
-                    first_keys_are_strings = False
-
-                if first_keys_are_strings:
-                    # Convert to Python dict
-                    result = {}
-                    for pair in value.elements:
-                        key = decode_vector(pair.elements[0], space, metric)
-                        val = _eigenscript_to_python(pair.elements[1], space, metric)
-                        result[key] = val
-                    return result
-
-        # Otherwise, convert as a list
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
+
+    if isinstance(value, EigenMap):
+        return {
+            key: _eigenscript_to_python(val, space, metric)
+            for key, val in value.entries.items()
+        }
+    elif isinstance(value, EigenList):
         return [_eigenscript_to_python(elem, space, metric) for elem in value.elements]
     else:
         decoded = decode_vector(value, space, metric)
@@ -1550,6 +1829,7 @@ def builtin_time_format(args, space: LRVMSpace, metric: Any = None) -> LRVMVecto
     Example:
         formatted is time_format of [now, "%Y-%m-%d"]
     """
+    from datetime import datetime
     from eigenscript.evaluator.interpreter import EigenList
 
     if not isinstance(args, EigenList):
@@ -1593,6 +1873,7 @@ def builtin_time_parse(args, space: LRVMSpace, metric: Any = None) -> LRVMVector
     Example:
         timestamp is time_parse of ["2025-11-19", "%Y-%m-%d"]
     """
+    from datetime import datetime
     from eigenscript.evaluator.interpreter import EigenList
 
     if not isinstance(args, EigenList):
@@ -1760,6 +2041,172 @@ def builtin_reverse(target_list, space: LRVMSpace, metric: Any = None):
     return EigenList(reversed_elements)
 
 
+# ============================================================================
+# Map Operations
+# ============================================================================
+
+
+def builtin_dict(pairs, space: LRVMSpace, metric: Any = None):
+    """
+    Build a map from a list of [key, value] pairs.
+
+    Args:
+        pairs: List of two-element [key, value] lists (or an existing map to copy)
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        New EigenMap
+
+    Example:
+        config is dict of [["host", "localhost"], ["port", 8080]]
+        empty is dict of []
+    """
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
+
+    if isinstance(pairs, EigenMap):
+        return EigenMap(dict(pairs.entries))
+
+    if not isinstance(pairs, EigenList):
+        raise TypeError("dict requires a list of [key, value] pairs")
+
+    entries = {}
+    for pair in pairs.elements:
+        if not isinstance(pair, EigenList) or len(pair.elements) != 2:
+            raise TypeError("dict requires a list of [key, value] pairs")
+        key = decode_map_key(pair.elements[0], space, metric)
+        entries[key] = pair.elements[1]
+
+    return EigenMap(entries)
+
+
+def builtin_keys(target_map, space: LRVMSpace, metric: Any = None):
+    """
+    Get the keys of a map in insertion order.
+
+    Args:
+        target_map: Map to read keys from
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        EigenList of keys
+
+    Example:
+        names is keys of config
+    """
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
+
+    if not isinstance(target_map, EigenMap):
+        raise TypeError("keys requires a map")
+
+    return EigenList([space.embed(key) for key in target_map.entries])
+
+
+def builtin_values(target_map, space: LRVMSpace, metric: Any = None):
+    """
+    Get the values of a map in insertion order.
+
+    Args:
+        target_map: Map to read values from
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        EigenList of values
+
+    Example:
+        settings is values of config
+    """
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
+
+    if not isinstance(target_map, EigenMap):
+        raise TypeError("values requires a map")
+
+    return EigenList(list(target_map.entries.values()))
+
+
+def builtin_has_key(args, space: LRVMSpace, metric: Any = None) -> LRVMVector:
+    """
+    Check whether a map contains a key.
+
+    Args:
+        args: Two-element list [map, key]
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        1 if the key is present, 0 otherwise (as LRVM vector)
+
+    Example:
+        if has_key of [config, "port"]:
+            port is config["port"]
+    """
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
+
+    if not isinstance(args, EigenList) or len(args.elements) != 2:
+        raise TypeError("has_key requires exactly 2 arguments: map and key")
+
+    target_map = args.elements[0]
+    if not isinstance(target_map, EigenMap):
+        raise TypeError("First argument to has_key must be a map")
+
+    key = decode_map_key(args.elements[1], space, metric)
+    return space.embed(1.0 if target_map.has(key) else 0.0)
+
+
+def builtin_set(args, space: LRVMSpace, metric: Any = None) -> LRVMVector:
+    """
+    Bind a key to a value in a map (mutates the map in place).
+
+    Args:
+        args: Three-element list [map, key, value]
+        space: LRVM space for operations
+        metric: Metric tensor (optional)
+
+    Returns:
+        Null vector (set has no meaningful return value)
+
+    Example:
+        set of [config, "port", 9090]
+    """
+    from eigenscript.evaluator.interpreter import EigenList, EigenMap
+
+    if not isinstance(args, EigenList) or len(args.elements) != 3:
+        raise TypeError("set requires exactly 3 arguments: map, key, and value")
+
+    target_map = args.elements[0]
+    if not isinstance(target_map, EigenMap):
+        raise TypeError("First argument to set must be a map")
+
+    key = decode_map_key(args.elements[1], space, metric)
+    target_map.set(key, args.elements[2])
+
+    return space.zero_vector()
+
+
+# Shared read-only table, built on first use by get_builtin_table()
+_BUILTIN_TABLE: Optional[Mapping[str, BuiltinFunction]] = None
+
+
+def get_builtin_table() -> Mapping[str, BuiltinFunction]:
+    """
+    Get the shared, read-only table of built-in functions.
+
+    The table is built once per process and reused by every interpreter,
+    so creating an interpreter does not allocate any BuiltinFunction
+    objects. Builtins never depend on the interpreter's LRVM space; they
+    receive it as an argument on each call.
+
+    Returns:
+        Read-only mapping from function names to BuiltinFunction objects
+    """
+    global _BUILTIN_TABLE
+    if _BUILTIN_TABLE is None:
+        _BUILTIN_TABLE = MappingProxyType(_build_builtin_table())
+    return _BUILTIN_TABLE
+
+
 def get_builtins(space: LRVMSpace) -> dict:
     """
     Get all built-in functions for the EigenScript environment.
@@ -1769,7 +2216,13 @@ def get_builtins(space: LRVMSpace) -> dict:
 
     Returns:
         Dictionary mapping function names to BuiltinFunction objects
+        (a mutable copy of the shared table)
     """
+    return dict(get_builtin_table())
+
+
+def _build_builtin_table() -> dict:
+    """Construct every BuiltinFunction entry (called once per process)."""
     builtins = {
         "print": BuiltinFunction(
             name="print", func=builtin_print, description="Print a value to stdout"
@@ -1828,6 +2281,21 @@ def get_builtins(space: LRVMSpace) -> dict:
         "sort": BuiltinFunction(
             name="sort", func=builtin_sort, description="Sort a list in ascending order"
         ),
+        "sort_by": BuiltinFunction(
+            name="sort_by",
+            func=builtin_sort_by,
+            description="Sort a list by a key function",
+        ),
+        "nsmallest": BuiltinFunction(
+            name="nsmallest",
+            func=builtin_nsmallest,
+            description="Return the k smallest elements of a list",
+        ),
+        "nlargest": BuiltinFunction(
+            name="nlargest",
+            func=builtin_nlargest,
+            description="Return the k largest elements of a list",
+        ),
         "map": BuiltinFunction(
             name="map",
             func=builtin_map,
@@ -1954,6 +2422,16 @@ def get_builtins(space: LRVMSpace) -> dict:
             func=builtin_json_stringify,
             description="Convert data to JSON string",
         ),
+        "json_read_line": BuiltinFunction(
+            name="json_read_line",
+            func=builtin_json_read_line,
+            description="Read next record from a JSON Lines file",
+        ),
+        "json_write_line": BuiltinFunction(
+            name="json_write_line",
+            func=builtin_json_write_line,
+            description="Append a record to a JSON Lines file",
+        ),
         # Date/Time operations
         "time_now": BuiltinFunction(
             name="time_now",
@@ -1985,6 +2463,26 @@ def get_builtins(space: LRVMSpace) -> dict:
         "reverse": BuiltinFunction(
             name="reverse", func=builtin_reverse, description="Reverse list order"
         ),
+        # Map operations
+        "dict": BuiltinFunction(
+            name="dict",
+            func=builtin_dict,
+            description="Build a map from [key, value] pairs",
+        ),
+        "keys": BuiltinFunction(
+            name="keys", func=builtin_keys, description="Get the keys of a map"
+        ),
+        "values": BuiltinFunction(
+            name="values", func=builtin_values, description="Get the values of a map"
+        ),
+        "has_key": BuiltinFunction(
+            name="has_key",
+            func=builtin_has_key,
+            description="Check whether a map contains a key",
+        ),
+        "set": BuiltinFunction(
+            name="set", func=builtin_set, description="Bind a key to a value in a map"
+        ),
     }
 
     return builtins
@@ -0,0 +1,102 @@
+"""
+Thin client for the EigenScript session server.
+
+Forwards its command line to a server started with
+``python -m eigenscript --serve`` and replays the script's output and exit
+status, so short scripts skip interpreter startup entirely::
+
+    python -m eigenscript.client job.eigs --show-fs
+
+The socket is taken from ``EIGEN_SERVER_SOCKET`` or the server's default
+path. If no server is listening, the script runs locally as
+``python -m eigenscript`` would run it. Once a request has been sent the
+server may already be running the script, so a failure after that point
+is reported instead of running it a second time. Only the standard
+library is imported until the fallback is needed.
+"""
+
+import json
+import os
+import socket
+import sys
+
+
+class ServerUnavailable(OSError):
+    """No session server accepted the connection."""
+
+
+def default_socket_path() -> str:
+    """
+    Get the socket path used when none is given.
+
+    ``EIGEN_SERVER_SOCKET`` overrides the per-user default in the
+    temporary directory.
+    """
+    path = os.environ.get("EIGEN_SERVER_SOCKET")
+    if path:
+        return path
+    user = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    tmpdir = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(tmpdir, f"eigenscript-{user}.sock")
+
+
+def send_request(path: str, argv: list[str], cwd: str | None = None) -> dict:
+    """
+    Run one command on a session server.
+
+    Args:
+        path: Unix socket of the server
+        argv: Arguments as given to ``python -m eigenscript``
+        cwd: Directory the arguments are relative to (default: current)
+
+    Returns:
+        Response with ``stdout``, ``stderr`` and ``exit_code``
+
+    Raises:
+        ServerUnavailable: If the server cannot be reached
+        OSError: If the connection fails after the request was sent
+    """
+    request = {"argv": list(argv), "cwd": cwd or os.getcwd()}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        try:
+            conn.connect(path)
+        except OSError as e:
+            raise ServerUnavailable(f"No EigenScript server on {path}: {e}") from e
+        conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with conn.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise OSError(f"EigenScript server on {path} closed the connection")
+    return json.loads(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Forward a command to the session server.
+
+    Args:
+        argv: Command-line arguments (defaults to ``sys.argv[1:]``)
+
+    Returns:
+        The script's exit code
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        response = send_request(default_socket_path(), argv)
+    except (ServerUnavailable, AttributeError):
+        # No server (or no Unix sockets): run the script here
+        from eigenscript.__main__ import main as run_locally
+
+        return run_locally(argv)
+    except OSError as e:
+        # The server may have run the script already; don't run it again
+        sys.stderr.write(f"eigenscript.client: {e}\n")
+        return 1
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    return response.get("exit_code", 1)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
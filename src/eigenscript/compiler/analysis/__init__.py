@@ -5,5 +5,6 @@ This module contains semantic analysis passes that run before code generation.
 """
 
 from eigenscript.compiler.analysis.observer import ObserverAnalyzer
+from eigenscript.compiler.analysis.folding import ConstantFolder
 
-__all__ = ["ObserverAnalyzer"]
+__all__ = ["ObserverAnalyzer", "ConstantFolder"]
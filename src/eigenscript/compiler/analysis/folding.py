@@ -0,0 +1,441 @@
+"""
+Constant Folding and Dead-Branch Elimination
+
+Simplifies a Program before it is executed or compiled:
+
+- Operators whose operands are all literals are replaced by their result
+  (``"a" + "b"`` → ``"ab"``, ``3 > 2`` → ``1``, ``7 % 4`` → ``3``).
+- ``if`` statements with a constant condition keep only the branch that
+  runs, and ``loop while`` statements whose condition is constantly false
+  are removed.
+- Number and string literals that are evaluated repeatedly (inside loops,
+  comprehensions and function bodies) are collected in
+  ``hoisted_literals`` so an engine can build their values once up front.
+
+The two execution engines represent numbers differently, so the pass is
+configured per engine. The interpreter computes ``+ - * /`` on full LRVM
+embeddings (``2 + 3`` is not the embedding of ``5``), so it folds only
+operations whose result it would embed from a scalar anyway. The LLVM
+backend works on IEEE doubles and can fold all arithmetic.
+
+Input trees are never modified; changed subtrees are rebuilt and unchanged
+ones are shared with the input.
+"""
+
+from dataclasses import replace
+from typing import Any, List, Optional, Set, Tuple
+from eigenscript.parser.ast_builder import (
+    ASTNode,
+    Assignment,
+    BinaryOp,
+    Break,
+    Conditional,
+    FunctionDef,
+    Index,
+    Interrogative,
+    ListComprehension,
+    ListLiteral,
+    Literal,
+    Loop,
+    MemberAccess,
+    Program,
+    Relation,
+    Return,
+    Slice,
+    UnaryOp,
+)
+
+# Values within this distance of zero are false in both engines;
+# values at least TRUE_THRESHOLD away are true in both (loop conditions
+# use the looser 1e-6 threshold in the interpreter)
+FALSE_THRESHOLD = 1e-10
+TRUE_THRESHOLD = 1e-6
+
+_COMPARISONS = {
+    "<": lambda a, b: a < b,
+    ">": lambda a, b: a > b,
+    "<=": lambda a, b: a <= b,
+    ">=": lambda a, b: a >= b,
+}
+
+_ARITHMETIC = {
+    "+": lambda a, b: a + b,
+    "-": lambda a, b: a - b,
+    "*": lambda a, b: a * b,
+    "/": lambda a, b: a / b,
+}
+
+
+def _is_number(node: ASTNode) -> bool:
+    return isinstance(node, Literal) and node.literal_type == "number"
+
+
+def _is_string(node: ASTNode) -> bool:
+    return isinstance(node, Literal) and node.literal_type == "string"
+
+
+def _truth(node: ASTNode) -> Optional[bool]:
+    """Get the truth value of a constant condition, or None if unknown."""
+    if not _is_number(node):
+        return None
+    magnitude = abs(node.value)
+    if magnitude <= FALSE_THRESHOLD:
+        return False
+    if magnitude >= TRUE_THRESHOLD:
+        return True
+    return None
+
+
+class ConstantFolder:
+    """Folds constant expressions and removes unreachable branches.
+
+    Args:
+        scalar_arithmetic: Fold ``+ - * /`` and ``= / !=`` on numbers with
+            double-precision semantics (for the LLVM backend). When False,
+            only folds that are exact for LRVM embeddings are made.
+        preserve_values: Keep the value of every statement in the program
+            and in function bodies unchanged. The interpreter records these
+            values in its Framework Strength tracker, so dead statements
+            there are replaced by ``null`` rather than removed, and taken
+            branches are not spliced into them.
+
+    Example:
+        >>> folder = ConstantFolder()
+        >>> program = folder.fold(program)
+        >>> folder.folded, folder.eliminated
+        (3, 1)
+    """
+
+    def __init__(self, scalar_arithmetic: bool = False, preserve_values: bool = True):
+        self.scalar_arithmetic = scalar_arithmetic
+        self.preserve_values = preserve_values
+        self.hoisted_literals: Set[Tuple[str, Any]] = set()
+        self.folded = 0
+        self.eliminated = 0
+        self._repeat_depth = 0
+
+    def fold(self, program: Program) -> Program:
+        """Fold a whole program.
+
+        Args:
+            program: Program to simplify
+
+        Returns:
+            The simplified program (the same object if nothing changed)
+        """
+        self._reset()
+        statements = self._fold_block(program.statements, tracked=True)
+        if statements is program.statements:
+            return program
+        return Program(
+            statements, span_start=program.span_start, span_end=program.span_end
+        )
+
+    def fold_statements(self, statements: List[ASTNode]) -> List[ASTNode]:
+        """Fold a list of top-level statements.
+
+        Args:
+            statements: Statements to simplify
+
+        Returns:
+            The simplified statements (the same list if nothing changed)
+        """
+        self._reset()
+        return self._fold_block(statements, tracked=True)
+
+    def _reset(self):
+        self.hoisted_literals = set()
+        self.folded = 0
+        self.eliminated = 0
+        self._repeat_depth = 0
+
+    # ------------------------------------------------------------------
+    # Statements
+    # ------------------------------------------------------------------
+
+    def _fold_block(self, statements: List[ASTNode], tracked: bool) -> List[ASTNode]:
+        """Fold a block, splicing or removing constant control flow.
+
+        ``tracked`` marks blocks whose every statement value is observed
+        (the program and function bodies).
+        """
+        keep_values = tracked and self.preserve_values
+        result = []
+        changed = False
+        last = len(statements) - 1
+
+        for i, stmt in enumerate(statements):
+            folded = self._fold_statement(stmt)
+            replacement = [folded]
+
+            if isinstance(folded, Conditional):
+                taken = _truth(folded.condition)
+                if taken is not None:
+                    replacement = self._resolve_conditional(folded, taken, keep_values)
+            elif isinstance(folded, Loop) and _truth(folded.condition) is False:
+                self.eliminated += 1
+                replacement = []
+
+            if not replacement and (
+                keep_values or (self.preserve_values and i == last)
+            ):
+                # The statement's value (a zero vector) is still observed
+                replacement = [self._null(folded)]
+
+            if len(replacement) != 1 or replacement[0] is not stmt:
+                changed = True
+
+            # Nothing after a return or break in the same block can run
+            cut = next(
+                (
+                    j
+                    for j, s in enumerate(replacement)
+                    if isinstance(s, (Return, Break))
+                ),
+                None,
+            )
+            if cut is not None and (cut + 1 < len(replacement) or i < last):
+                result.extend(replacement[: cut + 1])
+                self.eliminated += 1
+                changed = True
+                break
+            result.extend(replacement)
+
+        return result if changed else statements
+
+    def _resolve_conditional(
+        self, node: Conditional, taken: bool, keep_values: bool
+    ) -> List[ASTNode]:
+        """Get the statements that replace a conditional with a constant test."""
+        branch = node.if_block if taken else node.else_block
+        if not keep_values:
+            self.eliminated += 1
+            return list(branch or [])
+        if branch is None:
+            self.eliminated += 1
+            return []
+        if taken and node.else_block is None:
+            return [node]
+        # Keep a single always-true conditional so the statement still
+        # produces one value
+        self.eliminated += 1
+        return [
+            Conditional(
+                Literal(1, "number"),
+                branch,
+                span_start=node.span_start,
+                span_end=node.span_end,
+            )
+        ]
+
+    def _fold_statement(self, node: ASTNode) -> ASTNode:
+        if isinstance(node, Conditional):
+            condition = self._fold(node.condition)
+            if_block = self._fold_block(node.if_block, tracked=False)
+            else_block = (
+                self._fold_block(node.else_block, tracked=False)
+                if node.else_block is not None
+                else None
+            )
+            if (
+                condition is node.condition
+                and if_block is node.if_block
+                and else_block is node.else_block
+            ):
+                return node
+            return Conditional(
+                condition,
+                if_block,
+                else_block,
+                span_start=node.span_start,
+                span_end=node.span_end,
+            )
+
+        if isinstance(node, Loop):
+            self._repeat_depth += 1
+            try:
+                condition = self._fold(node.condition)
+                body = self._fold_block(node.body, tracked=False)
+            finally:
+                self._repeat_depth -= 1
+            if condition is node.condition and body is node.body:
+                return node
+            return Loop(
+                condition, body, span_start=node.span_start, span_end=node.span_end
+            )
+
+        if isinstance(node, FunctionDef):
+            self._repeat_depth += 1
+            try:
+                body = self._fold_block(node.body, tracked=True)
+            finally:
+                self._repeat_depth -= 1
+            if body is node.body:
+                return node
+            return FunctionDef(
+                node.name,
+                node.parameters,
+                body,
+                span_start=node.span_start,
+                span_end=node.span_end,
+            )
+
+        return self._fold(node)
+
+    # ------------------------------------------------------------------
+    # Expressions
+    # ------------------------------------------------------------------
+
+    def _fold(self, node: Optional[ASTNode]) -> Optional[ASTNode]:
+        """Fold an expression (or a simple statement wrapping one)."""
+        if node is None:
+            return None
+
+        if isinstance(node, Literal):
+            if self._repeat_depth and node.literal_type in ("number", "string"):
+                self.hoisted_literals.add((node.literal_type, node.value))
+            if (
+                node.literal_type == "vector"
+                and node.value
+                and any(isinstance(v, ASTNode) for v in node.value)
+            ):
+                return self._fold_vector(node)
+            return node
+
+        if isinstance(node, BinaryOp):
+            return self._fold_binary(node)
+
+        if isinstance(node, UnaryOp):
+            operand = self._fold(node.operand)
+            if node.operator == "not" and _truth(operand) is not None:
+                return self._constant(node, 0 if _truth(operand) else 1)
+            if operand is node.operand:
+                return node
+            return self._copy(node, operand=operand)
+
+        if isinstance(node, ListComprehension):
+            iterable = self._fold(node.iterable)
+            self._repeat_depth += 1
+            try:
+                expression = self._fold(node.expression)
+                condition = self._fold(node.condition)
+            finally:
+                self._repeat_depth -= 1
+            return self._rebuild(
+                node, expression=expression, iterable=iterable, condition=condition
+            )
+
+        if isinstance(node, Assignment):
+            return self._rebuild(node, expression=self._fold(node.expression))
+        if isinstance(node, Return):
+            return self._rebuild(node, expression=self._fold(node.expression))
+        if isinstance(node, Relation):
+            return self._rebuild(
+                node, left=self._fold(node.left), right=self._fold(node.right)
+            )
+        if isinstance(node, ListLiteral):
+            elements = [self._fold(e) for e in node.elements]
+            if all(new is old for new, old in zip(elements, node.elements)):
+                return node
+            return self._copy(node, elements=elements)
+        if isinstance(node, Index):
+            return self._rebuild(
+                node,
+                list_expr=self._fold(node.list_expr),
+                index_expr=self._fold(node.index_expr),
+            )
+        if isinstance(node, Slice):
+            return self._rebuild(
+                node,
+                expr=self._fold(node.expr),
+                start=self._fold(node.start),
+                end=self._fold(node.end),
+            )
+        if isinstance(node, Interrogative):
+            return self._rebuild(node, expression=self._fold(node.expression))
+        if isinstance(node, MemberAccess):
+            return self._rebuild(node, object=self._fold(node.object))
+
+        # Identifiers, imports, breaks and nested statements
+        if isinstance(node, (Conditional, Loop, FunctionDef)):
+            return self._fold_statement(node)
+        return node
+
+    def _fold_binary(self, node: BinaryOp) -> ASTNode:
+        op = node.operator
+        left = self._fold(node.left)
+
+        # Short-circuit operators only need a constant left side
+        if op in ("and", "or"):
+            left_truth = _truth(left)
+            if op == "and" and left_truth is False:
+                return self._constant(node, 0)
+            if op == "or" and left_truth is True:
+                return self._constant(node, 1)
+            right = self._fold(node.right)
+            right_truth = _truth(right)
+            if left_truth is not None and right_truth is not None:
+                return self._constant(node, 1 if right_truth else 0)
+            return self._rebuild(node, left=left, right=right)
+
+        right = self._fold(node.right)
+
+        if _is_number(left) and _is_number(right):
+            a, b = float(left.value), float(right.value)
+            if op in _COMPARISONS:
+                return self._constant(node, 1 if _COMPARISONS[op](a, b) else 0)
+            if op == "%" and abs(b) >= FALSE_THRESHOLD:
+                return self._constant(node, a % b)
+            if op in ("=", "!=") and (a == b or self.scalar_arithmetic):
+                return self._constant(node, 1 if (a == b) == (op == "=") else 0)
+            if (
+                self.scalar_arithmetic
+                and op in _ARITHMETIC
+                and not (op == "/" and b == 0.0)
+            ):
+                return self._constant(node, _ARITHMETIC[op](a, b))
+
+        elif _is_string(left) and _is_string(right):
+            if op == "+":
+                return self._constant(node, left.value + right.value, "string")
+            if op in ("=", "!=") and left.value == right.value:
+                return self._constant(node, 1 if op == "=" else 0)
+
+        return self._rebuild(node, left=left, right=right)
+
+    def _fold_vector(self, node: Literal) -> Literal:
+        """Fold the elements of a vector literal written with expressions."""
+        elements = [self._fold(e) for e in node.value]
+        if all(_is_number(e) for e in elements):
+            # Same shape the parser gives vectors of plain numbers
+            return self._copy(node, value=[e.value for e in elements])
+        if all(new is old for new, old in zip(elements, node.value)):
+            return node
+        return self._copy(node, value=elements)
+
+    # ------------------------------------------------------------------
+    # Node helpers
+    # ------------------------------------------------------------------
+
+    def _constant(self, node: ASTNode, value: Any, literal_type: str = "number"):
+        """Replace ``node`` by a literal spanning the same source."""
+        self.folded += 1
+        literal = Literal(
+            value, literal_type, span_start=node.span_start, span_end=node.span_end
+        )
+        if self._repeat_depth:
+            self.hoisted_literals.add((literal_type, value))
+        return literal
+
+    def _null(self, node: ASTNode) -> Literal:
+        return Literal(None, "null", span_start=node.span_start, span_end=node.span_end)
+
+    def _rebuild(self, node: ASTNode, **fields) -> ASTNode:
+        """Return ``node`` with some fields replaced, sharing it if unchanged."""
+        if all(getattr(node, name) is value for name, value in fields.items()):
+            return node
+        return self._copy(node, **fields)
+
+    @staticmethod
+    def _copy(node: ASTNode, **fields) -> ASTNode:
+        return replace(node, **fields)
@@ -8,9 +8,13 @@ interrogated (what, why, how, when, where) or passed to a function that might
 interrogate it. Otherwise, it can be compiled to a raw double for C-level speed.
 
 This implements zero-cost abstraction: pay for geometric semantics only when used.
+
+The same applies to function parameters: a function whose parameter is never
+observed takes a raw double instead of an EigenValue*, so calls to it pass
+plain scalars and recursive numeric code compiles to native recursion.
 """
 
-from typing import Set
+from typing import Dict, Set, Tuple
 from eigenscript.parser.ast_builder import (
     ASTNode,
     Identifier,
@@ -25,9 +29,42 @@ from eigenscript.parser.ast_builder import (
     UnaryOp,
     ListLiteral,
     Index,
+    Slice,
+    ListComprehension,
     Program,
 )
 
+PREDICATES = ("converged", "diverging", "oscillating", "stable", "improving")
+
+# Values each runtime predicate looks at (*_WINDOW in eigenvalue.h)
+PREDICATE_WINDOWS = {
+    "converged": 6,
+    "diverging": 5,
+    "oscillating": 10,
+    "stable": 1,
+    "improving": 3,
+}
+
+# Fields holding the sub-expressions and blocks of the nodes the compiler supports
+_CHILDREN = {
+    Assignment: ("expression",),
+    Interrogative: ("expression",),
+    Relation: ("left", "right"),
+    Conditional: ("condition", "if_block", "else_block"),
+    Loop: ("condition", "body"),
+    Return: ("expression",),
+    BinaryOp: ("left", "right"),
+    UnaryOp: ("operand",),
+    ListLiteral: ("elements",),
+    Index: ("list_expr", "index_expr"),
+    Slice: ("expr", "start", "end"),
+    ListComprehension: ("expression", "iterable", "condition"),
+}
+
+# Builtins taking a list, and the position of the list in their argument
+# ("len of xs" passes it directly, "map of [f, xs]" as an element)
+LIST_BUILTINS = {"len": None, "map": 1, "filter": 1, "reduce": 1, "append": 0}
+
 
 class ObserverAnalyzer:
     """Analyzes which variables need geometric tracking.
@@ -38,11 +75,25 @@ class ObserverAnalyzer:
     3. They are used in predicates (converged, diverging, etc.)
 
     Unobserved variables can be compiled to raw doubles for maximum performance.
+
+    A function's parameter ``n`` is observed if the function interrogates it,
+    rebinds it to an interrogative, uses a predicate, or passes ``n`` itself
+    to a function (or module function) whose parameter is observed. Functions
+    whose parameter is unobserved are listed in ``scalar_functions``.
+    Functions that index, slice or iterate over ``n``, or pass it to a list
+    builtin or a function doing so, take a list: they are listed in
+    ``list_functions`` instead.
+
+    ``history_depth`` is the number of history entries an EigenValue needs
+    for the predicates the program uses (at least 1).
     """
 
     def __init__(self):
         self.observed: Set[str] = set()
         self.user_functions: Set[str] = set()
+        self.scalar_functions: Set[str] = set()
+        self.list_functions: Set[str] = set()
+        self.predicates: Set[str] = set()
         self.current_function: str = None
 
     def analyze(self, ast_nodes: list[ASTNode]) -> Set[str]:
@@ -57,12 +108,17 @@ class ObserverAnalyzer:
         # Reset state
         self.observed = set()
         self.user_functions = set()
+        self.predicates = set()
         self.current_function = None
 
-        # First pass: collect all user-defined function names
-        for node in ast_nodes:
-            if isinstance(node, FunctionDef):
-                self.user_functions.add(node.name)
+        # First pass: collect all user-defined functions and classify parameters
+        functions = {
+            node.name: node for node in ast_nodes if isinstance(node, FunctionDef)
+        }
+        self.user_functions = set(functions)
+        self.scalar_functions, self.list_functions = self._classify_parameters(
+            functions
+        )
 
         # Second pass: find observed variables
         for node in ast_nodes:
@@ -70,6 +126,11 @@ class ObserverAnalyzer:
 
         return self.observed
 
+    @property
+    def history_depth(self) -> int:
+        """History entries per EigenValue needed by the predicates in use."""
+        return max((PREDICATE_WINDOWS[name] for name in self.predicates), default=1)
+
     def _visit(self, node: ASTNode):
         """Visit an AST node and detect observations."""
         if node is None:
@@ -80,12 +141,12 @@ class ObserverAnalyzer:
                 self._visit(stmt)
 
         elif isinstance(node, FunctionDef):
-            # Function parameters are always observed (might be interrogated inside)
             prev_function = self.current_function
             self.current_function = node.name
 
             # In EigenScript, functions implicitly have parameter 'n'
-            self.observed.add("n")
+            if node.name not in self.scalar_functions | self.list_functions:
+                self.observed.add("n")
 
             for stmt in node.body:
                 self._visit(stmt)
@@ -107,7 +168,11 @@ class ObserverAnalyzer:
             # Check if this is a call to a user-defined function
             if isinstance(node.left, Identifier):
                 func_name = node.left.name
-                if func_name in self.user_functions:
+                if (
+                    func_name in self.user_functions
+                    and func_name not in self.scalar_functions
+                    and func_name not in self.list_functions
+                ):
                     # Argument to user function is observed (might be interrogated inside)
                     if isinstance(node.right, Identifier):
                         self.observed.add(node.right.name)
@@ -152,33 +217,122 @@ class ObserverAnalyzer:
             self._visit(node.list_expr)
             self._visit(node.index_expr)
 
+        elif isinstance(node, ListComprehension):
+            self._visit(node.iterable)
+            self._visit(node.expression)
+            self._visit(node.condition)
+
+        elif isinstance(node, Slice):
+            self._visit(node.expr)
+            for bound in (node.start, node.end):
+                if bound is not None:
+                    self._visit(bound)
+
         elif isinstance(node, Identifier):
             # Check if this identifier is a predicate
-            if node.name in [
-                "converged",
-                "diverging",
-                "oscillating",
-                "stable",
-                "improving",
-            ]:
+            if node.name in PREDICATES:
                 # Predicates require the last variable to be observed
                 # This is a simplified heuristic - ideally we'd track scope
-                pass
+                self.predicates.add(node.name)
 
     def _check_for_predicates(self, node: ASTNode):
         """Check if condition uses predicates (converged, diverging, etc.)."""
         if isinstance(node, Identifier):
-            if node.name in [
-                "converged",
-                "diverging",
-                "oscillating",
-                "stable",
-                "improving",
-            ]:
+            if node.name in PREDICATES:
                 # TODO: Mark the variable being tested as observed
                 # For now, this is handled by the codegen heuristic of "last variable"
                 pass
 
+    def _classify_parameters(
+        self, functions: Dict[str, FunctionDef]
+    ) -> Tuple[Set[str], Set[str]]:
+        """Return the functions whose parameter is never observed, and the
+        functions whose parameter is a list."""
+        observed_params = set()
+        list_params = set()
+        forwards = {}
+        for name, func in functions.items():
+            observes, as_list, forwards[name] = self._parameter_uses(func.body)
+            if observes:
+                observed_params.add(name)
+            if as_list:
+                list_params.add(name)
+
+        # "g of n" hands n on to g: observing it (or using it as a list) there
+        # does so here
+        for params in (observed_params, list_params):
+            changed = True
+            while changed:
+                changed = False
+                for name, callees in forwards.items():
+                    if name not in params and callees & params:
+                        params.add(name)
+                        changed = True
+
+        return set(functions) - observed_params - list_params, list_params
+
+    def _parameter_uses(self, body: list[ASTNode]) -> Tuple[bool, bool, Set[str]]:
+        """Scan a function body for uses of its parameter ``n``.
+
+        Returns:
+            Whether the body observes ``n`` itself, whether it uses ``n`` as
+            a list, and the user functions that ``n`` is passed to unchanged
+        """
+        observes = False
+        as_list = False
+        forwarded_to = set()
+        stack = list(body)
+        while stack:
+            node = stack.pop()
+            if node is None or isinstance(node, FunctionDef):
+                continue  # nested functions have their own 'n'
+
+            if isinstance(node, Interrogative):
+                if isinstance(node.expression, Identifier):
+                    observes |= node.expression.name == "n"
+            elif isinstance(node, Identifier):
+                observes |= node.name in PREDICATES
+            elif isinstance(node, Assignment):
+                # "n is what is x" would make n an alias of x's EigenValue
+                observes |= node.identifier == "n" and isinstance(
+                    node.expression, Interrogative
+                )
+            elif isinstance(node, Index):
+                as_list |= _is_parameter(node.list_expr)
+            elif isinstance(node, Slice):
+                as_list |= _is_parameter(node.expr)
+            elif isinstance(node, ListComprehension):
+                as_list |= _is_parameter(node.iterable)
+            elif isinstance(node, Relation):
+                if _is_parameter(node.right):
+                    if isinstance(node.left, Identifier):
+                        if node.left.name in self.user_functions:
+                            forwarded_to.add(node.left.name)
+                        elif node.left.name == "len":
+                            as_list = True
+                    else:
+                        observes = True  # module function: signature unknown here
+                elif (
+                    isinstance(node.left, Identifier)
+                    and node.left.name not in self.user_functions
+                    and LIST_BUILTINS.get(node.left.name) is not None
+                    and isinstance(node.right, ListLiteral)
+                ):
+                    position = LIST_BUILTINS[node.left.name]
+                    elements = node.right.elements
+                    as_list |= len(elements) > position and _is_parameter(
+                        elements[position]
+                    )
+
+            for name in _CHILDREN.get(type(node), ()):
+                child = getattr(node, name)
+                if isinstance(child, list):
+                    stack.extend(child)
+                else:
+                    stack.append(child)
+
+        return observes, as_list, forwarded_to
+
     def _mark_expression_observed(self, node: ASTNode):
         """Recursively mark all identifiers in an expression as observed."""
         if isinstance(node, Identifier):
@@ -188,3 +342,7 @@ class ObserverAnalyzer:
             self._mark_expression_observed(node.right)
         elif isinstance(node, UnaryOp):
             self._mark_expression_observed(node.operand)
+
+
+def _is_parameter(node: ASTNode) -> bool:
+    return isinstance(node, Identifier) and node.name == "n"
@@ -0,0 +1,252 @@
+"""
+Content-addressed build cache for compiled modules.
+
+``compile_module`` turns every module of a program into an object file.
+The object file for a module is fully determined by its source text, the
+compiler (EigenScript and LLVM versions, runtime bitcode), the target
+triple, the optimization level, the name it is compiled as (or whether it
+is the entry module), its profile settings (instrumentation, or the counts
+it is optimized for), and the modules it imports. ``module_key`` hashes
+all of that into one key, and each compiled object is stored under its
+key, so a later build whose key matches copies the stored object instead
+of parsing, generating code, optimizing and emitting it again.
+
+A module's key includes the keys of the modules it imports, so editing one
+file invalidates that file and everything that (transitively) imports it,
+and nothing else.
+
+Entries live next to the parse cache: in an ``__eigscache__`` directory
+next to each source file, or in ``EIGEN_CACHE_DIR`` if it is set (where
+entry names include a hash of the source path, so modules with the same
+file name in different directories keep separate entries). Each
+entry holds a small header, the module's exported symbols (its
+``{name}_init`` or ``main`` and its functions) and the object code.
+Unreadable or corrupt entries are treated as misses. Each module keeps at
+most ``MAX_ENTRIES_PER_MODULE`` entries (one per recently used
+configuration); storing a new one removes the least recently used.
+"""
+
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from llvmlite import binding as llvm
+
+from eigenscript.compiler.codegen.llvm_backend import find_runtime_bitcode
+from eigenscript.parser.cache import CACHE_DIRNAME, source_hash
+
+BUILD_CACHE_SUFFIX = ".eigso"
+
+# Entries kept per module; loading an entry marks it as recently used
+MAX_ENTRIES_PER_MODULE = 4
+
+# Bump when the entry layout or the code generator's output changes shape
+FORMAT_VERSION = 3
+
+_MAGIC = b"EIGO"
+_HEADER = struct.Struct(">4sHI")  # magic, format version, symbol table length
+
+# Runtime bitcode digests, by path (the bitcode is linked into every module)
+_runtime_digests: Dict[Optional[str], bytes] = {}
+
+
+@dataclass
+class CachedModule:
+    """A compiled module loaded from the build cache."""
+
+    symbols: List[str]  # Symbols the object file defines for other modules
+    object_code: bytes
+
+
+def _runtime_digest(target_triple: Optional[str]) -> bytes:
+    runtime_bc = find_runtime_bitcode(target_triple)
+    if runtime_bc not in _runtime_digests:
+        digest = b""
+        if runtime_bc is not None:
+            with open(runtime_bc, "rb") as f:
+                digest = hashlib.sha256(f.read()).digest()
+        _runtime_digests[runtime_bc] = digest
+    return _runtime_digests[runtime_bc]
+
+
+def module_key(
+    source: str,
+    module_name: Optional[str],
+    target_triple: Optional[str],
+    opt_level: int,
+    dependency_keys: List[str],
+    profile: str = "",
+) -> str:
+    """
+    Compute the cache key of a module's object file.
+
+    Args:
+        source: Source text of the module
+        module_name: Name the module is compiled as (its symbols are
+                     prefixed with it), or None for the entry module
+        target_triple: LLVM target triple (None: host)
+        opt_level: Optimization level (0-3)
+        dependency_keys: Keys of the imported modules, in import order
+        profile: The module's profile settings, as a string (empty: built
+                 without instrumentation or profile)
+
+    Returns:
+        Hex digest identifying the object file
+    """
+    from eigenscript import __version__
+
+    triple = target_triple or llvm.get_default_triple()
+    config = [
+        str(FORMAT_VERSION),
+        __version__,
+        ".".join(str(part) for part in llvm.llvm_version_info),
+        triple,
+        str(opt_level),
+        # Module names are identifiers, so no name can collide with this
+        "<main>" if module_name is None else module_name,
+    ]
+    h = hashlib.sha256()
+    h.update("\0".join(config).encode("utf-8"))
+    h.update(_runtime_digest(target_triple))
+    h.update(source_hash(source))
+    h.update(source_hash(profile))
+    for key in dependency_keys:
+        h.update(key.encode("ascii"))
+    return h.hexdigest()
+
+
+def entry_path_for(source_path: str, key: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Get the cache entry path for a module's object file.
+
+    Args:
+        source_path: Path to the module's .eigs file
+        key: The module's key (``module_key``)
+        cache_dir: Directory for all cache files (default: ``EIGEN_CACHE_DIR``
+                   or an ``__eigscache__`` directory next to the source)
+
+    Returns:
+        Path of the ``.eigso`` entry (which may not exist yet)
+    """
+    stem, cache_dir = _entry_location(source_path, cache_dir)
+    return os.path.join(cache_dir, f"{stem}.{key}{BUILD_CACHE_SUFFIX}")
+
+
+def _entry_location(source_path: str, cache_dir: Optional[str]) -> Tuple[str, str]:
+    """The stem of a module's entries and the directory they live in."""
+    abs_path = os.path.abspath(source_path)
+    stem = os.path.splitext(os.path.basename(abs_path))[0]
+
+    cache_dir = cache_dir or os.environ.get("EIGEN_CACHE_DIR")
+    if cache_dir:
+        # One shared directory: disambiguate files with the same name
+        path_tag = hashlib.sha256(abs_path.encode("utf-8")).hexdigest()[:16]
+        return f"{stem}.{path_tag}", cache_dir
+
+    return stem, os.path.join(os.path.dirname(abs_path), CACHE_DIRNAME)
+
+
+def _prune_entries(source_path: str, cache_dir: Optional[str]) -> None:
+    """Remove a module's least recently used entries beyond the limit."""
+    stem, directory = _entry_location(source_path, cache_dir)
+    entry_name = re.compile(rf"{re.escape(stem)}\.[^.]+{re.escape(BUILD_CACHE_SUFFIX)}")
+    entries = []
+    try:
+        for entry in os.scandir(directory):
+            if entry_name.fullmatch(entry.name):
+                entries.append((entry.stat().st_mtime_ns, entry.path))
+    except OSError:
+        return
+
+    entries.sort(reverse=True)
+    for _, path in entries[MAX_ENTRIES_PER_MODULE:]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def load_cached_module(
+    source_path: str, key: str, cache_dir: Optional[str] = None
+) -> Optional[CachedModule]:
+    """
+    Load a module's object file from the cache.
+
+    Returns:
+        The cached module, or None if there is no valid entry for ``key``
+    """
+    entry_path = entry_path_for(source_path, key, cache_dir)
+    try:
+        with open(entry_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if len(data) < _HEADER.size:
+        return None
+    magic, format_version, symbols_len = _HEADER.unpack_from(data)
+    if magic != _MAGIC or format_version != FORMAT_VERSION:
+        return None
+
+    offset = _HEADER.size + symbols_len
+    try:
+        symbols = json.loads(data[_HEADER.size : offset].decode("utf-8"))
+    except ValueError:
+        return None
+    if not isinstance(symbols, list) or len(data) <= offset:
+        return None
+
+    try:
+        os.utime(entry_path)
+    except OSError:
+        pass
+    return CachedModule(symbols, data[offset:])
+
+
+def store_cached_module(
+    source_path: str,
+    key: str,
+    symbols: List[str],
+    object_code: bytes,
+    cache_dir: Optional[str] = None,
+) -> bool:
+    """
+    Store a module's object file in the cache.
+
+    The entry is written to a temporary name and renamed into place, so
+    concurrent builds never see a partial entry. The module's least
+    recently used entries beyond ``MAX_ENTRIES_PER_MODULE`` are removed.
+    Failures (read-only directories, full disks) are ignored.
+
+    Returns:
+        True if the entry was written
+    """
+    entry_path = entry_path_for(source_path, key, cache_dir)
+    symbol_table = json.dumps(symbols).encode("utf-8")
+    data = (
+        _HEADER.pack(_MAGIC, FORMAT_VERSION, len(symbol_table))
+        + symbol_table
+        + object_code
+    )
+
+    try:
+        directory = os.path.dirname(entry_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return False
+
+    _prune_entries(source_path, cache_dir)
+    return True
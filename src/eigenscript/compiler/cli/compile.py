@@ -5,17 +5,34 @@ Compile .eigs files to LLVM IR, native code, or WebAssembly.
 Supports recursive module compilation and dependency management.
 """
 
+import io
+import json
 import sys
 import os
 import argparse
 import subprocess
-from typing import List, Set, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from typing import Dict, List, NamedTuple, Set, Optional, Tuple
 
 from eigenscript.lexer import Tokenizer
 from eigenscript.parser.ast_builder import Parser, Import
+from eigenscript.parser.cache import parse_file, source_hash
 from eigenscript.compiler.codegen.llvm_backend import LLVMCodeGenerator
+from eigenscript.compiler.codegen.profile import (
+    Instrumentation,
+    Profile,
+    module_tag,
+    profile_path_for,
+)
 from eigenscript.compiler.analysis.observer import ObserverAnalyzer
 from eigenscript.compiler.analysis.resolver import ModuleResolver
+from eigenscript.compiler.cli.build_cache import (
+    load_cached_module,
+    module_key,
+    store_cached_module,
+)
 from eigenscript.compiler.runtime.targets import infer_target_name
 from llvmlite import binding as llvm
 
@@ -91,6 +108,83 @@ def scan_imports(ast) -> List[str]:
     return imports
 
 
+@dataclass
+class ModuleNode:
+    """One module of a program's import graph."""
+
+    path: str  # Absolute path of the source file
+    imports: List[str]  # Module names imported by this module, in source order
+    dependencies: List[str]  # Absolute paths of the imported modules
+
+
+class CompileUnit(NamedTuple):
+    """A module that needs compiling: the arguments of ``_compile_unit``."""
+
+    source_path: str
+    imports: List[str]
+    target_triple: Optional[str]
+    opt_level: int
+    is_main: bool
+    output_path: str
+    instrumentation: Optional[Instrumentation] = None
+    profile: Optional[Dict[str, int]] = None
+
+
+def build_import_graph(
+    source_path: str, resolver: ModuleResolver
+) -> Optional[Dict[str, ModuleNode]]:
+    """
+    Find every module a program depends on.
+
+    Each file is parsed once (through the parse cache) to read its import
+    statements. Import cycles are allowed: a module is visited only once.
+
+    Args:
+        source_path: Path to the program's entry module
+        resolver: ModuleResolver for finding imported modules
+
+    Returns:
+        Mapping from absolute path to ModuleNode, dependencies before the
+        modules that import them (the entry module last), or None if a
+        module cannot be found or read
+    """
+    graph: Dict[str, ModuleNode] = {}
+    pending: Dict[str, ModuleNode] = {}  # visited, dependencies not done yet
+
+    # Iterative depth-first walk: (path, have its dependencies been pushed?)
+    stack: List[Tuple[str, bool]] = [(os.path.abspath(source_path), False)]
+    while stack:
+        path, expanded = stack.pop()
+        if expanded:
+            graph[path] = pending.pop(path)
+            continue
+        if path in graph or path in pending:
+            continue
+
+        try:
+            with open(path, "r") as f:
+                source_code = f.read()
+        except FileNotFoundError:
+            print(f"  ✗ Module not found: {path}")
+            return None
+
+        imports = scan_imports(parse_file(path, source_code))
+        dependencies = []
+        for module_name in imports:
+            try:
+                dependencies.append(os.path.abspath(resolver.resolve(module_name)))
+            except ImportError as e:
+                print(f"  ✗ {e}")
+                return None
+
+        pending[path] = ModuleNode(path, imports, dependencies)
+        stack.append((path, True))
+        for dependency in reversed(dependencies):
+            stack.append((dependency, False))
+
+    return graph
+
+
 def compile_module(
     source_path: str,
     resolver: ModuleResolver,
@@ -98,9 +192,25 @@ def compile_module(
     target_triple: str = None,
     opt_level: int = 0,
     is_main: bool = False,
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
+    symbols: Optional[Dict[str, List[str]]] = None,
+    profile_generate: Optional[str] = None,
+    profile_use: Optional[str] = None,
 ) -> Optional[str]:
     """
-    Recursively compile a module and its dependencies.
+    Compile a module and all of its dependencies.
+
+    The import graph is built first. Modules whose object file is in the
+    build cache (``build_cache``) under their current key are copied from
+    it without being compiled; a module's key covers its source, the
+    compiler configuration and the keys of its imports, so after an edit
+    only the edited module and its importers are rebuilt. Compiling one
+    module needs only the names of the modules it imports, never their
+    object code, so all remaining modules that are not yet in
+    ``compiled_objects`` are compiled at the same time in a process pool;
+    the build takes as long as its slowest module rather than the sum of
+    all of them.
 
     Args:
         source_path: Path to the .eigs file to compile
@@ -109,16 +219,190 @@ def compile_module(
         target_triple: LLVM target triple
         opt_level: Optimization level (0-3)
         is_main: True if this is the main entry point (generates main()), False for libraries
+        jobs: Maximum number of modules compiled at once (default: CPU count;
+              1 compiles in this process, one module after another)
+        use_cache: Reuse and store object files in the build cache
+        symbols: Filled with the symbols each compiled module exports
+                 (its init function or main, and its functions), by path
+        profile_generate: Instrument every module; the program appends its
+                          execution counts to this profile file
+        profile_use: Optimize every module for its counts in this profile
+                     file (modules edited since it was recorded have none)
 
     Returns:
         Path to the compiled object file, or None on failure
     """
-    # Prevent circular dependencies and duplicate compilation
+    # Prevent duplicate compilation
     abs_path = os.path.abspath(source_path)
     if abs_path in compiled_objects:
         # Already compiled, return the object file path
         return resolver.get_output_path(source_path, target_triple)
 
+    graph = build_import_graph(source_path, resolver)
+    if graph is None:
+        return None
+
+    if symbols is None:
+        symbols = {}
+
+    profile = None
+    if profile_use:
+        try:
+            profile = Profile.load(profile_use)
+        except (OSError, ValueError) as e:
+            print(f"  ✗ Could not read profile: {e}")
+            return None
+
+    sources = {}
+    for path in graph:
+        with open(path, "r") as f:
+            sources[path] = f.read()
+
+    # Keys in graph order, so dependencies are keyed before their importers.
+    # A module imported through a cycle is not keyed yet: use its source.
+    keys: Dict[str, str] = {}
+    units: List[CompileUnit] = []
+    for path, node in graph.items():
+        # Dependencies are always libraries (is_main=False)
+        module_is_main = is_main and path == abs_path
+        dependency_keys = [
+            keys.get(dependency) or source_hash(sources[dependency]).hex()
+            for dependency in node.dependencies
+        ]
+        module_name = (
+            None if module_is_main else os.path.splitext(os.path.basename(path))[0]
+        )
+        tag = module_tag(module_name, sources[path])
+        instrumentation = None
+        if profile_generate:
+            output = os.path.abspath(profile_generate) if module_is_main else None
+            instrumentation = Instrumentation(tag, output)
+        counts = profile.module(tag) if profile else None
+        keys[path] = module_key(
+            sources[path],
+            module_name,
+            target_triple,
+            opt_level,
+            dependency_keys,
+            _profile_key(instrumentation, counts),
+        )
+        if path in compiled_objects:
+            continue
+        if profile is not None and counts is None:
+            print(f"  ! No profile for {path} (edited since it was recorded?)")
+
+        output_path = resolver.get_output_path(path, target_triple)
+        cached = load_cached_module(path, keys[path]) if use_cache else None
+        if cached is not None:
+            print(f"\n→ Module up to date: {path}")
+            _write_object(output_path, cached.object_code)
+            compiled_objects.add(path)
+            symbols[path] = cached.symbols
+            continue
+
+        units.append(
+            CompileUnit(
+                source_path if path == abs_path else path,
+                node.imports,
+                target_triple,
+                opt_level,
+                module_is_main,
+                output_path,
+                instrumentation,
+                counts,
+            )
+        )
+
+    jobs = min(jobs or os.cpu_count() or 1, len(units))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = []
+            for exported, log in pool.map(_compile_unit_captured, units):
+                print(log, end="")
+                results.append(exported)
+    else:
+        results = [_compile_unit(*unit) for unit in units]
+
+    failed = []
+    for unit, exported in zip(units, results):
+        path = os.path.abspath(unit.source_path)
+        if exported is None:
+            failed.append(path)
+            continue
+        compiled_objects.add(path)
+        symbols[path] = exported
+        if use_cache:
+            with open(unit.output_path, "rb") as f:
+                store_cached_module(path, keys[path], exported, f.read())
+
+    if abs_path in failed:
+        return None
+    if failed:
+        for path in failed:
+            module_name = os.path.splitext(os.path.basename(path))[0]
+            print(f"  ✗ Failed to compile dependency: {module_name}")
+        return None
+
+    return resolver.get_output_path(source_path, target_triple)
+
+
+def _profile_key(
+    instrumentation: Optional[Instrumentation], counts: Optional[Dict[str, int]]
+) -> str:
+    """What a module's profile settings add to its build cache key."""
+    if instrumentation is not None:
+        return f"generate:{instrumentation.output or ''}"
+    if counts is not None:
+        return "use:" + json.dumps(counts, sort_keys=True)
+    return ""
+
+
+def _write_object(output_path: str, object_code: bytes) -> None:
+    """Write an object file, leaving it untouched if it is already current."""
+    try:
+        with open(output_path, "rb") as f:
+            if f.read() == object_code:
+                return
+    except OSError:
+        pass
+    with open(output_path, "wb") as f:
+        f.write(object_code)
+
+
+def _compile_unit_captured(unit: CompileUnit) -> Tuple[Optional[List[str]], str]:
+    """Run ``_compile_unit`` in a worker process, returning its output."""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        exported = _compile_unit(*unit)
+    return exported, buffer.getvalue()
+
+
+def _compile_unit(
+    source_path: str,
+    imports: List[str],
+    target_triple: Optional[str],
+    opt_level: int,
+    is_main: bool,
+    output_path: str,
+    instrumentation: Optional[Instrumentation] = None,
+    profile: Optional[Dict[str, int]] = None,
+) -> Optional[List[str]]:
+    """
+    Compile one module to an object file.
+
+    Args:
+        source_path: Path to the module's .eigs file
+        imports: Names of the modules it imports
+        target_triple: LLVM target triple
+        opt_level: Optimization level (0-3)
+        is_main: Generate main() instead of a {module}_init() library entry
+        output_path: Object file to write
+        instrumentation: Count executions into a profile
+        profile: The module's counts from a profile, to optimize for
+
+    Returns:
+        The symbols the module exports, or None if no object file was written
+    """
     print(f"\n→ Compiling module: {source_path}")
 
     # Read source
@@ -129,34 +413,10 @@ def compile_module(
         print(f"  ✗ Module not found: {source_path}")
         return None
 
-    # Parse to find imports
-    tokenizer = Tokenizer(source_code)
-    tokens = tokenizer.tokenize()
-    parser = Parser(tokens)
-    ast = parser.parse()
-
-    # Find and recursively compile dependencies first
-    imports = scan_imports(ast)
+    # Parse (reusing the cached AST when the source is unchanged)
+    ast = parse_file(source_path, source_code)
     if imports:
         print(f"  → Found imports: {imports}")
-        for module_name in imports:
-            try:
-                module_path = resolver.resolve(module_name)
-                # Dependencies are always libraries (is_main=False)
-                dep_obj = compile_module(
-                    module_path,
-                    resolver,
-                    compiled_objects,
-                    target_triple,
-                    opt_level,
-                    is_main=False,
-                )
-                if not dep_obj:
-                    print(f"  ✗ Failed to compile dependency: {module_name}")
-                    return None
-            except ImportError as e:
-                print(f"  ✗ {e}")
-                return None
 
     # Now compile this module
     try:
@@ -182,6 +442,11 @@ def compile_module(
             observed_variables=observed_vars,
             target_triple=target_triple,
             module_name=codegen_module_name,
+            scalar_functions=analyzer.scalar_functions,
+            list_functions=analyzer.list_functions,
+            history_depth=analyzer.history_depth,
+            instrumentation=instrumentation,
+            profile=profile,
         )
         # Phase 4.4: Pass imported modules so main() can call their init functions
         imported_modules_for_codegen = imports if is_main else None
@@ -190,6 +455,11 @@ def compile_module(
         # Parse and verify
         llvm_module = llvm.parse_assembly(llvm_ir)
         llvm_module.verify()
+        exported = [
+            func.name
+            for func in llvm_module.functions
+            if not func.is_declaration and func.linkage == llvm.Linkage.external
+        ]
 
         # Link runtime bitcode
         llvm_module = codegen.link_runtime_bitcode(llvm_module, target_triple)
@@ -207,12 +477,9 @@ def compile_module(
             target_machine = target.create_target_machine()
 
             pb = llvm.create_pass_builder(target_machine, pto)
-            mpm = llvm.create_module_pass_manager()
-            pb.populate_module_pass_manager(mpm)
-            mpm.run(llvm_module)
+            pb.getModulePassManager().run(llvm_module, pb)
 
         # Emit object file
-        output_path = resolver.get_output_path(source_path, target_triple)
         if target_triple:
             target = llvm.Target.from_triple(target_triple)
         else:
@@ -223,10 +490,7 @@ def compile_module(
             f.write(target_machine.emit_object(llvm_module))
 
         print(f"  ✓ Compiled to: {output_path}")
-
-        # Mark as compiled
-        compiled_objects.add(abs_path)
-        return output_path
+        return exported
 
     except Exception as e:
         print(f"  ✗ Compilation failed: {e}")
@@ -241,6 +505,10 @@ def compile_file(
     link_exec: bool = False,
     opt_level: int = 0,
     target_triple: str = None,
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
+    profile_generate: Optional[str] = None,
+    profile_use: Optional[str] = None,
 ):
     """Compile an EigenScript file to LLVM IR, object code, or executable."""
 
@@ -285,6 +553,10 @@ def compile_file(
                 target_triple,
                 opt_level,
                 is_main=True,
+                jobs=jobs,
+                use_cache=use_cache,
+                profile_generate=profile_generate,
+                profile_use=profile_use,
             )
 
             if not main_obj:
@@ -371,10 +643,37 @@ def compile_file(
             )
         else:
             print(f"  ✓ Analysis: No variables need geometric tracking (pure scalars!)")
+        if analyzer.scalar_functions:
+            print(
+                f"  ✓ Analysis: {len(analyzer.scalar_functions)} functions take raw "
+                f"doubles {analyzer.scalar_functions}"
+            )
+
+        # Profile-guided optimization
+        tag = module_tag(None, source_code)
+        instrumentation = None
+        if profile_generate:
+            instrumentation = Instrumentation(tag, os.path.abspath(profile_generate))
+            print(f"  ✓ Instrumented: counts go to {profile_generate}")
+        profile = None
+        if profile_use:
+            profile = Profile.load(profile_use).module(tag)
+            if profile is None:
+                print(
+                    f"  ! No profile for {input_file} (edited since it was recorded?)"
+                )
+            else:
+                print(f"  ✓ Profile: {len(profile)} counts from {profile_use}")
 
         # Generate LLVM IR
         codegen = LLVMCodeGenerator(
-            observed_variables=observed_vars, target_triple=target_triple
+            observed_variables=observed_vars,
+            target_triple=target_triple,
+            scalar_functions=analyzer.scalar_functions,
+            list_functions=analyzer.list_functions,
+            history_depth=analyzer.history_depth,
+            instrumentation=instrumentation,
+            profile=profile,
         )
         llvm_ir = codegen.compile(ast.statements)
         print(f"  ✓ Generated LLVM IR")
@@ -420,9 +719,7 @@ def compile_file(
             target_machine = target.create_target_machine()
 
             pb = llvm.create_pass_builder(target_machine, pto)
-            mpm = llvm.create_module_pass_manager()
-            pb.populate_module_pass_manager(mpm)
-            mpm.run(llvm_module)
+            pb.getModulePassManager().run(llvm_module, pb)
             print(f"  ✓ Optimizations applied (level {opt_level})")
 
         # Write output
@@ -464,6 +761,10 @@ Examples:
   %(prog)s program.eigs -O2 --exec                   # Compile with -O2 optimizations
   %(prog)s program.eigs --target {DEFAULT_WASM_TARGET} --exec  # Compile to WebAssembly (program.wasm)
   %(prog)s program.eigs --no-verify                  # Skip verification
+  %(prog)s program.eigs --exec -j 8                  # Compile up to 8 modules at once
+  %(prog)s program.eigs --exec --no-cache            # Recompile every module
+  %(prog)s program.eigs --exec --profile-generate    # Count into program.eigprof
+  %(prog)s program.eigs -O2 --exec --profile-use program.eigprof  # Optimize for it
         """,
     )
 
@@ -492,9 +793,40 @@ Examples:
     parser.add_argument(
         "--no-verify", action="store_true", help="Skip LLVM IR verification"
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of modules to compile in parallel (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompile every module instead of reusing cached object files",
+    )
+
+    profile = parser.add_mutually_exclusive_group()
+    profile.add_argument(
+        "--profile-generate",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="Instrument the program to count function calls, branches and loop "
+        "iterations into FILE each time it runs (default: input with .eigprof "
+        "extension)",
+    )
+    profile.add_argument(
+        "--profile-use",
+        metavar="FILE",
+        help="Optimize for the counts recorded by an instrumented build",
+    )
 
     args = parser.parse_args()
 
+    profile_generate = args.profile_generate
+    if profile_generate == "":
+        profile_generate = profile_path_for(args.input)
+
     # Determine output mode
     emit_llvm = not args.obj and not args.exec
     link_exec = args.exec
@@ -507,6 +839,10 @@ Examples:
         link_exec=link_exec,
         opt_level=args.optimize,
         target_triple=args.target,
+        jobs=args.jobs,
+        use_cache=not args.no_cache,
+        profile_generate=profile_generate,
+        profile_use=args.profile_use,
     )
 
     sys.exit(result)
@@ -0,0 +1,251 @@
+"""
+In-process JIT execution for the LLVM backend.
+
+``compile.py`` turns a program into an object file, links an executable
+with an external toolchain and runs it as a new process. The JIT skips all
+of that: the module produced by ``LLVMCodeGenerator.compile``, the modules
+it imports and the runtime bitcode are linked into one LLVM module,
+optimized, compiled to machine code in memory by llvmlite's MCJIT, and
+``main`` is called directly. No C compiler or linker is needed at run
+time, only the runtime bitcode (``runtime/eigenvalue.bc``, built once with
+``runtime/build_runtime.py``).
+
+Without the bitcode, the runtime can be provided as a shared library built
+from ``eigenvalue.c`` instead, through the ``EIGEN_RUNTIME_LIB`` environment
+variable or the ``runtime_library`` argument.
+
+Compiled programs print through C's stdio, straight to file descriptor 1,
+so redirecting ``sys.stdout`` in Python does not capture their output.
+
+Profile-guided optimization works as with ``compile.py``: a program
+compiled with ``profile_generate`` appends its counts to that profile file
+every time it runs, and compiling it with ``profile_use`` optimizes it for
+them (see ``profile.py``).
+
+Example:
+    >>> program = jit_compile("fibonacci.eigs")
+    >>> exit_code = program.run()
+"""
+
+import ctypes
+import ctypes.util
+import os
+import sys
+from typing import Dict, List, Optional
+
+from llvmlite import binding as llvm
+
+from eigenscript.compiler.analysis.observer import ObserverAnalyzer
+from eigenscript.compiler.codegen.llvm_backend import (
+    LLVMCodeGenerator,
+    find_runtime_bitcode,
+)
+from eigenscript.compiler.codegen.profile import Instrumentation, Profile, module_tag
+from eigenscript.parser.ast_builder import ASTNode, Import, Program
+
+RUNTIME_LIBRARY_ENV = "EIGEN_RUNTIME_LIB"
+
+
+class JITProgram:
+    """A compiled program loaded into this process, ready to run."""
+
+    def __init__(self, engine: llvm.ExecutionEngine, llvm_module: llvm.ModuleRef):
+        # The engine owns the machine code; keep it alive with the program
+        self._engine = engine
+        self.llvm_module = llvm_module
+        address = engine.get_function_address("main")
+        self._main = ctypes.CFUNCTYPE(ctypes.c_int32)(address)
+
+    def run(self) -> int:
+        """Call the program's ``main`` and return its exit code."""
+        sys.stdout.flush()  # keep Python and C output in order
+        try:
+            return self._main()
+        finally:
+            _flush_c_stdio()
+
+
+def _flush_c_stdio() -> None:
+    ctypes.CDLL(None).fflush(None)
+
+
+def _load_runtime(llvm_module: llvm.ModuleRef, runtime_library: Optional[str]) -> None:
+    """Link the runtime bitcode into the module, or load a runtime library."""
+    runtime_bc = find_runtime_bitcode()
+    if runtime_bc is not None:
+        with open(runtime_bc, "rb") as f:
+            llvm.link_modules(llvm_module, llvm.parse_bitcode(f.read()))
+    else:
+        library = runtime_library or os.environ.get(RUNTIME_LIBRARY_ENV)
+        if not library or not os.path.exists(library):
+            raise RuntimeError(
+                "The JIT needs the EigenScript runtime: build runtime/eigenvalue.bc "
+                "with runtime/build_runtime.py, or set "
+                f"{RUNTIME_LIBRARY_ENV} to a shared library built from eigenvalue.c"
+            )
+        llvm.load_library_permanently(library)
+
+    # The runtime calls into libm
+    libm = ctypes.util.find_library("m")
+    if libm:
+        llvm.load_library_permanently(libm)
+
+
+def _generate(
+    statements: List[ASTNode],
+    module_name: Optional[str],
+    imports: List[str],
+    instrumentation: Optional[Instrumentation] = None,
+    profile: Optional[Dict[str, int]] = None,
+) -> llvm.ModuleRef:
+    """Generate and verify the LLVM module for one EigenScript module."""
+    code_statements = [stmt for stmt in statements if not isinstance(stmt, Import)]
+    analyzer = ObserverAnalyzer()
+    codegen = LLVMCodeGenerator(
+        observed_variables=analyzer.analyze(code_statements),
+        module_name=module_name,
+        scalar_functions=analyzer.scalar_functions,
+        list_functions=analyzer.list_functions,
+        history_depth=analyzer.history_depth,
+        instrumentation=instrumentation,
+        profile=profile,
+    )
+    # Only main() calls the init functions of the modules it imports
+    llvm_ir = codegen.compile(code_statements, imports if module_name is None else None)
+    llvm_module = llvm.parse_assembly(llvm_ir)
+    llvm_module.verify()
+    return llvm_module
+
+
+def _optimize(
+    llvm_module: llvm.ModuleRef, target_machine: llvm.TargetMachine, opt_level: int
+) -> None:
+    """Run the same pass pipeline as ``compile.py`` at ``opt_level``."""
+    pto = llvm.create_pipeline_tuning_options()
+    pto.speed_level = opt_level
+    pto.size_level = 0
+    pto.inline_threshold = {1: 75, 2: 225, 3: 375}.get(opt_level, 225)
+    if opt_level >= 2:
+        pto.loop_vectorization = True
+        pto.slp_vectorization = True
+        pto.loop_interleaving = True
+        pto.loop_unrolling = True
+
+    pb = llvm.create_pass_builder(target_machine, pto)
+    pb.getModulePassManager().run(llvm_module, pb)
+
+
+def jit_compile(
+    source_path: str,
+    program: Optional[Program] = None,
+    opt_level: int = 2,
+    runtime_library: Optional[str] = None,
+    profile_generate: Optional[str] = None,
+    profile_use: Optional[str] = None,
+) -> JITProgram:
+    """
+    Compile a program and the modules it imports to machine code in memory.
+
+    Args:
+        source_path: Path to the program's .eigs file (imports are resolved
+                     from its directory)
+        program: Already parsed AST of the file (default: parse it)
+        opt_level: Optimization level (0-3)
+        runtime_library: Shared runtime library to use if there is no
+                         runtime bitcode (default: ``EIGEN_RUNTIME_LIB``)
+        profile_generate: Instrument the program to append its execution
+                          counts to this profile file whenever it runs
+        profile_use: Optimize the program for the counts in this profile file
+
+    Returns:
+        The loaded program
+
+    Raises:
+        ImportError: If an imported module cannot be found
+        OSError: If the ``profile_use`` file cannot be read
+        ValueError: If the ``profile_use`` file is not a profile
+        RuntimeError: If neither the runtime bitcode nor a runtime library
+                      is available
+        CompilerError: If the program cannot be compiled
+    """
+    from eigenscript.compiler.analysis.resolver import ModuleResolver
+    from eigenscript.compiler.cli.compile import build_import_graph
+    from eigenscript.parser.cache import parse_file
+
+    main_path = os.path.abspath(source_path)
+    resolver = ModuleResolver(root_dir=os.path.dirname(main_path))
+    graph = build_import_graph(main_path, resolver)
+    if graph is None:
+        raise ImportError(f"Could not load the modules imported by {source_path}")
+
+    profile = Profile.load(profile_use) if profile_use else None
+
+    # Dependencies first, main last: all of them become one module
+    llvm_module = None
+    for path, node in graph.items():
+        is_main = path == main_path
+        module_name = None if is_main else os.path.splitext(os.path.basename(path))[0]
+        with open(path, "r") as f:
+            source = f.read()
+        tag = module_tag(module_name, source)
+        instrumentation = None
+        if profile_generate:
+            output = os.path.abspath(profile_generate) if is_main else None
+            instrumentation = Instrumentation(tag, output)
+
+        if is_main and program is not None:
+            statements = program.statements
+        else:
+            statements = parse_file(path, source).statements
+        module = _generate(
+            statements,
+            module_name,
+            node.imports,
+            instrumentation,
+            profile.module(tag) if profile else None,
+        )
+        if llvm_module is None:
+            llvm_module = module
+        else:
+            llvm.link_modules(llvm_module, module)
+
+    _load_runtime(llvm_module, runtime_library)
+
+    target_machine = llvm.Target.from_default_triple().create_target_machine()
+    if opt_level > 0:
+        _optimize(llvm_module, target_machine, opt_level)
+
+    engine = llvm.create_mcjit_compiler(llvm_module, target_machine)
+    engine.finalize_object()
+    engine.run_static_constructors()
+    return JITProgram(engine, llvm_module)
+
+
+def run_jit(
+    source_path: str,
+    program: Optional[Program] = None,
+    opt_level: int = 2,
+    profile_generate: Optional[str] = None,
+    profile_use: Optional[str] = None,
+) -> int:
+    """
+    Compile a program with the JIT and run it in this process.
+
+    Args:
+        source_path: Path to the program's .eigs file
+        program: Already parsed AST of the file (default: parse it)
+        opt_level: Optimization level (0-3)
+        profile_generate: Instrument the program, appending its execution
+                          counts to this profile file
+        profile_use: Optimize the program for the counts in this profile file
+
+    Returns:
+        The program's exit code
+    """
+    return jit_compile(
+        source_path,
+        program,
+        opt_level,
+        profile_generate=profile_generate,
+        profile_use=profile_use,
+    ).run()
@@ -4,9 +4,10 @@ Generates LLVM IR from EigenScript AST nodes.
 """
 
 import os
+from collections import Counter
 from llvmlite import ir
 from llvmlite import binding as llvm
-from typing import Dict, Any, Optional, Union, Set
+from typing import Callable, Dict, Any, Optional, Tuple, Union, Set
 from enum import Enum
 from dataclasses import dataclass
 
@@ -25,12 +26,17 @@ from eigenscript.parser.ast_builder import (
     Relation,
     Interrogative,
     ListLiteral,
+    ListComprehension,
     Index,
     Slice,
     Program,
     Import,
     MemberAccess,
 )
+from eigenscript.parser.arena import ASTArena
+from eigenscript.compiler.analysis.folding import ConstantFolder
+from eigenscript.compiler.analysis.observer import PREDICATE_WINDOWS
+from eigenscript.compiler.codegen.profile import Instrumentation
 
 
 class CompilerError(Exception):
@@ -59,6 +65,8 @@ class ValueKind(Enum):
     SCALAR = "scalar"  # Raw double value
     EIGEN_PTR = "eigen_ptr"  # EigenValue* pointer
     LIST_PTR = "list_ptr"  # EigenList* pointer
+    STRING_PTR = "string_ptr"  # EigenString* pointer
+    STRING_LIST_PTR = "string_list_ptr"  # EigenStringList* pointer
 
 
 @dataclass
@@ -74,6 +82,95 @@ class GeneratedValue:
     kind: ValueKind
 
 
+# Largest EigenValue history the runtime supports (MAX_HISTORY in eigenvalue.h),
+# used when no history depth is given
+MAX_HISTORY = 100
+
+# CONVERGENCE_THRESHOLD in eigenvalue.h, for the inline eigen_update
+CONVERGENCE_THRESHOLD = 1e-6
+
+# Field indices of the EigenValue struct (see eigen_value_type)
+_EV_VALUE = 0
+_EV_GRADIENT = 1
+_EV_STABILITY = 2
+_EV_ITERATION = 3
+_EV_PREV_VALUE = 4
+_EV_PREV_GRADIENT = 5
+_EV_LAST_DELTA = 6
+_EV_SMALL_DELTA_RUN = 7
+_EV_GROWTH_RUN = 8
+_EV_SIGN_FLIPS = 9
+_EV_SIGN_CHANGES = 10
+_EV_HISTORY_SIZE = 11
+_EV_HISTORY_INDEX = 12
+_EV_HISTORY_CAPACITY = 13
+_EV_HISTORY = 14
+
+# Branch weights for the in-bounds and out-of-bounds paths of list accesses
+_LIKELY = [2000, 1]
+
+# With a profile, functions called at least this share as often as the most
+# called function of their module are inlined more eagerly
+_HOT_CALL_SHARE = 0.1
+
+# Values held in variables as pointers rather than doubles or EigenValues
+_POINTER_KINDS = (ValueKind.LIST_PTR, ValueKind.STRING_PTR, ValueKind.STRING_LIST_PTR)
+
+# Builtins on strings, handled by _generate_string_builtin
+_STRING_BUILTINS = ("upper", "lower", "split", "join")
+
+# Runtime functions that create objects (in the current arena)
+_ALLOCATING_RUNTIME = frozenset(
+    [
+        "eigen_create",
+        "eigen_list_create",
+        "eigen_list_slice",
+        "eigen_string_concat",
+        "eigen_string_index",
+        "eigen_string_slice",
+        "eigen_string_upper",
+        "eigen_string_lower",
+        "eigen_string_split",
+        "eigen_string_join",
+        "eigen_string_list_create",
+        "eigen_string_list_get",
+    ]
+)
+
+
+# Builtins on lists, handled by _generate_list_builtin
+_LIST_BUILTINS = ("len", "range", "append", "map", "filter", "reduce")
+
+_STRING_HINT = (
+    "Strings support +, =, !=, indexing, slicing, len, upper, lower, split, "
+    "join and print"
+)
+
+
+def _default_runtime_bitcode() -> str:
+    return os.path.join(os.path.dirname(__file__), "../runtime/eigenvalue.bc")
+
+
+def find_runtime_bitcode(target_triple: str = None) -> Optional[str]:
+    """Find the runtime bitcode for a target (None: host), if it was built.
+
+    Looks for ``runtime/build/<triple>/eigenvalue.bc`` first and falls back
+    to the host bitcode ``runtime/eigenvalue.bc``.
+
+    Returns:
+        Path to the bitcode file, or None if there is none
+    """
+    if target_triple:
+        target_bc = os.path.join(
+            os.path.dirname(__file__),
+            f"../runtime/build/{target_triple}/eigenvalue.bc",
+        )
+        if os.path.exists(target_bc):
+            return target_bc
+    runtime_bc = _default_runtime_bitcode()
+    return runtime_bc if os.path.exists(runtime_bc) else None
+
+
 class LLVMCodeGenerator:
     """Generates LLVM IR from EigenScript AST."""
 
@@ -82,6 +179,12 @@ class LLVMCodeGenerator:
         observed_variables: Set[str] = None,
         target_triple: str = None,
         module_name: str = None,
+        scalar_functions: Set[str] = None,
+        history_depth: int = None,
+        inline_runtime: bool = True,
+        list_functions: Set[str] = None,
+        instrumentation: Instrumentation = None,
+        profile: Dict[str, int] = None,
     ):
         # Initialize LLVM targets (initialization is now automatic in llvmlite)
         llvm.initialize_native_target()
@@ -122,6 +225,15 @@ class LLVMCodeGenerator:
         # Observer Effect: Track which variables need geometric tracking
         # Unobserved variables compile to raw doubles for C-level performance
         self.observed_variables = observed_variables or set()
+        # Functions whose parameter is unobserved take a raw double, not an
+        # EigenValue* (ObserverAnalyzer.scalar_functions)
+        self.scalar_functions = scalar_functions or set()
+        # Functions whose parameter is used as a list take an EigenList*
+        # (ObserverAnalyzer.list_functions)
+        self.list_functions = list_functions or set()
+        # History entries per EigenValue: enough for the predicates the program
+        # uses (ObserverAnalyzer.history_depth)
+        self.history_depth = max(1, min(history_depth or MAX_HISTORY, MAX_HISTORY))
 
         # 2. Dynamic Type Definitions
         self.double_type = ir.DoubleType()
@@ -162,37 +274,76 @@ class LLVMCodeGenerator:
         # typedef struct {
         #     double value, gradient, stability;
         #     int64_t iteration;
-        #     double history[100];
-        #     int history_size, history_index;
         #     double prev_value, prev_gradient;
+        #     double last_delta;
+        #     int32_t small_delta_run, growth_run, sign_flips, sign_changes;
+        #     int32_t history_size, history_index, history_capacity;
+        #     double history[];  // history_capacity entries
         # } EigenValue;
+        # The flexible history array is sized to history_depth in this module
         self.eigen_value_type = ir.LiteralStructType(
             [
                 self.double_type,  # value
                 self.double_type,  # gradient (why)
                 self.double_type,  # stability (how)
                 self.int64_type,  # iteration (when) - always 64-bit in C runtime
-                ir.ArrayType(self.double_type, 100),  # history[100]
-                self.int32_type,  # history_size
-                self.int32_type,  # history_index
                 self.double_type,  # prev_value
                 self.double_type,  # prev_gradient
+                self.double_type,  # last_delta
+                self.int32_type,  # small_delta_run (converged)
+                self.int32_type,  # growth_run (diverging)
+                self.int32_type,  # sign_flips (oscillating)
+                self.int32_type,  # sign_changes (oscillating)
+                self.int32_type,  # history_size
+                self.int32_type,  # history_index
+                self.int32_type,  # history_capacity
+                ir.ArrayType(self.double_type, self.history_depth),  # history
             ]
         )
 
-        # EigenList structure: {double* data, i64 length, i64 capacity}
-        # matches C: {double* data, int64_t length, int64_t capacity}
+        # EigenArena structure: {EigenArenaBlock* blocks, EigenArena* parent}
+        self.eigen_arena_type = ir.LiteralStructType(
+            [self.int8_type.as_pointer(), self.int8_type.as_pointer()]
+        )
+        self.eigen_arena_ptr = self.eigen_arena_type.as_pointer()
+
+        # EigenList structure: {double* data, i64 length, i64 capacity, arena}
+        # matches C: {double* data, int64_t length, int64_t capacity,
+        # EigenArena* arena}
         self.eigen_list_type = ir.LiteralStructType(
             [
                 self.double_type.as_pointer(),  # data ptr (size varies by arch)
                 self.int64_type,  # length (always 64-bit)
                 self.int64_type,  # capacity (always 64-bit)
+                self.eigen_arena_ptr,  # owning arena (NULL: malloc'd)
+            ]
+        )
+
+        # EigenString structure: {i64 length, i64 char_count, char data[]}
+        # matches C: length-prefixed UTF-8, NUL-terminated after length bytes
+        self.eigen_string_type = ir.LiteralStructType(
+            [
+                self.int64_type,  # length in bytes
+                self.int64_type,  # char_count (code points)
+                ir.ArrayType(self.int8_type, 0),  # data (flexible array)
+            ]
+        )
+        # EigenStringList structure: {EigenString** data, i64 length,
+        # i64 capacity, EigenArena* arena}
+        self.eigen_string_list_type = ir.LiteralStructType(
+            [
+                self.eigen_string_type.as_pointer().as_pointer(),  # data
+                self.int64_type,  # length
+                self.int64_type,  # capacity
+                self.eigen_arena_ptr,  # owning arena
             ]
         )
 
         # Pointer types
         self.eigen_value_ptr = self.eigen_value_type.as_pointer()
         self.eigen_list_ptr = self.eigen_list_type.as_pointer()
+        self.eigen_string_ptr = self.eigen_string_type.as_pointer()
+        self.eigen_string_list_ptr = self.eigen_string_list_type.as_pointer()
         self.string_type = self.int8_type.as_pointer()
 
         # Symbol tables
@@ -210,12 +361,30 @@ class LLVMCodeGenerator:
         # Loop context (for break/continue statements)
         self.loop_end_stack: list[ir.Block] = []  # Stack of loop end blocks
 
-        # Cleanup tracking (for memory management)
-        self.allocated_eigenvalues: list[ir.Value] = []
-        self.allocated_lists: list[ir.Value] = []
+        # The module being compiled, laid out by index (parser/arena.py); the
+        # arena indices of the statements of the function being generated;
+        # and how often they read each name (computed for the first loop
+        # that needs it). The scope is None for code outside the arena.
+        self.arena = ASTArena()
+        self.scope: Optional[list[int]] = []
+        self.scope_reads: Optional[Counter] = None
+
+        # Profile-guided optimization (codegen/profile.py): count executions
+        # into a profile, or optimize for the counts of a module's profile
+        self.instrumentation = instrumentation
+        self.profile = profile
+        self.hottest_calls = max(
+            (count for key, count in (profile or {}).items() if key.endswith(".calls")),
+            default=0,
+        )
+        self.profile_counters: Dict[str, ir.GlobalVariable] = {}
+        self.profile_sites: Dict[str, int] = {}
 
         # Initialize runtime functions
         self._declare_runtime_functions()
+        # Hot runtime operations as IR the optimizer can see through
+        if inline_runtime:
+            self._define_inline_runtime()
 
     def _declare_runtime_functions(self):
         """Declare runtime functions with architecture-correct types."""
@@ -232,16 +401,18 @@ class LLVMCodeGenerator:
         self.malloc.attributes.add("nounwind")
 
         # Runtime functions for geometric tracking
-        # eigen_create(value) -> EigenValue* (heap allocation)
-        eigen_create_type = ir.FunctionType(self.eigen_value_ptr, [self.double_type])
+        # eigen_create(value, history_capacity) -> EigenValue* (heap allocation)
+        eigen_create_type = ir.FunctionType(
+            self.eigen_value_ptr, [self.double_type, self.int32_type]
+        )
         self.eigen_create = ir.Function(
             self.module, eigen_create_type, name="eigen_create"
         )
         self.eigen_create.attributes.add("nounwind")
 
-        # eigen_init(eigen*, value) -> void (stack initialization)
+        # eigen_init(eigen*, value, history_capacity) -> void (stack initialization)
         eigen_init_type = ir.FunctionType(
-            self.void_type, [self.eigen_value_ptr, self.double_type]
+            self.void_type, [self.eigen_value_ptr, self.double_type, self.int32_type]
         )
         self.eigen_init = ir.Function(self.module, eigen_init_type, name="eigen_init")
         self.eigen_init.attributes.add("nounwind")
@@ -393,6 +564,342 @@ class LLVMCodeGenerator:
         )
         self.eigen_list_destroy.attributes.add("nounwind")
 
+        # Arenas: objects created by a call are freed together when it returns
+        self.eigen_arena_enter = self._declare_runtime(
+            "eigen_arena_enter", self.void_type, [self.eigen_arena_ptr]
+        )
+        self.eigen_arena_exit = self._declare_runtime(
+            "eigen_arena_exit", self.void_type, [self.eigen_arena_ptr]
+        )
+
+        # Profiles of instrumented modules: {module tag, number of counters,
+        # counter names, counters, next registered profile}
+        self.eigen_profile_type = ir.LiteralStructType(
+            [
+                self.string_type,
+                self.int64_type,
+                self.string_type.as_pointer(),
+                self.int64_type.as_pointer().as_pointer(),
+                self.string_type,
+            ]
+        )
+        self.eigen_profile_register = self._declare_runtime(
+            "eigen_profile_register",
+            self.void_type,
+            [self.eigen_profile_type.as_pointer()],
+        )
+        self.eigen_profile_write = self._declare_runtime(
+            "eigen_profile_write", self.void_type, [self.string_type]
+        )
+
+        # List operations beyond element access
+        self.eigen_list_append = self._declare_runtime(
+            "eigen_list_append",
+            self.void_type,
+            [self.eigen_list_ptr, self.double_type],
+        )
+        self.eigen_list_slice = self._declare_runtime(
+            "eigen_list_slice",
+            self.eigen_list_ptr,
+            [self.eigen_list_ptr, self.int64_type, self.int64_type],
+        )
+
+        # String runtime functions (strings are immutable, so every operation
+        # that returns a string allocates a new one)
+        string = self.eigen_string_ptr
+        string_list = self.eigen_string_list_ptr
+        i64 = self.int64_type
+        self.eigen_string_concat = self._declare_runtime(
+            "eigen_string_concat", string, [string, string]
+        )
+        self.eigen_string_index = self._declare_runtime(
+            "eigen_string_index", string, [string, i64]
+        )
+        self.eigen_string_slice = self._declare_runtime(
+            "eigen_string_slice", string, [string, i64, i64]
+        )
+        self.eigen_string_length = self._declare_runtime(
+            "eigen_string_length", i64, [string], readonly=True
+        )
+        self.eigen_string_upper = self._declare_runtime(
+            "eigen_string_upper", string, [string]
+        )
+        self.eigen_string_lower = self._declare_runtime(
+            "eigen_string_lower", string, [string]
+        )
+        self.eigen_string_equals = self._declare_runtime(
+            "eigen_string_equals", self.bool_type, [string, string], readonly=True
+        )
+        self.eigen_string_print = self._declare_runtime(
+            "eigen_string_print", self.void_type, [string]
+        )
+        self.eigen_string_split = self._declare_runtime(
+            "eigen_string_split", string_list, [string]
+        )
+        self.eigen_string_join = self._declare_runtime(
+            "eigen_string_join", string, [string_list, string]
+        )
+        self.eigen_string_list_create = self._declare_runtime(
+            "eigen_string_list_create", string_list, []
+        )
+        self.eigen_string_list_append = self._declare_runtime(
+            "eigen_string_list_append", self.void_type, [string_list, string]
+        )
+        self.eigen_string_list_get = self._declare_runtime(
+            "eigen_string_list_get", string, [string_list, i64], readonly=True
+        )
+        self.eigen_string_list_length = self._declare_runtime(
+            "eigen_string_list_length", i64, [string_list], readonly=True
+        )
+
+    def _declare_runtime(
+        self,
+        name: str,
+        return_type: ir.Type,
+        arg_types: list,
+        readonly: bool = False,
+    ) -> ir.Function:
+        """Declare a nounwind runtime function."""
+        func = ir.Function(
+            self.module, ir.FunctionType(return_type, arg_types), name=name
+        )
+        func.attributes.add("nounwind")
+        if readonly:
+            func.attributes.add("readonly")
+        return func
+
+    def _define_inline_runtime(self):
+        """Define the hot runtime operations as internal IR functions.
+
+        Reading a value, recording an update and list get/set/length run on
+        every assignment and element access. As calls into the C runtime they
+        are opaque to LLVM; as always-inline IR they are optimized together
+        with the loop that uses them. The C functions remain the cold paths:
+        out-of-bounds list accesses still go through them for the error.
+        """
+        self.eigen_get_value = self._define_inline_get_value()
+        self.eigen_update = self._define_inline_update()
+        self.eigen_list_length = self._define_inline_list_length()
+        self.eigen_list_get = self._define_inline_list_get(self.eigen_list_get)
+        self.eigen_list_set = self._define_inline_list_set(self.eigen_list_set)
+
+    def _inline_function(self, extern: ir.Function) -> ir.Function:
+        """Create an internal, always-inline counterpart of a runtime function."""
+        func = ir.Function(
+            self.module, extern.function_type, name=f"{extern.name}.inline"
+        )
+        func.linkage = "internal"
+        func.attributes.add("alwaysinline")
+        func.attributes.add("nounwind")
+        return func
+
+    def _field(self, builder: ir.IRBuilder, ptr: ir.Value, index: int) -> ir.Value:
+        """Pointer to a field of an EigenValue or EigenList."""
+        zero = ir.Constant(self.int32_type, 0)
+        return builder.gep(
+            ptr, [zero, ir.Constant(self.int32_type, index)], inbounds=True
+        )
+
+    def _define_inline_get_value(self) -> ir.Function:
+        # ev ? ev->value : 0.0
+        func = self._inline_function(self.eigen_get_value)
+        (ev,) = func.args
+        builder = ir.IRBuilder(func.append_basic_block("entry"))
+        present = func.append_basic_block("present")
+        missing = func.append_basic_block("missing")
+        not_null = builder.icmp_unsigned("!=", ev, ev.type(None))
+        builder.cbranch(not_null, present, missing)
+
+        builder.position_at_end(present)
+        builder.ret(builder.load(self._field(builder, ev, _EV_VALUE)))
+        builder.position_at_end(missing)
+        builder.ret(ir.Constant(self.double_type, 0.0))
+        return func
+
+    def _define_inline_update(self) -> ir.Function:
+        # Mirrors eigen_update in eigenvalue.c, field for field
+        func = self._inline_function(self.eigen_update)
+        ev, new_value = func.args
+        fabs = self.module.declare_intrinsic("llvm.fabs", [self.double_type])
+        exp = self.module.declare_intrinsic("llvm.exp", [self.double_type])
+
+        def i32(n):
+            return ir.Constant(self.int32_type, n)
+
+        def f64(x):
+            return ir.Constant(self.double_type, x)
+
+        builder = ir.IRBuilder(func.append_basic_block("entry"))
+        update = func.append_basic_block("update")
+        track_deltas = func.append_basic_block("track_deltas")
+        record = func.append_basic_block("record")
+        done = func.append_basic_block("done")
+        builder.cbranch(builder.icmp_unsigned("!=", ev, ev.type(None)), update, done)
+
+        def field(index):
+            return self._field(builder, ev, index)
+
+        def count_run(index, extend, window):
+            # run = extend ? min(run + 1, window) : 0
+            run = builder.load(field(index))
+            saturated = builder.select(
+                builder.icmp_signed("<", run, i32(window)),
+                builder.add(run, i32(1)),
+                run,
+            )
+            builder.store(builder.select(extend, saturated, i32(0)), field(index))
+
+        # Gradient, and stability from the change in gradient
+        builder.position_at_end(update)
+        value = builder.load(field(_EV_VALUE))
+        prev_value = builder.load(field(_EV_PREV_VALUE))
+        gradient = builder.fsub(new_value, prev_value)
+        builder.store(gradient, field(_EV_GRADIENT))
+        acceleration = builder.fsub(gradient, builder.load(field(_EV_PREV_GRADIENT)))
+        magnitude = builder.call(fabs, [acceleration])
+        stability = builder.call(exp, [builder.fneg(magnitude)])
+        builder.store(stability, field(_EV_STABILITY))
+
+        # Predicate state
+        delta = builder.fsub(new_value, value)
+        abs_delta = builder.call(fabs, [delta])
+        small = builder.fcmp_ordered("<", abs_delta, f64(CONVERGENCE_THRESHOLD))
+        count_run(_EV_SMALL_DELTA_RUN, small, PREDICATE_WINDOWS["converged"])
+        iteration = builder.load(field(_EV_ITERATION))
+        has_delta = builder.icmp_signed(">", iteration, ir.Constant(self.int64_type, 0))
+        builder.cbranch(has_delta, track_deltas, record)
+
+        builder.position_at_end(track_deltas)
+        last_delta = builder.load(field(_EV_LAST_DELTA))
+        growing = builder.fcmp_ordered(
+            ">", abs_delta, builder.fmul(builder.call(fabs, [last_delta]), f64(1.2))
+        )
+        count_run(_EV_GROWTH_RUN, growing, PREDICATE_WINDOWS["diverging"])
+        oscillating_window = PREDICATE_WINDOWS["oscillating"]
+        flipped = builder.zext(
+            builder.fcmp_ordered("<", builder.fmul(delta, last_delta), f64(0.0)),
+            self.int32_type,
+        )
+        flips = builder.load(field(_EV_SIGN_FLIPS))
+        dropped = builder.and_(builder.lshr(flips, i32(oscillating_window - 3)), i32(1))
+        shifted = builder.or_(builder.shl(flips, i32(1)), flipped)
+        mask = i32((1 << (oscillating_window - 2)) - 1)
+        builder.store(builder.and_(shifted, mask), field(_EV_SIGN_FLIPS))
+        changes = builder.load(field(_EV_SIGN_CHANGES))
+        changes = builder.add(changes, builder.sub(flipped, dropped))
+        builder.store(changes, field(_EV_SIGN_CHANGES))
+        builder.branch(record)
+
+        # History ring buffer and tracking variables
+        builder.position_at_end(record)
+        builder.store(delta, field(_EV_LAST_DELTA))
+        capacity = builder.load(field(_EV_HISTORY_CAPACITY))
+        index = builder.add(builder.load(field(_EV_HISTORY_INDEX)), i32(1))
+        index = builder.srem(index, capacity)
+        builder.store(index, field(_EV_HISTORY_INDEX))
+        # Not inbounds: values from other modules may have a longer history
+        slot = builder.gep(ev, [i32(0), i32(_EV_HISTORY), index])
+        builder.store(new_value, slot)
+        size = builder.load(field(_EV_HISTORY_SIZE))
+        size = builder.select(
+            builder.icmp_signed("<", size, capacity), builder.add(size, i32(1)), size
+        )
+        builder.store(size, field(_EV_HISTORY_SIZE))
+        builder.store(gradient, field(_EV_PREV_GRADIENT))
+        builder.store(value, field(_EV_PREV_VALUE))
+        builder.store(new_value, field(_EV_VALUE))
+        one = ir.Constant(self.int64_type, 1)
+        builder.store(builder.add(iteration, one), field(_EV_ITERATION))
+        builder.branch(done)
+
+        builder.position_at_end(done)
+        builder.ret_void()
+        return func
+
+    def _define_inline_list_length(self) -> ir.Function:
+        # list ? list->length : 0
+        func = self._inline_function(self.eigen_list_length)
+        (lst,) = func.args
+        builder = ir.IRBuilder(func.append_basic_block("entry"))
+        present = func.append_basic_block("present")
+        missing = func.append_basic_block("missing")
+        not_null = builder.icmp_unsigned("!=", lst, lst.type(None))
+        builder.cbranch(not_null, present, missing)
+
+        builder.position_at_end(present)
+        builder.ret(builder.load(self._field(builder, lst, 1)))
+        builder.position_at_end(missing)
+        builder.ret(ir.Constant(self.int64_type, 0))
+        return func
+
+    def _bounds_check(
+        self, func: ir.Function, builder: ir.IRBuilder, lst: ir.Value, index: ir.Value
+    ):
+        """Branch to an in-bounds block or an out-of-bounds block.
+
+        A single unsigned comparison rejects negative indices too.
+
+        Returns:
+            (in_bounds, out_of_bounds) blocks, with the builder before them
+        """
+        check = func.append_basic_block("check")
+        in_bounds = func.append_basic_block("in_bounds")
+        out_of_bounds = func.append_basic_block("out_of_bounds")
+        not_null = builder.icmp_unsigned("!=", lst, lst.type(None))
+        builder.cbranch(not_null, check, out_of_bounds).set_weights(_LIKELY)
+
+        builder.position_at_end(check)
+        length = builder.load(self._field(builder, lst, 1))
+        fits = builder.icmp_unsigned("<", index, length)
+        builder.cbranch(fits, in_bounds, out_of_bounds).set_weights(_LIKELY)
+        return in_bounds, out_of_bounds
+
+    def _define_inline_list_get(self, cold: ir.Function) -> ir.Function:
+        func = self._inline_function(cold)
+        lst, index = func.args
+        builder = ir.IRBuilder(func.append_basic_block("entry"))
+        in_bounds, out_of_bounds = self._bounds_check(func, builder, lst, index)
+
+        builder.position_at_end(in_bounds)
+        data = builder.load(self._field(builder, lst, 0))
+        builder.ret(builder.load(builder.gep(data, [index], inbounds=True)))
+        builder.position_at_end(out_of_bounds)
+        builder.ret(builder.call(cold, [lst, index]))
+        return func
+
+    def _define_inline_list_set(self, cold: ir.Function) -> ir.Function:
+        func = self._inline_function(cold)
+        lst, index, value = func.args
+        builder = ir.IRBuilder(func.append_basic_block("entry"))
+        in_bounds, out_of_bounds = self._bounds_check(func, builder, lst, index)
+
+        builder.position_at_end(in_bounds)
+        data = builder.load(self._field(builder, lst, 0))
+        builder.store(value, builder.gep(data, [index], inbounds=True))
+        builder.ret_void()
+        builder.position_at_end(out_of_bounds)
+        builder.call(cold, [lst, index, value])
+        builder.ret_void()
+        return func
+
+    def _value_kind(self, value: Union[GeneratedValue, ir.Value]) -> ValueKind:
+        """The kind of a generated value, from its LLVM type if it is unwrapped."""
+        if isinstance(value, GeneratedValue):
+            return value.kind
+        if value.type == self.eigen_list_ptr:
+            return ValueKind.LIST_PTR
+        if value.type == self.eigen_string_ptr:
+            return ValueKind.STRING_PTR
+        if value.type == self.eigen_string_list_ptr:
+            return ValueKind.STRING_LIST_PTR
+        if value.type == self.eigen_value_ptr:
+            return ValueKind.EIGEN_PTR
+        return ValueKind.SCALAR
+
+    @staticmethod
+    def _raw_value(value: Union[GeneratedValue, ir.Value]) -> ir.Value:
+        return value.value if isinstance(value, GeneratedValue) else value
+
     def ensure_scalar(self, gen_val: Union[GeneratedValue, ir.Value]) -> ir.Value:
         """Convert a GeneratedValue to a scalar double.
 
@@ -401,6 +908,12 @@ class LLVMCodeGenerator:
         If given a raw ir.Value, assumes it's already a scalar and returns it.
         Handles conversion of boolean (i1) to double (1.0 or 0.0).
         """
+        if self._value_kind(gen_val) in (
+            ValueKind.STRING_PTR,
+            ValueKind.STRING_LIST_PTR,
+        ):
+            raise CompilerError("Cannot use a string as a number", hint=_STRING_HINT)
+
         # Backward compatibility: if passed raw ir.Value, assume it's a scalar
         if isinstance(gen_val, ir.Value):
             # Check if it's a boolean that needs conversion to double
@@ -430,24 +943,19 @@ class LLVMCodeGenerator:
         If given a scalar, wraps it in a new EigenValue.
         If given an EigenValue*, returns it directly (enabling aliasing).
 
-        NOTE: Only track heap allocations in main scope for cleanup.
-        Functions manage their own temporary allocations.
+        New EigenValues belong to the current function's arena.
         """
         # Backward compatibility: if passed raw ir.Value, assume it's a scalar
         if isinstance(gen_val, ir.Value):
-            eigen_ptr = self.builder.call(self.eigen_create, [gen_val])
-            # Only track allocations in main scope (not in functions)
-            if self.current_function and self.current_function.name == "main":
-                self.allocated_eigenvalues.append(eigen_ptr)
-            return eigen_ptr
+            return self.builder.call(
+                self.eigen_create, [gen_val, self._history_capacity()]
+            )
 
         if gen_val.kind == ValueKind.SCALAR:
             # Wrap scalar in new EigenValue
-            eigen_ptr = self.builder.call(self.eigen_create, [gen_val.value])
-            # Only track allocations in main scope (not in functions)
-            if self.current_function and self.current_function.name == "main":
-                self.allocated_eigenvalues.append(eigen_ptr)
-            return eigen_ptr
+            return self.builder.call(
+                self.eigen_create, [gen_val.value, self._history_capacity()]
+            )
         elif gen_val.kind == ValueKind.EIGEN_PTR:
             # Already a pointer, return directly (this enables aliasing!)
             return gen_val.value
@@ -553,27 +1061,218 @@ class LLVMCodeGenerator:
         """
         # 1. Allocate EigenValue struct on stack (O(1) - just shifts stack pointer)
         #    Generates: %name = alloca %struct.EigenValue
-        eigen_stack = self.builder.alloca(self.eigen_value_type, name="eigen_stack")
+        #    In the entry block, so calls in loops reuse one slot
+        eigen_stack = self._alloca_at_entry(self.eigen_value_type, name="eigen_stack")
 
         # 2. Initialize in-place using eigen_init (O(1) - lazy history init)
         #    Generates: call void @eigen_init(%name, %val)
         #    This is MUCH faster than manually setting 9 fields via GEP
-        self.builder.call(self.eigen_init, [eigen_stack, initial_value])
+        self.builder.call(
+            self.eigen_init, [eigen_stack, initial_value, self._history_capacity()]
+        )
 
         return eigen_stack
 
-    def _generate_cleanup(self) -> None:
-        """Generate cleanup code to free all allocated EigenValues and lists.
+    def _history_capacity(self) -> ir.Constant:
+        """The history capacity argument for eigen_create and eigen_init."""
+        return ir.Constant(self.int32_type, self.history_depth)
+
+    def _add_arena(self, func: ir.Function) -> None:
+        """Give a function that creates runtime objects an arena for them.
+
+        The arena lives in the function's frame: it is entered after the
+        entry block's allocas and exited before every return, which frees
+        everything the call created, wherever it was created. Functions
+        that create nothing (most numeric code) are left alone.
+        """
+        allocates = any(
+            isinstance(instr, ir.CallInstr) and instr.callee.name in _ALLOCATING_RUNTIME
+            for block in func.blocks
+            for instr in block.instructions
+        )
+        if not allocates:
+            return
 
-        This should be called before any return statement to prevent memory leaks.
+        builder = ir.IRBuilder()
+        builder.position_before(
+            next(
+                instr
+                for instr in func.blocks[0].instructions
+                if not isinstance(instr, ir.AllocaInstr)
+            )
+        )
+        arena = builder.alloca(self.eigen_arena_type, name="arena")
+        builder.call(self.eigen_arena_enter, [arena])
+        for block in func.blocks:
+            if isinstance(block.instructions[-1], ir.Ret):
+                builder.position_before(block.instructions[-1])
+                builder.call(self.eigen_arena_exit, [arena])
+
+    def _add_iteration_arena(
+        self, node: Loop, body: list[ir.Block], loop_cond: ir.Block, loop_end: ir.Block
+    ) -> None:
+        """Free what each iteration of a loop creates when the iteration ends.
+
+        The body gets an arena of its own, entered at the top of the body and
+        exited on every edge leaving it (continuing, breaking and returning),
+        when none of the objects an iteration creates can be used after it:
+        every list, string or EigenValue variable the body stores must be
+        assigned before it is read in the body and not be read in the loop
+        condition or outside the loop. Otherwise the objects stay in the
+        enclosing arena until the function returns.
         """
-        # Free all tracked EigenValue pointers
-        for eigen_ptr in self.allocated_eigenvalues:
-            self.builder.call(self.eigen_destroy, [eigen_ptr])
+        if (
+            self.is_library
+            and self.current_function.name == f"{self.module_prefix}init"
+        ):
+            return  # Module values live for the whole program
+
+        variables = {id(ptr): name for name, ptr in self.local_vars.items()}
+        allocates = False
+        stored = set()
+        for block in body:
+            for instr in block.instructions:
+                if isinstance(instr, ir.StoreInstr):
+                    value, ptr = instr.operands
+                    if isinstance(value.type, ir.PointerType):
+                        if id(ptr) not in variables:
+                            return
+                        stored.add(variables[id(ptr)])
+                elif isinstance(instr, ir.CallInstr):
+                    name = instr.callee.name
+                    allocates = allocates or name in _ALLOCATING_RUNTIME
+                    # A string appended to an older list outlives the iteration
+                    if name == "eigen_string_list_append" and not isinstance(
+                        instr.operands[0], ir.CallInstr
+                    ):
+                        return
+        if not allocates:
+            return
+
+        if stored:
+            arena = self.arena
+            try:
+                index = arena.index_of(node)
+            except KeyError:
+                return  # Not laid out, so its reads are unknown
+            if self.scope is None:
+                return
+            if self.scope_reads is None:
+                self.scope_reads = arena.names_read(self.scope)
+            if not self.scope_reads.keys().isdisjoint(PREDICATE_WINDOWS):
+                return  # Predicates read the last variable assigned
+            carried = set(self.scope_reads - arena.names_read([index]))
+            carried.update(arena.names_read([arena.child(index, "condition")]))
+            assigned = set()
+            for stmt in arena.block(index, "body"):
+                carried.update(
+                    name for name in arena.names_read([stmt]) if name not in assigned
+                )
+                if arena.kind(stmt) is Assignment:
+                    assigned.add(arena.nodes[stmt].identifier)
+            if not stored.isdisjoint(carried):
+                return
+
+        arena = self._alloca_at_entry(self.eigen_arena_type, name="loop.arena")
+        builder = ir.IRBuilder()
+        builder.position_at_start(body[0])
+        builder.call(self.eigen_arena_enter, [arena])
+        for block in body:
+            for instr in list(block.instructions):
+                if isinstance(instr, ir.Ret) or (
+                    isinstance(instr, ir.Branch)
+                    and instr.operands[0] in (loop_cond, loop_end)
+                ):
+                    builder.position_before(instr)
+                    builder.call(self.eigen_arena_exit, [arena])
+
+    def _profile_site(self, kind: str) -> str:
+        """Name the next ``kind`` site (if, loop) of the current function."""
+        prefix = f"{self.current_function.name}.{kind}"
+        index = self.profile_sites.get(prefix, 0)
+        self.profile_sites[prefix] = index + 1
+        return f"{prefix}{index}"
+
+    def _count(self, key: str) -> None:
+        """Count an execution of the current point in an instrumented build."""
+        if self.instrumentation is None:
+            return
+        counter = self.profile_counters.get(key)
+        if counter is None:
+            counter = ir.GlobalVariable(
+                self.module, self.int64_type, name=self.module.get_unique_name("prof")
+            )
+            counter.linkage = "internal"
+            counter.initializer = ir.Constant(self.int64_type, 0)
+            self.profile_counters[key] = counter
+        count = self.builder.load(counter)
+        self.builder.store(
+            self.builder.add(count, ir.Constant(self.int64_type, 1)), counter
+        )
+
+    def _weigh_branch(self, branch: ir.Instruction, taken: str, runs: str) -> None:
+        """Weight a branch with the profile: ``taken`` out of ``runs`` times."""
+        if not self.profile or not self.profile.get(runs):
+            return
+        count = self.profile[runs]
+        taken_count = min(self.profile.get(taken, 0), count)
+        # Never-taken sides keep a weight of 1, as LLVM expects
+        branch.set_weights([taken_count + 1, count - taken_count + 1])
+
+    def _weigh_function(self, func: ir.Function) -> None:
+        """Give a function its entry count and hotness from the profile."""
+        if self.profile is None:
+            return
+        calls = self.profile.get(f"{func.name}.calls", 0)
+        entry_count = self.module.add_metadata(
+            ["function_entry_count", ir.Constant(self.int64_type, calls)]
+        )
+        func.set_metadata("prof", entry_count)
+        if calls == 0:
+            func.attributes.add("cold")
+        elif calls >= self.hottest_calls * _HOT_CALL_SHARE:
+            func.attributes.add("inlinehint")
+
+    def _c_string(self, text: str) -> ir.Value:
+        """A constant NUL-terminated string (as a constant i8*)."""
+        data = bytearray(text.encode("utf-8") + b"\0")
+        const = ir.Constant(ir.ArrayType(self.int8_type, len(data)), data)
+        global_str = ir.GlobalVariable(
+            self.module, const.type, name=self.module.get_unique_name("cstr")
+        )
+        global_str.linkage = "internal"
+        global_str.global_constant = True
+        global_str.initializer = const
+        return global_str.bitcast(self.string_type)
+
+    def _define_profile(self, profile: ir.GlobalVariable) -> None:
+        """Fill in the module's profile once all its counters exist."""
+        keys = list(self.profile_counters)
+
+        def array(element_type, elements, name):
+            const = ir.Constant(ir.ArrayType(element_type, len(elements)), elements)
+            table = ir.GlobalVariable(
+                self.module, const.type, name=self.module.get_unique_name(name)
+            )
+            table.linkage = "internal"
+            table.global_constant = True
+            table.initializer = const
+            return table.bitcast(element_type.as_pointer())
 
-        # Free all tracked EigenList pointers
-        for list_ptr in self.allocated_lists:
-            self.builder.call(self.eigen_list_destroy, [list_ptr])
+        profile.initializer = ir.Constant(
+            self.eigen_profile_type,
+            [
+                self._c_string(self.instrumentation.tag),
+                ir.Constant(self.int64_type, len(keys)),
+                array(self.string_type, [self._c_string(key) for key in keys], "keys"),
+                array(
+                    self.int64_type.as_pointer(),
+                    list(self.profile_counters.values()),
+                    "counters",
+                ),
+                ir.Constant(self.string_type, None),
+            ],
+        )
 
     def link_runtime_bitcode(
         self, llvm_module: llvm.ModuleRef, target_triple: str = None
@@ -596,27 +1295,12 @@ class LLVMCodeGenerator:
         Returns:
             Linked module with runtime functions inlined
         """
-        # Find runtime bitcode
-        runtime_dir = os.path.dirname(__file__)
-
-        # Try target-specific bitcode first
-        if target_triple:
-            target_bc = os.path.join(
-                runtime_dir, f"../runtime/build/{target_triple}/eigenvalue.bc"
-            )
-            if os.path.exists(target_bc):
-                runtime_bc = target_bc
-            else:
-                # Fall back to default
-                runtime_bc = os.path.join(runtime_dir, "../runtime/eigenvalue.bc")
-        else:
-            runtime_bc = os.path.join(runtime_dir, "../runtime/eigenvalue.bc")
-
-        if not os.path.exists(runtime_bc):
+        runtime_bc = find_runtime_bitcode(target_triple)
+        if runtime_bc is None:
             import warnings
 
             warnings.warn(
-                f"Runtime bitcode not found at {runtime_bc}. "
+                f"Runtime bitcode not found at {_default_runtime_bitcode()}. "
                 "Performance will be degraded. Run: python3 runtime/build_runtime.py",
                 RuntimeWarning,
             )
@@ -636,19 +1320,27 @@ class LLVMCodeGenerator:
         return llvm_module
 
     def compile(
-        self, ast_nodes: list[ASTNode], imported_modules: list[str] = None
+        self,
+        ast_nodes: Union[list[ASTNode], ASTArena],
+        imported_modules: list[str] = None,
     ) -> str:
-        """Compile a list of AST nodes to LLVM IR.
+        """Compile a list of AST nodes, or an arena laid out from one, to LLVM IR.
 
         Args:
-            ast_nodes: List of AST nodes to compile
+            ast_nodes: List of AST nodes to compile, or their ASTArena
             imported_modules: List of module names that were imported (for init calls)
         """
-
-        # Reset cleanup tracking for this compilation
-        # (Important: prevents stale references from previous compilations)
-        self.allocated_eigenvalues = []
-        self.allocated_lists = []
+        arena = ast_nodes if isinstance(ast_nodes, ASTArena) else None
+        statements = arena.top_level() if arena else list(ast_nodes)
+        # Numbers are plain doubles here, so all literal arithmetic folds
+        folded = ConstantFolder(
+            scalar_arithmetic=True, preserve_values=False
+        ).fold_statements(statements)
+        if arena is None or folded is not statements:
+            arena = ASTArena.from_statements(folded)
+        self.arena = arena
+        self.scope = list(arena.statements)
+        self.scope_reads = None
 
         # Create entry function based on compilation mode
         if self.is_library:
@@ -686,20 +1378,36 @@ class LLVMCodeGenerator:
                     # Call the init function
                     self.builder.call(init_func, [])
 
-        # Generate code for each statement
-        for node in ast_nodes:
-            self._generate(node)
+        # Instrumented modules register their counters when they start
+        profile = None
+        if self.instrumentation is not None:
+            profile = ir.GlobalVariable(
+                self.module, self.eigen_profile_type, name="eigen.profile"
+            )
+            profile.linkage = "internal"
+            self.builder.call(self.eigen_profile_register, [profile])
 
-        # Cleanup: free all allocated memory before return
-        self._generate_cleanup()
+        # Generate code for each statement
+        for index in arena.statements:
+            self._generate(arena.nodes[index])
 
         # Return based on compilation mode
         if self.is_library:
-            # Library init functions return void
+            # Library init functions return void; the module's values live
+            # as long as the program, so they are not in an arena
             self.builder.ret_void()
         else:
-            # Main returns 0
+            if self.instrumentation is not None and self.instrumentation.output:
+                self.builder.call(
+                    self.eigen_profile_write,
+                    [self._c_string(self.instrumentation.output)],
+                )
+            # Main returns 0, freeing everything the program created
             self.builder.ret(ir.Constant(self.int32_type, 0))
+            self._add_arena(self.current_function)
+
+        if profile is not None:
+            self._define_profile(profile)
 
         return str(self.module)
 
@@ -734,6 +1442,10 @@ class LLVMCodeGenerator:
             return self._generate_list_literal(node)
         elif isinstance(node, Index):
             return self._generate_index(node)
+        elif isinstance(node, Slice):
+            return self._generate_slice(node)
+        elif isinstance(node, ListComprehension):
+            return self._generate_list_comprehension(node)
         elif isinstance(node, Import):
             # Import statements are no-ops in code generation
             # Module linking is handled by compile.py during recursive compilation
@@ -753,18 +1465,22 @@ class LLVMCodeGenerator:
         if node.literal_type == "number":
             return ir.Constant(self.double_type, float(node.value))
         elif node.literal_type == "string":
-            # String literals - create global constant
-            string_val = node.value + "\0"
-            string_const = ir.Constant(
-                ir.ArrayType(self.int8_type, len(string_val)),
-                bytearray(string_val.encode("utf-8")),
+            # String literals are constant EigenStrings: no allocation at run time
+            data = bytearray(node.value.encode("utf-8") + b"\0")
+            string_const = ir.Constant.literal_struct(
+                [
+                    ir.Constant(self.int64_type, len(data) - 1),
+                    ir.Constant(self.int64_type, len(node.value)),
+                    ir.Constant(ir.ArrayType(self.int8_type, len(data)), data),
+                ]
             )
             global_str = ir.GlobalVariable(
-                self.module, string_const.type, name=f"str_{id(node)}"
+                self.module, string_const.type, name=self.module.get_unique_name("str")
             )
+            global_str.linkage = "internal"
             global_str.global_constant = True
             global_str.initializer = string_const
-            return self.builder.bitcast(global_str, self.string_type)
+            return self.builder.bitcast(global_str, self.eigen_string_ptr)
         else:
             raise NotImplementedError(
                 f"Literal type {node.literal_type} not implemented"
@@ -853,16 +1569,9 @@ class LLVMCodeGenerator:
         # Otherwise, load the pointer and check what it points to
         loaded_ptr = self.builder.load(var_ptr)
 
-        # Check if it's a list
-        if isinstance(loaded_ptr.type, ir.PointerType):
-            pointed_type = loaded_ptr.type.pointee
-            if (
-                isinstance(pointed_type, ir.LiteralStructType)
-                and len(pointed_type.elements) == 3
-                and isinstance(pointed_type.elements[0], ir.PointerType)
-            ):
-                # It's a list - return the pointer directly
-                return loaded_ptr
+        # Lists and strings are used through their pointers
+        if loaded_ptr.type != self.eigen_value_ptr:
+            return loaded_ptr
 
         # It's an EigenValue - get the actual value
         return self.builder.call(self.eigen_get_value, [loaded_ptr])
@@ -876,6 +1585,12 @@ class LLVMCodeGenerator:
         left_gen = self._generate(node.left)
         right_gen = self._generate(node.right)
 
+        string_kinds = (ValueKind.STRING_PTR, ValueKind.STRING_LIST_PTR)
+        left_kind = self._value_kind(left_gen)
+        right_kind = self._value_kind(right_gen)
+        if left_kind in string_kinds or right_kind in string_kinds:
+            return self._generate_string_op(node, left_gen, right_gen)
+
         # Convert to scalars (handles aliases from interrogatives)
         left = self.ensure_scalar(left_gen)
         right = self.ensure_scalar(right_gen)
@@ -907,6 +1622,34 @@ class LLVMCodeGenerator:
                 node=node,
             )
 
+    def _generate_string_op(
+        self,
+        node: BinaryOp,
+        left: Union[GeneratedValue, ir.Value],
+        right: Union[GeneratedValue, ir.Value],
+    ) -> ir.Value:
+        """Generate concatenation and (in)equality of two strings."""
+        both_strings = (
+            self._value_kind(left) == ValueKind.STRING_PTR
+            and self._value_kind(right) == ValueKind.STRING_PTR
+        )
+        if both_strings and node.operator == "+":
+            return self.builder.call(
+                self.eigen_string_concat,
+                [self._raw_value(left), self._raw_value(right)],
+            )
+        if both_strings and node.operator in ("=", "!="):
+            equal = self.builder.call(
+                self.eigen_string_equals,
+                [self._raw_value(left), self._raw_value(right)],
+            )
+            return equal if node.operator == "=" else self.builder.not_(equal)
+        raise CompilerError(
+            f"Unsupported operator '{node.operator}' for these operands",
+            hint=_STRING_HINT + " (both sides of + must be strings)",
+            node=node,
+        )
+
     def _generate_unary_op(self, node: UnaryOp) -> ir.Value:
         """Generate code for unary operations."""
         # Check if operand is a predicate (converged, diverging, etc.)
@@ -984,34 +1727,30 @@ class LLVMCodeGenerator:
 
         # Handle backward compatibility: convert raw ir.Value to GeneratedValue
         if isinstance(gen_value, ir.Value):
-            # Detect if it's a list
-            is_list = False
-            if isinstance(gen_value.type, ir.PointerType):
-                pointed_type = gen_value.type.pointee
-                if (
-                    isinstance(pointed_type, ir.LiteralStructType)
-                    and len(pointed_type.elements) == 3
-                    and isinstance(pointed_type.elements[0], ir.PointerType)
-                ):
-                    is_list = True
-
-            if is_list:
-                gen_value = GeneratedValue(value=gen_value, kind=ValueKind.LIST_PTR)
-            else:
-                # Assume it's a scalar
-                gen_value = GeneratedValue(value=gen_value, kind=ValueKind.SCALAR)
+            gen_value = GeneratedValue(
+                value=gen_value, kind=self._value_kind(gen_value)
+            )
 
-        # Handle list assignment
-        if gen_value.kind == ValueKind.LIST_PTR:
-            var_ptr = self._alloca_at_entry(self.eigen_list_ptr, name=node.identifier)
+        # Handle list and string assignment: the variable holds the pointer
+        if gen_value.kind in _POINTER_KINDS:
+            value_type = gen_value.value.type
+            var_ptr = self.local_vars.get(node.identifier)
+            if var_ptr is None or var_ptr.type.pointee != value_type:
+                var_ptr = self._alloca_at_entry(value_type, name=node.identifier)
+                self.local_vars[node.identifier] = var_ptr
             self.builder.store(gen_value.value, var_ptr)
-            self.local_vars[node.identifier] = var_ptr
             return
 
         # Handle EigenValue assignment (scalar or pointer)
         if node.identifier in self.local_vars:
             # Variable exists - update or rebind
             var_ptr = self.local_vars[node.identifier]
+            if var_ptr.type.pointee not in (self.double_type, self.eigen_value_ptr):
+                raise CompilerError(
+                    f"Cannot assign a number to '{node.identifier}', "
+                    "which holds a list or string",
+                    node=node,
+                )
 
             if gen_value.kind == ValueKind.EIGEN_PTR:
                 # Aliasing: rebind to point to the same EigenValue*
@@ -1047,8 +1786,7 @@ class LLVMCodeGenerator:
 
             elif in_function and gen_value.kind == ValueKind.SCALAR:
                 # Observed variable in function: Stack-allocated EigenValue
-                # IMPORTANT: Stack variables are NOT added to allocated_eigenvalues
-                # They don't need cleanup - automatically freed when function returns
+                # Automatically freed when the function returns
                 scalar_val = self.ensure_scalar(gen_value)
                 eigen_ptr = self._create_eigen_on_stack(scalar_val)
                 var_ptr = self._alloca_at_entry(
@@ -1056,10 +1794,8 @@ class LLVMCodeGenerator:
                 )
                 self.builder.store(eigen_ptr, var_ptr)
                 self.local_vars[node.identifier] = var_ptr
-                # NOTE: Stack variables are NOT tracked in allocated_eigenvalues!
             else:
-                # Observed variable in main scope: Heap allocation
-                # These DO need cleanup via eigen_destroy
+                # Observed variable in main scope: allocated in main's arena
                 eigen_ptr = self.ensure_eigen_ptr(gen_value)
                 var_ptr = self._alloca_at_entry(
                     self.eigen_value_ptr, name=node.identifier
@@ -1076,6 +1812,10 @@ class LLVMCodeGenerator:
             # Handle built-in functions
             if func_name == "print":
                 arg_gen_val = self._generate(node.right)
+                if self._value_kind(arg_gen_val) == ValueKind.STRING_PTR:
+                    return self.builder.call(
+                        self.eigen_string_print, [self._raw_value(arg_gen_val)]
+                    )
                 # Convert to scalar for printing (handles both raw values and aliases)
                 arg_val = self.ensure_scalar(arg_gen_val)
                 # Print format string
@@ -1094,44 +1834,15 @@ class LLVMCodeGenerator:
 
             # Handle user-defined functions
             if func_name in self.functions:
-                # Get the argument expression
-                arg = node.right
-
-                # Generate the argument value
-                gen_arg = self._generate(arg)
-
-                # Determine if we have a scalar or a pointer
-                call_arg = None
-
-                # Case 1: Argument is a GeneratedValue wrapper (from interrogative)
-                if isinstance(gen_arg, GeneratedValue):
-                    if gen_arg.kind == ValueKind.SCALAR:
-                        # JIT Promotion: Scalar -> Stack EigenValue
-                        call_arg = self._create_eigen_on_stack(gen_arg.value)
-                    elif gen_arg.kind == ValueKind.EIGEN_PTR:
-                        call_arg = gen_arg.value
-                    else:
-                        raise TypeError(
-                            "Cannot pass List to function expecting EigenValue"
-                        )
+                return self._call_user_function(
+                    self.functions[func_name], self._generate(node.right)
+                )
 
-                # Case 2: Argument is a raw LLVM Value
-                elif isinstance(gen_arg, ir.Value):
-                    if gen_arg.type == self.double_type:
-                        # JIT Promotion: Scalar -> Stack EigenValue
-                        # This fixes the crash! We create a temp wrapper on the stack.
-                        call_arg = self._create_eigen_on_stack(gen_arg)
-                    elif isinstance(gen_arg.type, ir.PointerType):
-                        # Assume it's an EigenValue pointer
-                        # (In a full implementation we'd check the struct type strictly)
-                        call_arg = gen_arg
-                    else:
-                        raise TypeError(f"Unexpected argument type: {gen_arg.type}")
+            if func_name in _LIST_BUILTINS:
+                return self._generate_list_builtin(func_name, node)
 
-                # Call the function
-                func = self.functions[func_name]
-                result = self.builder.call(func, [call_arg])
-                return result
+            if func_name in _STRING_BUILTINS:
+                return self._generate_string_builtin(func_name, node)
 
         elif isinstance(node.left, MemberAccess):
             # Handle module.function calls (cross-module function calls)
@@ -1147,45 +1858,129 @@ class LLVMCodeGenerator:
                     node=node,
                 )
 
-            # Generate the argument (same logic as user-defined functions)
-            gen_arg = self._generate(node.right)
-
-            # Determine call argument based on type
-            call_arg = None
-
-            if isinstance(gen_arg, GeneratedValue):
-                if gen_arg.kind == ValueKind.SCALAR:
-                    # JIT Promotion: Scalar -> Stack EigenValue
-                    call_arg = self._create_eigen_on_stack(gen_arg.value)
-                elif gen_arg.kind == ValueKind.EIGEN_PTR:
-                    call_arg = gen_arg.value
-                else:
-                    raise TypeError("Cannot pass List to function expecting EigenValue")
-            elif isinstance(gen_arg, ir.Value):
-                if gen_arg.type == self.double_type:
-                    # JIT Promotion: Scalar -> Stack EigenValue
-                    call_arg = self._create_eigen_on_stack(gen_arg)
-                elif isinstance(gen_arg.type, ir.PointerType):
-                    # Assume it's an EigenValue pointer
-                    call_arg = gen_arg
-                else:
-                    raise TypeError(f"Unexpected argument type: {gen_arg.type}")
-
-            # Call the function
-            func = self.functions[mangled_name]
-            result = self.builder.call(func, [call_arg])
-            return result
+            return self._call_user_function(
+                self.functions[mangled_name], self._generate(node.right)
+            )
 
         raise NotImplementedError(
             f"Relation {node.left} of {node.right} not implemented"
         )
 
+    def _generate_string_builtin(self, func_name: str, node: Relation) -> ir.Value:
+        """Generate upper, lower, split and join on strings."""
+        if func_name == "join" and isinstance(node.right, ListLiteral):
+            # join of [separator, words] or join of ["a", "b", ...]
+            elements = [self._generate(elem) for elem in node.right.elements]
+            kinds = [self._value_kind(elem) for elem in elements]
+            if kinds == [ValueKind.STRING_PTR, ValueKind.STRING_LIST_PTR]:
+                separator, words = (self._raw_value(elem) for elem in elements)
+                return self.builder.call(self.eigen_string_join, [words, separator])
+            words = self._build_string_list(elements, node)
+            return self.builder.call(
+                self.eigen_string_join, [words, self.eigen_string_ptr(None)]
+            )
+
+        arg = self._generate(node.right)
+        kind = self._value_kind(arg)
+        arg = self._raw_value(arg)
+        if func_name == "join" and kind == ValueKind.STRING_LIST_PTR:
+            return self.builder.call(
+                self.eigen_string_join, [arg, self.eigen_string_ptr(None)]
+            )
+        if func_name in ("upper", "lower", "split") and kind == ValueKind.STRING_PTR:
+            runtime_func = {
+                "upper": self.eigen_string_upper,
+                "lower": self.eigen_string_lower,
+                "split": self.eigen_string_split,
+            }[func_name]
+            return self.builder.call(runtime_func, [arg])
+
+        raise CompilerError(
+            f"'{func_name}' is not supported for this argument by the compiler",
+            hint=_STRING_HINT,
+            node=node,
+        )
+
+    def _build_string_list(self, elements: list, node: ASTNode) -> ir.Value:
+        """Create an EigenStringList from generated string values."""
+        if any(self._value_kind(elem) != ValueKind.STRING_PTR for elem in elements):
+            raise CompilerError(
+                "Lists must hold only numbers or only strings",
+                hint="Compiled lists cannot mix strings with other values",
+                node=node,
+            )
+        string_list = self.builder.call(self.eigen_string_list_create, [])
+        for elem in elements:
+            self.builder.call(
+                self.eigen_string_list_append, [string_list, self._raw_value(elem)]
+            )
+        return string_list
+
+    def _call_user_function(
+        self, func: ir.Function, gen_arg: Union[GeneratedValue, ir.Value]
+    ) -> ir.Value:
+        """Call a user-defined function, converting the argument to its parameter.
+
+        Functions with a double parameter get the argument's scalar value.
+        Functions with an EigenValue* parameter get the argument's EigenValue,
+        or a temporary one on the stack if the argument is a scalar.
+        """
+        if self._value_kind(gen_arg) in (
+            ValueKind.STRING_PTR,
+            ValueKind.STRING_LIST_PTR,
+        ):
+            raise CompilerError(
+                f"Cannot pass a string to '{func.name}'",
+                hint="Compiled functions take a number or a list of numbers",
+            )
+        if func.args[0].type == self.eigen_list_ptr:
+            if self._value_kind(gen_arg) != ValueKind.LIST_PTR:
+                raise CompilerError(
+                    f"'{func.name}' takes a list",
+                    hint="The function indexes or iterates over its argument",
+                )
+            return self.builder.call(func, [self._raw_value(gen_arg)])
+        if func.args[0].type == self.double_type:
+            scalar_arg = self.ensure_scalar(gen_arg)
+            if scalar_arg.type != self.double_type:
+                raise TypeError("Cannot pass List to function expecting a number")
+            return self.builder.call(func, [scalar_arg])
+
+        call_arg = None
+
+        # Case 1: Argument is a GeneratedValue wrapper (from interrogative)
+        if isinstance(gen_arg, GeneratedValue):
+            if gen_arg.kind == ValueKind.SCALAR:
+                # JIT Promotion: Scalar -> Stack EigenValue
+                call_arg = self._create_eigen_on_stack(gen_arg.value)
+            elif gen_arg.kind == ValueKind.EIGEN_PTR:
+                call_arg = gen_arg.value
+            else:
+                raise TypeError("Cannot pass List to function expecting EigenValue")
+
+        # Case 2: Argument is a raw LLVM Value
+        elif isinstance(gen_arg, ir.Value):
+            if gen_arg.type == self.double_type:
+                # JIT Promotion: Scalar -> Stack EigenValue
+                # This fixes the crash! We create a temp wrapper on the stack.
+                call_arg = self._create_eigen_on_stack(gen_arg)
+            elif isinstance(gen_arg.type, ir.PointerType):
+                # Assume it's an EigenValue pointer
+                # (In a full implementation we'd check the struct type strictly)
+                call_arg = gen_arg
+            else:
+                raise TypeError(f"Unexpected argument type: {gen_arg.type}")
+
+        return self.builder.call(func, [call_arg])
+
     def _generate_conditional(self, node: Conditional) -> None:
         """Generate code for if-else statements."""
         raw_cond = self._generate(node.condition)
 
         # FIX: Ensure we have a boolean for the branch
         cond = self.ensure_bool(raw_cond)
+        site = self._profile_site("if")
+        self._count(site)
 
         # Create basic blocks
         then_block = self.current_function.append_basic_block(name="if.then")
@@ -1198,12 +1993,14 @@ class LLVMCodeGenerator:
 
         # Branch based on condition
         if else_block:
-            self.builder.cbranch(cond, then_block, else_block)
+            branch = self.builder.cbranch(cond, then_block, else_block)
         else:
-            self.builder.cbranch(cond, then_block, merge_block)
+            branch = self.builder.cbranch(cond, then_block, merge_block)
+        self._weigh_branch(branch, f"{site}.then", site)
 
         # Generate then block
         self.builder.position_at_end(then_block)
+        self._count(f"{site}.then")
         then_terminated = False
         for stmt in node.if_block:
             self._generate(stmt)
@@ -1238,6 +2035,9 @@ class LLVMCodeGenerator:
         # Push loop_end onto stack for break statements
         self.loop_end_stack.append(loop_end)
 
+        site = self._profile_site("loop")
+        self._count(site)
+
         # Jump to condition check
         self.builder.branch(loop_cond)
 
@@ -1248,10 +2048,17 @@ class LLVMCodeGenerator:
         # FIX: Ensure we have a boolean for the branch
         cond = self.ensure_bool(raw_cond)
 
-        self.builder.cbranch(cond, loop_body, loop_end)
+        branch = self.builder.cbranch(cond, loop_body, loop_end)
+        # Each run of the loop ends with one exit, after the body's iterations
+        if self.profile and self.profile.get(site):
+            branch.set_weights(
+                [self.profile.get(f"{site}.body", 0) + 1, self.profile[site] + 1]
+            )
 
         # Generate loop body
         self.builder.position_at_end(loop_body)
+        first_body_block = len(self.current_function.blocks)
+        self._count(f"{site}.body")
         body_terminated = False
         for stmt in node.body:
             self._generate(stmt)
@@ -1261,6 +2068,8 @@ class LLVMCodeGenerator:
                 break
         if not body_terminated:
             self.builder.branch(loop_cond)
+        body = [loop_body] + self.current_function.blocks[first_body_block:]
+        self._add_iteration_arena(node, body, loop_cond, loop_end)
 
         # Pop loop context
         self.loop_end_stack.pop()
@@ -1380,14 +2189,22 @@ class LLVMCodeGenerator:
         mangled_name = f"{self.module_prefix}{node.name}"
 
         # Create function signature
-        # In EigenScript, functions take one EigenValue* parameter and return double
-        func_type = ir.FunctionType(
-            self.double_type, [self.eigen_value_ptr]  # Single parameter passed via "of"
-        )
+        # In EigenScript, functions take one parameter (passed via "of") and
+        # return double. The parameter is an EigenValue* unless it is never
+        # observed, in which case it is a raw double, or used as a list, in
+        # which case it is an EigenList*.
+        if node.name in self.list_functions:
+            param_type = self.eigen_list_ptr
+        elif node.name in self.scalar_functions:
+            param_type = self.double_type
+        else:
+            param_type = self.eigen_value_ptr
+        func_type = ir.FunctionType(self.double_type, [param_type])
 
         func = ir.Function(self.module, func_type, name=mangled_name)
         # Add function attributes for optimization
         func.attributes.add("nounwind")  # No exceptions in EigenScript
+        self._weigh_function(func)
         # Store function under original name for internal lookups
         # The LLVM IR will use the mangled name, but within the module
         # we reference functions by their original names
@@ -1401,18 +2218,25 @@ class LLVMCodeGenerator:
         prev_builder = self.builder
         prev_local_vars = self.local_vars
         prev_entry_block = self.entry_block
+        prev_scope = self.scope, self.scope_reads
 
         # Set up new context for function
         self.current_function = func
         self.builder = ir.IRBuilder(block)
         self.entry_block = block  # Store entry block for proper alloca placement
         self.local_vars = {}
+        try:
+            self.scope = self.arena.block(self.arena.index_of(node), "body")
+        except KeyError:
+            self.scope = None
+        self.scope_reads = None
 
         # The parameter is implicitly named 'n' in EigenScript functions
         # (convention based on examples)
-        param_ptr = self._alloca_at_entry(self.eigen_value_ptr, name="n")
+        param_ptr = self._alloca_at_entry(param_type, name="n")
         self.builder.store(func.args[0], param_ptr)
         self.local_vars["n"] = param_ptr
+        self._count(f"{func.name}.calls")
 
         # Generate function body
         function_terminated = False
@@ -1428,16 +2252,21 @@ class LLVMCodeGenerator:
         if not function_terminated:
             self.builder.ret(ir.Constant(self.double_type, 0.0))
 
+        # Free what each call created when it returns
+        self._add_arena(func)
+
         # Restore previous context
         self.current_function = prev_function
         self.builder = prev_builder
         self.local_vars = prev_local_vars
         self.entry_block = prev_entry_block
+        self.scope, self.scope_reads = prev_scope
 
     def _generate_return(self, node: Return) -> ir.Value:
         """Generate code for return statements."""
         if node.expression:
-            return_val = self._generate(node.expression)
+            # Functions return double: unwrap interrogatives and booleans
+            return_val = self.ensure_scalar(self._generate(node.expression))
             # Emit the actual return instruction
             self.builder.ret(return_val)
             return return_val
@@ -1464,17 +2293,18 @@ class LLVMCodeGenerator:
 
     def _generate_list_literal(self, node: ListLiteral) -> ir.Value:
         """Generate code for list literals."""
+        elements = [self._generate(elem) for elem in node.elements]
+        if elements and self._value_kind(elements[0]) == ValueKind.STRING_PTR:
+            return self._build_string_list(elements, node)
+
         # Create list with length
         length = len(node.elements)
         length_val = ir.Constant(self.int64_type, length)
         list_ptr = self.builder.call(self.eigen_list_create, [length_val])
-        # Only track allocations in main scope (not in functions)
-        if self.current_function and self.current_function.name == "main":
-            self.allocated_lists.append(list_ptr)
 
         # Set each element
-        for i, elem in enumerate(node.elements):
-            elem_val = self._generate(elem)
+        for i, elem in enumerate(elements):
+            elem_val = self.ensure_scalar(elem)
             index_val = ir.Constant(self.int64_type, i)
             self.builder.call(self.eigen_list_set, [list_ptr, index_val, elem_val])
 
@@ -1484,20 +2314,352 @@ class LLVMCodeGenerator:
         """Generate code for list indexing."""
         # Get the list
         list_expr = self._generate(node.list_expr)
+        kind = self._value_kind(list_expr)
+        list_expr = self._raw_value(list_expr)
 
         # Get the index
-        index_expr = self._generate(node.index_expr)
+        index_val = self._generate_index_value(node.index_expr)
 
-        # Convert index to i64 if it's a double
-        if isinstance(index_expr.type, ir.DoubleType):
-            index_val = self.builder.fptosi(index_expr, self.int64_type)
-        else:
-            index_val = index_expr
+        if kind == ValueKind.STRING_PTR:
+            return self.builder.call(self.eigen_string_index, [list_expr, index_val])
+        if kind == ValueKind.STRING_LIST_PTR:
+            return self.builder.call(self.eigen_string_list_get, [list_expr, index_val])
 
         # Call eigen_list_get
         result = self.builder.call(self.eigen_list_get, [list_expr, index_val])
         return result
 
+    def _generate_index_value(self, node: ASTNode) -> ir.Value:
+        """Generate an index or slice bound as an i64."""
+        index_expr = self.ensure_scalar(self._generate(node))
+        return self.builder.fptosi(index_expr, self.int64_type)
+
+    def _generate_slice(self, node: Slice) -> ir.Value:
+        """Generate code for slicing strings and lists (xs[start:end])."""
+        target = self._generate(node.expr)
+        kind = self._value_kind(target)
+        if kind not in (ValueKind.STRING_PTR, ValueKind.LIST_PTR):
+            raise CompilerError(
+                "Only strings and lists of numbers can be sliced by the compiler",
+                node=node,
+            )
+        # Open bounds: from the first character, to the last one
+        start = (
+            self._generate_index_value(node.start)
+            if node.start is not None
+            else ir.Constant(self.int64_type, 0)
+        )
+        end = (
+            self._generate_index_value(node.end)
+            if node.end is not None
+            else ir.Constant(self.int64_type, 2**63 - 1)
+        )
+        if kind == ValueKind.LIST_PTR:
+            return self.builder.call(
+                self.eigen_list_slice, [self._raw_value(target), start, end]
+            )
+        return self.builder.call(
+            self.eigen_string_slice, [self._raw_value(target), start, end]
+        )
+
+    def _generate_list_comprehension(self, node: ListComprehension) -> ir.Value:
+        """Generate a list comprehension as a loop with the body inlined.
+
+        ``[x * 2 for x in xs if x > 0]`` fills a list as large as ``xs``
+        and sets its length to the number of elements kept. Iterating over
+        ``range of n`` counts without creating the range list.
+        """
+        count, element = self._iteration(node.iterable)
+        result = self.builder.call(self.eigen_list_create, [count])
+        size_ptr = self._alloca_at_entry(self.int64_type, name="comp.size")
+        self.builder.store(ir.Constant(self.int64_type, 0), size_ptr)
+
+        # The loop variable is a double scoped to the comprehension
+        var_ptr = self._alloca_at_entry(self.double_type, name=node.variable)
+        shadowed = self.local_vars.get(node.variable)
+        self.local_vars[node.variable] = var_ptr
+
+        def body(index):
+            self.builder.store(element(index), var_ptr)
+            if node.condition is not None:
+                keep = self.current_function.append_basic_block("comp.keep")
+                skip = self.current_function.append_basic_block("comp.next")
+                condition = self.ensure_bool(self._generate(node.condition))
+                self.builder.cbranch(condition, keep, skip)
+                self.builder.position_at_end(keep)
+            value = self.ensure_scalar(self._generate(node.expression))
+            self._push(result, size_ptr, value)
+            if node.condition is not None:
+                self.builder.branch(skip)
+                self.builder.position_at_end(skip)
+
+        self._emit_counted_loop(count, "comp", body)
+
+        if shadowed is None:
+            del self.local_vars[node.variable]
+        else:
+            self.local_vars[node.variable] = shadowed
+        self._set_length(result, size_ptr)
+        return result
+
+    def _generate_list_builtin(self, func_name: str, node: Relation) -> ir.Value:
+        """Generate len, range, append, map, filter and reduce.
+
+        map, filter and reduce are loops over the list's data that call the
+        function directly, like the interpreter's builtins:
+        ``map of [f, xs]``, ``filter of [f, xs]`` and ``reduce of [f, xs, init]``
+        (f receives ``[accumulator, element]`` as a list).
+        """
+        if func_name == "len":
+            return self._generate_len(node)
+        if func_name == "range":
+            count = self._range_count(node.right)
+            result = self.builder.call(self.eigen_list_create, [count])
+            data = self.builder.load(self._field(self.builder, result, 0))
+
+            def body(index):
+                value = self.builder.sitofp(index, self.double_type)
+                address = self.builder.gep(data, [index], inbounds=True)
+                self.builder.store(value, address)
+
+            self._emit_counted_loop(count, "range", body)
+            return result
+        if func_name == "append":
+            target, value = self._builtin_arguments(func_name, node, 2)
+            target = self._generate(target)
+            value = self._generate(value)
+            kind = self._value_kind(target)
+            if kind == ValueKind.LIST_PTR:
+                self.builder.call(
+                    self.eigen_list_append,
+                    [self._raw_value(target), self.ensure_scalar(value)],
+                )
+            elif (
+                kind == ValueKind.STRING_LIST_PTR
+                and self._value_kind(value) == ValueKind.STRING_PTR
+            ):
+                self.builder.call(
+                    self.eigen_string_list_append,
+                    [self._raw_value(target), self._raw_value(value)],
+                )
+            else:
+                raise CompilerError(
+                    "append needs a list and an element of the same type",
+                    hint="Use append of [xs, value]",
+                    node=node,
+                )
+            return ir.Constant(self.double_type, 0.0)
+
+        arg_count = 3 if func_name == "reduce" else 2
+        args = self._builtin_arguments(func_name, node, arg_count)
+        func = self._function_argument(func_name, args[0])
+        source = self._generate(args[1])
+        if self._value_kind(source) != ValueKind.LIST_PTR:
+            raise CompilerError(
+                f"The second argument to {func_name} must be a list of numbers",
+                node=node,
+            )
+        source = self._raw_value(source)
+        count = self.builder.call(self.eigen_list_length, [source])
+
+        def element(index):
+            # Reload the data pointer: the function may append to the list
+            data = self.builder.load(self._field(self.builder, source, 0))
+            return self.builder.load(self.builder.gep(data, [index], inbounds=True))
+
+        if func_name == "reduce":
+            return self._generate_reduce(func, count, element, args[2], node)
+
+        if func.args[0].type == self.eigen_list_ptr:
+            raise CompilerError(
+                f"'{func.name}' takes a list, but {func_name} passes it numbers",
+                node=node,
+            )
+        result = self.builder.call(self.eigen_list_create, [count])
+        if func_name == "map":
+
+            def body(index):
+                value = self._call_user_function(func, element(index))
+                data = self.builder.load(self._field(self.builder, result, 0))
+                address = self.builder.gep(data, [index], inbounds=True)
+                self.builder.store(value, address)
+
+            self._emit_counted_loop(count, "map", body)
+            return result
+
+        size_ptr = self._alloca_at_entry(self.int64_type, name="filter.size")
+        self.builder.store(ir.Constant(self.int64_type, 0), size_ptr)
+
+        def body(index):
+            value = element(index)
+            keep = self.current_function.append_basic_block("filter.keep")
+            skip = self.current_function.append_basic_block("filter.next")
+            verdict = self._call_user_function(func, value)
+            condition = self.builder.fcmp_unordered(
+                "!=", verdict, ir.Constant(self.double_type, 0.0)
+            )
+            self.builder.cbranch(condition, keep, skip)
+            self.builder.position_at_end(keep)
+            self._push(result, size_ptr, value)
+            self.builder.branch(skip)
+            self.builder.position_at_end(skip)
+
+        self._emit_counted_loop(count, "filter", body)
+        self._set_length(result, size_ptr)
+        return result
+
+    def _generate_reduce(
+        self,
+        func: ir.Function,
+        count: ir.Value,
+        element: Callable[[ir.Value], ir.Value],
+        initial: ASTNode,
+        node: Relation,
+    ) -> ir.Value:
+        """Fold a list with a function that takes [accumulator, element]."""
+        if func.args[0].type != self.eigen_list_ptr:
+            raise CompilerError(
+                f"reduce passes a list to '{func.name}'",
+                hint="Read the accumulator and the element as n[0] and n[1]",
+                node=node,
+            )
+        acc_ptr = self._alloca_at_entry(self.double_type, name="reduce.acc")
+        self.builder.store(self.ensure_scalar(self._generate(initial)), acc_ptr)
+        # One argument list for all the calls
+        pair = self.builder.call(
+            self.eigen_list_create, [ir.Constant(self.int64_type, 2)]
+        )
+
+        def body(index):
+            value = element(index)
+            data = self.builder.load(self._field(self.builder, pair, 0))
+            self.builder.store(self.builder.load(acc_ptr), data)
+            second = self.builder.gep(
+                data, [ir.Constant(self.int64_type, 1)], inbounds=True
+            )
+            self.builder.store(value, second)
+            self.builder.store(self.builder.call(func, [pair]), acc_ptr)
+
+        self._emit_counted_loop(count, "reduce", body)
+        return self.builder.load(acc_ptr)
+
+    def _generate_len(self, node: Relation) -> ir.Value:
+        """Generate len of a list, a string or a list of strings."""
+        arg = self._generate(node.right)
+        length_functions = {
+            ValueKind.LIST_PTR: self.eigen_list_length,
+            ValueKind.STRING_PTR: self.eigen_string_length,
+            ValueKind.STRING_LIST_PTR: self.eigen_string_list_length,
+        }
+        length_func = length_functions.get(self._value_kind(arg))
+        if length_func is None:
+            raise CompilerError(
+                "len needs a list or a string",
+                hint=_STRING_HINT,
+                node=node,
+            )
+        length = self.builder.call(length_func, [self._raw_value(arg)])
+        return self.builder.sitofp(length, self.double_type)
+
+    def _builtin_arguments(
+        self, func_name: str, node: Relation, count: int
+    ) -> list[ASTNode]:
+        """The elements of the argument list of ``func_name of [a, b, ...]``."""
+        if not isinstance(node.right, ListLiteral) or len(node.right.elements) != count:
+            raise CompilerError(
+                f"{func_name} takes a list of {count} arguments",
+                hint=f"e.g. {func_name} of [{', '.join('abcd'[:count])}]",
+                node=node,
+            )
+        return node.right.elements
+
+    def _function_argument(self, func_name: str, node: ASTNode) -> ir.Function:
+        if not isinstance(node, Identifier) or node.name not in self.functions:
+            raise CompilerError(
+                f"The first argument to {func_name} must be a function "
+                "defined in this module",
+                node=node,
+            )
+        return self.functions[node.name]
+
+    def _range_count(self, node: ASTNode) -> ir.Value:
+        """The number of elements of ``range of node`` (0 if it is negative)."""
+        count = self.builder.fptosi(
+            self.ensure_scalar(self._generate(node)), self.int64_type
+        )
+        zero = ir.Constant(self.int64_type, 0)
+        return self.builder.select(
+            self.builder.icmp_signed("<", count, zero), zero, count
+        )
+
+    def _iteration(
+        self, node: ASTNode
+    ) -> Tuple[ir.Value, Callable[[ir.Value], ir.Value]]:
+        """The element count of an iterable, and a function loading element i."""
+        is_range = (
+            isinstance(node, Relation)
+            and isinstance(node.left, Identifier)
+            and node.left.name == "range"
+            and "range" not in self.functions
+        )
+        if is_range:
+            count = self._range_count(node.right)
+            return count, lambda index: self.builder.sitofp(index, self.double_type)
+
+        source = self._generate(node)
+        if self._value_kind(source) != ValueKind.LIST_PTR:
+            raise CompilerError(
+                "Compiled comprehensions iterate over lists of numbers",
+                node=node,
+            )
+        source = self._raw_value(source)
+
+        def element(index):
+            data = self.builder.load(self._field(self.builder, source, 0))
+            return self.builder.load(self.builder.gep(data, [index], inbounds=True))
+
+        return self.builder.call(self.eigen_list_length, [source]), element
+
+    def _push(self, lst: ir.Value, size_ptr: ir.Value, value: ir.Value) -> None:
+        """Store value after the first size elements of a list with room for it."""
+        size = self.builder.load(size_ptr)
+        data = self.builder.load(self._field(self.builder, lst, 0))
+        self.builder.store(value, self.builder.gep(data, [size], inbounds=True))
+        self.builder.store(
+            self.builder.add(size, ir.Constant(self.int64_type, 1)), size_ptr
+        )
+
+    def _set_length(self, lst: ir.Value, size_ptr: ir.Value) -> None:
+        length_ptr = self._field(self.builder, lst, 1)
+        self.builder.store(self.builder.load(size_ptr), length_ptr)
+
+    def _emit_counted_loop(
+        self, count: ir.Value, name: str, body: Callable[[ir.Value], None]
+    ) -> None:
+        """Emit ``for i in 0..count: body(i)``, leaving the builder after it."""
+        preheader = self.builder.block
+        loop_cond = self.current_function.append_basic_block(name=f"{name}.cond")
+        loop_body = self.current_function.append_basic_block(name=f"{name}.body")
+        loop_end = self.current_function.append_basic_block(name=f"{name}.end")
+        self.builder.branch(loop_cond)
+
+        self.builder.position_at_end(loop_cond)
+        index = self.builder.phi(self.int64_type, name=f"{name}.i")
+        index.add_incoming(ir.Constant(self.int64_type, 0), preheader)
+        self.builder.cbranch(
+            self.builder.icmp_signed("<", index, count), loop_body, loop_end
+        )
+
+        self.builder.position_at_end(loop_body)
+        body(index)
+        next_index = self.builder.add(
+            index, ir.Constant(self.int64_type, 1), flags=["nsw"]
+        )
+        index.add_incoming(next_index, self.builder.block)
+        self.builder.branch(loop_cond)
+
+        self.builder.position_at_end(loop_end)
+
     def get_llvm_ir(self) -> str:
         """Get the generated LLVM IR as a string."""
         return str(self.module)
@@ -0,0 +1,98 @@
+"""
+Execution profiles for profile-guided optimization.
+
+A program compiled with instrumentation (``compile.py --profile-generate``
+or ``jit_compile(profile_generate=...)``) counts, in every module, how
+often each function is called, how often each ``if`` runs and takes its
+branch, and how often each loop starts and runs its body. Before ``main``
+returns, the runtime appends the counts to the profile file, so repeated
+runs of the instrumented program add up. Compiling again with the profile
+(``--profile-use``) feeds the counts back into ``LLVMCodeGenerator``: they
+become branch weights and function entry counts for LLVM's optimizer, hot
+functions are marked for inlining and functions that never ran are marked
+cold.
+
+Counters are named after the function they are in and their position in
+it (``fib.calls``, ``main.loop0.body``, ``fib.if1.then``). Each module's
+counts are tagged with the module's name and a hash of its source
+(``module_tag``), so counts recorded for an older version of a module are
+ignored instead of being applied to code they no longer describe.
+
+The profile file is text, one block per module and run::
+
+    module <tag>
+    <count> <counter>
+    ...
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from eigenscript.parser.cache import source_hash
+
+PROFILE_SUFFIX = ".eigprof"
+
+
+@dataclass(frozen=True)
+class Instrumentation:
+    """How to instrument one module."""
+
+    tag: str  # The module's tag (module_tag), written with its counts
+    output: Optional[str] = None  # Profile file main() appends to (main only)
+
+
+def module_tag(module_name: Optional[str], source: str) -> str:
+    """
+    Tag identifying a module's counts in a profile.
+
+    Args:
+        module_name: Name the module is compiled as, or None for the entry
+                     module
+        source: Source text of the module
+
+    Returns:
+        The module's name and a hash of its source
+    """
+    name = "<main>" if module_name is None else module_name
+    return f"{name}:{source_hash(source).hex()[:16]}"
+
+
+def profile_path_for(source_path: str) -> str:
+    """Default profile file of a program: next to it, with .eigprof."""
+    return os.path.abspath(os.path.splitext(source_path)[0] + PROFILE_SUFFIX)
+
+
+class Profile:
+    """Counts recorded by instrumented runs, by module tag."""
+
+    def __init__(self, modules: Optional[Dict[str, Dict[str, int]]] = None):
+        self.modules = modules or {}
+
+    @classmethod
+    def load(cls, path: str) -> "Profile":
+        """
+        Read a profile file, adding up the counts of all runs.
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a profile
+        """
+        modules: Dict[str, Dict[str, int]] = {}
+        counts = None
+        with open(path, "r") as f:
+            for line_number, line in enumerate(f, 1):
+                fields = line.split()
+                if not fields:
+                    continue
+                if len(fields) == 2 and fields[0] == "module":
+                    counts = modules.setdefault(fields[1], {})
+                elif len(fields) == 2 and counts is not None and fields[0].isdigit():
+                    counts[fields[1]] = counts.get(fields[1], 0) + int(fields[0])
+                else:
+                    raise ValueError(f"{path}:{line_number}: not a profile line")
+        return cls(modules)
+
+    def module(self, tag: str) -> Optional[Dict[str, int]]:
+        """The counts of the module with this tag, or None if it never ran."""
+        return self.modules.get(tag)
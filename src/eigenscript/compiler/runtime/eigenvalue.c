@@ -5,16 +5,134 @@
  */
 
 #include "eigenvalue.h"
+#include "eigenvalue_case.h"
 #include <stdlib.h>
 #include <string.h>
 #include <math.h>
 #include <stdio.h>
+#include <ctype.h>
+#include <errno.h>
+
+// Sign flips remembered for oscillation: one per pair of changes in the window
+#define SIGN_FLIP_MASK ((1 << (OSCILLATING_WINDOW - 2)) - 1)
+
+/**
+ * Arena Implementation
+ *
+ * An arena is a chain of blocks filled front to back. Standard blocks are
+ * kept in a small cache when their arena exits, so a function that creates
+ * objects on every call reuses the same memory instead of calling malloc.
+ */
+
+// Standard block size; larger requests get a block of their own
+#define ARENA_BLOCK_SIZE 4096
+// Standard blocks kept for reuse after their arena exits
+#define ARENA_CACHED_BLOCKS 64
+#define ARENA_ALIGN _Alignof(max_align_t)
+
+struct EigenArenaBlock {
+    EigenArenaBlock* next;
+    size_t size;  // Bytes of data
+    size_t used;
+    max_align_t data[];
+};
+
+static EigenArena* current_arena = NULL;
+static EigenArenaBlock* cached_blocks = NULL;
+static int cached_block_count = 0;
+
+static EigenArenaBlock* arena_block_new(size_t size) {
+    if (size <= ARENA_BLOCK_SIZE) {
+        size = ARENA_BLOCK_SIZE;
+        if (cached_blocks) {
+            EigenArenaBlock* block = cached_blocks;
+            cached_blocks = block->next;
+            cached_block_count--;
+            return block;
+        }
+    }
+    EigenArenaBlock* block = (EigenArenaBlock*)malloc(sizeof(EigenArenaBlock) + size);
+    if (block) block->size = size;
+    return block;
+}
+
+void eigen_arena_enter(EigenArena* arena) {
+    arena->blocks = NULL;
+    arena->parent = current_arena;
+    current_arena = arena;
+}
+
+void eigen_arena_exit(EigenArena* arena) {
+    EigenArenaBlock* block = arena->blocks;
+    while (block) {
+        EigenArenaBlock* next = block->next;
+        if (block->size == ARENA_BLOCK_SIZE && cached_block_count < ARENA_CACHED_BLOCKS) {
+            block->next = cached_blocks;
+            cached_blocks = block;
+            cached_block_count++;
+        } else {
+            free(block);
+        }
+        block = next;
+    }
+    arena->blocks = NULL;
+    current_arena = arena->parent;
+}
+
+void* eigen_arena_alloc(EigenArena* arena, size_t size) {
+    size = size ? (size + ARENA_ALIGN - 1) & ~(ARENA_ALIGN - 1) : ARENA_ALIGN;
+
+    EigenArenaBlock* head = arena->blocks;
+    if (head && head->size - head->used >= size) {
+        void* ptr = (char*)head->data + head->used;
+        head->used += size;
+        return ptr;
+    }
+
+    EigenArenaBlock* block = arena_block_new(size);
+    if (!block) return NULL;
+    block->used = size;
+    if (head && size > ARENA_BLOCK_SIZE / 4) {
+        // A large object gets its own block; keep filling the current one
+        block->next = head->next;
+        head->next = block;
+    } else {
+        block->next = head;
+        arena->blocks = block;
+    }
+    return block->data;
+}
+
+// Memory for a new object: from the current arena, or malloc without one
+static void* runtime_alloc(size_t size) {
+    return current_arena ? eigen_arena_alloc(current_arena, size) : malloc(size);
+}
+
+// Grow an array owned by a list in arena (or malloc'd if arena is NULL)
+static void* runtime_grow(EigenArena* arena, void* data, size_t old_size,
+                          size_t new_size) {
+    if (!arena) return realloc(data, new_size);
+    void* grown = eigen_arena_alloc(arena, new_size);
+    if (grown) memcpy(grown, data, old_size);
+    return grown;
+}
+
+static inline void eigen_reset_predicates(EigenValue* ev) {
+    ev->last_delta = 0.0;
+    ev->small_delta_run = 0;
+    ev->growth_run = 0;
+    ev->sign_flips = 0;
+    ev->sign_changes = 0;
+}
 
 /**
  * Create a new EigenValue with initial value
  */
-EigenValue* eigen_create(double initial_value) {
-    EigenValue* ev = (EigenValue*)malloc(sizeof(EigenValue));
+EigenValue* eigen_create(double initial_value, int32_t history_capacity) {
+    if (history_capacity < 1) history_capacity = 1;
+    if (history_capacity > MAX_HISTORY) history_capacity = MAX_HISTORY;
+
+    EigenValue* ev = (EigenValue*)runtime_alloc(EIGEN_VALUE_SIZE(history_capacity));
     if (!ev) return NULL;
     
     ev->value = initial_value;
@@ -23,10 +141,12 @@ EigenValue* eigen_create(double initial_value) {
     ev->iteration = 0;
     ev->prev_value = initial_value;
     ev->prev_gradient = 0.0;
+    eigen_reset_predicates(ev);
     
     ev->history_size = 0;
     ev->history_index = 0;
-    memset(ev->history, 0, sizeof(ev->history));
+    ev->history_capacity = history_capacity;
+    memset(ev->history, 0, (size_t)history_capacity * sizeof(double));
     
     // Add initial value to history
     ev->history[0] = initial_value;
@@ -45,7 +165,7 @@ EigenValue* eigen_create(double initial_value) {
  * Marked for aggressive inlining since this is on the hot path for recursion.
  */
 __attribute__((always_inline))
-inline void eigen_init(EigenValue* ev, double initial_value) {
+inline void eigen_init(EigenValue* ev, double initial_value, int32_t history_capacity) {
     if (!ev) return;
 
     // Set scalar fields
@@ -55,15 +175,17 @@ inline void eigen_init(EigenValue* ev, double initial_value) {
     ev->iteration = 0;
     ev->prev_value = initial_value;
     ev->prev_gradient = 0.0;
+    eigen_reset_predicates(ev);
 
-    // Lazy history initialization - O(1) not O(100)!
-    // We do NOT zero out the entire history[100] array
+    // Lazy history initialization - O(1) not O(capacity)!
+    // We do NOT zero out the history array
     // Just set size to 1 and write the first element
     // The rest is uninitialized memory (garbage), but history_size guards it
     ev->history_size = 1;
     ev->history_index = 0;
+    ev->history_capacity = history_capacity;
     ev->history[0] = initial_value;
-    // history[1..99] contains garbage, but will never be accessed
+    // history[1..capacity-1] contains garbage, but will never be accessed
 }
 
 /**
@@ -83,10 +205,30 @@ void eigen_update(EigenValue* ev, double new_value) {
     // Lower acceleration = more stable
     ev->stability = exp(-fabs(acceleration));
     
+    // Update predicate state with this change (replaces history scans)
+    double delta = new_value - ev->value;
+    if (fabs(delta) < CONVERGENCE_THRESHOLD) {
+        if (ev->small_delta_run < CONVERGED_WINDOW) ev->small_delta_run++;
+    } else {
+        ev->small_delta_run = 0;
+    }
+    if (ev->iteration > 0) {
+        if (fabs(delta) > fabs(ev->last_delta) * 1.2) {  // 20% increase
+            if (ev->growth_run < DIVERGING_WINDOW) ev->growth_run++;
+        } else {
+            ev->growth_run = 0;
+        }
+        int flipped = delta * ev->last_delta < 0;
+        int dropped = (ev->sign_flips >> (OSCILLATING_WINDOW - 3)) & 1;
+        ev->sign_flips = ((ev->sign_flips << 1) | flipped) & SIGN_FLIP_MASK;
+        ev->sign_changes += flipped - dropped;
+    }
+    ev->last_delta = delta;
+    
     // Update history
-    ev->history_index = (ev->history_index + 1) % MAX_HISTORY;
+    ev->history_index = (ev->history_index + 1) % ev->history_capacity;
     ev->history[ev->history_index] = new_value;
-    if (ev->history_size < MAX_HISTORY) {
+    if (ev->history_size < ev->history_capacity) {
         ev->history_size++;
     }
     
@@ -129,34 +271,20 @@ int64_t eigen_get_iteration(EigenValue* ev) {
 
 /**
  * Check if value has converged
- * Returns true if recent changes are below threshold
+ * Returns true if the last 5 changes were all below threshold
  */
-bool eigen_check_converged(EigenValue* ev) {
-    if (!ev || ev->history_size < 5) {
-        return false;  // Need at least 5 values to determine convergence
-    }
-    
-    // Check if last 5 changes are all below threshold
-    double max_change = 0.0;
-    for (int i = 0; i < 5; i++) {
-        int idx1 = (ev->history_index - i + MAX_HISTORY) % MAX_HISTORY;
-        int idx2 = (ev->history_index - i - 1 + MAX_HISTORY) % MAX_HISTORY;
-        
-        double change = fabs(ev->history[idx1] - ev->history[idx2]);
-        if (change > max_change) {
-            max_change = change;
-        }
-    }
-    
-    return max_change < CONVERGENCE_THRESHOLD;
+__attribute__((always_inline))
+inline bool eigen_check_converged(EigenValue* ev) {
+    return ev && ev->small_delta_run >= CONVERGED_WINDOW - 1;
 }
 
 /**
  * Check if value is diverging
  * Returns true if value is growing rapidly
  */
-bool eigen_check_diverging(EigenValue* ev) {
-    if (!ev || ev->history_size < 3) {
+__attribute__((always_inline))
+inline bool eigen_check_diverging(EigenValue* ev) {
+    if (!ev || ev->iteration < 2) {
         return false;
     }
     
@@ -165,51 +293,22 @@ bool eigen_check_diverging(EigenValue* ev) {
         return true;
     }
     
-    // Check if recent gradients are all increasing in magnitude
-    double prev_abs_gradient = 0.0;
-    int increasing_count = 0;
-    
-    for (int i = 1; i < fmin(5, ev->history_size); i++) {
-        int idx1 = (ev->history_index - i + 1 + MAX_HISTORY) % MAX_HISTORY;
-        int idx2 = (ev->history_index - i + MAX_HISTORY) % MAX_HISTORY;
-        
-        double gradient = fabs(ev->history[idx1] - ev->history[idx2]);
-        if (gradient > prev_abs_gradient * 1.2) {  // 20% increase
-            increasing_count++;
-        }
-        prev_abs_gradient = gradient;
-    }
-    
-    return increasing_count >= 3;
+    // Check if recent changes are all increasing in magnitude
+    return ev->growth_run >= DIVERGING_WINDOW - 2;
 }
 
 /**
  * Check if value is oscillating
  * Returns true if value is bouncing back and forth
  */
-bool eigen_check_oscillating(EigenValue* ev) {
-    if (!ev || ev->history_size < OSCILLATION_CYCLES * 2) {
+__attribute__((always_inline))
+inline bool eigen_check_oscillating(EigenValue* ev) {
+    if (!ev || ev->iteration < OSCILLATION_CYCLES * 2 - 1) {
         return false;
     }
     
-    // Count sign changes in gradients
-    int sign_changes = 0;
-    double prev_gradient = 0.0;
-    
-    for (int i = 1; i < fmin(10, ev->history_size); i++) {
-        int idx1 = (ev->history_index - i + 1 + MAX_HISTORY) % MAX_HISTORY;
-        int idx2 = (ev->history_index - i + MAX_HISTORY) % MAX_HISTORY;
-        
-        double gradient = ev->history[idx1] - ev->history[idx2];
-        
-        if (i > 1 && (gradient * prev_gradient < 0)) {
-            sign_changes++;
-        }
-        prev_gradient = gradient;
-    }
-    
     // If we have multiple sign changes, it's oscillating
-    return sign_changes >= OSCILLATION_CYCLES;
+    return ev->sign_changes >= OSCILLATION_CYCLES;
 }
 
 /**
@@ -226,7 +325,7 @@ bool eigen_check_stable(EigenValue* ev) {
  * Returns true if gradient shows consistent improvement
  */
 bool eigen_check_improving(EigenValue* ev) {
-    if (!ev || ev->history_size < 3) {
+    if (!ev || ev->iteration < IMPROVING_WINDOW - 1) {
         return false;
     }
     
@@ -250,17 +349,21 @@ void eigen_destroy(EigenValue* ev) {
  */
 
 EigenList* eigen_list_create(int64_t length) {
-    EigenList* list = (EigenList*)malloc(sizeof(EigenList));
+    if (length < 0) length = 0;
+    EigenList* list = (EigenList*)runtime_alloc(sizeof(EigenList));
     if (!list) return NULL;
     
+    list->arena = current_arena;
     list->length = length;
     list->capacity = length;
-    list->data = (double*)calloc(length, sizeof(double));
+    // malloc(0) may return NULL: always allocate at least one element
+    list->data = (double*)runtime_alloc((length > 0 ? length : 1) * sizeof(double));
     
     if (!list->data) {
-        free(list);
+        if (!list->arena) free(list);
         return NULL;
     }
+    memset(list->data, 0, length * sizeof(double));
     
     return list;
 }
@@ -297,7 +400,9 @@ void eigen_list_append(EigenList* list, double value) {
     if (list->length >= list->capacity) {
         // Double the capacity (or start with 8 if capacity is 0)
         int64_t new_capacity = list->capacity == 0 ? 8 : list->capacity * 2;
-        double* new_data = (double*)realloc(list->data, new_capacity * sizeof(double));
+        double* new_data = (double*)runtime_grow(
+            list->arena, list->data, list->capacity * sizeof(double),
+            new_capacity * sizeof(double));
 
         if (!new_data) {
             fprintf(stderr, "Failed to grow list capacity\n");
@@ -313,11 +418,413 @@ void eigen_list_append(EigenList* list, double value) {
     list->length++;
 }
 
+EigenList* eigen_list_slice(const EigenList* list, int64_t start, int64_t end) {
+    int64_t length = list ? list->length : 0;
+    if (start < 0) start = start + length < 0 ? 0 : start + length;
+    if (end < 0) end = end + length < 0 ? 0 : end + length;
+    if (start > length) start = length;
+    if (end > length) end = length;
+    if (end < start) end = start;
+
+    EigenList* slice = eigen_list_create(end - start);
+    if (slice && end > start) {
+        memcpy(slice->data, list->data + start, (end - start) * sizeof(double));
+    }
+    return slice;
+}
+
 void eigen_list_destroy(EigenList* list) {
-    if (list) {
+    if (list && !list->arena) {
         if (list->data) {
             free(list->data);
         }
         free(list);
     }
 }
+
+/**
+ * String Implementation
+ */
+
+// Continuation bytes (10xxxxxx) do not start a code point
+static inline int utf8_starts_char(char byte) {
+    return ((unsigned char)byte & 0xC0) != 0x80;
+}
+
+static int64_t utf8_count(const char* data, int64_t length) {
+    int64_t count = 0;
+    for (int64_t i = 0; i < length; i++) {
+        count += utf8_starts_char(data[i]);
+    }
+    return count;
+}
+
+// Byte offset of code point index (0 <= index <= char_count)
+static int64_t utf8_offset(const EigenString* s, int64_t index) {
+    if (s->length == s->char_count) return index;  // ASCII
+    int64_t offset = 0;
+    for (int64_t seen = -1; offset < s->length; offset++) {
+        if (utf8_starts_char(s->data[offset]) && ++seen == index) break;
+    }
+    return offset;
+}
+
+static EigenString* eigen_string_alloc(int64_t length, int64_t char_count) {
+    EigenString* s = (EigenString*)runtime_alloc(sizeof(EigenString) + length + 1);
+    if (!s) return NULL;
+    s->length = length;
+    s->char_count = char_count;
+    s->data[length] = '\0';
+    return s;
+}
+
+EigenString* eigen_string_create(const char* data, int64_t length) {
+    EigenString* s = eigen_string_alloc(length, utf8_count(data, length));
+    if (s) memcpy(s->data, data, length);
+    return s;
+}
+
+EigenString* eigen_string_concat(const EigenString* a, const EigenString* b) {
+    EigenString* s = eigen_string_alloc(a->length + b->length,
+                                        a->char_count + b->char_count);
+    if (!s) return NULL;
+    memcpy(s->data, a->data, a->length);
+    memcpy(s->data + a->length, b->data, b->length);
+    return s;
+}
+
+EigenString* eigen_string_index(const EigenString* s, int64_t index) {
+    if (index < 0 || index >= s->char_count) {
+        fprintf(stderr, "String index out of bounds: %lld (length: %lld)\n",
+                (long long)index, (long long)s->char_count);
+        return eigen_string_alloc(0, 0);
+    }
+    int64_t start = utf8_offset(s, index);
+    int64_t end = start + 1;
+    while (end < s->length && !utf8_starts_char(s->data[end])) end++;
+    return eigen_string_create(s->data + start, end - start);
+}
+
+EigenString* eigen_string_slice(const EigenString* s, int64_t start, int64_t end) {
+    int64_t count = s->char_count;
+    if (start < 0) start = start + count < 0 ? 0 : start + count;
+    if (end < 0) end = end + count < 0 ? 0 : end + count;
+    if (start > count) start = count;
+    if (end > count) end = count;
+    if (end <= start) return eigen_string_alloc(0, 0);
+
+    int64_t first = utf8_offset(s, start);
+    int64_t last = end == count ? s->length : utf8_offset(s, end);
+    EigenString* slice = eigen_string_alloc(last - first, end - start);
+    if (slice) memcpy(slice->data, s->data + first, last - first);
+    return slice;
+}
+
+int64_t eigen_string_length(const EigenString* s) {
+    return s ? s->char_count : 0;
+}
+
+/* ---- Case conversion (tables generated by gen_case_tables.py) ---- */
+
+static const CaseRun* find_run(const CaseRun* runs, size_t count, uint32_t cp) {
+    size_t low = 0, high = count;
+    while (low < high) {
+        size_t mid = (low + high) / 2;
+        if (runs[mid].first <= cp) low = mid + 1;
+        else high = mid;
+    }
+    if (low == 0) return NULL;
+    const CaseRun* run = &runs[low - 1];
+    if (cp > run->last || (cp - run->first) % run->stride != 0) return NULL;
+    return run;
+}
+
+static const CaseSpecial* find_special(const CaseSpecial* specials, size_t count,
+                                       uint32_t cp) {
+    size_t low = 0, high = count;
+    while (low < high) {
+        size_t mid = (low + high) / 2;
+        if (specials[mid].code < cp) low = mid + 1;
+        else high = mid;
+    }
+    return low < count && specials[low].code == cp ? &specials[low] : NULL;
+}
+
+static bool in_ranges(const CodeRange* ranges, size_t count, uint32_t cp) {
+    size_t low = 0, high = count;
+    while (low < high) {
+        size_t mid = (low + high) / 2;
+        if (ranges[mid].last < cp) low = mid + 1;
+        else high = mid;
+    }
+    return low < count && ranges[low].first <= cp;
+}
+
+#define TABLE(name) name, sizeof(name) / sizeof(name[0])
+
+// Decode the code point at data[*pos] and advance past it; -1 for a byte
+// that does not start a valid sequence (it is skipped on its own)
+static int32_t utf8_decode(const char* data, int64_t length, int64_t* pos) {
+    static const unsigned char masks[] = {0x7F, 0x1F, 0x0F, 0x07};
+    unsigned char lead = (unsigned char)data[*pos];
+    int extra = lead < 0x80 ? 0 : lead < 0xC0 ? -1 : lead < 0xE0 ? 1
+              : lead < 0xF0 ? 2 : lead < 0xF8 ? 3 : -1;
+    if (extra < 0 || *pos + extra >= length) {
+        (*pos)++;
+        return -1;
+    }
+    int32_t cp = lead & masks[extra];
+    for (int i = 1; i <= extra; i++) {
+        unsigned char byte = (unsigned char)data[*pos + i];
+        if ((byte & 0xC0) != 0x80) {
+            (*pos)++;
+            return -1;
+        }
+        cp = (cp << 6) | (byte & 0x3F);
+    }
+    *pos += extra + 1;
+    return cp;
+}
+
+static int utf8_encode(uint32_t cp, char* out) {
+    if (cp < 0x80) {
+        out[0] = (char)cp;
+        return 1;
+    }
+    if (cp < 0x800) {
+        out[0] = (char)(0xC0 | (cp >> 6));
+        out[1] = (char)(0x80 | (cp & 0x3F));
+        return 2;
+    }
+    if (cp < 0x10000) {
+        out[0] = (char)(0xE0 | (cp >> 12));
+        out[1] = (char)(0x80 | ((cp >> 6) & 0x3F));
+        out[2] = (char)(0x80 | (cp & 0x3F));
+        return 3;
+    }
+    out[0] = (char)(0xF0 | (cp >> 18));
+    out[1] = (char)(0x80 | ((cp >> 12) & 0x3F));
+    out[2] = (char)(0x80 | ((cp >> 6) & 0x3F));
+    out[3] = (char)(0x80 | (cp & 0x3F));
+    return 4;
+}
+
+// The first code point from pos onwards (backward: before pos) that is not
+// case-ignorable, or -1 if there is none
+static int32_t skip_case_ignorable(const EigenString* s, int64_t pos, bool backward) {
+    while (backward ? pos > 0 : pos < s->length) {
+        int64_t at = pos;
+        if (backward) {
+            do at--; while (at > 0 && !utf8_starts_char(s->data[at]));
+            pos = at;
+        }
+        int32_t cp = utf8_decode(s->data, s->length, &at);
+        if (!backward) pos = at;
+        if (cp < 0 || !in_ranges(TABLE(case_ignorable_ranges), (uint32_t)cp)) return cp;
+    }
+    return -1;
+}
+
+// Whether the capital sigma at data[start..end) ends a word, as in
+// str.lower: a cased letter before it and none after it, skipping
+// case-ignorable characters
+static bool is_final_sigma(const EigenString* s, int64_t start, int64_t end) {
+    int32_t before = skip_case_ignorable(s, start, true);
+    if (before < 0 || !in_ranges(TABLE(cased_ranges), (uint32_t)before)) return false;
+    int32_t after = skip_case_ignorable(s, end, false);
+    return after < 0 || !in_ranges(TABLE(cased_ranges), (uint32_t)after);
+}
+
+// Convert s's case into out, or only measure the result if out is NULL;
+// returns the converted length in bytes
+static int64_t case_convert(const EigenString* s, bool upper, char* out) {
+    char buffer[12];
+    int64_t length = 0;
+    int64_t pos = 0;
+    while (pos < s->length) {
+        unsigned char byte = (unsigned char)s->data[pos];
+        if (byte < 0x80) {
+            if (out) out[length] = (char)(upper ? toupper(byte) : tolower(byte));
+            length++;
+            pos++;
+            continue;
+        }
+
+        int64_t start = pos;
+        int32_t cp = utf8_decode(s->data, s->length, &pos);
+        int size = 0;
+        const CaseSpecial* special = NULL;
+        const CaseRun* run = NULL;
+        if (cp < 0) {
+            buffer[size++] = (char)byte;
+        } else if (!upper && cp == 0x03A3 && is_final_sigma(s, start, pos)) {
+            size = utf8_encode(0x03C2, buffer);
+        } else if ((special = upper ? find_special(TABLE(upper_specials), cp)
+                                    : find_special(TABLE(lower_specials), cp))) {
+            for (uint32_t i = 0; i < special->count; i++) {
+                size += utf8_encode(special->mapped[i], buffer + size);
+            }
+        } else if ((run = upper ? find_run(TABLE(upper_runs), cp)
+                                : find_run(TABLE(lower_runs), cp))) {
+            size = utf8_encode((uint32_t)(cp + run->delta), buffer);
+        } else {
+            size = utf8_encode((uint32_t)cp, buffer);
+        }
+        if (out) memcpy(out + length, buffer, size);
+        length += size;
+    }
+    return length;
+}
+
+static EigenString* eigen_string_convert_case(const EigenString* s, bool upper) {
+    int64_t length = case_convert(s, upper, NULL);
+    EigenString* result = eigen_string_alloc(length, 0);
+    if (!result) return NULL;
+    case_convert(s, upper, result->data);
+    result->char_count = utf8_count(result->data, length);
+    return result;
+}
+
+EigenString* eigen_string_upper(const EigenString* s) {
+    return eigen_string_convert_case(s, true);
+}
+
+EigenString* eigen_string_lower(const EigenString* s) {
+    return eigen_string_convert_case(s, false);
+}
+
+bool eigen_string_equals(const EigenString* a, const EigenString* b) {
+    return a->length == b->length && memcmp(a->data, b->data, a->length) == 0;
+}
+
+void eigen_string_print(const EigenString* s) {
+    fwrite(s->data, 1, s->length, stdout);
+    fputc('\n', stdout);
+}
+
+EigenStringList* eigen_string_list_create(void) {
+    EigenStringList* list = (EigenStringList*)runtime_alloc(sizeof(EigenStringList));
+    if (!list) return NULL;
+    list->data = NULL;
+    list->length = 0;
+    list->capacity = 0;
+    list->arena = current_arena;
+    return list;
+}
+
+void eigen_string_list_append(EigenStringList* list, EigenString* s) {
+    if (list->length >= list->capacity) {
+        int64_t new_capacity = list->capacity == 0 ? 8 : list->capacity * 2;
+        EigenString** new_data = (EigenString**)runtime_grow(
+            list->arena, list->data, list->capacity * sizeof(EigenString*),
+            new_capacity * sizeof(EigenString*));
+        if (!new_data) {
+            fprintf(stderr, "Failed to grow list capacity\n");
+            return;
+        }
+        list->data = new_data;
+        list->capacity = new_capacity;
+    }
+    list->data[list->length++] = s;
+}
+
+EigenStringList* eigen_string_split(const EigenString* s) {
+    EigenStringList* list = eigen_string_list_create();
+    if (!list) return NULL;
+    int64_t i = 0;
+    while (i < s->length) {
+        while (i < s->length && isspace((unsigned char)s->data[i])) i++;
+        int64_t start = i;
+        while (i < s->length && !isspace((unsigned char)s->data[i])) i++;
+        if (i > start) {
+            eigen_string_list_append(list, eigen_string_create(s->data + start, i - start));
+        }
+    }
+    return list;
+}
+
+EigenString* eigen_string_join(const EigenStringList* list, const EigenString* separator) {
+    const char* sep = separator ? separator->data : " ";
+    int64_t sep_length = separator ? separator->length : 1;
+    int64_t sep_count = separator ? separator->char_count : 1;
+    int64_t n = list ? list->length : 0;
+
+    int64_t length = 0;
+    int64_t char_count = 0;
+    for (int64_t i = 0; i < n; i++) {
+        length += list->data[i]->length;
+        char_count += list->data[i]->char_count;
+    }
+    if (n > 1) {
+        length += (n - 1) * sep_length;
+        char_count += (n - 1) * sep_count;
+    }
+
+    EigenString* s = eigen_string_alloc(length, char_count);
+    if (!s) return NULL;
+    char* out = s->data;
+    for (int64_t i = 0; i < n; i++) {
+        if (i > 0) {
+            memcpy(out, sep, sep_length);
+            out += sep_length;
+        }
+        memcpy(out, list->data[i]->data, list->data[i]->length);
+        out += list->data[i]->length;
+    }
+    return s;
+}
+
+EigenString* eigen_string_list_get(const EigenStringList* list, int64_t index) {
+    if (!list || index < 0 || index >= list->length) {
+        fprintf(stderr, "List index out of bounds: %lld (length: %lld)\n",
+                (long long)index, (long long)(list ? list->length : 0));
+        return eigen_string_alloc(0, 0);
+    }
+    return list->data[index];
+}
+
+int64_t eigen_string_list_length(const EigenStringList* list) {
+    return list ? list->length : 0;
+}
+
+void eigen_string_destroy(EigenString* s) {
+    free(s);
+}
+
+void eigen_string_list_destroy(EigenStringList* list) {
+    if (list && !list->arena) {
+        free(list->data);
+        free(list);
+    }
+}
+
+// Profiles of the instrumented modules that have started
+static EigenProfile* registered_profiles = NULL;
+
+void eigen_profile_register(EigenProfile* profile) {
+    for (EigenProfile* p = registered_profiles; p; p = p->next) {
+        if (p == profile) {
+            return;
+        }
+    }
+    profile->next = registered_profiles;
+    registered_profiles = profile;
+}
+
+void eigen_profile_write(const char* path) {
+    FILE* f = fopen(path, "a");
+    if (!f) {
+        fprintf(stderr, "Could not write profile %s: %s\n", path, strerror(errno));
+        return;
+    }
+    for (EigenProfile* p = registered_profiles; p; p = p->next) {
+        fprintf(f, "module %s\n", p->module);
+        for (int64_t i = 0; i < p->size; i++) {
+            fprintf(f, "%lld %s\n", (long long)*p->counters[i], p->keys[i]);
+            *p->counters[i] = 0;
+        }
+    }
+    if (fclose(f) != 0) {
+        fprintf(stderr, "Could not write profile %s: %s\n", path, strerror(errno));
+    }
+}
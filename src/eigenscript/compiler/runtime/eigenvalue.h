@@ -7,6 +7,7 @@
 #ifndef EIGENVALUE_H
 #define EIGENVALUE_H
 
+#include <stddef.h>
 #include <stdint.h>
 #include <stdbool.h>
 
@@ -15,8 +16,51 @@
 #define DIVERGENCE_THRESHOLD 1e3
 #define OSCILLATION_CYCLES 3
 
+// Values each predicate looks at. eigen_update keeps a running summary of
+// these windows, so predicates are O(1) field reads. The compiler sizes the
+// history of the values in a program to the largest window among the
+// predicates it uses (ObserverAnalyzer.history_depth); keep the two in sync.
+#define CONVERGED_WINDOW 6    // 5 changes below CONVERGENCE_THRESHOLD
+#define DIVERGING_WINDOW 5    // 4 changes, each 20% larger than the last
+#define OSCILLATING_WINDOW 10 // OSCILLATION_CYCLES sign flips in 9 changes
+#define IMPROVING_WINDOW 3
+
+/**
+ * Arenas: region allocation for compiled code
+ *
+ * While an arena is current, every object the runtime creates (EigenValues,
+ * lists, strings) is carved out of it, and exiting the arena frees them all
+ * at once. Generated functions that create objects enter an arena on entry
+ * and exit it before returning, so the objects they create live exactly as
+ * long as the call (functions return numbers, so none can escape); main's
+ * arena is the module arena holding the program's top-level values.
+ *
+ * Without a current arena, objects are malloc'd individually as before.
+ * Objects in an arena must not be destroyed individually (eigen_list_destroy
+ * and eigen_string_list_destroy ignore them). Not thread-safe.
+ */
+typedef struct EigenArenaBlock EigenArenaBlock;
+
+typedef struct EigenArena {
+    EigenArenaBlock* blocks;    // Block being filled first
+    struct EigenArena* parent;  // Arena that was current before this one
+} EigenArena;
+
+// Make arena current (its contents need no initialization: it may be
+// uninitialized storage on the caller's stack)
+void eigen_arena_enter(EigenArena* arena);
+
+// Free everything allocated in arena and make its parent current again
+void eigen_arena_exit(EigenArena* arena);
+
+// size bytes from arena, aligned for any type (NULL if out of memory)
+void* eigen_arena_alloc(EigenArena* arena, size_t size);
+
 /**
  * EigenValue structure: tracks value + geometric properties
+ *
+ * The history is a flexible array of history_capacity entries at the end
+ * of the struct, so values that no predicate looks at stay small.
  */
 typedef struct {
     double value;          // Current value
@@ -24,24 +68,39 @@ typedef struct {
     double stability;      // Stability metric
     int64_t iteration;     // Number of updates
     
-    // History for calculating geometric properties
-    double history[MAX_HISTORY];
-    int history_size;
-    int history_index;
-    
     double prev_value;     // Previous value for gradient calculation
     double prev_gradient;  // Previous gradient for acceleration
+    
+    // Predicate state, maintained incrementally by eigen_update
+    double last_delta;        // Change made by the last update
+    int32_t small_delta_run;  // Consecutive changes below CONVERGENCE_THRESHOLD
+    int32_t growth_run;       // Consecutive changes 20% larger than the one before
+    int32_t sign_flips;       // Bit i: change i+1 updates ago flipped sign
+    int32_t sign_changes;     // Set bits in sign_flips
+    
+    // History for calculating geometric properties (ring buffer)
+    int32_t history_size;
+    int32_t history_index;
+    int32_t history_capacity;
+    double history[];
 } EigenValue;
 
+// Bytes needed for an EigenValue with room for `capacity` history entries
+#define EIGEN_VALUE_SIZE(capacity) \
+    (sizeof(EigenValue) + (size_t)(capacity) * sizeof(double))
+
 /**
  * Runtime API Functions
  */
 
-// Create a new EigenValue with initial value (heap allocation)
-EigenValue* eigen_create(double initial_value);
+// Create a new EigenValue with initial value (in the current arena, or on
+// the heap without one)
+// history_capacity is clamped to 1..MAX_HISTORY
+EigenValue* eigen_create(double initial_value, int32_t history_capacity);
 
 // Initialize an already-allocated EigenValue (for stack allocation)
-void eigen_init(EigenValue* ev, double initial_value);
+// ev must point to EIGEN_VALUE_SIZE(history_capacity) bytes
+void eigen_init(EigenValue* ev, double initial_value, int32_t history_capacity);
 
 // Update an EigenValue with a new value
 void eigen_update(EigenValue* ev, double new_value);
@@ -65,7 +124,7 @@ bool eigen_check_oscillating(EigenValue* ev);
 bool eigen_check_stable(EigenValue* ev);
 bool eigen_check_improving(EigenValue* ev);
 
-// Cleanup
+// Cleanup (only for values created without an arena)
 void eigen_destroy(EigenValue* ev);
 
 /**
@@ -75,6 +134,7 @@ typedef struct {
     double* data;
     int64_t length;
     int64_t capacity;
+    EigenArena* arena;  // Arena holding the list and its data, or NULL
 } EigenList;
 
 /**
@@ -96,7 +156,109 @@ int64_t eigen_list_length(EigenList* list);
 // Append element to end of list
 void eigen_list_append(EigenList* list, double value);
 
+// New list of elements [start, end), clamped like Python slices
+// (negative bounds count from the end; pass INT64_MAX for an open end)
+EigenList* eigen_list_slice(const EigenList* list, int64_t start, int64_t end);
+
 // Cleanup
 void eigen_list_destroy(EigenList* list);
 
+/**
+ * EigenString structure: immutable, length-prefixed UTF-8 text
+ *
+ * data holds length bytes followed by a NUL, so it can also be printed as a
+ * C string. char_count is the number of code points; it equals length for
+ * ASCII text, which is then indexed and sliced without scanning.
+ */
+typedef struct {
+    int64_t length;      // bytes, excluding the NUL
+    int64_t char_count;  // code points
+    char data[];
+} EigenString;
+
+/**
+ * EigenStringList structure: dynamic array of strings (from split)
+ */
+typedef struct {
+    EigenString** data;
+    int64_t length;
+    int64_t capacity;
+    EigenArena* arena;  // Arena holding the list and its data, or NULL
+} EigenStringList;
+
+/**
+ * String API Functions
+ *
+ * Indices count code points. Operations return new strings and never modify
+ * their arguments.
+ */
+
+// Create a string from length bytes of UTF-8
+EigenString* eigen_string_create(const char* data, int64_t length);
+
+// a + b
+EigenString* eigen_string_concat(const EigenString* a, const EigenString* b);
+
+// One-character string at index
+EigenString* eigen_string_index(const EigenString* s, int64_t index);
+
+// Characters from start up to end, with Python's rules for negative and
+// out-of-range bounds (pass 0 and INT64_MAX for an open slice)
+EigenString* eigen_string_slice(const EigenString* s, int64_t start, int64_t end);
+
+// Number of characters
+int64_t eigen_string_length(const EigenString* s);
+
+// Case conversion, matching Python's str.upper and str.lower
+EigenString* eigen_string_upper(const EigenString* s);
+EigenString* eigen_string_lower(const EigenString* s);
+
+// Same text
+bool eigen_string_equals(const EigenString* a, const EigenString* b);
+
+// Print followed by a newline
+void eigen_string_print(const EigenString* s);
+
+// Words separated by runs of whitespace
+EigenStringList* eigen_string_split(const EigenString* s);
+
+// Strings joined with separator (NULL: a single space)
+EigenString* eigen_string_join(const EigenStringList* list, const EigenString* separator);
+
+// String lists
+EigenStringList* eigen_string_list_create(void);
+void eigen_string_list_append(EigenStringList* list, EigenString* s);
+EigenString* eigen_string_list_get(const EigenStringList* list, int64_t index);
+int64_t eigen_string_list_length(const EigenStringList* list);
+
+// Cleanup (a list does not own its strings, which may be shared; strings
+// created in an arena must not be destroyed)
+void eigen_string_destroy(EigenString* s);
+void eigen_string_list_destroy(EigenStringList* list);
+
+/**
+ * Profiles: execution counts for profile-guided optimization
+ *
+ * Modules compiled with instrumentation count function calls, branches and
+ * loop iterations in counters of their own, and register one EigenProfile
+ * naming those counters when they start. Before main returns it calls
+ * eigen_profile_write, which appends the counts of every registered module
+ * to the profile file read back by the compiler (codegen/profile.py) and
+ * resets them. Not thread-safe.
+ */
+typedef struct EigenProfile {
+    const char* module;         // Module tag: name and source hash
+    int64_t size;               // Number of counters
+    const char* const* keys;    // Name of each counter
+    int64_t* const* counters;   // Each counter
+    struct EigenProfile* next;  // Next registered module
+} EigenProfile;
+
+// Add a module's counters to those written by eigen_profile_write
+// (registering the same profile again has no effect)
+void eigen_profile_register(EigenProfile* profile);
+
+// Append the counts of all registered modules to path and reset them
+void eigen_profile_write(const char* path);
+
 #endif // EIGENVALUE_H
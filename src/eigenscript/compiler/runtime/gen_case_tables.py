@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Generate eigenvalue_case.h, the Unicode case tables of the C runtime.
+
+Compiled ``upper`` and ``lower`` must produce the same text as the
+interpreter, which uses Python's ``str.upper`` and ``str.lower``. The
+tables are therefore derived from those methods rather than from the
+Unicode data files:
+
+- one-to-one mappings, as runs of code points that share an offset
+  (consecutive, or every other code point as in Latin Extended-A);
+- mappings to several code points (``ß`` to ``SS``);
+- the cased and case-ignorable ranges that decide whether a capital
+  sigma lowercases to the final form ``ς``.
+
+Run it again with a newer Python to follow a newer Unicode version::
+
+    python3 gen_case_tables.py
+"""
+
+import unicodedata
+from pathlib import Path
+
+OUTPUT = Path(__file__).parent / "eigenvalue_case.h"
+
+MAX_CODE_POINT = 0x10FFFF
+SIGMA = "Σ"
+
+
+def code_points():
+    for cp in range(MAX_CODE_POINT + 1):
+        if not 0xD800 <= cp <= 0xDFFF:
+            yield cp
+
+
+def is_cased(char: str) -> bool:
+    return char.islower() or char.isupper() or char.istitle()
+
+
+def is_case_ignorable(char: str) -> bool:
+    # Probe str.lower's final sigma rule: ignorable characters are skipped
+    # when looking for the cased letter before a sigma
+    if is_cased(char):
+        return ("1" + char + SIGMA).lower()[-1] != "ς"
+    return ("A" + char + SIGMA).lower()[-1] == "ς"
+
+
+def mappings(convert):
+    """One-to-one and one-to-many mappings of a case conversion."""
+    single, multiple = [], []
+    for cp in code_points():
+        mapped = convert(chr(cp))
+        if mapped == chr(cp):
+            continue
+        if len(mapped) == 1:
+            single.append((cp, ord(mapped)))
+        else:
+            multiple.append((cp, [ord(char) for char in mapped]))
+    return single, multiple
+
+
+def runs(single):
+    """Runs of [first, last, delta, stride] covering the one-to-one mappings."""
+    result = []
+    for cp, mapped in single:
+        delta = mapped - cp
+        if result and result[-1][2] == delta:
+            run = result[-1]
+            stride = cp - run[1]
+            # A run's stride is fixed by its second code point
+            if stride in (1, 2) and (run[0] == run[1] or stride == run[3]):
+                run[1] = cp
+                run[3] = stride
+                continue
+        result.append([cp, cp, delta, 1])
+    return result
+
+
+def ranges(predicate):
+    result = []
+    for cp in code_points():
+        if predicate(chr(cp)):
+            if result and result[-1][1] == cp - 1:
+                result[-1][1] = cp
+            else:
+                result.append([cp, cp])
+    return result
+
+
+def c_array(declaration: str, rows, per_line: int) -> str:
+    lines = [f"static const {declaration}[] = {{"]
+    for i in range(0, len(rows), per_line):
+        lines.append("    " + " ".join(rows[i : i + per_line]))
+    lines.append("};")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    sections = []
+    for name, convert in (("upper", str.upper), ("lower", str.lower)):
+        single, multiple = mappings(convert)
+        run_rows = [
+            f"{{0x{first:04X}, 0x{last:04X}, {delta}, {stride}}},"
+            for first, last, delta, stride in runs(single)
+        ]
+        sections.append(c_array(f"CaseRun {name}_runs", run_rows, 3))
+        special_rows = []
+        for cp, mapped in multiple:
+            padded = mapped + [0] * (3 - len(mapped))
+            codes = ", ".join(f"0x{code:04X}" for code in padded)
+            special_rows.append(f"{{0x{cp:04X}, {len(mapped)}, {{{codes}}}}},")
+        sections.append(c_array(f"CaseSpecial {name}_specials", special_rows, 2))
+
+    for name, predicate in (
+        ("cased", is_cased),
+        ("case_ignorable", is_case_ignorable),
+    ):
+        rows = [
+            f"{{0x{first:04X}, 0x{last:04X}}}," for first, last in ranges(predicate)
+        ]
+        sections.append(c_array(f"CodeRange {name}_ranges", rows, 4))
+
+    header = f"""\
+/*
+ * Unicode case tables for eigen_string_upper and eigen_string_lower.
+ *
+ * Generated by gen_case_tables.py from Python's str.upper and str.lower
+ * (Unicode {unicodedata.unidata_version}); do not edit.
+ */
+
+#ifndef EIGENVALUE_CASE_H
+#define EIGENVALUE_CASE_H
+
+#include <stdint.h>
+
+// Code points first..last, every stride-th one, map to code point + delta
+typedef struct {{
+    uint32_t first;
+    uint32_t last;
+    int32_t delta;
+    uint32_t stride;
+}} CaseRun;
+
+// A code point that maps to several code points
+typedef struct {{
+    uint32_t code;
+    uint32_t count;
+    uint32_t mapped[3];
+}} CaseSpecial;
+
+typedef struct {{
+    uint32_t first;
+    uint32_t last;
+}} CodeRange;
+
+"""
+    OUTPUT.write_text(header + "\n\n".join(sections) + "\n\n#endif\n")
+    print(f"Wrote {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,19 @@ Executes Abstract Syntax Trees using geometric transformations
 in LRVM space.
 """
 
+import os
 import numpy as np
-from typing import Dict, Optional, Any, List, Union
+from typing import Dict, Optional, Any, List, Mapping, Set, Tuple, Union
 from dataclasses import dataclass
 from eigenscript.parser.ast_builder import *
-from eigenscript.semantic.lrvm import LRVMVector, LRVMSpace
+from eigenscript.parser.arena import ASTArena
+from eigenscript.semantic.lrvm import LRVMVector, LRVMSpace, LazyStringVector
 from eigenscript.semantic.metric import MetricTensor
 from eigenscript.runtime.framework_strength import FrameworkStrengthTracker
-from eigenscript.builtins import BuiltinFunction, get_builtins
+from eigenscript.builtins import BuiltinFunction, get_builtin_table
 
 # Type alias for values that can flow through the interpreter
-Value = Union[LRVMVector, "EigenList"]
+Value = Union[LRVMVector, "EigenList", "EigenMap"]
 
 
 @dataclass
@@ -80,6 +82,76 @@ class EigenList:
         return self.elements.pop()
 
 
+@dataclass
+class EigenMap:
+    """
+    Represents a dictionary/hash-map object in EigenScript.
+
+    Maps associate hashable keys (strings or numbers, stored in their
+    native Python form) with values, giving O(1) lookup instead of a
+    linear scan over [key, value] pair lists.
+    """
+
+    entries: Dict[Union[str, int, float], Value]
+
+    def __repr__(self) -> str:
+        return f"EigenMap({len(self.entries)} entries)"
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Union[str, int, float]) -> Value:
+        """
+        Look up the value bound to a key.
+
+        Args:
+            key: Native key (string or number)
+
+        Returns:
+            The value stored under the key
+
+        Raises:
+            KeyError: If the key is not present
+        """
+        try:
+            return self.entries[key]
+        except KeyError:
+            raise KeyError(f"Key {key!r} not found in map") from None
+
+    def set(self, key: Union[str, int, float], value: Value) -> None:
+        """
+        Bind a key to a value (mutates the map in place).
+
+        Args:
+            key: Native key (string or number)
+            value: Value to store
+        """
+        self.entries[key] = value
+
+    def has(self, key: Union[str, int, float]) -> bool:
+        """Check whether a key is present."""
+        return key in self.entries
+
+
+@dataclass
+class Module:
+    """
+    Represents an imported EigenScript module.
+
+    A module is the global environment left behind by evaluating a source
+    file in its own interpreter; ``module.member`` looks names up there.
+    """
+
+    name: str
+    path: str  # Absolute path of the source file
+    environment: "Environment"
+    interpreter: "Interpreter"  # Interpreter the module was evaluated in
+    stamp: Tuple[int, int]  # (mtime_ns, size) of the file when it was loaded
+
+    def __repr__(self) -> str:
+        return f"Module({self.name!r})"
+
+
 class ReturnValue(Exception):
     """
     Exception used to implement return statements.
@@ -162,6 +234,53 @@ class Environment:
         return f"Environment({len(self.bindings)} bindings)"
 
 
+class BuiltinEnvironment(Environment):
+    """
+    Read-only root scope holding the built-in functions.
+
+    Wraps the shared builtin table without copying it, so every
+    interpreter can use the same instance as the parent of its global
+    environment. User code that reuses a builtin name binds it in the
+    global scope, shadowing the builtin rather than replacing it.
+    """
+
+    def __init__(self, table: Mapping[str, BuiltinFunction]):
+        """
+        Initialize the builtin scope.
+
+        Args:
+            table: Read-only mapping of builtin names to functions
+        """
+        self.bindings = table
+        self.parent = None
+
+    def bind(self, name: str, value: Any) -> None:
+        """Builtin scope is immutable; bindings belong in a child scope."""
+        raise TypeError(f"Cannot bind {name!r} in the read-only builtin scope")
+
+
+_builtin_environment: Optional[BuiltinEnvironment] = None
+
+
+def get_builtin_environment() -> BuiltinEnvironment:
+    """Get the builtin scope shared by all interpreters (created once)."""
+    global _builtin_environment
+    if _builtin_environment is None:
+        _builtin_environment = BuiltinEnvironment(get_builtin_table())
+    return _builtin_environment
+
+
+# Evaluated modules shared by every interpreter in the process, keyed by
+# (absolute path, dimension, metric type)
+_module_cache: Dict[Tuple[str, int, str], Module] = {}
+_modules_loading: Set[Tuple[str, int, str]] = set()
+
+
+def clear_module_cache() -> None:
+    """Forget all loaded modules, so that the next import evaluates them again."""
+    _module_cache.clear()
+
+
 class Interpreter:
     """
     Main interpreter for EigenScript.
@@ -185,6 +304,8 @@ class Interpreter:
         max_iterations: Optional[int] = None,
         convergence_threshold: float = 0.95,
         enable_convergence_detection: bool = True,
+        fold_constants: bool = True,
+        module_root: Optional[str] = None,
     ):
         """
         Initialize the interpreter.
@@ -195,16 +316,34 @@ class Interpreter:
             max_iterations: Maximum loop iterations (None = unbounded for Turing completeness)
             convergence_threshold: FS threshold for eigenstate detection (default: 0.95)
             enable_convergence_detection: Enable automatic convergence detection (default: True)
+            fold_constants: Fold constant expressions and dead branches in each
+                            program before running it (default: True)
+            module_root: Directory searched first for imported modules
+                         (default: the current working directory)
         """
         # Geometric components
         self.space = LRVMSpace(dimension=dimension)
         self.metric = MetricTensor(dimension=dimension, metric_type=metric_type)
 
-        # Runtime state
-        self.environment = Environment()
+        # Runtime state: globals live in a child of the shared builtin scope
+        self.environment = Environment(parent=get_builtin_environment())
         self.fs_tracker = FrameworkStrengthTracker()
         self.max_iterations = max_iterations
 
+        # Constant folding; literals inside loops and functions are
+        # embedded once and reused on every evaluation
+        self.folder = None
+        if fold_constants:
+            from eigenscript.compiler.analysis.folding import ConstantFolder
+
+            self.folder = ConstantFolder()
+        self._hoisted_numbers: Dict[Any, LRVMVector] = {}
+        self._hoisted_strings: Dict[str, LRVMVector] = {}
+
+        # Module imports (resolver created on the first import)
+        self.module_root = module_root
+        self._module_resolver = None
+
         # Convergence detection
         self.convergence_threshold = convergence_threshold
         self.enable_convergence_detection = enable_convergence_detection
@@ -214,11 +353,6 @@ class Interpreter:
         # Special lightlike OF vector
         self._of_vector = self._create_of_vector()
 
-        # Load built-in functions into environment
-        builtins = get_builtins(self.space)
-        for name, builtin_func in builtins.items():
-            self.environment.bind(name, builtin_func)
-
     def _create_of_vector(self) -> LRVMVector:
         """
         Create the special lightlike OF vector.
@@ -267,14 +401,49 @@ class Interpreter:
         ast = parser.parse()
         return self.evaluate(ast)
 
-    def evaluate(self, node: ASTNode) -> Union[LRVMVector, EigenList]:
+    def save_snapshot(self, path: str) -> None:
+        """
+        Save the global state to a snapshot file.
+
+        Captures the global environment (including user functions and
+        their closures), the Framework Strength trajectory and the hoisted
+        literals; see ``eigenscript.evaluator.snapshot``.
+
+        Args:
+            path: Destination file (conventionally ``*.eigsnap``)
+
+        Raises:
+            ValueError: If called inside a function, or the state holds
+                        values that cannot be saved (such as open files)
+        """
+        from eigenscript.evaluator.snapshot import save_snapshot
+
+        save_snapshot(self, path)
+
+    def load_snapshot(self, path: str) -> None:
+        """
+        Replace the global state with a snapshot saved by ``save_snapshot``.
+
+        Much faster than re-running the script that built the state.
+
+        Args:
+            path: Snapshot file
+
+        Raises:
+            ValueError: If the file is not a compatible snapshot
+        """
+        from eigenscript.evaluator.snapshot import load_snapshot
+
+        load_snapshot(self, path)
+
+    def evaluate(self, node: Union[ASTNode, ASTArena]) -> Union[LRVMVector, EigenList]:
         """
         Evaluate an AST node to an LRVM vector.
 
         Dispatches to appropriate evaluation method based on node type.
 
         Args:
-            node: AST node to evaluate
+            node: AST node to evaluate, or an ASTArena of a whole program
 
         Returns:
             LRVM vector result
@@ -284,6 +453,8 @@ class Interpreter:
         """
         if isinstance(node, Program):
             return self._eval_program(node)
+        elif isinstance(node, ASTArena):
+            return self._eval_arena(node)
         elif isinstance(node, Assignment):
             return self._eval_assignment(node)
         elif isinstance(node, Relation):
@@ -314,11 +485,19 @@ class Interpreter:
             return self._eval_index(node)
         elif isinstance(node, Slice):
             return self._eval_slice(node)
+        elif isinstance(node, MemberAccess):
+            return self._eval_member_access(node)
+        elif isinstance(node, Import):
+            return self._eval_import(node)
         else:
             raise RuntimeError(f"Unknown AST node type: {type(node).__name__}")
 
     def _eval_program(self, node: Program) -> Union[LRVMVector, EigenList]:
         """Evaluate a program (sequence of statements)."""
+        if self.folder is not None:
+            node = self.folder.fold(node)
+            self._hoist_literals(self.folder.hoisted_literals)
+
         result = self.space.zero_vector()
 
         for statement in node.statements:
@@ -329,6 +508,25 @@ class Interpreter:
 
         return result
 
+    def _eval_arena(self, arena: ASTArena) -> Union[LRVMVector, EigenList]:
+        """Evaluate a program laid out as an arena, statement by index."""
+        if self.folder is not None:
+            statements = arena.top_level()
+            folded = self.folder.fold_statements(statements)
+            self._hoist_literals(self.folder.hoisted_literals)
+            if folded is not statements:
+                arena = ASTArena.from_statements(folded)
+
+        result = self.space.zero_vector()
+
+        for index in arena.statements:
+            result = self.evaluate(arena.nodes[index])
+            # Update Framework Strength tracker (only for vectors)
+            if isinstance(result, LRVMVector):
+                self.fs_tracker.update(result)
+
+        return result
+
     def _eval_assignment(self, node: Assignment) -> LRVMVector:
         """
         Evaluate IS operator: x is y
@@ -419,7 +617,9 @@ class Interpreter:
             # Ensure both operands are vectors (not lists) for arithmetic/comparison operations
             # Note: equality operators (=, !=) allow lists for list comparison
             if node.operator in ("+", "-", "*", "/", "%", "<", ">", "<=", ">="):
-                if isinstance(left, EigenList) or isinstance(right, EigenList):
+                if isinstance(left, (EigenList, EigenMap)) or isinstance(
+                    right, (EigenList, EigenMap)
+                ):
                     # Special case: string concatenation with +
                     if (
                         node.operator == "+"
@@ -439,13 +639,15 @@ class Interpreter:
             # Check if both operands are strings (have string_value metadata)
             # Only check metadata if both are LRVMVectors (not EigenLists)
             if isinstance(left, LRVMVector) and isinstance(right, LRVMVector):
-                left_str = left.metadata.get("string_value")
                 right_str = right.metadata.get("string_value")
 
-                if left_str is not None and right_str is not None:
-                    # String concatenation: combine strings and re-embed
-                    result_str = left_str + right_str
-                    return self.space.embed_string(result_str)
+                if right_str is not None and (
+                    isinstance(left, LazyStringVector)
+                    or "string_value" in left.metadata
+                ):
+                    # String concatenation: append to a lazy string so that
+                    # copying and re-embedding wait until the text is used
+                    return LazyStringVector.concat(self.space, left, right_str)
 
             # Numeric addition: additive equilibrium composition
             # ‖a+b‖² = ‖a‖² + ‖b‖² + 2(a^T g b)
@@ -489,24 +691,16 @@ class Interpreter:
 
             # Handle list equality
             if isinstance(left, EigenList) and isinstance(right, EigenList):
-                # Lists are equal if they have same length and all elements are equal
-                if len(left.elements) != len(right.elements):
-                    return self.space.embed_scalar(0.0)
-                # Check element-wise equality
-                for i in range(len(left.elements)):
-                    elem_left = left.elements[i]
-                    elem_right = right.elements[i]
-                    # Both must be vectors for comparison
-                    if isinstance(elem_left, EigenList) or isinstance(
-                        elem_right, EigenList
-                    ):
-                        # Nested lists not supported for equality yet
-                        return self.space.embed_scalar(0.0)
-                    if not self.space.is_operator(elem_left, elem_right, self.metric.g):
-                        return self.space.embed_scalar(0.0)
-                return self.space.embed_scalar(1.0)
-            elif isinstance(left, EigenList) or isinstance(right, EigenList):
-                # One is list, one is vector - not equal
+                is_equal = self._lists_equal(left, right)
+                return self.space.embed_scalar(1.0 if is_equal else 0.0)
+            elif isinstance(left, EigenMap) and isinstance(right, EigenMap):
+                # Maps are equal if they bind the same keys to equal values
+                is_equal = self._maps_equal(left, right)
+                return self.space.embed_scalar(1.0 if is_equal else 0.0)
+            elif isinstance(left, (EigenList, EigenMap)) or isinstance(
+                right, (EigenList, EigenMap)
+            ):
+                # One is a container, one is vector - not equal
                 return self.space.embed_scalar(0.0)
             else:
                 # Both are vectors
@@ -562,24 +756,16 @@ class Interpreter:
 
             # Handle list inequality
             if isinstance(left, EigenList) and isinstance(right, EigenList):
-                # Lists are not equal if they have different length or any element differs
-                if len(left.elements) != len(right.elements):
-                    return self.space.embed_scalar(1.0)
-                # Check element-wise equality
-                for i in range(len(left.elements)):
-                    elem_left = left.elements[i]
-                    elem_right = right.elements[i]
-                    # Both must be vectors for comparison
-                    if isinstance(elem_left, EigenList) or isinstance(
-                        elem_right, EigenList
-                    ):
-                        # Nested lists not supported for equality yet
-                        return self.space.embed_scalar(1.0)
-                    if not self.space.is_operator(elem_left, elem_right, self.metric.g):
-                        return self.space.embed_scalar(1.0)
-                return self.space.embed_scalar(0.0)
-            elif isinstance(left, EigenList) or isinstance(right, EigenList):
-                # One is list, one is vector - not equal
+                is_equal = self._lists_equal(left, right)
+                return self.space.embed_scalar(0.0 if is_equal else 1.0)
+            elif isinstance(left, EigenMap) and isinstance(right, EigenMap):
+                # Maps are equal if they bind the same keys to equal values
+                is_equal = self._maps_equal(left, right)
+                return self.space.embed_scalar(0.0 if is_equal else 1.0)
+            elif isinstance(left, (EigenList, EigenMap)) or isinstance(
+                right, (EigenList, EigenMap)
+            ):
+                # One is a container, one is vector - not equal
                 return self.space.embed_scalar(1.0)
             else:
                 # Both are vectors
@@ -746,7 +932,14 @@ class Interpreter:
             result = self._eval_block(node.body)
 
             # Check for convergence (only for vector results)
-            if isinstance(result, LRVMVector) and previous is not None:
+            # A string that is still growing has not converged; skip the
+            # distance so the text is not joined and embedded every iteration
+            growing = (
+                isinstance(result, LazyStringVector)
+                and isinstance(previous, LazyStringVector)
+                and result.length != previous.length
+            )
+            if isinstance(result, LRVMVector) and previous is not None and not growing:
                 distance = self.metric.distance(result, previous)
                 if distance < convergence_threshold:
                     break
@@ -783,6 +976,93 @@ class Interpreter:
         func_vector = self.space.embed_string(f"<function {node.name}>")
         return func_vector
 
+    def _eval_import(self, node: Import) -> LRVMVector:
+        """
+        Evaluate an import statement.
+
+        Binds the module (under its alias, if given) in the current scope.
+        Each module file is evaluated once per process; later imports, from
+        any interpreter with the same dimension and metric, reuse it.
+        """
+        if self._module_resolver is None:
+            from eigenscript.compiler.analysis.resolver import ModuleResolver
+
+            self._module_resolver = ModuleResolver(self.module_root)
+
+        module = self.load_module(self._module_resolver.resolve(node.module_name))
+        self.environment.bind(node.alias or node.module_name, module)
+        return self.space.embed_string(f"<module {module.name}>")
+
+    def load_module(self, path: str) -> Module:
+        """
+        Get the module for a source file, evaluating it on first use.
+
+        The evaluated module is cached for the whole process. It is
+        evaluated again only if the file has changed since.
+
+        Args:
+            path: Path to the module's .eigs file
+
+        Returns:
+            The loaded module
+
+        Raises:
+            ImportError: If the module imports itself, directly or indirectly
+        """
+        from eigenscript.parser.cache import parse_file
+
+        abs_path = os.path.abspath(path)
+        key = (abs_path, self.space.dimension, self.metric.metric_type)
+        info = os.stat(abs_path)
+        stamp = (info.st_mtime_ns, info.st_size)
+
+        module = _module_cache.get(key)
+        if module is not None and module.stamp == stamp:
+            return module
+
+        name = os.path.splitext(os.path.basename(abs_path))[0]
+        if key in _modules_loading:
+            raise ImportError(f"Circular import of module {name!r}")
+
+        with open(abs_path, "r", encoding="utf-8") as f:
+            program = parse_file(abs_path, f.read())
+
+        interpreter = Interpreter(
+            dimension=self.space.dimension,
+            metric_type=self.metric.metric_type,
+            max_iterations=self.max_iterations,
+            convergence_threshold=self.convergence_threshold,
+            enable_convergence_detection=self.enable_convergence_detection,
+            fold_constants=self.folder is not None,
+            module_root=self.module_root,
+        )
+        interpreter._module_resolver = self._module_resolver
+
+        _modules_loading.add(key)
+        try:
+            interpreter.evaluate(program)
+        finally:
+            _modules_loading.discard(key)
+
+        module = Module(name, abs_path, interpreter.environment, interpreter, stamp)
+        _module_cache[key] = module
+        return module
+
+    def _eval_member_access(self, node: MemberAccess) -> Any:
+        """Evaluate ``module.member``: a global of an imported module."""
+        target = self.evaluate(node.object)
+        if not isinstance(target, Module):
+            raise TypeError(
+                f"Cannot access member {node.member!r} of {type(target).__name__}; "
+                f"only modules have members"
+            )
+        try:
+            return target.environment.bindings[node.member]
+        except KeyError:
+            raise NameError(
+                f"Module {target.name!r} has no member {node.member!r}"
+            ) from None
+
     def _eval_return(self, node: Return) -> LRVMVector:
         """
         Evaluate return statement.
@@ -795,16 +1075,32 @@ class Interpreter:
         value = self.evaluate(node.expression)
         raise ReturnValue(value)
 
+    def _hoist_literals(self, literals) -> None:
+        """Embed repeatedly evaluated literals once, ahead of time."""
+        for literal_type, value in literals:
+            if literal_type == "number":
+                if value not in self._hoisted_numbers:
+                    self._hoisted_numbers[value] = self.space.embed_scalar(float(value))
+            elif value not in self._hoisted_strings:
+                self._hoisted_strings[value] = self.space.embed_string(value)
+
     def _eval_literal(self, node: Literal) -> LRVMVector:
         """
         Evaluate a literal value.
 
         Convert literal to LRVM vector using appropriate embedding.
+        Hoisted literals reuse their precomputed (never mutated) vector.
         """
         if node.literal_type == "number":
-            return self.space.embed_scalar(float(node.value))
+            vector = self._hoisted_numbers.get(node.value)
+            if vector is None:
+                vector = self.space.embed_scalar(float(node.value))
+            return vector
         elif node.literal_type == "string":
-            return self.space.embed_string(node.value)
+            vector = self._hoisted_strings.get(node.value)
+            if vector is None:
+                vector = self.space.embed_string(node.value)
+            return vector
         elif node.literal_type == "null":
             return self.space.zero_vector()
         elif node.literal_type == "vector":
@@ -894,14 +1190,16 @@ class Interpreter:
 
     def _eval_index(self, node: Index) -> Value:
         """
-        Evaluate list or string indexing.
+        Evaluate list, string, or map indexing.
 
-        Supports indexing into EigenLists and strings to extract elements.
+        Supports indexing into EigenLists and strings to extract elements,
+        and key lookup into EigenMaps.
 
         Example:
             my_list[0]  # Get first element from list
             numbers[i]  # Get element at index i from list
             text[0]     # Get first character from string
+            config["name"]  # Look up a key in a map
         """
         # Evaluate the indexed expression
         indexed_value = self.evaluate(node.list_expr)
@@ -909,8 +1207,15 @@ class Interpreter:
         # Evaluate the index expression
         index_value = self.evaluate(node.index_expr)
 
+        # Maps are indexed by hashed key, not by position
+        if isinstance(indexed_value, EigenMap):
+            from eigenscript.builtins import decode_map_key
+
+            key = decode_map_key(index_value, self.space, self.metric)
+            return indexed_value.get(key)
+
         # Ensure index is a vector, not a list
-        if isinstance(index_value, EigenList):
+        if isinstance(index_value, (EigenList, EigenMap)):
             raise TypeError("Index must be a number, not a list")
 
         # Decode the index to an integer
@@ -1143,8 +1448,8 @@ class Interpreter:
         elif interrogative == "what":
             # WHAT: Magnitude extraction (scalar value)
             # Extract the primary scalar value (first coordinate)
-            if isinstance(value, EigenList):
-                # For lists, return the length as magnitude
+            if isinstance(value, (EigenList, EigenMap)):
+                # For lists and maps, return the length as magnitude
                 return self.space.embed_scalar(float(len(value)))
             scalar_value = value.coords[0]
             return self.space.embed_scalar(scalar_value)
@@ -1365,6 +1670,55 @@ class Interpreter:
             self.environment = saved_env
             self.recursion_depth -= 1
 
+    def _lists_equal(self, left: EigenList, right: EigenList) -> bool:
+        """
+        Check whether two lists have the same length and equal elements.
+
+        Map elements are compared entry by entry; nested lists are not
+        compared (they are never equal).
+        """
+        if len(left.elements) != len(right.elements):
+            return False
+        for elem_left, elem_right in zip(left.elements, right.elements):
+            if isinstance(elem_left, EigenList) or isinstance(elem_right, EigenList):
+                # Nested lists not supported for equality yet
+                return False
+            if isinstance(elem_left, EigenMap) or isinstance(elem_right, EigenMap):
+                if not (
+                    isinstance(elem_left, EigenMap)
+                    and isinstance(elem_right, EigenMap)
+                    and self._maps_equal(elem_left, elem_right)
+                ):
+                    return False
+            elif not self.space.is_operator(elem_left, elem_right, self.metric.g):
+                return False
+        return True
+
+    def _maps_equal(self, left: EigenMap, right: EigenMap) -> bool:
+        """
+        Check whether two maps bind the same keys to equal values.
+
+        List values are compared like lists (_lists_equal) and map values
+        recursively, so nested records such as JSON objects compare equal.
+        """
+        if left.entries.keys() != right.entries.keys():
+            return False
+        for key, elem_left in left.entries.items():
+            elem_right = right.entries[key]
+            if isinstance(elem_left, EigenList) and isinstance(elem_right, EigenList):
+                if not self._lists_equal(elem_left, elem_right):
+                    return False
+            elif isinstance(elem_left, EigenMap) and isinstance(elem_right, EigenMap):
+                if not self._maps_equal(elem_left, elem_right):
+                    return False
+            elif not isinstance(elem_left, LRVMVector) or not isinstance(
+                elem_right, LRVMVector
+            ):
+                return False
+            elif not self.space.is_operator(elem_left, elem_right, self.metric.g):
+                return False
+        return True
+
     def _is_of_vector(self, vector: LRVMVector) -> bool:
         """
         Check if a vector is the special OF vector.
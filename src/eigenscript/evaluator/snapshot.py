@@ -0,0 +1,265 @@
+"""
+Interpreter snapshots for EigenScript.
+
+A snapshot is an image of an Interpreter's global state: the bindings of
+its global environment (values, EigenLists and EigenMaps, and user
+functions with their AST bodies and closures), the Framework Strength
+trajectory and the hoisted literal embeddings. Restoring one replaces
+re-running the script that built that state, so a heavy prelude costs a
+single unpickle instead of a full evaluation.
+
+Snapshot files start with a small header (magic, format version and the
+EigenScript version that wrote them) followed by a pickle payload. Objects
+that belong to the process rather than the state are written as references
+and reattached on load: the shared builtin scope and builtin functions,
+the interpreter and LRVM space that functions and lazy strings point
+back to, and imported modules, which are imported again (or taken from
+the module cache) when the snapshot is loaded. Embeddings are mostly
+zeros, so vectors are stored sparsely as their non-zero coordinates,
+which keeps snapshots a small fraction of the size of the raw arrays. A
+snapshot is only loaded by the same EigenScript version, into an
+interpreter with the same dimension and metric.
+
+Example:
+    >>> interp = Interpreter()
+    >>> interp.run("define square as:\\n    return n * n")
+    >>> interp.save_snapshot("prelude.eigsnap")
+    >>> fresh = Interpreter()
+    >>> fresh.load_snapshot("prelude.eigsnap")
+"""
+
+import io
+import os
+import pickle
+import struct
+import tempfile
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from eigenscript.builtins import BuiltinFunction, get_builtin_table
+from eigenscript.evaluator.interpreter import _module_cache, get_builtin_environment
+from eigenscript.semantic.lrvm import LRVMVector
+
+if TYPE_CHECKING:
+    from eigenscript.evaluator.interpreter import Interpreter
+
+SNAPSHOT_SUFFIX = ".eigsnap"
+
+# Bump when the interpreter's value classes or the payload change shape
+FORMAT_VERSION = 1
+
+_MAGIC = b"EIGS"
+_HEADER = struct.Struct(">4sHH")  # magic, format version, version string length
+
+# Persistent ids for objects that are reattached instead of stored
+_REF_INTERPRETER = "interpreter"
+_REF_SPACE = "space"
+_REF_BUILTINS = "builtins"
+
+
+def _language_version() -> bytes:
+    from eigenscript import __version__
+
+    return __version__.encode("ascii")
+
+
+def _sparse_vector(dimension: int, indices: bytes, values: bytes) -> LRVMVector:
+    """Rebuild a vector stored by ``_SnapshotPickler`` (state is set after)."""
+    coords = np.zeros(dimension)
+    coords[np.frombuffer(indices, dtype=np.int32)] = np.frombuffer(values)
+    vector = LRVMVector.__new__(LRVMVector)
+    vector.coords = coords
+    return vector
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """Pickler that writes process-owned objects as references."""
+
+    def __init__(self, file, interpreter: "Interpreter"):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._interpreter = interpreter
+        self._builtin_env = get_builtin_environment()
+        self._builtins = get_builtin_table()
+        # Parts of loaded modules that values can point into, by object id
+        self._module_parts: Dict[int, Tuple[str, str]] = {}
+        for module in _module_cache.values():
+            self._module_parts[id(module)] = ("module", module.path)
+            self._module_parts[id(module.environment)] = ("module_env", module.path)
+            self._module_parts[id(module.interpreter)] = (
+                "module_interpreter",
+                module.path,
+            )
+
+    def persistent_id(self, obj: Any) -> Optional[Any]:
+        if obj is self._interpreter:
+            return _REF_INTERPRETER
+        if obj is self._interpreter.space:
+            return _REF_SPACE
+        if obj is self._builtin_env:
+            return _REF_BUILTINS
+        if isinstance(obj, BuiltinFunction) and self._builtins.get(obj.name) is obj:
+            return ("builtin", obj.name)
+        return self._module_parts.get(id(obj))
+
+    def reducer_override(self, obj: Any) -> Any:
+        if type(obj) is not LRVMVector:
+            return NotImplemented
+        coords = obj.coords
+        if coords.dtype != np.float64 or coords.ndim != 1:
+            return NotImplemented
+        # Compare bit patterns so that -0.0 counts as non-zero and survives
+        nonzero = np.flatnonzero(coords.view(np.int64))
+        if 3 * len(nonzero) >= 2 * len(coords):
+            return NotImplemented  # dense: the plain array is smaller
+        state = dict(obj.__dict__)
+        del state["coords"]
+        args = (
+            len(coords),
+            nonzero.astype(np.int32).tobytes(),
+            coords[nonzero].tobytes(),
+        )
+        return _sparse_vector, args, state
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler that resolves references against the target interpreter."""
+
+    def __init__(self, file, interpreter: "Interpreter"):
+        super().__init__(file)
+        self._interpreter = interpreter
+        self._builtins = get_builtin_table()
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == _REF_INTERPRETER:
+            return self._interpreter
+        if pid == _REF_SPACE:
+            return self._interpreter.space
+        if pid == _REF_BUILTINS:
+            return get_builtin_environment()
+        if isinstance(pid, tuple) and pid[0] == "builtin" and pid[1] in self._builtins:
+            return self._builtins[pid[1]]
+        if isinstance(pid, tuple) and pid[0] == "module":
+            return self._interpreter.load_module(pid[1])
+        if isinstance(pid, tuple) and pid[0] == "module_env":
+            return self._interpreter.load_module(pid[1]).environment
+        if isinstance(pid, tuple) and pid[0] == "module_interpreter":
+            return self._interpreter.load_module(pid[1]).interpreter
+        raise pickle.UnpicklingError(f"Unknown snapshot reference: {pid!r}")
+
+
+def _config(interpreter: "Interpreter") -> Tuple[int, str]:
+    return interpreter.space.dimension, interpreter.metric.metric_type
+
+
+def save_snapshot(interpreter: "Interpreter", path: str) -> None:
+    """
+    Write an interpreter's global state to a snapshot file.
+
+    The file is written to a temporary name and renamed into place, so a
+    concurrent reader never sees a partial snapshot.
+
+    Args:
+        interpreter: Interpreter to snapshot; must not be inside a call
+        path: Destination file (conventionally ``*.eigsnap``)
+
+    Raises:
+        ValueError: If the interpreter is not at the top level, or its state
+                    holds values that cannot be saved (such as open files)
+        OSError: If the file cannot be written
+    """
+    environment = interpreter.environment
+    if environment.parent is not get_builtin_environment():
+        raise ValueError("Snapshots can only be taken at the top level")
+
+    state = {
+        "config": _config(interpreter),
+        "environment": environment,
+        "trajectory": interpreter.fs_tracker.trajectory,
+        "window_size": interpreter.fs_tracker.window_size,
+        "hoisted_numbers": interpreter._hoisted_numbers,
+        "hoisted_strings": interpreter._hoisted_strings,
+    }
+
+    buffer = io.BytesIO()
+    try:
+        _SnapshotPickler(buffer, interpreter).dump(state)
+    except (pickle.PicklingError, TypeError, AttributeError, RecursionError) as e:
+        raise ValueError(f"Interpreter state cannot be snapshotted: {e}") from e
+
+    version = _language_version()
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, len(version))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(version)
+            f.write(buffer.getbuffer())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def load_snapshot(interpreter: "Interpreter", path: str) -> None:
+    """
+    Restore a snapshot into an interpreter.
+
+    Replaces the interpreter's global environment, Framework Strength
+    trajectory and hoisted literals with those in the snapshot. Restored
+    functions run in, and close over, this interpreter.
+
+    Args:
+        interpreter: Interpreter to restore into (same dimension and metric
+                     as the one that wrote the snapshot)
+        path: Snapshot file written by ``save_snapshot``
+
+    Raises:
+        ValueError: If the file is not a snapshot, was written by another
+                    EigenScript version or for another configuration
+        OSError: If the file cannot be read
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    version = _language_version()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"Not an EigenScript snapshot: {path}")
+    magic, format_version, version_len = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError(f"Not an EigenScript snapshot: {path}")
+
+    offset = _HEADER.size + version_len
+    if format_version != FORMAT_VERSION or data[_HEADER.size : offset] != version:
+        written_by = data[_HEADER.size : offset].decode("ascii", "replace")
+        raise ValueError(
+            f"Snapshot {path} was written by EigenScript {written_by} "
+            f"(format {format_version}); re-create it with this version"
+        )
+
+    try:
+        state = _SnapshotUnpickler(
+            io.BytesIO(memoryview(data)[offset:]), interpreter
+        ).load()
+    except Exception as e:
+        raise ValueError(f"Cannot load snapshot {path}: {e}") from e
+
+    if tuple(state["config"]) != _config(interpreter):
+        dimension, metric_type = state["config"]
+        raise ValueError(
+            f"Snapshot {path} is for dimension {dimension} with a "
+            f"{metric_type} metric; this interpreter uses dimension "
+            f"{interpreter.space.dimension} with a "
+            f"{interpreter.metric.metric_type} metric"
+        )
+
+    interpreter.environment = state["environment"]
+    interpreter.fs_tracker.trajectory = state["trajectory"]
+    interpreter.fs_tracker.window_size = state["window_size"]
+    interpreter._hoisted_numbers = state["hoisted_numbers"]
+    interpreter._hoisted_strings = state["hoisted_strings"]
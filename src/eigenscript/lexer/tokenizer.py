@@ -4,9 +4,10 @@ Tokenizer for EigenScript.
 Converts source code text into a stream of tokens.
 """
 
+import re
 from enum import Enum
-from dataclasses import dataclass
-from typing import List, Optional, Any
+from dataclasses import dataclass, field
+from typing import Any, Container, List, Optional
 
 
 class TokenType(Enum):
@@ -76,7 +77,7 @@ class TokenType(Enum):
     EOF = "EOF"
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     """
     Represents a single token in the source code.
@@ -86,12 +87,16 @@ class Token:
         value: The actual value of the token (if applicable)
         line: Line number where token appears
         column: Column number where token starts
+        offset: Character offset where token starts in the source
+        end: Character offset just past the end of the token
     """
 
     type: TokenType
     value: Any = None
     line: int = 0
     column: int = 0
+    offset: int = field(default=0, compare=False)
+    end: int = field(default=0, compare=False)
 
     def __repr__(self) -> str:
         if self.value is not None:
@@ -99,6 +104,37 @@ class Token:
         return f"Token({self.type.name}, {self.line}:{self.column})"
 
 
+# Master pattern: leading blanks, then one alternative per token class,
+# tried in order. OTHER catches anything else so every position matches.
+_TOKEN_PATTERN = re.compile(
+    r"""
+    [ \t\r]*
+    (?:
+    (?P<NUMBER>-?\d+(?:\.\d+)?)
+    | (?P<NAME>\w+)
+    | (?P<OP>!=|<=|>=|[:,()\[\]+\-*/%=<>.])
+    | (?P<NEWLINE>\n(?P<indent>[ \t]*))
+    | (?P<SKIP>\#[^\n]*|\Z)
+    | (?P<STRING>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    | (?P<OTHER>.)
+    )
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_INDENT_PATTERN = re.compile(r"[ \t]*")
+
+_ESCAPE_PATTERN = re.compile(r"\\(.)", re.DOTALL)
+
+# Common escape sequences; any other escaped character stands for itself
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "\\": "\\", "'": "'", '"': '"'}
+
+
+def _unescape(match: "re.Match") -> str:
+    char = match.group(1)
+    return _ESCAPES.get(char, char)
+
+
 class Tokenizer:
     """
     Tokenizes EigenScript source code.
@@ -141,6 +177,28 @@ class Tokenizer:
         "how": TokenType.HOW,
     }
 
+    # Punctuation and operator mapping
+    OPERATORS = {
+        ":": TokenType.COLON,
+        ",": TokenType.COMMA,
+        "(": TokenType.LPAREN,
+        ")": TokenType.RPAREN,
+        "[": TokenType.LBRACKET,
+        "]": TokenType.RBRACKET,
+        ".": TokenType.DOT,
+        "+": TokenType.PLUS,
+        "-": TokenType.MINUS,
+        "*": TokenType.MULTIPLY,
+        "/": TokenType.DIVIDE,
+        "%": TokenType.MODULO,
+        "=": TokenType.EQUALS,
+        "!=": TokenType.NOT_EQUAL,
+        "<": TokenType.LESS_THAN,
+        "<=": TokenType.LESS_EQUAL,
+        ">": TokenType.GREATER_THAN,
+        ">=": TokenType.GREATER_EQUAL,
+    }
+
     def __init__(self, source: str):
         """
         Initialize the tokenizer with source code.
@@ -161,181 +219,265 @@ class Tokenizer:
         """
         Tokenize the entire source code.
 
+        Scans with a single compiled master pattern (see ``_TOKEN_PATTERN``)
+        and computes line/column positions from match offsets. The rare
+        inputs the pattern cannot classify on its own (unterminated strings,
+        non-decimal Unicode digits, stray characters) are handed to the
+        character-level readers so errors are reported exactly as before.
+
         Returns:
             List of tokens including EOF token at the end
 
         Raises:
             SyntaxError: If invalid syntax is encountered
         """
-        # Track if we're at the beginning of a line for indentation
-        at_line_start = True
-
-        while self.position < len(self.source):
-            # Handle indentation at the start of lines
-            if at_line_start:
-                self.handle_indentation()
-                at_line_start = False
-                continue
+        self._scan()
+        self._close()
+        return self.tokens
 
-            # Skip whitespace (but not newlines)
-            self.skip_whitespace()
+    def tokenize_region(
+        self, start: int, line: int, stops: Container[int] = ()
+    ) -> Optional[int]:
+        """
+        Tokenize part of the source, for incremental re-parsing.
 
-            # Skip comments
-            if self.current_char() == "#":
-                self.skip_comment()
-                continue
+        Lexing starts at ``start``, which must be the beginning of a line
+        with no indentation (where the indent stack is empty, so the lexer
+        state is fully known). It stops at the first later line that also
+        starts at top-level indentation at an offset in ``stops``; beyond
+        such a line the source lexes exactly as it did before an edit. New
+        tokens are appended to ``self.tokens``.
 
-            char = self.current_char()
+        Args:
+            start: Offset of a top-level line start
+            line: Line number of that line
+            stops: Offsets of top-level line starts where lexing may stop
 
-            if char is None:
-                break
+        Returns:
+            The offset lexing stopped at, or None if it reached the end of
+            the source (in which case EOF has been appended)
 
-            # Newlines are significant (for indentation tracking)
-            if char == "\n":
-                token = Token(TokenType.NEWLINE, line=self.line, column=self.column)
-                self.tokens.append(token)
-                self.advance()
-                at_line_start = True
-                continue
+        Raises:
+            SyntaxError: If invalid syntax is encountered
+        """
+        self.position = start
+        self.line = line
+        self.column = 1
+        self.indent_stack = [0]
 
-            # Numbers
-            if char.isdigit() or (
-                char == "-" and self.peek_char() and self.peek_char().isdigit()
-            ):
-                self.tokens.append(self.read_number())
-                continue
+        stop = self._scan(stops or None)
+        if stop is None:
+            self._close()
+        return stop
 
-            # Strings
-            if char in ('"', "'"):
-                self.tokens.append(self.read_string())
-                continue
+    def _scan(self, stops: Optional[Container[int]] = None) -> Optional[int]:
+        """
+        Run the master-pattern loop from the current position.
+
+        Args:
+            stops: Offsets of top-level line starts at which to stop early
 
-            # Identifiers and keywords
-            if char.isalpha() or char == "_":
-                self.tokens.append(self.read_identifier())
+        Returns:
+            The offset scanning stopped at, or None at the end of the source
+        """
+        source = self.source
+        length = len(source)
+        tokens = self.tokens
+        append = tokens.append
+        match = _TOKEN_PATTERN.match
+        keywords = self.KEYWORDS
+        operators = self.OPERATORS
+
+        pos = self.position
+        line = self.line
+        line_start = pos - (self.column - 1)
+
+        # Handle indentation at the start of the first line
+        if pos < length:
+            indent = _INDENT_PATTERN.match(source, pos).group()
+            pos += len(indent)
+            self._emit_indentation(indent, pos, line)
+
+        same_indent = " " * self.indent_stack[-1]
+
+        # Identifier/keyword classification, cached per distinct name
+        names: dict = {}
+
+        while pos < length:
+            m = match(source, pos)
+            kind = m.lastgroup
+            start, end = m.span(kind)
+            column = start - line_start + 1
+
+            if kind == "NAME":
+                text = source[start:end]
+                entry = names.get(text)
+                if entry is None:
+                    first = text[0]
+                    if first.isalpha() or first == "_":
+                        token_type = keywords.get(text.lower())
+                        if token_type is not None:
+                            entry = (token_type, None)
+                        else:
+                            entry = (TokenType.IDENTIFIER, text)
+                        names[text] = entry
+                if entry is not None:
+                    append(Token(entry[0], entry[1], line, column, start, end))
+                    pos = end
+                    continue
+
+            elif kind == "OP":
+                text = source[start:end]
+                # "-" directly before a digit starts a negative number
+                if text != "-" or not source[end : end + 1].isdigit():
+                    append(Token(operators[text], None, line, column, start, end))
+                    pos = end
+                    continue
+
+            elif kind == "NEWLINE":
+                # Newlines are significant (for indentation tracking)
+                append(Token(TokenType.NEWLINE, None, line, column, start, start + 1))
+                line += 1
+                line_start = start + 1
+                pos = end
+                if pos < length:
+                    # Lines indented like the previous one need no tokens
+                    indent = m.group("indent")
+                    if indent != same_indent:
+                        self._emit_indentation(indent, pos, line)
+                        same_indent = " " * self.indent_stack[-1]
+                    if stops and pos in stops and len(self.indent_stack) == 1:
+                        self.position = pos
+                        self.line = line
+                        self.column = 1
+                        return pos
                 continue
 
-            # Punctuation and Operators
-            start_line = self.line
-            start_col = self.column
+            elif kind == "SKIP":
+                pos = end
+                continue
 
-            if char == ":":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.COLON, line=start_line, column=start_col)
-                )
-            elif char == ",":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.COMMA, line=start_line, column=start_col)
-                )
-            elif char == "(":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.LPAREN, line=start_line, column=start_col)
-                )
-            elif char == ")":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.RPAREN, line=start_line, column=start_col)
-                )
-            elif char == "[":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.LBRACKET, line=start_line, column=start_col)
-                )
-            elif char == "]":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.RBRACKET, line=start_line, column=start_col)
-                )
-            # Arithmetic operators
-            elif char == "+":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.PLUS, line=start_line, column=start_col)
-                )
-            elif char == "-" and not (self.peek_char() and self.peek_char().isdigit()):
-                # Only treat as operator if not start of negative number
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.MINUS, line=start_line, column=start_col)
-                )
-            elif char == "*":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.MULTIPLY, line=start_line, column=start_col)
-                )
-            elif char == "/":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.DIVIDE, line=start_line, column=start_col)
-                )
-            elif char == "%":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.MODULO, line=start_line, column=start_col)
-                )
-            elif char == "!":
-                self.advance()
-                if self.current_char() == "=":
-                    self.advance()
-                    self.tokens.append(
-                        Token(TokenType.NOT_EQUAL, line=start_line, column=start_col)
-                    )
-                else:
-                    raise SyntaxError(
-                        f"Unexpected character '!' at line {start_line}, column {start_col}. Did you mean 'not' or '!='?"
-                    )
-            elif char == "=":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.EQUALS, line=start_line, column=start_col)
-                )
-            elif char == "<":
-                self.advance()
-                if self.current_char() == "=":
-                    self.advance()
-                    self.tokens.append(
-                        Token(TokenType.LESS_EQUAL, line=start_line, column=start_col)
-                    )
-                else:
-                    self.tokens.append(
-                        Token(TokenType.LESS_THAN, line=start_line, column=start_col)
+            elif kind == "NUMBER":
+                text = source[start:end]
+                following = source[end : end + 2]
+                # Non-decimal digits (e.g. superscripts) continue a number
+                # in the character-level reader; let it handle them
+                if not following or not (
+                    following[0].isdigit()
+                    or (
+                        following[0] == "."
+                        and "." not in text
+                        and following[1:].isdigit()
                     )
-            elif char == ">":
-                self.advance()
-                if self.current_char() == "=":
-                    self.advance()
-                    self.tokens.append(
-                        Token(
-                            TokenType.GREATER_EQUAL, line=start_line, column=start_col
-                        )
-                    )
-                else:
-                    self.tokens.append(
-                        Token(TokenType.GREATER_THAN, line=start_line, column=start_col)
-                    )
-            elif char == ".":
-                self.advance()
-                self.tokens.append(
-                    Token(TokenType.DOT, line=start_line, column=start_col)
-                )
-            else:
-                raise SyntaxError(
-                    f"Unexpected character '{char}' at line {self.line}, column {self.column}"
-                )
+                ):
+                    value = float(text) if "." in text else int(text)
+                    append(Token(TokenType.NUMBER, value, line, column, start, end))
+                    pos = end
+                    continue
+
+            elif kind == "STRING":
+                text = source[start:end]
+                value = text[1:-1]
+                if "\\" in value:
+                    value = _ESCAPE_PATTERN.sub(_unescape, value)
+                append(Token(TokenType.STRING, value, line, column, start, end))
+                newlines = text.count("\n")
+                if newlines:
+                    line += newlines
+                    line_start = start + text.rfind("\n") + 1
+                pos = end
+                continue
 
-        # Close any remaining indentation levels
+            # Fall back to the character-level readers from this position
+            self.position = start
+            self.line = line
+            self.column = column
+            self._read_unmatched()
+            pos = self.position
+            tokens[-1].offset = start
+            tokens[-1].end = pos
+            line = self.line
+            line_start = pos - (self.column - 1)
+
+        self.position = pos
+        self.line = line
+        self.column = pos - line_start + 1
+        return None
+
+    def _close(self) -> None:
+        """Close any open indentation levels and append the EOF token."""
+        pos = self.position
         while len(self.indent_stack) > 1:
             self.indent_stack.pop()
             self.tokens.append(
-                Token(TokenType.DEDENT, line=self.line, column=self.column)
+                Token(TokenType.DEDENT, None, self.line, self.column, pos, pos)
             )
 
-        # Add EOF token
-        self.tokens.append(Token(TokenType.EOF, line=self.line, column=self.column))
-        return self.tokens
+        self.tokens.append(Token(TokenType.EOF, None, self.line, self.column, pos, pos))
+
+    def _emit_indentation(self, indent: str, pos: int, line: int) -> None:
+        """
+        Emit INDENT/DEDENT tokens for a line's leading whitespace.
+
+        Args:
+            indent: Leading spaces and tabs of the line
+            pos: Offset of the first character after the indentation
+            line: Line number of the line
+        """
+        # Skip blank lines (lines with only whitespace) and comment lines
+        next_char = self.source[pos : pos + 1]
+        if next_char in ("\n", "", "#"):
+            return
+
+        current_indent = self.indent_stack[-1]
+        if indent == " " * current_indent:
+            return
+
+        # Tabs count as 4 spaces
+        indent_level = len(indent) + 3 * indent.count("\t")
+
+        if indent_level > current_indent:
+            # Increased indentation - emit INDENT
+            self.indent_stack.append(indent_level)
+            self.tokens.append(Token(TokenType.INDENT, None, line, 1, pos, pos))
+        elif indent_level < current_indent:
+            # Decreased indentation - emit DEDENT(s)
+            while len(self.indent_stack) > 1 and self.indent_stack[-1] > indent_level:
+                self.indent_stack.pop()
+                self.tokens.append(Token(TokenType.DEDENT, None, line, 1, pos, pos))
+
+            # Check for indentation error (mismatched indent level)
+            if self.indent_stack[-1] != indent_level:
+                raise SyntaxError(
+                    f"Indentation error at line {line}: "
+                    f"expected {self.indent_stack[-1]} spaces, got {indent_level}"
+                )
+
+    def _read_unmatched(self) -> None:
+        """
+        Read one token character by character at the current position.
+
+        Used for input the master pattern cannot classify by itself; it
+        either appends a token and advances, or raises SyntaxError.
+        """
+        char = self.current_char()
+
+        if char.isdigit() or (
+            char == "-" and self.peek_char() and self.peek_char().isdigit()
+        ):
+            self.tokens.append(self.read_number())
+        elif char in ('"', "'"):
+            self.tokens.append(self.read_string())
+        elif char.isalpha() or char == "_":
+            self.tokens.append(self.read_identifier())
+        elif char == "!":
+            raise SyntaxError(
+                f"Unexpected character '!' at line {self.line}, column {self.column}. Did you mean 'not' or '!='?"
+            )
+        else:
+            raise SyntaxError(
+                f"Unexpected character '{char}' at line {self.line}, column {self.column}"
+            )
 
     def current_char(self) -> Optional[str]:
         """Get current character without advancing."""
@@ -366,17 +508,6 @@ class Tokenizer:
 
         return char
 
-    def skip_whitespace(self):
-        """Skip whitespace except newlines (which are significant)."""
-        while self.current_char() and self.current_char() in " \t\r":
-            self.advance()
-
-    def skip_comment(self):
-        """Skip single-line comments starting with #."""
-        if self.current_char() == "#":
-            while self.current_char() and self.current_char() != "\n":
-                self.advance()
-
     def read_number(self) -> Token:
         """
         Read a number literal (integer or float).
@@ -504,44 +635,3 @@ class Tokenizer:
         # This method is a placeholder for future enhancements
         # For now, vectors are parsed as LPAREN, values, RPAREN sequences
         raise NotImplementedError("Vector literals are parsed at the parser level")
-
-    def handle_indentation(self):
-        """
-        Handle indentation-based block structure.
-
-        Emits INDENT and DEDENT tokens similar to Python.
-        """
-        # Count spaces/tabs at the beginning of the line
-        indent_level = 0
-        start_pos = self.position
-
-        while self.current_char() and self.current_char() in " \t":
-            if self.current_char() == " ":
-                indent_level += 1
-            else:  # tab
-                indent_level += 4  # Treat tab as 4 spaces
-            self.advance()
-
-        # Skip blank lines (lines with only whitespace)
-        if self.current_char() in ("\n", None, "#"):
-            return
-
-        # Compare with current indent level
-        current_indent = self.indent_stack[-1]
-
-        if indent_level > current_indent:
-            # Increased indentation - emit INDENT
-            self.indent_stack.append(indent_level)
-            self.tokens.append(Token(TokenType.INDENT, line=self.line, column=1))
-        elif indent_level < current_indent:
-            # Decreased indentation - emit DEDENT(s)
-            while len(self.indent_stack) > 1 and self.indent_stack[-1] > indent_level:
-                self.indent_stack.pop()
-                self.tokens.append(Token(TokenType.DEDENT, line=self.line, column=1))
-
-            # Check for indentation error (mismatched indent level)
-            if self.indent_stack[-1] != indent_level:
-                raise SyntaxError(
-                    f"Indentation error at line {self.line}: "
-                    f"expected {self.indent_stack[-1]} spaces, got {indent_level}"
-                )
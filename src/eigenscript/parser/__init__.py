@@ -21,6 +21,7 @@ from eigenscript.parser.ast_builder import (
     Import,
     MemberAccess,
 )
+from eigenscript.parser.arena import ASTArena
 
 __all__ = [
     "Parser",
@@ -38,4 +39,5 @@ __all__ = [
     "Program",
     "Import",
     "MemberAccess",
+    "ASTArena",
 ]
@@ -0,0 +1,231 @@
+"""
+Flat, index-based layout of an EigenScript parse tree.
+
+An ``ASTArena`` lists every node of a tree in pre-order. Node ``i`` is
+``nodes[i]``, its class is ``NODE_TYPES[kinds[i]]``, and its subtree is
+``nodes[i:ends[i]]``: every subtree is one contiguous index range, and
+the next sibling of node ``i`` is node ``ends[i]``. Passes over a subtree
+are therefore linear scans of the arrays rather than recursive walks over
+node attributes. ``statements`` holds the indices of the top-level
+statements.
+
+The interpreter and ``LLVMCodeGenerator`` both accept an arena in place
+of a Program or a statement list and run its statements by index. The
+code generator lays out each module it compiles as an arena and answers
+"which names does this code read" by scanning index ranges.
+
+Example, for the program::
+
+    x is 0
+    loop while x < 3:
+        x is x + 1
+        y is x * 2
+
+    >>> arena = ASTArena.from_program(program)
+    >>> [arena.kind(i).__name__ for i in arena.statements]
+    ['Assignment', 'Loop']
+    >>> arena.block(arena.statements[1], "body")
+    [6, 10]
+    >>> arena.names_read(arena.statements)
+    Counter({'x': 3})
+"""
+
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple, Type
+
+from eigenscript.parser.ast_builder import (
+    ASTNode,
+    Assignment,
+    BinaryOp,
+    Break,
+    Conditional,
+    FunctionDef,
+    Identifier,
+    Import,
+    Index,
+    Interrogative,
+    ListComprehension,
+    ListLiteral,
+    Literal,
+    Loop,
+    MemberAccess,
+    Program,
+    Relation,
+    Return,
+    Slice,
+    UnaryOp,
+    _child_fields,
+)
+
+# Node classes in kind order. Append only: kinds are stored as indices.
+NODE_TYPES: Tuple[Type[ASTNode], ...] = (
+    Program,
+    Literal,
+    ListLiteral,
+    ListComprehension,
+    Index,
+    Slice,
+    Identifier,
+    Relation,
+    BinaryOp,
+    UnaryOp,
+    Assignment,
+    Conditional,
+    Loop,
+    FunctionDef,
+    Return,
+    Break,
+    Interrogative,
+    Import,
+    MemberAccess,
+)
+
+_KIND_OF = {cls: kind for kind, cls in enumerate(NODE_TYPES)}
+_IDENTIFIER = _KIND_OF[Identifier]
+_FUNCTION_DEF = _KIND_OF[FunctionDef]
+
+
+def _children(node: ASTNode) -> List[ASTNode]:
+    """The node's children in layout order: single children, then blocks."""
+    children, blocks = _child_fields(type(node))
+    result = [getattr(node, name) for name in children]
+    result = [child for child in result if child is not None]
+    for name in blocks:
+        result.extend(getattr(node, name) or ())
+    if type(node) is Literal and node.literal_type == "vector":
+        # Vectors of expressions keep their element nodes in ``value``
+        result.extend(item for item in node.value if isinstance(item, ASTNode))
+    return result
+
+
+class ASTArena:
+    """
+    A parse tree laid out as flat arrays, in pre-order.
+
+    Build one with ``from_program`` or ``from_statements``. The node
+    objects are shared with the tree, not copied.
+    """
+
+    __slots__ = ("nodes", "kinds", "ends", "statements", "_scopes")
+
+    def __init__(self):
+        self.nodes: List[ASTNode] = []
+        self.kinds = array("B")
+        self.ends = array("i")
+        self.statements = array("i")
+        # Indices of the nodes that hold statement blocks, by node identity
+        self._scopes: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @classmethod
+    def from_program(cls, program: Program) -> "ASTArena":
+        """Lay out a Program's statements."""
+        return cls.from_statements(program.statements)
+
+    @classmethod
+    def from_statements(cls, statements: Iterable[ASTNode]) -> "ASTArena":
+        """
+        Lay out a list of top-level statements.
+
+        Raises:
+            TypeError: If the tree contains a node class the arena has no
+                       kind for
+        """
+        arena = cls()
+        nodes, kinds, ends, scopes = arena.nodes, arena.kinds, arena.ends, arena._scopes
+        for statement in statements:
+            arena.statements.append(len(nodes))
+            # Entries are nodes to lay out, or the index of a laid-out node
+            # whose subtree is complete
+            stack: List[object] = [statement]
+            while stack:
+                entry = stack.pop()
+                if type(entry) is int:
+                    ends[entry] = len(nodes)
+                    continue
+                node_type = type(entry)
+                if node_type not in _KIND_OF:
+                    raise TypeError(f"Cannot lay out {node_type.__name__} nodes")
+                index = len(nodes)
+                nodes.append(entry)
+                kinds.append(_KIND_OF[node_type])
+                ends.append(0)
+                if _child_fields(node_type)[1]:
+                    scopes[id(entry)] = index
+                stack.append(index)
+                stack.extend(reversed(_children(entry)))
+        return arena
+
+    def kind(self, index: int) -> Type[ASTNode]:
+        """The class of node ``index``."""
+        return NODE_TYPES[self.kinds[index]]
+
+    def top_level(self) -> List[ASTNode]:
+        """The top-level statement nodes."""
+        return [self.nodes[index] for index in self.statements]
+
+    def index_of(self, node: ASTNode) -> int:
+        """
+        Index of a node that holds statement blocks (a Conditional, Loop or
+        FunctionDef).
+
+        Raises:
+            KeyError: If the node is not one of this arena's block nodes
+        """
+        return self._scopes[id(node)]
+
+    def child(self, index: int, name: str) -> int:
+        """Index of the node in single-child field ``name`` of node ``index``."""
+        return self._field_start(index, name)
+
+    def block(self, index: int, name: str) -> List[int]:
+        """Indices of the statements in block field ``name`` of node ``index``."""
+        position = self._field_start(index, name)
+        ends = self.ends
+        result = []
+        for _ in range(len(getattr(self.nodes[index], name) or ())):
+            result.append(position)
+            position = ends[position]
+        return result
+
+    def _field_start(self, index: int, name: str) -> int:
+        """Index of the first node laid out for one field of node ``index``."""
+        node = self.nodes[index]
+        children, blocks = _child_fields(type(node))
+        skip = 0
+        for field in children + blocks:
+            if field == name:
+                break
+            value = getattr(node, field)
+            if field in children:
+                skip += value is not None
+            else:
+                skip += len(value or ())
+        else:
+            raise KeyError(f"{type(node).__name__} has no child field {name!r}")
+
+        ends = self.ends
+        position = index + 1
+        for _ in range(skip):
+            position = ends[position]
+        return position
+
+    def names_read(self, roots: Iterable[int]) -> Counter:
+        """
+        How often each name is read in the subtrees of ``roots``.
+
+        Roots that are function definitions are skipped: their bodies run
+        in their own scope.
+        """
+        kinds, ends, nodes = self.kinds, self.ends, self.nodes
+        counts: Counter = Counter()
+        for root in roots:
+            if kinds[root] == _FUNCTION_DEF:
+                continue
+            for index in range(root, ends[root]):
+                if kinds[index] == _IDENTIFIER:
+                    counts[nodes[index].name] += 1
+        return counts
@@ -2,11 +2,27 @@
 Abstract Syntax Tree (AST) builder for EigenScript.
 
 Defines AST node classes and the parser that builds them from tokens.
+
+Nodes are slotted dataclasses: they have no per-instance ``__dict__``,
+which keeps large parse trees compact and makes field access in the
+interpreter and code generator cheaper. Every node records the source
+span it was parsed from as ``span_start``/``span_end`` character offsets.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Any
-from eigenscript.lexer import Token, TokenType
+from bisect import bisect_left
+from dataclasses import dataclass, field, fields, replace
+from functools import lru_cache
+from typing import (
+    Any,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    get_args,
+    get_origin,
+)
+from eigenscript.lexer import Token, TokenType, Tokenizer
 
 
 # ============================================================================
@@ -14,14 +30,32 @@ from eigenscript.lexer import Token, TokenType
 # ============================================================================
 
 
+@dataclass(slots=True, repr=False)
 class ASTNode:
-    """Base class for all AST nodes."""
+    """
+    Base class for all AST nodes.
+
+    Attributes:
+        span_start: Offset of the first source character of the node
+        span_end: Offset just past the last source character of the node
+
+    Spans are keyword-only and ignored by ``==``, so nodes built by hand
+    compare equal to parsed ones. Both are -1 when unknown.
+    """
+
+    span_start: int = field(default=-1, kw_only=True, compare=False)
+    span_end: int = field(default=-1, kw_only=True, compare=False)
+
+    @property
+    def span(self) -> tuple:
+        """The node's (start, end) source offsets."""
+        return self.span_start, self.span_end
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
 
-@dataclass
+@dataclass(slots=True)
 class Literal(ASTNode):
     """
     Represents a literal value (number, string, vector, null).
@@ -37,7 +71,7 @@ class Literal(ASTNode):
         return f"Literal({self.value!r}, {self.literal_type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class ListLiteral(ASTNode):
     """
     Represents a list literal.
@@ -54,7 +88,7 @@ class ListLiteral(ASTNode):
         return f"ListLiteral({self.elements})"
 
 
-@dataclass
+@dataclass(slots=True)
 class ListComprehension(ASTNode):
     """
     Represents a list comprehension.
@@ -73,7 +107,7 @@ class ListComprehension(ASTNode):
         return f"ListComprehension({self.expression}, {self.variable}, {self.iterable}, {self.condition})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Index(ASTNode):
     """
     Represents list indexing.
@@ -90,7 +124,7 @@ class Index(ASTNode):
         return f"Index({self.list_expr}, {self.index_expr})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Slice(ASTNode):
     """
     Represents slicing (for lists and strings).
@@ -110,7 +144,7 @@ class Slice(ASTNode):
         return f"Slice({self.expr}, {self.start}, {self.end})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Identifier(ASTNode):
     """
     Represents a variable identifier.
@@ -125,7 +159,7 @@ class Identifier(ASTNode):
         return f"Identifier({self.name!r})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Relation(ASTNode):
     """
     Represents the OF operator (relational operation).
@@ -144,7 +178,7 @@ class Relation(ASTNode):
         return f"Relation({self.left}, {self.right})"
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOp(ASTNode):
     """
     Represents binary arithmetic operations (+, -, *, /, =, <, >).
@@ -174,7 +208,7 @@ class BinaryOp(ASTNode):
         return f"BinaryOp({self.left}, {self.operator!r}, {self.right})"
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryOp(ASTNode):
     """
     Represents unary operations (not).
@@ -195,7 +229,7 @@ class UnaryOp(ASTNode):
         return f"UnaryOp({self.operator!r}, {self.operand})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Assignment(ASTNode):
     """
     Represents the IS operator (identity/binding).
@@ -214,7 +248,7 @@ class Assignment(ASTNode):
         return f"Assignment({self.identifier!r}, {self.expression})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Conditional(ASTNode):
     """
     Represents an IF statement (geometric conditional).
@@ -236,7 +270,7 @@ class Conditional(ASTNode):
         return f"Conditional({self.condition}, if={len(self.if_block)}, else={len(self.else_block) if self.else_block else 0})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Loop(ASTNode):
     """
     Represents a LOOP statement (geodesic iteration).
@@ -256,7 +290,7 @@ class Loop(ASTNode):
         return f"Loop({self.condition}, body={len(self.body)})"
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionDef(ASTNode):
     """
     Represents a function definition (timelike transformation).
@@ -279,7 +313,7 @@ class FunctionDef(ASTNode):
         return f"FunctionDef({self.name!r}, params={self.parameters}, body={len(self.body)})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Return(ASTNode):
     """
     Represents a RETURN statement (flow termination).
@@ -296,7 +330,7 @@ class Return(ASTNode):
         return f"Return({self.expression})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Break(ASTNode):
     """
     Represents a BREAK statement (loop termination).
@@ -309,7 +343,7 @@ class Break(ASTNode):
         return "Break()"
 
 
-@dataclass
+@dataclass(slots=True)
 class Interrogative(ASTNode):
     """
     Represents an interrogative operator (WHO, WHAT, WHEN, WHERE, WHY, HOW).
@@ -335,7 +369,7 @@ class Interrogative(ASTNode):
         return f"Interrogative({self.interrogative!r}, {self.expression})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Import(ASTNode):
     """
     Represents an import statement.
@@ -352,7 +386,7 @@ class Import(ASTNode):
         return f"Import({self.module_name!r}, alias={self.alias!r})"
 
 
-@dataclass
+@dataclass(slots=True)
 class MemberAccess(ASTNode):
     """
     Represents accessing a member of a module or object.
@@ -369,7 +403,7 @@ class MemberAccess(ASTNode):
         return f"MemberAccess({self.object}, {self.member!r})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Program(ASTNode):
     """
     Represents a complete EigenScript program.
@@ -387,6 +421,96 @@ class Program(ASTNode):
 # Parser
 # ============================================================================
 
+# Tokens that carry no source text of their own; spans never end on them
+_LAYOUT_TOKENS = frozenset({TokenType.NEWLINE, TokenType.INDENT, TokenType.DEDENT})
+
+
+def _span_start(node: ASTNode) -> int:
+    return node.span_start
+
+
+def _token_at(tokens: List[Token], offset: int) -> int:
+    """Index of the first non-DEDENT token starting at ``offset``."""
+    index = bisect_left(tokens, offset, key=_token_offset)
+    while tokens[index].type == TokenType.DEDENT:
+        index += 1
+    return index
+
+
+def _token_offset(token: Token) -> int:
+    return token.offset
+
+
+def walk(node: ASTNode) -> Iterator[ASTNode]:
+    """Yield ``node`` and every node below it, in no particular order."""
+    stack = [node]
+    pop = stack.pop
+    push = stack.append
+    extend = stack.extend
+    while stack:
+        node = pop()
+        yield node
+        children, blocks = _child_fields(type(node))
+        for name in children:
+            child = getattr(node, name)
+            if child is not None:
+                push(child)
+        for name in blocks:
+            block = getattr(node, name)
+            if block:
+                extend(block)
+        if type(node) is Literal and node.literal_type == "vector":
+            # Vectors of expressions keep their element nodes in ``value``
+            extend(item for item in node.value if isinstance(item, ASTNode))
+
+
+def _shift_spans(node: ASTNode, delta: int) -> None:
+    """Move the spans of a subtree by ``delta`` characters."""
+    for node in walk(node):
+        node.span_start += delta
+        node.span_end += delta
+
+
+@lru_cache(maxsize=None)
+def _child_fields(cls: type) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Names of the fields holding one child node and lists of nodes."""
+    children, blocks = [], []
+    for f in fields(cls):
+        hint = f.type
+        if get_origin(hint) is Union:  # Optional[...]
+            hint = get_args(hint)[0]
+        if hint is ASTNode:
+            children.append(f.name)
+        elif get_origin(hint) is list and get_args(hint) == (ASTNode,):
+            blocks.append(f.name)
+    return tuple(children), tuple(blocks)
+
+
+class _ResyncPoints:
+    """
+    Offsets, after an edit, where re-lexing can rejoin the old tokens.
+
+    Maps the shifted start of each statement after the edit to its index;
+    an offset only counts if the statement also began a line before the
+    edit, so reused tokens keep their columns.
+    """
+
+    __slots__ = ("statements", "tokens", "delta")
+
+    def __init__(self, statements: dict, tokens: List[Token], delta: int):
+        self.statements = statements
+        self.tokens = tokens
+        self.delta = delta
+
+    def __bool__(self) -> bool:
+        return bool(self.statements)
+
+    def __contains__(self, offset: int) -> bool:
+        if offset not in self.statements:
+            return False
+        tokens = self.tokens
+        return tokens[_token_at(tokens, offset - self.delta)].column == 1
+
 
 class Parser:
     """
@@ -423,6 +547,7 @@ class Parser:
             SyntaxError: If invalid syntax is encountered
         """
         statements = []
+        start = self.tokens[0].offset if self.tokens else 0
 
         while self.current_token() and self.current_token().type != TokenType.EOF:
             # Skip newlines at the top level
@@ -435,7 +560,152 @@ class Parser:
             if stmt:
                 statements.append(stmt)
 
-        return Program(statements)
+        return self._finish(Program(statements), start)
+
+    def reparse(
+        self, program: Program, source: str, start: int, old_end: int, new_end: int
+    ) -> Program:
+        """
+        Re-parse a program after an edit, reusing what the edit left intact.
+
+        ``self.tokens`` must be the token stream ``program`` was parsed from.
+        The edit replaced ``[start, old_end)`` of the old source with the
+        text now at ``[start, new_end)`` of ``source``.
+
+        Top-level statements begin on unindented lines, where the lexer's
+        indent stack is empty, so they split the file into pieces that lex
+        and parse independently. Only the lines from the last top-level
+        statement before the edit up to the first unindented statement
+        after it are re-lexed and re-parsed. The statements and tokens
+        around that region are reused; the statements after it are updated
+        in place for the shift in offsets, so after a successful call the
+        previous tree should not be used again.
+        On return ``self.tokens`` holds the token stream for ``source``.
+        If the edited source has a syntax error, the previous tree and
+        tokens are left untouched and still describe the previous source.
+
+        Args:
+            program: Tree parsed from ``self.tokens``
+            source: Source text after the edit
+            start: Offset where the edit begins
+            old_end: End of the replaced text in the old source
+            new_end: End of the inserted text in ``source``
+
+        Returns:
+            Program node for ``source``
+
+        Raises:
+            SyntaxError: If the edited region has invalid syntax
+        """
+        old_tokens = self.tokens
+        statements = program.statements
+        delta = new_end - old_end
+
+        # Restart at the last statement beginning an unindented line before
+        # the edit; a statement starting right at the edit may join the one
+        # before it (e.g. if the edit indents it into a block)
+        first = bisect_left(statements, start, key=_span_start)
+        while first > 0:
+            first -= 1
+            restart = statements[first].span_start
+            if restart == 0 or source[restart - 1] == "\n":
+                break
+        else:
+            first = 0
+            restart = 0
+
+        # Candidate resync points: unindented statements after the edit
+        last = bisect_left(statements, old_end, key=_span_start)
+        stops = _ResyncPoints(
+            {
+                stmt.span_start + delta: index
+                for index, stmt in enumerate(statements[last:], last)
+            },
+            old_tokens,
+            delta,
+        )
+
+        if restart == 0:
+            keep = 0
+            line = 1
+        else:
+            keep = _token_at(old_tokens, restart)
+            line = old_tokens[keep].line
+
+        tokenizer = Tokenizer(source)
+        tokenizer.tokens = old_tokens[:keep]
+        stop = tokenizer.tokenize_region(restart, line, stops)
+        tokens = tokenizer.tokens
+        region_end = len(tokens)
+
+        suffix: List[ASTNode] = []
+        if stop is not None:
+            suffix = statements[stops.statements[stop] :]
+            old_index = _token_at(old_tokens, stop - delta)
+            line_delta = tokenizer.line - old_tokens[old_index].line
+            # The parser looks at the first reused token to end the region;
+            # give it a shifted copy so errors report the right position
+            boundary = old_tokens[old_index]
+            tokens.append(
+                replace(
+                    boundary,
+                    line=boundary.line + line_delta,
+                    offset=boundary.offset + delta,
+                    end=boundary.end + delta,
+                )
+            )
+            tokens.extend(old_tokens[old_index + 1 :])
+
+        # Parse the re-lexed tokens, leaving the old parse intact on error
+        self.tokens = tokens
+        self.position = keep
+        middle = []
+        try:
+            while (
+                self.position < region_end
+                and tokens[self.position].type != TokenType.EOF
+            ):
+                if tokens[self.position].type == TokenType.NEWLINE:
+                    self.advance()
+                    continue
+                stmt = self.parse_statement()
+                if stmt:
+                    middle.append(stmt)
+        except SyntaxError:
+            self.tokens = old_tokens
+            self.position = 0
+            raise
+
+        if stop is not None:
+            if delta or line_delta:
+                # Shift copies, so the old token stream stays valid if the
+                # full parse below fails
+                tokens[region_end + 1 :] = [
+                    replace(
+                        token,
+                        line=token.line + line_delta,
+                        offset=token.offset + delta,
+                        end=token.end + delta,
+                    )
+                    for token in old_tokens[old_index + 1 :]
+                ]
+
+            if self.position != region_end:
+                # The region did not end on a statement boundary
+                self.position = 0
+                try:
+                    return self.parse()
+                except SyntaxError:
+                    self.tokens = old_tokens
+                    raise
+
+            if delta:
+                for stmt in suffix:
+                    _shift_spans(stmt, delta)
+
+        self.position = len(tokens) - 1
+        result = Program(statements[:first] + middle + suffix)
+        return self._finish(result, tokens[0].offset if tokens else 0)
 
     def current_token(self) -> Optional[Token]:
         """Get current token without advancing."""
@@ -457,6 +727,28 @@ class Parser:
             self.position += 1
         return token
 
+    def _finish(self, node: ASTNode, start: int) -> ASTNode:
+        """
+        Record the source span of a freshly built node.
+
+        The span runs from ``start`` to the end of the last token consumed
+        for the node, not counting trailing newlines and block layout.
+
+        Args:
+            node: Node to annotate
+            start: Source offset where the node begins
+
+        Returns:
+            The same node
+        """
+        tokens = self.tokens
+        pos = self.position - 1
+        while pos > 0 and tokens[pos].type in _LAYOUT_TOKENS:
+            pos -= 1
+        node.span_start = start
+        node.span_end = tokens[pos].end if pos >= 0 else start
+        return node
+
     def expect(self, token_type: TokenType) -> Token:
         """
         Expect a specific token type and advance.
@@ -524,7 +816,7 @@ class Parser:
             # Consume optional newline
             if self.current_token() and self.current_token().type == TokenType.NEWLINE:
                 self.advance()
-            return Break()
+            return self._finish(Break(), token.offset)
 
         # Assignment (identifier IS expression)
         if token.type == TokenType.IDENTIFIER:
@@ -562,7 +854,7 @@ class Parser:
         if self.current_token() and self.current_token().type == TokenType.NEWLINE:
             self.advance()
 
-        return Assignment(identifier, expression)
+        return self._finish(Assignment(identifier, expression), id_token.offset)
 
     def parse_import(self) -> Import:
         """
@@ -570,7 +862,7 @@ class Parser:
 
         Grammar: IMPORT identifier (AS identifier)?
         """
-        self.expect(TokenType.IMPORT)
+        start = self.expect(TokenType.IMPORT).offset
 
         module_token = self.expect(TokenType.IDENTIFIER)
         module_name = module_token.value
@@ -586,7 +878,7 @@ class Parser:
         if self.current_token() and self.current_token().type == TokenType.NEWLINE:
             self.advance()
 
-        return Import(module_name, alias)
+        return self._finish(Import(module_name, alias), start)
 
     def parse_definition(self) -> FunctionDef:
         """
@@ -595,7 +887,7 @@ class Parser:
         Grammar: DEFINE identifier AS COLON block
         """
         # Consume DEFINE
-        self.expect(TokenType.DEFINE)
+        start = self.expect(TokenType.DEFINE).offset
 
         # Get function name
         name_token = self.expect(TokenType.IDENTIFIER)
@@ -619,7 +911,7 @@ class Parser:
         # Parse block
         body = self.parse_block()
 
-        return FunctionDef(name, parameters, body)
+        return self._finish(FunctionDef(name, parameters, body), start)
 
     def parse_conditional(self) -> Conditional:
         """
@@ -628,7 +920,7 @@ class Parser:
         Grammar: IF expression COLON block (ELSE COLON block)?
         """
         # Consume IF
-        self.expect(TokenType.IF)
+        start = self.expect(TokenType.IF).offset
 
         # Parse condition
         condition = self.parse_expression()
@@ -658,7 +950,7 @@ class Parser:
             # Parse else block
             else_block = self.parse_block()
 
-        return Conditional(condition, if_block, else_block)
+        return self._finish(Conditional(condition, if_block, else_block), start)
 
     def parse_loop(self) -> Loop:
         """
@@ -667,7 +959,7 @@ class Parser:
         Grammar: LOOP WHILE expression COLON block
         """
         # Consume LOOP
-        self.expect(TokenType.LOOP)
+        start = self.expect(TokenType.LOOP).offset
 
         # Expect WHILE
         self.expect(TokenType.WHILE)
@@ -685,7 +977,7 @@ class Parser:
         # Parse loop body
         body = self.parse_block()
 
-        return Loop(condition, body)
+        return self._finish(Loop(condition, body), start)
 
     def parse_return(self) -> Return:
         """
@@ -694,7 +986,7 @@ class Parser:
         Grammar: RETURN expression
         """
         # Consume RETURN
-        self.expect(TokenType.RETURN)
+        start = self.expect(TokenType.RETURN).offset
 
         # Parse expression
         expression = self.parse_expression()
@@ -703,7 +995,7 @@ class Parser:
         if self.current_token() and self.current_token().type == TokenType.NEWLINE:
             self.advance()
 
-        return Return(expression)
+        return self._finish(Return(expression), start)
 
     def parse_interrogative(self) -> Interrogative:
         """
@@ -737,7 +1029,7 @@ class Parser:
         # This avoids infinite recursion since primary won't parse interrogatives
         expression = self.parse_identifier_or_literal()
 
-        return Interrogative(interrogative, expression)
+        return self._finish(Interrogative(interrogative, expression), token.offset)
 
     def parse_identifier_or_literal(self) -> ASTNode:
         """
@@ -760,29 +1052,29 @@ class Parser:
         # Number literal
         if token.type == TokenType.NUMBER:
             self.advance()
-            return Literal(token.value, "number")
+            return self._finish(Literal(token.value, "number"), token.offset)
 
         # String literal
         if token.type == TokenType.STRING:
             self.advance()
-            return Literal(token.value, "string")
+            return self._finish(Literal(token.value, "string"), token.offset)
 
         # Null literal
         if token.type == TokenType.NULL:
             self.advance()
-            return Literal(None, "null")
+            return self._finish(Literal(None, "null"), token.offset)
 
         # Identifier
         if token.type == TokenType.IDENTIFIER:
             self.advance()
-            return Identifier(token.value)
+            return self._finish(Identifier(token.value), token.offset)
 
         # Parenthesized expression
         if token.type == TokenType.LPAREN:
             self.advance()
             expr = self.parse_expression()
             self.expect(TokenType.RPAREN)
-            return expr
+            return self._finish(expr, token.offset)
 
         raise SyntaxError(
             f"Expected identifier or literal, got {token.type.name} at line {token.line}, column {token.column}"
@@ -843,7 +1135,7 @@ class Parser:
         while self.current_token() and self.current_token().type == TokenType.OR:
             self.advance()
             right = self.parse_logical_and()
-            left = BinaryOp(left, "or", right)
+            left = self._finish(BinaryOp(left, "or", right), left.span_start)
 
         return left
 
@@ -858,7 +1150,7 @@ class Parser:
         while self.current_token() and self.current_token().type == TokenType.AND:
             self.advance()
             right = self.parse_comparison()
-            left = BinaryOp(left, "and", right)
+            left = self._finish(BinaryOp(left, "and", right), left.span_start)
 
         return left
 
@@ -891,7 +1183,9 @@ class Parser:
                 TokenType.GREATER_THAN: ">",
                 TokenType.GREATER_EQUAL: ">=",
             }
-            left = BinaryOp(left, op_map[op_token.type], right)
+            left = self._finish(
+                BinaryOp(left, op_map[op_token.type], right), left.span_start
+            )
 
         return left
 
@@ -913,7 +1207,9 @@ class Parser:
             right = self.parse_multiplicative()
 
             op_map = {TokenType.PLUS: "+", TokenType.MINUS: "-"}
-            left = BinaryOp(left, op_map[op_token.type], right)
+            left = self._finish(
+                BinaryOp(left, op_map[op_token.type], right), left.span_start
+            )
 
         return left
 
@@ -940,7 +1236,9 @@ class Parser:
                 TokenType.DIVIDE: "/",
                 TokenType.MODULO: "%",
             }
-            left = BinaryOp(left, op_map[op_token.type], right)
+            left = self._finish(
+                BinaryOp(left, op_map[op_token.type], right), left.span_start
+            )
 
         return left
 
@@ -961,7 +1259,7 @@ class Parser:
             self.advance()
             # Recursively parse right side to handle right-associativity
             right = self.parse_relation()
-            return Relation(left, right)
+            return self._finish(Relation(left, right), left.span_start)
 
         return left
 
@@ -991,7 +1289,9 @@ class Parser:
                 # Handle Member Access (x.y)
                 self.advance()  # consume DOT
                 member_token = self.expect(TokenType.IDENTIFIER)
-                expr = MemberAccess(expr, member_token.value)
+                expr = self._finish(
+                    MemberAccess(expr, member_token.value), expr.span_start
+                )
             else:
                 # Handle Indexing/Slicing (Existing logic)
                 self.advance()
@@ -1025,7 +1325,9 @@ class Parser:
                         end_expr = self.parse_expression()
 
                     self.expect(TokenType.RBRACKET)
-                    expr = Slice(expr, start_expr, end_expr)
+                    expr = self._finish(
+                        Slice(expr, start_expr, end_expr), expr.span_start
+                    )
                 else:
                     # This is regular indexing
                     if start_expr is None:
@@ -1037,7 +1339,7 @@ class Parser:
                         else:
                             raise SyntaxError("Expected index expression")
                     self.expect(TokenType.RBRACKET)
-                    expr = Index(expr, start_expr)
+                    expr = self._finish(Index(expr, start_expr), expr.span_start)
 
         return expr
 
@@ -1058,7 +1360,7 @@ class Parser:
         if token and token.type == TokenType.NOT:
             self.advance()
             operand = self.parse_unary()  # Allow chaining: not not x
-            return UnaryOp("not", operand)
+            return self._finish(UnaryOp("not", operand), token.offset)
 
         # Otherwise parse primary
         return self.parse_primary()
@@ -1095,22 +1397,22 @@ class Parser:
         # Number literal
         if token.type == TokenType.NUMBER:
             self.advance()
-            return Literal(token.value, "number")
+            return self._finish(Literal(token.value, "number"), token.offset)
 
         # String literal
         if token.type == TokenType.STRING:
             self.advance()
-            return Literal(token.value, "string")
+            return self._finish(Literal(token.value, "string"), token.offset)
 
         # Null literal
         if token.type == TokenType.NULL:
             self.advance()
-            return Literal(None, "null")
+            return self._finish(Literal(None, "null"), token.offset)
 
         # Identifier
         if token.type == TokenType.IDENTIFIER:
             self.advance()
-            return Identifier(token.value)
+            return self._finish(Identifier(token.value), token.offset)
 
         # List literal or list comprehension
         if token.type == TokenType.LBRACKET:
@@ -1119,7 +1421,7 @@ class Parser:
             # Check for empty list
             if self.current_token() and self.current_token().type == TokenType.RBRACKET:
                 self.advance()
-                return ListLiteral([])
+                return self._finish(ListLiteral([]), token.offset)
 
             # Parse first expression
             first_expr = self.parse_expression()
@@ -1169,7 +1471,10 @@ class Parser:
                     condition = self.parse_expression()
 
                 self.expect(TokenType.RBRACKET)
-                return ListComprehension(first_expr, var_name, iterable, condition)
+                return self._finish(
+                    ListComprehension(first_expr, var_name, iterable, condition),
+                    token.offset,
+                )
 
             # Otherwise, it's a regular list literal
             elements = [first_expr]
@@ -1182,7 +1487,7 @@ class Parser:
                     elements.append(self.parse_expression())
 
             self.expect(TokenType.RBRACKET)
-            return ListLiteral(elements)
+            return self._finish(ListLiteral(elements), token.offset)
 
         # Parenthesized expression or vector literal
         if token.type == TokenType.LPAREN:
@@ -1220,14 +1525,14 @@ class Parser:
                         values.append(elem.value)
                     else:
                         # Mixed types - keep as list of AST nodes
-                        return Literal(elements, "vector")
-                return Literal(values, "vector")
+                        return self._finish(Literal(elements, "vector"), token.offset)
+                return self._finish(Literal(values, "vector"), token.offset)
             elif len(elements) == 1:
-                # Single element in parentheses
-                return elements[0]
+                # Single element in parentheses (its span includes them)
+                return self._finish(elements[0], token.offset)
             else:
                 # Empty parentheses - treat as empty vector
-                return Literal([], "vector")
+                return self._finish(Literal([], "vector"), token.offset)
 
         # Bracket notation for vectors
         if token.type == TokenType.LBRACKET:
@@ -1253,8 +1558,8 @@ class Parser:
                 if isinstance(elem, Literal) and elem.literal_type == "number":
                     values.append(elem.value)
                 else:
-                    return Literal(elements, "vector")
-            return Literal(values, "vector")
+                    return self._finish(Literal(elements, "vector"), token.offset)
+            return self._finish(Literal(values, "vector"), token.offset)
 
         raise SyntaxError(
             f"Unexpected token {token.type.name} at line {token.line}, column {token.column}"
@@ -0,0 +1,215 @@
+"""
+Persistent parse cache for EigenScript.
+
+Stores the parsed Program AST of a source file in a compact binary
+``.eigsc`` file so that later runs can skip tokenizing and parsing,
+much like Python's ``__pycache__``. By default cache files live in an
+``__eigscache__`` directory next to the source; set the ``EIGEN_CACHE_DIR``
+environment variable to keep them all in one place instead.
+
+A cache file is only used when both the SHA-256 hash of the source text
+and the EigenScript version recorded in its header match. Anything else
+(stale, corrupt or unreadable files) silently falls back to a fresh parse.
+"""
+
+import hashlib
+import os
+import pickle
+import struct
+import tempfile
+from typing import Optional, Tuple
+
+from eigenscript.lexer import Tokenizer
+from eigenscript.parser.ast_builder import Parser, Program
+
+CACHE_DIRNAME = "__eigscache__"
+CACHE_SUFFIX = ".eigsc"
+
+# Bump when the AST node classes change shape
+FORMAT_VERSION = 2
+
+_MAGIC = b"EIGC"
+_HEADER = struct.Struct(">4sHH")  # magic, format version, version string length
+_DIGEST_SIZE = 32
+
+
+def _language_version() -> bytes:
+    from eigenscript import __version__
+
+    return __version__.encode("ascii")
+
+
+def source_hash(source: str) -> bytes:
+    """Return the SHA-256 digest identifying a source text."""
+    return hashlib.sha256(source.encode("utf-8")).digest()
+
+
+def cache_path_for(source_path: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Get the cache file path for a source file.
+
+    Args:
+        source_path: Path to the .eigs source file
+        cache_dir: Directory for all cache files (default: ``EIGEN_CACHE_DIR``
+                   or an ``__eigscache__`` directory next to the source)
+
+    Returns:
+        Path of the ``.eigsc`` file (which may not exist yet)
+    """
+    abs_path = os.path.abspath(source_path)
+    stem = os.path.splitext(os.path.basename(abs_path))[0]
+
+    cache_dir = cache_dir or os.environ.get("EIGEN_CACHE_DIR")
+    if cache_dir:
+        # One shared directory: disambiguate files with the same name
+        path_tag = hashlib.sha256(abs_path.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(cache_dir, f"{stem}.{path_tag}{CACHE_SUFFIX}")
+
+    return os.path.join(os.path.dirname(abs_path), CACHE_DIRNAME, stem + CACHE_SUFFIX)
+
+
+def load_cached_program(
+    source_path: str, source: str, cache_dir: Optional[str] = None
+) -> Optional[Program]:
+    """
+    Load the cached AST for a source file if it is still valid.
+
+    Args:
+        source_path: Path to the .eigs source file
+        source: Current source text (used to validate the cache)
+        cache_dir: Optional cache directory override
+
+    Returns:
+        The cached Program, or None if there is no valid cache entry
+    """
+    try:
+        with open(cache_path_for(source_path, cache_dir), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    version = _language_version()
+    header_size = _HEADER.size + len(version) + _DIGEST_SIZE
+    if len(data) < header_size:
+        return None
+
+    magic, format_version, version_len = _HEADER.unpack_from(data)
+    if (
+        magic != _MAGIC
+        or format_version != FORMAT_VERSION
+        or version_len != len(version)
+    ):
+        return None
+
+    offset = _HEADER.size
+    if data[offset : offset + version_len] != version:
+        return None
+    offset += version_len
+    if data[offset : offset + _DIGEST_SIZE] != source_hash(source):
+        return None
+
+    try:
+        program = pickle.loads(data[header_size:])
+    except Exception:
+        return None
+
+    return program if isinstance(program, Program) else None
+
+
+def store_cached_program(
+    source_path: str, source: str, program: Program, cache_dir: Optional[str] = None
+) -> bool:
+    """
+    Write the AST for a source file to its cache file.
+
+    The file is written to a temporary name and renamed into place, so
+    concurrent readers never see a partial entry. Failures (read-only
+    directories, ASTs too deep to serialize) are ignored.
+
+    Args:
+        source_path: Path to the .eigs source file
+        source: Source text the program was parsed from
+        program: Parsed Program AST
+        cache_dir: Optional cache directory override
+
+    Returns:
+        True if the cache file was written
+    """
+    version = _language_version()
+    cache_path = cache_path_for(source_path, cache_dir)
+
+    try:
+        payload = pickle.dumps(program, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, RecursionError):
+        return False
+
+    header = _HEADER.pack(_MAGIC, FORMAT_VERSION, len(version))
+    data = header + version + source_hash(source) + payload
+
+    try:
+        directory = os.path.dirname(cache_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return False
+
+    return True
+
+
+def parse_source(source: str) -> Tuple[Program, int]:
+    """
+    Tokenize and parse source text.
+
+    Returns:
+        Tuple of (Program AST, number of tokens)
+    """
+    tokens = Tokenizer(source).tokenize()
+    return Parser(tokens).parse(), len(tokens)
+
+
+def parse_file(
+    source_path: str,
+    source: Optional[str] = None,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+) -> Program:
+    """
+    Parse a source file, reusing its cached AST when valid.
+
+    Args:
+        source_path: Path to the .eigs source file
+        source: Source text, if already read (avoids a second read)
+        use_cache: Read and write the parse cache (default: True)
+        cache_dir: Optional cache directory override
+
+    Returns:
+        Program AST for the file
+
+    Raises:
+        SyntaxError: If the source cannot be tokenized or parsed
+
+    Example:
+        >>> program = parse_file("physics.eigs")
+    """
+    if source is None:
+        with open(source_path, "r", encoding="utf-8") as f:
+            source = f.read()
+
+    if use_cache:
+        program = load_cached_program(source_path, source, cache_dir)
+        if program is not None:
+            return program
+
+    program, _ = parse_source(source)
+
+    if use_cache:
+        store_cached_program(source_path, source, program, cache_dir)
+
+    return program
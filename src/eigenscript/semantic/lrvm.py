@@ -205,6 +205,96 @@ class LRVMVector:
         return hash(tuple(self.coords.tolist()))
 
 
+class LazyStringVector(LRVMVector):
+    """
+    A string vector whose text and embedding are built on first use.
+
+    Concatenating onto a LazyStringVector appends the new piece to a list
+    shared with the left operand instead of copying the text, so building
+    a string piece by piece in a loop costs amortized O(1) per step. The
+    pieces are joined the first time ``metadata`` is read, and the
+    character embedding is computed the first time ``coords`` is read.
+
+    Example:
+        >>> space = LRVMSpace(dimension=768)
+        >>> s = LazyStringVector.concat(space, space.embed_string("ab"), "cd")
+        >>> s.length
+        4
+        >>> s.metadata["string_value"]
+        'abcd'
+    """
+
+    def __init__(self, space: "LRVMSpace", pieces: List[str], count: int, length: int):
+        """
+        Initialize a lazy string vector.
+
+        Args:
+            space: LRVM space used to embed the text once it is needed
+            pieces: String pieces, possibly shared with other lazy strings
+            count: Number of leading pieces that make up this string
+            length: Total length of the text in characters
+        """
+        self._space = space
+        self._pieces = pieces
+        self._count = count
+        self.length = length
+        self._metadata = None
+        self._coords = None
+        self.dimension = space.dimension
+
+    @classmethod
+    def concat(
+        cls, space: "LRVMSpace", left: LRVMVector, right_str: str
+    ) -> "LazyStringVector":
+        """
+        Concatenate a string onto a string vector without copying.
+
+        Args:
+            space: LRVM space for the result
+            left: String vector (lazy or eager) on the left of ``+``
+            right_str: Text appended on the right
+
+        Returns:
+            Lazy string vector for ``left + right_str``
+        """
+        if isinstance(left, LazyStringVector) and left._metadata is None:
+            pieces = left._pieces
+            if len(pieces) != left._count:
+                # Another string already extended these pieces; branch off
+                pieces = pieces[: left._count]
+            pieces.append(right_str)
+            return cls(space, pieces, len(pieces), left.length + len(right_str))
+
+        left_str = left.metadata["string_value"]
+        return cls(space, [left_str, right_str], 2, len(left_str) + len(right_str))
+
+    @property
+    def metadata(self) -> dict:
+        """Metadata with the joined ``string_value``, built on first access."""
+        if self._metadata is None:
+            text = "".join(self._pieces[: self._count])
+            self._metadata = {"string_value": text}
+            self._pieces = None
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: dict) -> None:
+        self._metadata = value
+        self._pieces = None
+
+    @property
+    def coords(self) -> np.ndarray:
+        """Character embedding of the text, computed on first access."""
+        if self._coords is None:
+            text = self.metadata["string_value"]
+            self._coords = self._space.embed_string(text).coords
+        return self._coords
+
+    @coords.setter
+    def coords(self, value: np.ndarray) -> None:
+        self._coords = value
+
+
 class LRVMSpace:
     """
     Represents the entire LRVM semantic space.
@@ -0,0 +1,397 @@
+"""
+Persistent session server for the EigenScript CLI.
+
+Starting ``python -m eigenscript`` costs far more than running a small
+script: the Python interpreter starts, NumPy is imported and the
+interpreter's tables are built. The session server pays that once. It
+warms up a process and keeps pre-forked copies of it waiting; each copy
+runs exactly one request and exits, so every script starts from the same
+pristine, pre-warmed state and cannot affect the next one.
+
+Requests and responses are single lines of JSON::
+
+    {"argv": ["script.eigs", "--show-fs"], "cwd": "/path/to/jobs"}
+    {"stdout": "...", "stderr": "...", "exit_code": 0}
+
+``argv`` holds the arguments of ``python -m eigenscript``, resolved against
+``cwd``. An optional ``"stdin"`` string is given to the script as its
+standard input (otherwise it reads end-of-file).
+
+The server listens on a Unix socket (``python -m eigenscript --serve``),
+one request per connection, or reads request lines from its own stdin and
+answers on stdout (``--serve -``). The thin client in ``eigenscript.client``
+forwards its command line to a running server.
+"""
+
+import gc
+import io
+import json
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from eigenscript.client import default_socket_path
+
+# Script each process runs before serving, so that imports, caches and the
+# memory a run writes to are already in place when a request arrives
+_WARM_UP_SCRIPT = "warm is [1, 2, 3]\nwarm is warm[0] + 1\nprint of warm\n"
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+
+
+def execute(request: Request) -> Response:
+    """
+    Run one request in the current process.
+
+    Args:
+        request: Decoded request with ``argv`` and optional ``cwd``/``stdin``
+
+    Returns:
+        Response with the captured ``stdout``/``stderr`` and ``exit_code``
+    """
+    from eigenscript.__main__ import main
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    saved_cwd = os.getcwd()
+    saved_stdin = sys.stdin
+    sys.stdin = io.StringIO(request.get("stdin") or "")
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                argv = request.get("argv")
+                if not isinstance(argv, list) or not all(
+                    isinstance(arg, str) for arg in argv
+                ):
+                    raise ValueError("request 'argv' must be a list of strings")
+                if request.get("cwd"):
+                    os.chdir(request["cwd"])
+                exit_code = main(argv)
+            except SystemExit as e:
+                if e.code is None:
+                    exit_code = 0
+                elif isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except Exception as e:
+                print(f"Error: {type(e).__name__}: {e}", file=sys.stderr)
+                exit_code = 1
+    finally:
+        sys.stdin = saved_stdin
+        os.chdir(saved_cwd)
+
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "exit_code": exit_code or 0,
+    }
+
+
+def decode_request(line: bytes) -> Tuple[Optional[Request], Optional[Response]]:
+    """
+    Decode one request line.
+
+    Returns:
+        ``(request, None)``, or ``(None, response)`` with exit code 2 if
+        the line is not a valid request
+    """
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+    except ValueError as e:
+        return None, {"stdout": "", "stderr": f"Bad request: {e}\n", "exit_code": 2}
+    return request, None
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a request or response as one line."""
+    return json.dumps(message).encode("utf-8") + b"\n"
+
+
+class ScriptPool:
+    """
+    Warmed-up process that forks single-use script workers.
+
+    Example:
+        >>> pool = ScriptPool()
+        >>> pool.warm_up()
+        >>> pid = pool.fork_worker(serve_one_request)
+    """
+
+    def __init__(self):
+        self._tmpdir: Optional[str] = None
+        self._warm_script: Optional[str] = None
+
+    def warm_up(self) -> None:
+        """
+        Import and initialize everything a script run needs.
+
+        Runs a tiny script through the CLI entry point, then freezes the
+        heap so forked workers do not copy it when the garbage collector
+        runs.
+        """
+        self._tmpdir = tempfile.mkdtemp(prefix="eigenscript-server-")
+        self._warm_script = os.path.join(self._tmpdir, "warm.eigs")
+        with open(self._warm_script, "w", encoding="utf-8") as f:
+            f.write(_WARM_UP_SCRIPT)
+        self._prime()
+        gc.collect()
+        gc.freeze()
+
+    def close(self) -> None:
+        """Remove the warm-up files."""
+        if self._tmpdir is not None:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
+            self._tmpdir = None
+
+    def fork_worker(self, serve: Callable[[], None]) -> int:
+        """
+        Fork a worker that primes itself, calls ``serve`` once and exits.
+
+        Priming runs the warm-up script again in the child. That copies the
+        memory pages a script run writes to before a request is waiting,
+        instead of while it runs.
+
+        Args:
+            serve: Receives one request, executes it and sends the response
+
+        Returns:
+            Process id of the worker
+        """
+        pid = os.fork()
+        if pid:
+            return pid
+
+        # Worker: never return into the server's code
+        status = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self._prime()
+            serve()
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _prime(self) -> None:
+        if self._warm_script is not None:
+            execute({"argv": [self._warm_script]})
+
+
+class _PipeWorker:
+    """A pre-forked worker that takes its request over a pipe."""
+
+    def __init__(self, pool: ScriptPool):
+        request_read, self._request_fd = os.pipe()
+        self._response_fd, response_write = os.pipe()
+
+        def serve() -> None:
+            os.close(self._request_fd)
+            os.close(self._response_fd)
+            with os.fdopen(request_read, "rb") as reader:
+                line = reader.readline()
+            if not line:
+                return
+            request, _ = decode_request(line)
+            with os.fdopen(response_write, "wb") as writer:
+                writer.write(encode_message(execute(request)))
+
+        self.pid = pool.fork_worker(serve)
+        os.close(request_read)
+        os.close(response_write)
+
+    def send(self, request: Request) -> None:
+        """Hand the worker its request."""
+        with os.fdopen(self._request_fd, "wb") as writer:
+            writer.write(encode_message(request))
+
+    def result(self) -> Response:
+        """Wait for the worker to finish and return its response."""
+        with os.fdopen(self._response_fd, "rb") as reader:
+            data = reader.read()
+        _, status = os.waitpid(self.pid, 0)
+        if data:
+            return json.loads(data)
+        return {
+            "stdout": "",
+            "stderr": f"Error: script process failed (status {status})\n",
+            "exit_code": 1,
+        }
+
+    def discard(self) -> None:
+        """Let an unused worker exit."""
+        os.close(self._request_fd)
+        self.result()
+
+
+def serve_stream(reader: BinaryIO, writer: BinaryIO, pool: ScriptPool) -> None:
+    """
+    Serve request lines from a stream until it is closed.
+
+    Each request runs in its own pre-forked worker; the next worker is
+    forked while the current one executes. Without ``os.fork`` requests
+    run in-process, one after another.
+
+    Args:
+        reader: Binary stream of request lines
+        writer: Binary stream for response lines
+        pool: Warmed-up pool to fork workers from
+    """
+    standby = _PipeWorker(pool) if hasattr(os, "fork") else None
+    try:
+        for line in reader:
+            if not line.strip():
+                continue
+            request, response = decode_request(line)
+            if request is not None and standby is None:
+                response = execute(request)
+            elif request is not None:
+                worker, standby = standby, None
+                worker.send(request)
+                standby = _PipeWorker(pool)  # forked while the request runs
+                response = worker.result()
+            writer.write(encode_message(response))
+            writer.flush()
+    finally:
+        if standby is not None:
+            standby.discard()
+
+
+class SessionServer:
+    """
+    Unix socket server backed by pre-forked, warmed-up workers.
+
+    Each worker accepts one connection, answers its single request and
+    exits; the server replaces it straight away. Up to ``workers`` scripts
+    run concurrently.
+
+    Example:
+        >>> server = SessionServer("/tmp/eigen.sock")
+        >>> server.serve_forever()
+    """
+
+    def __init__(self, path: str, workers: int = 4):
+        self.path = path
+        self.workers = max(1, workers)
+        self.pool = ScriptPool()
+        self._pids: List[int] = []
+
+        _remove_stale_socket(path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)  # only the owner may connect
+        try:
+            self.listener.bind(path)
+        finally:
+            os.umask(old_umask)
+        self.listener.listen(128)
+
+    def serve_forever(self) -> None:
+        """Warm up, start the workers and keep the pool full until stopped."""
+        previous = signal.signal(signal.SIGTERM, _interrupt)
+        try:
+            self.pool.warm_up()
+            for _ in range(self.workers):
+                self._spawn()
+            while True:
+                pid, _ = os.wait()
+                if pid in self._pids:
+                    self._pids.remove(pid)
+                    self._spawn()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            self.close()
+
+    def close(self) -> None:
+        """Stop the workers and remove the socket."""
+        for pid in self._pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        self._pids.clear()
+        self.listener.close()
+        self.pool.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def _spawn(self) -> None:
+        self._pids.append(self.pool.fork_worker(self._serve_one))
+
+    def _serve_one(self) -> None:
+        conn, _ = self.listener.accept()
+        self.listener.close()
+        with conn, conn.makefile("rb") as reader, conn.makefile("wb") as writer:
+            request, response = decode_request(reader.readline())
+            if request is not None:
+                response = execute(request)
+            writer.write(encode_message(response))
+
+
+def _interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket file left behind by a server that is no longer running."""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"An EigenScript server is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def serve(path: Optional[str] = None, workers: int = 4) -> int:
+    """
+    Run the session server until interrupted.
+
+    Args:
+        path: Unix socket path, ``"-"`` to serve requests from stdin and
+              answer on stdout, or None for ``default_socket_path()``
+        workers: Number of scripts that can run at once on a socket
+
+    Returns:
+        Exit code
+    """
+    if path == "-":
+        pool = ScriptPool()
+        pool.warm_up()
+        try:
+            serve_stream(sys.stdin.buffer, sys.stdout.buffer, pool)
+        finally:
+            pool.close()
+        return 0
+
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        print("Error: Unix sockets are not available; use --serve -", file=sys.stderr)
+        return 1
+
+    path = path or default_socket_path()
+    try:
+        server = SessionServer(path, workers=workers)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"EigenScript server listening on {path}", file=sys.stderr)
+    server.serve_forever()
+    return 0
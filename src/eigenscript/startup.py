@@ -0,0 +1,145 @@
+"""
+Startup profiling for the EigenScript CLI.
+
+Records how long each module takes to import while a command runs, in the
+spirit of ``python -X importtime``, and formats a short report. Used by
+``python -m eigenscript --startup-report``.
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass
+class ImportRecord:
+    """Timing of one module import."""
+
+    name: str
+    self_time: float  # seconds spent in the module itself
+    cumulative_time: float  # seconds including its own imports
+    depth: int  # nesting level (0 = imported directly)
+
+
+class _TimedLoader:
+    """Loader proxy that times ``exec_module`` and delegates everything else."""
+
+    def __init__(self, loader, timer: "ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        timer = self._timer
+        timer._child_times.append(0.0)
+        depth = len(timer._child_times) - 1
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = timer._child_times.pop()
+            if timer._child_times:
+                timer._child_times[-1] += elapsed
+            timer.records.append(
+                ImportRecord(module.__name__, elapsed - children, elapsed, depth)
+            )
+
+
+class ImportTimer:
+    """
+    Measures module imports performed while installed.
+
+    Example:
+        >>> timer = ImportTimer()
+        >>> timer.install()
+        >>> import json
+        >>> timer.uninstall()
+        >>> print(timer.format_report())
+    """
+
+    def __init__(self):
+        self.records: List[ImportRecord] = []
+        self.started: Optional[float] = None
+        self.stopped: Optional[float] = None
+        self._child_times: List[float] = []
+
+    def install(self) -> None:
+        """Start timing imports (and the overall run)."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        self.started = time.perf_counter()
+
+    def uninstall(self) -> None:
+        """Stop timing imports."""
+        self.stopped = time.perf_counter()
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        """Find a module with the other finders and wrap its loader."""
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    @property
+    def import_time(self) -> float:
+        """Total seconds spent in top-level imports."""
+        return sum(r.cumulative_time for r in self.records if r.depth == 0)
+
+    def format_report(self, limit: int = 15) -> str:
+        """
+        Format the recorded timings.
+
+        Args:
+            limit: Number of slowest imports to list
+
+        Returns:
+            Multi-line report
+        """
+        end = self.stopped if self.stopped is not None else time.perf_counter()
+        total = end - self.started if self.started is not None else 0.0
+        imports = self.import_time
+
+        lines = [
+            "=" * 60,
+            "Startup Report",
+            "=" * 60,
+            f"Total:   {total * 1000:8.1f} ms",
+            f"Imports: {imports * 1000:8.1f} ms ({len(self.records)} modules)",
+            f"Other:   {(total - imports) * 1000:8.1f} ms",
+        ]
+
+        if self.records:
+            lines.append("")
+            lines.append("    self [ms] | cumulative [ms] | module")
+            slowest = sorted(
+                self.records, key=lambda r: r.cumulative_time, reverse=True
+            )[:limit]
+            for record in slowest:
+                lines.append(
+                    f"    {record.self_time * 1000:9.2f} | "
+                    f"{record.cumulative_time * 1000:15.2f} | "
+                    f"{'  ' * record.depth}{record.name}"
+                )
+
+        lines.append("=" * 60)
+        return "\n".join(lines)
@@ -1,3 +1,34 @@
 """
 Tests for EigenScript LLVM compiler.
 """
+
+from eigenscript.lexer import Tokenizer
+from eigenscript.parser.ast_builder import Parser
+
+
+def parse(source: str):
+    """The statements of a program."""
+    return Parser(Tokenizer(source).tokenize()).parse().statements
+
+
+def generate(source: str, **codegen_kwargs) -> str:
+    """
+    Compile a program to verified LLVM IR, with the observer analysis's
+    results passed to the code generator as compile.py passes them.
+    """
+    from llvmlite import binding as llvm
+    from eigenscript.compiler.analysis.observer import ObserverAnalyzer
+    from eigenscript.compiler.codegen.llvm_backend import LLVMCodeGenerator
+
+    statements = parse(source)
+    analyzer = ObserverAnalyzer()
+    codegen_kwargs = {
+        "observed_variables": analyzer.analyze(statements),
+        "scalar_functions": analyzer.scalar_functions,
+        "list_functions": analyzer.list_functions,
+        "history_depth": analyzer.history_depth,
+        **codegen_kwargs,
+    }
+    llvm_ir = LLVMCodeGenerator(**codegen_kwargs).compile(statements)
+    llvm.parse_assembly(llvm_ir).verify()
+    return llvm_ir
@@ -0,0 +1,100 @@
+"""
+Shared fixtures for the compiler tests.
+
+The C runtime is built into a shared library once per session. Tests load
+it with ctypes, and the JIT links it when the runtime bitcode has not been
+built.
+"""
+
+import ctypes
+import os
+import shutil
+import subprocess
+
+import pytest
+
+try:
+    from eigenscript.compiler.codegen import jit
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+RUNTIME_SOURCE = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "src",
+    "eigenscript",
+    "compiler",
+    "runtime",
+    "eigenvalue.c",
+)
+
+
+@pytest.fixture(scope="session")
+def runtime_library(tmp_path_factory) -> str:
+    """Path of the C runtime built as a shared library."""
+    cc = shutil.which("cc") or shutil.which("gcc") or shutil.which("clang")
+    if cc is None:
+        pytest.skip("No C compiler available")
+    library = str(tmp_path_factory.mktemp("runtime") / "libeigenvalue.so")
+    subprocess.run(
+        [cc, "-shared", "-fPIC", "-O2", RUNTIME_SOURCE, "-o", library, "-lm"],
+        check=True,
+    )
+    return library
+
+
+@pytest.fixture(scope="session")
+def lib(runtime_library):
+    """The C runtime, loaded with ctypes."""
+    lib = ctypes.CDLL(runtime_library)
+    lib.eigen_create.restype = ctypes.c_void_p
+    lib.eigen_create.argtypes = [ctypes.c_double, ctypes.c_int32]
+    lib.eigen_update.argtypes = [ctypes.c_void_p, ctypes.c_double]
+    lib.eigen_get_value.restype = ctypes.c_double
+    lib.eigen_get_value.argtypes = [ctypes.c_void_p]
+    lib.eigen_destroy.argtypes = [ctypes.c_void_p]
+    for name in ("converged", "oscillating", "diverging", "improving"):
+        predicate = getattr(lib, f"eigen_check_{name}")
+        predicate.restype = ctypes.c_bool
+        predicate.argtypes = [ctypes.c_void_p]
+    lib.eigen_list_create.restype = ctypes.c_void_p
+    lib.eigen_list_create.argtypes = [ctypes.c_int64]
+    lib.eigen_list_append.argtypes = [ctypes.c_void_p, ctypes.c_double]
+    lib.eigen_list_get.restype = ctypes.c_double
+    lib.eigen_list_get.argtypes = [ctypes.c_void_p, ctypes.c_int64]
+    lib.eigen_list_destroy.argtypes = [ctypes.c_void_p]
+    lib.eigen_arena_alloc.restype = ctypes.c_void_p
+    lib.eigen_arena_alloc.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+    lib.eigen_arena_enter.argtypes = [ctypes.c_void_p]
+    lib.eigen_arena_exit.argtypes = [ctypes.c_void_p]
+    return lib
+
+
+@pytest.fixture(scope="session")
+def runtime(request):
+    """Let the JIT link the runtime: its bitcode, or else the shared library."""
+    if not COMPILER_AVAILABLE:
+        pytest.skip("Compiler dependencies not installed")
+    if jit.find_runtime_bitcode() is not None:
+        yield
+        return
+    patch = pytest.MonkeyPatch()
+    patch.setenv(jit.RUNTIME_LIBRARY_ENV, request.getfixturevalue("runtime_library"))
+    yield
+    patch.undo()
+
+
+@pytest.fixture
+def run(runtime, tmp_path, capfd):
+    """Run programs with the JIT; each call returns the lines it printed."""
+
+    def run(source: str) -> list:
+        path = tmp_path / "program.eigs"
+        path.write_text(source)
+        assert jit.run_jit(str(path)) == 0
+        return capfd.readouterr().out.splitlines()
+
+    return run
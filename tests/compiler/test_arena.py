@@ -0,0 +1,234 @@
+"""
+Tests for arena allocation in compiled code: functions that create runtime
+objects allocate them in a per-call arena that is freed when they return,
+and loop iterations whose objects are not used later get their own arena.
+"""
+
+import ctypes
+import re
+
+import pytest
+
+from tests.compiler import generate, parse
+
+try:
+    from llvmlite import binding as llvm
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+
+FUNCTIONS = """
+define fib as:
+    if n < 2:
+        return n
+    return (fib of (n - 1)) + (fib of (n - 2))
+
+define spread as:
+    row is [x * n for x in range of 4]
+    if n > 2:
+        return row[3]
+    return row[1]
+
+define add as:
+    return n[0] + n[1]
+"""
+
+
+def module_of(source: str, **codegen_kwargs) -> llvm.ModuleRef:
+    return llvm.parse_assembly(generate(source, **codegen_kwargs))
+
+
+def calls(function) -> list:
+    return re.findall(r'call [^@]*@"?([\w.]+)', str(function))
+
+
+class TestGeneratedCode:
+    def test_functions_without_objects_have_no_arena(self):
+        module = module_of(FUNCTIONS + "print of fib of 10\n")
+        for name in ("fib", "add", "main"):
+            assert "eigen_arena_enter" not in calls(module.get_function(name))
+
+    def test_arena_exited_before_every_return(self):
+        spread = str(module_of(FUNCTIONS).get_function("spread"))
+        assert calls(spread).count("eigen_arena_enter") == 1
+        returns = spread.count("\n  ret ")
+        assert returns == 2
+        assert len(re.findall(r"eigen_arena_exit[^\n]*\n  ret ", spread)) == returns
+
+    def test_library_init_has_no_arena(self):
+        module = module_of("xs is [1, 2]\n", module_name="shapes")
+        assert "eigen_arena_enter" not in calls(module.get_function("shapes_init"))
+
+    def test_iteration_arena_exited_on_every_exit(self):
+        source = (
+            "i is 0\n"
+            "loop while i < 10:\n"
+            "    xs is [i, i]\n"
+            "    loop while i < 5:\n"
+            "        ys is [i]\n"
+            "        break\n"
+            "    i is i + xs[0] + 1\n"
+        )
+        main = str(module_of(source).get_function("main"))
+        assert calls(main).count("eigen_arena_enter") == 3
+        bodies = re.findall(r"\nloop\.body[.\d]*:[^\n]*\n([^\n]*)", main)
+        assert len(bodies) == 2
+        assert all("eigen_arena_enter" in line for line in bodies)
+        # Each back edge and the break leave their iteration's arena
+        exits = re.findall(r"eigen_arena_exit[^\n]*\n  br label %([\w.]+)", main)
+        assert sorted(exits) == ["loop.cond", "loop.end.1"]
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            # Read after the loop
+            "i is 0\nloop while i < 3:\n    xs is [i]\n    i is i + 1\nprint of xs[0]\n",
+            # Read by the next iteration before it is assigned
+            "i is 0\nxs is [0]\nloop while i < 3:\n"
+            "    i is i + xs[0]\n    xs is [1]\n",
+            # Read by the condition
+            "xs is [0]\nloop while xs[0] < 3:\n    xs is [xs[0] + 1]\n",
+        ],
+    )
+    def test_objects_used_after_iteration_stay(self, source):
+        main = module_of(source).get_function("main")
+        assert calls(main).count("eigen_arena_enter") == 1
+
+    def test_compiles_node_arena(self):
+        """An ASTArena compiles to the same IR as its statement list."""
+        from eigenscript.compiler.analysis.observer import ObserverAnalyzer
+        from eigenscript.compiler.codegen.llvm_backend import LLVMCodeGenerator
+        from eigenscript.parser import ASTArena
+
+        source = FUNCTIONS + (
+            "i is 0\nloop while i < 3:\n    xs is [i]\n    i is i + xs[0] + 1\n"
+        )
+        statements = parse(source)
+        analyzer = ObserverAnalyzer()
+        observed = analyzer.analyze(statements)
+
+        def compile(nodes):
+            return LLVMCodeGenerator(
+                observed_variables=observed,
+                scalar_functions=analyzer.scalar_functions,
+                list_functions=analyzer.list_functions,
+            ).compile(nodes)
+
+        llvm_ir = compile(ASTArena.from_statements(statements))
+        assert llvm_ir == compile(statements)
+        assert (
+            calls(llvm.parse_assembly(llvm_ir).get_function("main")).count(
+                "eigen_arena_enter"
+            )
+            == 2
+        )
+
+
+def new_arena():
+    return ctypes.create_string_buffer(2 * ctypes.sizeof(ctypes.c_void_p))
+
+
+def list_arena(lst) -> int:
+    """The arena field of an EigenList."""
+    return ctypes.cast(lst, ctypes.POINTER(ctypes.c_void_p))[3] or 0
+
+
+class TestRuntime:
+    def test_alloc_is_aligned(self, lib):
+        arena = new_arena()
+        lib.eigen_arena_enter(arena)
+        for size in (1, 3, 24, 2000, 100000, 7):
+            address = lib.eigen_arena_alloc(arena, size)
+            assert address % 16 == 0
+            ctypes.memset(address, 0xAB, size)
+        lib.eigen_arena_exit(arena)
+
+    def test_nested_arenas(self, lib):
+        outer, inner = new_arena(), new_arena()
+        lib.eigen_arena_enter(outer)
+        assert list_arena(lib.eigen_list_create(1)) == ctypes.addressof(outer)
+        lib.eigen_arena_enter(inner)
+        assert list_arena(lib.eigen_list_create(1)) == ctypes.addressof(inner)
+        lib.eigen_arena_exit(inner)
+        assert list_arena(lib.eigen_list_create(1)) == ctypes.addressof(outer)
+        lib.eigen_arena_exit(outer)
+
+        lst = lib.eigen_list_create(1)
+        assert list_arena(lst) == 0
+        lib.eigen_list_destroy(lst)
+
+    def test_list_grown_in_inner_arena_survives(self, lib):
+        outer, inner = new_arena(), new_arena()
+        lib.eigen_arena_enter(outer)
+        lst = lib.eigen_list_create(0)
+        lib.eigen_arena_enter(inner)
+        for i in range(1000):
+            lib.eigen_list_append(lst, float(i))
+        lib.eigen_arena_exit(inner)
+        # Reusing the inner arena's blocks must not clobber the list
+        lib.eigen_arena_enter(inner)
+        for _ in range(100):
+            ctypes.memset(lib.eigen_arena_alloc(inner, 512), 0, 512)
+        lib.eigen_arena_exit(inner)
+        assert [lib.eigen_list_get(lst, i) for i in (0, 500, 999)] == [
+            0.0,
+            500.0,
+            999.0,
+        ]
+        lib.eigen_arena_exit(outer)
+
+
+class TestPrograms:
+    def test_objects_created_in_calls(self, run):
+        source = FUNCTIONS + (
+            "xs is []\n"
+            "i is 0\n"
+            "j is 0\n"
+            "total is 0\n"
+            "loop while i < 2000:\n"
+            "    total is total + (spread of j)\n"
+            "    append of [xs, i]\n"
+            "    i is i + 1\n"
+            "    j is j + 1\n"
+            "    if j > 4:\n"
+            "        j is 0\n"
+            "print of total\n"
+            "print of len of xs\n"
+            "print of xs[1999]\n"
+            "print of reduce of [add, xs, 0]\n"
+        )
+        values = [float(line) for line in run(source)]
+        # Per 5 iterations: 0 + 1 + 2 + 9 + 12
+        assert values == [400 * 24, 2000, 1999, 1999 * 2000 / 2]
+
+    def test_objects_created_in_loops(self, run):
+        source = (
+            "define first_over as:\n"
+            "    i is 0\n"
+            "    loop while i < 100:\n"
+            "        row is [x * i for x in range of 3]\n"
+            "        if row[2] > n:\n"
+            "            return i\n"
+            "        i is i + 1\n"
+            "    return -1\n"
+            "\n"
+            "xs is []\n"
+            "i is 0\n"
+            "total is 0\n"
+            "loop while i < 50000:\n"
+            "    pair is [i, first_over of 7]\n"
+            '    word is "ab" + "c"\n'
+            "    total is total + pair[1] + (len of word)\n"
+            "    append of [xs, pair[0]]\n"
+            "    i is i + 1\n"
+            "print of total\n"
+            "print of xs[40000]\n"
+        )
+        values = [float(line) for line in run(source)]
+        # first_over of 7 is 4, and len of "abc" is 3
+        assert values == [50000 * 7, 40000]
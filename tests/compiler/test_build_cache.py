@@ -0,0 +1,192 @@
+"""
+Tests for the build cache of compiled modules
+(eigenscript.compiler.cli.build_cache) and its use by compile_module.
+"""
+
+import glob
+import os
+import re
+
+import pytest
+
+try:
+    from eigenscript.compiler.analysis.resolver import ModuleResolver
+    from eigenscript.compiler.cli import build_cache
+    from eigenscript.compiler.cli.compile import compile_module
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """main imports shapes and util; shapes imports geo."""
+    monkeypatch.delenv("EIGEN_CACHE_DIR", raising=False)
+    (tmp_path / "geo.eigs").write_text("pi is 3\n")
+    (tmp_path / "util.eigs").write_text("define twice as:\n    return n * 2\n")
+    (tmp_path / "shapes.eigs").write_text("import geo\nsides is 4\n")
+    (tmp_path / "main.eigs").write_text(
+        "import shapes\nimport util\nx is 5\nprint of x\n"
+    )
+    return tmp_path
+
+
+def build(project, capsys, **kwargs):
+    """Compile main.eigs; return the names of the modules actually compiled."""
+    symbols = {}
+    obj_path = compile_module(
+        str(project / "main.eigs"),
+        ModuleResolver(root_dir=str(project)),
+        set(),
+        is_main=True,
+        jobs=1,
+        symbols=symbols,
+        **kwargs,
+    )
+    assert obj_path == str(project / "main.o")
+    compiled = re.findall(r"Compiling module: .*?(\w+)\.eigs", capsys.readouterr().out)
+    return sorted(compiled), symbols
+
+
+class TestBuildCache:
+    """Unchanged modules are taken from the cache."""
+
+    def test_rebuild_compiles_nothing(self, project, capsys):
+        first, _ = build(project, capsys)
+        assert first == ["geo", "main", "shapes", "util"]
+        objects = {name: (project / name).read_bytes() for name in ("main.o", "geo.o")}
+
+        second, symbols = build(project, capsys)
+        assert second == []
+        for name, data in objects.items():
+            assert (project / name).read_bytes() == data
+        # Hits still report what each module exports
+        assert "main" in symbols[str(project / "main.eigs")]
+        assert symbols[str(project / "geo.eigs")] == ["geo_init"]
+        assert set(symbols[str(project / "util.eigs")]) == {"util_init", "util_twice"}
+
+    def test_edit_rebuilds_importers_only(self, project, capsys):
+        build(project, capsys)
+        (project / "geo.eigs").write_text("pi is 4\n")
+        assert build(project, capsys)[0] == ["geo", "main", "shapes"]
+
+        (project / "main.eigs").write_text("import shapes\nimport util\nprint of 1\n")
+        assert build(project, capsys)[0] == ["main"]
+
+    def test_configuration_is_part_of_key(self, project, capsys):
+        build(project, capsys)
+        assert len(build(project, capsys, opt_level=2)[0]) == 4
+        assert build(project, capsys, opt_level=2)[0] == []
+
+    def test_missing_object_restored(self, project, capsys):
+        build(project, capsys)
+        os.remove(project / "geo.o")
+        assert build(project, capsys)[0] == []
+        assert (project / "geo.o").exists()
+
+    def test_disabled(self, project, capsys):
+        build(project, capsys)
+        assert len(build(project, capsys, use_cache=False)[0]) == 4
+
+    def test_corrupt_entry_is_a_miss(self, project, capsys):
+        build(project, capsys)
+        for entry in glob.glob(str(project / "__eigscache__" / "util.*.eigso")):
+            with open(entry, "wb") as f:
+                f.write(b"EIGO")
+        assert build(project, capsys)[0] == ["util"]
+
+    def test_profile_is_part_of_key(self, project, tmp_path, capsys):
+        build(project, capsys)
+        profile = str(tmp_path / "main.eigprof")
+        assert len(build(project, capsys, profile_generate=profile)[0]) == 4
+        assert build(project, capsys, profile_generate=profile)[0] == []
+        assert build(project, capsys)[0] == []
+
+    def test_shared_cache_dir(self, project, tmp_path_factory, monkeypatch, capsys):
+        cache_dir = tmp_path_factory.mktemp("cache")
+        monkeypatch.setenv("EIGEN_CACHE_DIR", str(cache_dir))
+        build(project, capsys)
+        assert len(glob.glob(str(cache_dir / "*.eigso"))) == 4
+        assert not glob.glob(str(project / "__eigscache__" / "*.eigso"))
+
+
+class TestModuleKey:
+    def key(self, **overrides):
+        args = dict(
+            source="x is 1\n",
+            module_name="geo",
+            target_triple=None,
+            opt_level=0,
+            dependency_keys=[],
+        )
+        args.update(overrides)
+        return build_cache.module_key(**args)
+
+    def test_stable(self):
+        assert self.key() == self.key()
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"source": "x is 2\n"},
+            {"module_name": None},
+            {"module_name": "shapes"},
+            {"target_triple": "wasm32-unknown-unknown"},
+            {"opt_level": 2},
+            {"dependency_keys": ["0" * 64]},
+            {"profile": "generate:"},
+        ],
+    )
+    def test_inputs_change_key(self, change):
+        assert self.key(**change) != self.key()
+
+    def test_round_trip(self, tmp_path):
+        source = str(tmp_path / "geo.eigs")
+        assert build_cache.load_cached_module(source, "k") is None
+        assert build_cache.store_cached_module(source, "k", ["geo_init"], b"\x7fELF")
+        cached = build_cache.load_cached_module(source, "k")
+        assert cached.symbols == ["geo_init"]
+        assert cached.object_code == b"\x7fELF"
+
+    def test_least_recently_used_entries_removed(self, tmp_path):
+        source = str(tmp_path / "geo.eigs")
+        other = str(tmp_path / "geo.v2.eigs")
+        build_cache.store_cached_module(other, "k0", ["geo_v2_init"], b"\x7fELF")
+        limit = build_cache.MAX_ENTRIES_PER_MODULE
+        for i in range(limit + 2):
+            key = f"k{i}"
+            build_cache.store_cached_module(source, key, ["geo_init"], b"\x7fELF")
+            # Distinct ages, oldest first
+            os.utime(build_cache.entry_path_for(source, key), ns=(i, i))
+            if i == 0:
+                # Used again since: kept
+                build_cache.load_cached_module(source, key)
+
+        def cached(path, key):
+            return build_cache.load_cached_module(path, key) is not None
+
+        kept = [f"k{i}" for i in range(limit + 2) if cached(source, f"k{i}")]
+        assert kept == ["k0"] + [f"k{i}" for i in range(3, limit + 2)]
+        assert cached(other, "k0")
+
+    def test_same_file_name_in_shared_dir(self, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        first = str(tmp_path / "a" / "utils.eigs")
+        second = str(tmp_path / "b" / "utils.eigs")
+        for i in range(build_cache.MAX_ENTRIES_PER_MODULE):
+            key = f"k{i}"
+            build_cache.store_cached_module(first, key, ["utils_init"], b"a", cache_dir)
+            build_cache.store_cached_module(
+                second, key, ["utils_init"], b"b", cache_dir
+            )
+        for i in range(build_cache.MAX_ENTRIES_PER_MODULE):
+            key = f"k{i}"
+            cached = build_cache.load_cached_module(first, key, cache_dir)
+            assert cached.object_code == b"a"
+            cached = build_cache.load_cached_module(second, key, cache_dir)
+            assert cached.object_code == b"b"
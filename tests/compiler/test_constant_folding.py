@@ -0,0 +1,216 @@
+"""
+Tests for the constant folding and dead-branch elimination pass.
+"""
+
+import pytest
+from eigenscript.builtins import decode_vector
+from eigenscript.compiler.analysis import ConstantFolder
+from eigenscript.evaluator import Interpreter
+from eigenscript.lexer import Tokenizer
+from eigenscript.parser.ast_builder import (
+    BinaryOp,
+    Break,
+    Conditional,
+    Literal,
+    Parser,
+    Program,
+)
+
+
+def parse(source: str) -> Program:
+    return Parser(Tokenizer(source).tokenize()).parse()
+
+
+def first_expression(program: Program):
+    return program.statements[0].expression
+
+
+class TestInterpreterFolding:
+    """Folds that are exact for the interpreter's LRVM embeddings."""
+
+    def test_comparison_folds(self):
+        """Comparisons of number literals become 0/1 literals."""
+        program = ConstantFolder().fold(parse("x is 3 > 2"))
+        expr = first_expression(program)
+        assert isinstance(expr, Literal)
+        assert expr.value == 1
+
+    def test_string_concatenation_folds(self):
+        """Concatenating string literals produces one literal."""
+        program = ConstantFolder().fold(parse('x is "ab" + "cd" + "e"'))
+        assert first_expression(program) == Literal("abcde", "string")
+
+    def test_modulo_and_logic_fold(self):
+        """Modulo and boolean operators on literals fold."""
+        program = ConstantFolder().fold(parse("x is 7 % 4\ny is not 0 and 1"))
+        assert first_expression(program).value == 3
+        assert program.statements[1].expression.value == 1
+
+    def test_short_circuit_with_unknown_right(self):
+        """A constant left side decides and/or without the right side."""
+        program = ConstantFolder().fold(parse("x is 0 and y\nz is 1 or y"))
+        assert first_expression(program).value == 0
+        assert program.statements[1].expression.value == 1
+
+    def test_arithmetic_not_folded(self):
+        """Embedding arithmetic is not scalar arithmetic, so it is kept."""
+        program = ConstantFolder().fold(parse("x is 2 * 3 + 1"))
+        assert isinstance(first_expression(program), BinaryOp)
+
+    def test_folded_span(self):
+        """Folded literals keep the span of the expression they replace."""
+        source = "x is 3 > 2"
+        expr = first_expression(ConstantFolder().fold(parse(source)))
+        assert source[expr.span_start : expr.span_end] == "3 > 2"
+
+    def test_input_not_modified(self):
+        """Folding returns new nodes and leaves the input alone."""
+        program = parse("x is 1 < 2\ny is z")
+        folded = ConstantFolder().fold(program)
+        assert isinstance(first_expression(program), BinaryOp)
+        assert folded.statements[1] is program.statements[1]
+
+    def test_unchanged_program_is_shared(self):
+        """A program with nothing to fold is returned as is."""
+        program = parse("x is y + 1")
+        assert ConstantFolder().fold(program) is program
+
+
+class TestDeadBranches:
+    """Tests for removing unreachable code."""
+
+    def test_nested_false_branch_spliced(self):
+        """Inside a block, a taken else branch replaces the conditional."""
+        program = parse(
+            "loop while x < 3:\n"
+            "    if 1 > 2:\n"
+            "        y is 1\n"
+            "    else:\n"
+            "        y is 2\n"
+            "    x is x + 1\n"
+        )
+        folder = ConstantFolder()
+        loop = folder.fold(program).statements[0]
+        assert [s.identifier for s in loop.body] == ["y", "x"]
+        assert folder.eliminated == 1
+
+    def test_top_level_keeps_statement_value(self):
+        """At the top level a dead if becomes null to keep its value."""
+        program = ConstantFolder().fold(parse("if 0:\n    y is 1\nz is 2"))
+        assert program.statements[0] == Literal(None, "null")
+
+    def test_top_level_taken_branch_wrapped(self):
+        """A taken branch at the top level stays a single statement."""
+        program = ConstantFolder().fold(
+            parse("if 2 > 1:\n    y is 1\nelse:\n    y is 2")
+        )
+        stmt = program.statements[0]
+        assert isinstance(stmt, Conditional)
+        assert stmt.else_block is None
+        assert stmt.if_block[0].expression.value == 1
+
+    def test_false_loop_removed(self):
+        """A loop whose condition is constantly false disappears."""
+        program = parse("loop while 1 > 2:\n    x is 1\ny is 2")
+        folded = ConstantFolder(preserve_values=False).fold(program)
+        assert len(folded.statements) == 1
+        assert folded.statements[0].identifier == "y"
+
+    def test_code_after_break_dropped(self):
+        """Statements after a spliced break cannot run."""
+        program = parse(
+            "loop while x < 3:\n" "    if 1:\n" "        break\n" "    x is x + 1\n"
+        )
+        loop = ConstantFolder().fold(program).statements[0]
+        assert len(loop.body) == 1
+        assert isinstance(loop.body[0], Break)
+
+    def test_hoisted_literals(self):
+        """Literals in loops and functions are reported for hoisting."""
+        program = parse(
+            "a is 100\n"
+            "loop while i < 10:\n"
+            "    i is i + 1\n"
+            "define f as:\n"
+            '    return "s"\n'
+        )
+        folder = ConstantFolder()
+        folder.fold(program)
+        assert folder.hoisted_literals == {
+            ("number", 10),
+            ("number", 1),
+            ("string", "s"),
+        }
+
+
+class TestScalarFolding:
+    """Folds for the LLVM backend, where numbers are doubles."""
+
+    def test_arithmetic_folds(self):
+        """All literal arithmetic folds with double semantics."""
+        folder = ConstantFolder(scalar_arithmetic=True, preserve_values=False)
+        (stmt,) = folder.fold_statements(parse("x is 2 * 3 + 1").statements)
+        assert stmt.expression == Literal(7.0, "number")
+
+    def test_division_by_zero_kept(self):
+        """Division by a zero literal is left for the runtime."""
+        folder = ConstantFolder(scalar_arithmetic=True)
+        (stmt,) = folder.fold_statements(parse("x is 1 / 0").statements)
+        assert isinstance(stmt.expression, BinaryOp)
+
+    def test_top_level_branch_spliced(self):
+        """Without value preservation, taken branches are spliced."""
+        folder = ConstantFolder(scalar_arithmetic=True, preserve_values=False)
+        statements = folder.fold_statements(
+            parse("if 1 = 1:\n    x is 1\n    y is 2\nz is 3").statements
+        )
+        assert [s.identifier for s in statements] == ["x", "y", "z"]
+
+
+class TestEngines:
+    """Both engines run the pass before executing a program."""
+
+    def run(self, source: str, fold: bool):
+        interp = Interpreter(fold_constants=fold)
+        result = interp.evaluate(parse(source))
+        return interp, result
+
+    def test_interpreter_results_unchanged(self):
+        """Folding must not change what a program computes."""
+        source = (
+            "a is 2 + 3 = 5\n"
+            'b is "x" + "y"\n'
+            "if 0:\n"
+            "    c is 1\n"
+            "total is 0\n"
+            "i is 0\n"
+            "loop while i < 5:\n"
+            "    if 3 > 2:\n"
+            "        total is total + 2\n"
+            "    i is i + 1\n"
+        )
+        folded, folded_result = self.run(source, fold=True)
+        plain, plain_result = self.run(source, fold=False)
+        for name in ("a", "b", "total"):
+            assert decode_vector(
+                folded.environment.lookup(name), folded.space
+            ) == decode_vector(plain.environment.lookup(name), plain.space)
+        assert folded_result.coords.tolist() == plain_result.coords.tolist()
+        assert len(folded.fs_tracker.trajectory) == len(plain.fs_tracker.trajectory)
+
+    def test_interpreter_skips_dead_branch(self):
+        """Unreachable branches are not evaluated."""
+        interp, _ = self.run("if 1 > 2:\n    x is undefined_name\ny is 1", fold=True)
+        assert decode_vector(interp.environment.lookup("y"), interp.space) == 1
+
+    def test_codegen_folds_arithmetic(self):
+        """The LLVM backend emits the folded constant."""
+        llvm = pytest.importorskip("llvmlite.binding")
+        from eigenscript.compiler.codegen.llvm_backend import LLVMCodeGenerator
+
+        module_ir = LLVMCodeGenerator().compile(parse("x is 2 * 3 + 1").statements)
+        # The inline runtime definitions do arithmetic of their own
+        llvm_ir = str(llvm.parse_assembly(module_ir).get_function("main"))
+        assert "fmul" not in llvm_ir
+        assert "fadd" not in llvm_ir
+        assert "7.0" in llvm_ir or "0x401c000000000000" in llvm_ir
@@ -0,0 +1,182 @@
+"""
+Tests for the configurable EigenValue history window: the depth the
+ObserverAnalyzer derives from the predicates a program uses, the struct
+layout the code generator emits for it, the runtime's handling of
+per-value history capacities and its incrementally maintained predicates.
+"""
+
+import random
+
+import pytest
+
+from eigenscript.compiler.analysis.observer import ObserverAnalyzer
+from tests.compiler import parse
+
+try:
+    from llvmlite import binding as llvm
+    from eigenscript.compiler.codegen.llvm_backend import (
+        MAX_HISTORY,
+        LLVMCodeGenerator,
+    )
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+
+def depth_of(source: str) -> int:
+    analyzer = ObserverAnalyzer()
+    analyzer.analyze(parse(source))
+    return analyzer.history_depth
+
+
+class TestHistoryDepth:
+    """The analyzer sizes history to the predicates in use."""
+
+    def test_no_predicates(self):
+        assert depth_of("x is 1\ny is why is x\n") == 1
+
+    @pytest.mark.parametrize(
+        "predicate, depth",
+        [("stable", 1), ("improving", 3), ("diverging", 5), ("converged", 6)],
+    )
+    def test_single_predicate(self, predicate, depth):
+        source = f"x is 1\nif {predicate}:\n    x is 2\n"
+        assert depth_of(source) == depth
+
+    def test_largest_window_wins(self):
+        source = (
+            "x is 1\nloop while not converged:\n    x is x / 2\n"
+            "if oscillating:\n    x is 0\n"
+        )
+        assert depth_of(source) == 10
+
+    def test_predicates_in_functions(self):
+        source = "define f as:\n    if diverging:\n        return 1\n    return n\n"
+        assert depth_of(source) == 5
+
+
+@pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+class TestStructLayout:
+    """The generated EigenValue type carries only the history in use."""
+
+    def eigen_value_size(self, source: str, **kwargs) -> int:
+        codegen = LLVMCodeGenerator(**kwargs)
+        module = llvm.parse_assembly(codegen.compile(parse(source)))
+        module.verify()
+        target_data = llvm.create_target_data(codegen.module.data_layout)
+        return codegen.eigen_value_type.get_abi_size(target_data)
+
+    def test_default_keeps_full_history(self):
+        size = self.eigen_value_size("x is 1")
+        assert size == 7 * 8 + 7 * 4 + 4 + MAX_HISTORY * 8
+
+    def test_depth_from_analysis(self):
+        statements = parse("x is 1\ng is why is x\nif converged:\n    x is 2\n")
+        analyzer = ObserverAnalyzer()
+        observed = analyzer.analyze(statements)
+        codegen = LLVMCodeGenerator(
+            observed_variables=observed, history_depth=analyzer.history_depth
+        )
+        llvm_ir = codegen.compile(statements)
+        assert "[6 x double]" in llvm_ir
+        assert "i32 6)" in llvm_ir  # capacity passed to the runtime
+
+    def test_small_values(self):
+        """Without predicates an EigenValue is about a tenth of the old size."""
+        assert self.eigen_value_size("x is 1", history_depth=1) == 96
+
+
+def track(lib, values, capacity):
+    ev = lib.eigen_create(values[0], capacity)
+    for value in values[1:]:
+        lib.eigen_update(ev, value)
+    return ev
+
+
+class TestRuntimeCapacity:
+    """Predicates behave the same for any capacity that covers their window."""
+
+    @pytest.mark.parametrize("capacity", [6, 100])
+    def test_converged(self, lib, capacity):
+        ev = track(lib, [100.0, 50.0] + [1.0] * 8, capacity)
+        assert lib.eigen_check_converged(ev)
+        assert lib.eigen_get_value(ev) == 1.0
+        lib.eigen_destroy(ev)
+
+    @pytest.mark.parametrize("capacity", [10, 100])
+    def test_oscillating(self, lib, capacity):
+        ev = track(lib, [1.0, -1.0] * 10, capacity)
+        assert lib.eigen_check_oscillating(ev)
+        lib.eigen_destroy(ev)
+
+    def test_ring_buffer_wraps(self, lib):
+        """A small history keeps the latest values once it is full."""
+        ev = track(lib, [float(i) for i in range(50)] + [7.0] * 6, 6)
+        assert lib.eigen_check_converged(ev)
+        lib.eigen_destroy(ev)
+
+    def test_window_larger_than_capacity(self, lib):
+        """Predicates keep their own state and do not read the history."""
+        ev = track(lib, [1.0] * 10, 3)
+        assert lib.eigen_check_converged(ev)
+        lib.eigen_destroy(ev)
+
+    def test_capacity_clamped(self, lib):
+        ev = track(lib, [1.0, -1.0] * 10, 0)
+        assert lib.eigen_check_oscillating(ev)
+        assert lib.eigen_get_value(ev) == -1.0
+        lib.eigen_destroy(ev)
+
+
+def scan_converged(values):
+    """The history scan eigen_check_converged used to do."""
+    if len(values) < 6:
+        return False
+    window = values[-6:]
+    deltas = [abs(b - a) for a, b in zip(window, window[1:])]
+    return max(deltas) < 1e-6
+
+
+def scan_oscillating(values):
+    """The history scan eigen_check_oscillating used to do."""
+    if len(values) < 6:
+        return False
+    window = values[-10:]
+    deltas = [b - a for a, b in zip(window, window[1:])]
+    flips = sum(1 for a, b in zip(deltas, deltas[1:]) if a * b < 0)
+    return flips >= 3
+
+
+class TestIncrementalPredicates:
+    """Running predicate state matches a scan over the recent values."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_history_scan(self, lib, seed):
+        rng = random.Random(seed)
+        values = [rng.choice([0.0, 1.0, -1.0, 2.5])]
+        ev = lib.eigen_create(values[0], 10)
+        for _ in range(300):
+            step = rng.choice([0.0, 0.0, 1e-9, 1.0, -1.0, -values[-1] * 2])
+            values.append(values[-1] + step)
+            lib.eigen_update(ev, values[-1])
+            assert lib.eigen_check_converged(ev) == scan_converged(values)
+            assert lib.eigen_check_oscillating(ev) == scan_oscillating(values)
+        lib.eigen_destroy(ev)
+
+    def test_diverging_on_growing_steps(self, lib):
+        """Four changes, each 20% larger than the one before."""
+        ev = track(lib, [0.0, 1.0, 3.0, 6.0], 1)
+        assert not lib.eigen_check_diverging(ev)
+        lib.eigen_update(ev, 10.0)
+        assert lib.eigen_check_diverging(ev)
+        lib.eigen_update(ev, 11.0)  # a smaller step ends the run
+        assert not lib.eigen_check_diverging(ev)
+        lib.eigen_destroy(ev)
+
+    def test_diverging_on_magnitude(self, lib):
+        ev = track(lib, [0.0, 1.0, 5000.0], 1)
+        assert lib.eigen_check_diverging(ev)
+        lib.eigen_destroy(ev)
@@ -0,0 +1,156 @@
+"""
+Tests for the runtime fast paths the LLVM backend emits as inline IR: they
+replace the C calls in generated code and behave exactly like the C
+runtime, which they fall back to for out-of-bounds list accesses.
+"""
+
+import ctypes
+import ctypes.util
+import random
+import re
+
+import pytest
+
+from tests.compiler import parse
+
+try:
+    from llvmlite import binding as llvm
+    from eigenscript.compiler.codegen.llvm_backend import LLVMCodeGenerator
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+
+LIST_LOOP = """
+xs is [1, 2, 3, 4, 5]
+i is 0
+total is 0
+loop while i < 5:
+    total is total + xs[i]
+    i is i + 1
+print of total
+"""
+
+HISTORY = 10
+
+
+def optimized_calls(source: str, observed, **kwargs) -> set:
+    """Functions main() still calls after -O2."""
+    codegen = LLVMCodeGenerator(observed_variables=observed, **kwargs)
+    module = llvm.parse_assembly(codegen.compile(parse(source)))
+    module.verify()
+    target_machine = llvm.Target.from_default_triple().create_target_machine()
+    pto = llvm.create_pipeline_tuning_options()
+    pto.speed_level = 2
+    pb = llvm.create_pass_builder(target_machine, pto)
+    pb.getModulePassManager().run(module, pb)
+    main = str(module.get_function("main"))
+    return set(re.findall(r'call [^@]*@"?([\w.]+)', main))
+
+
+class TestGeneratedCode:
+    """Hot operations no longer cross into the C runtime."""
+
+    def test_inline_definitions_are_internal(self):
+        codegen = LLVMCodeGenerator()
+        codegen.compile(parse("x is 1"))
+        for name in ("eigen_get_value", "eigen_update", "eigen_list_get"):
+            func = codegen.module.get_global(f"{name}.inline")
+            assert func.linkage == "internal"
+            assert "alwaysinline" in func.attributes
+
+    def test_update_and_read_are_inlined(self):
+        calls = optimized_calls(LIST_LOOP, {"total"})
+        assert "eigen_update" not in calls
+        assert "eigen_get_value" not in calls
+        assert "eigen_list_length" not in calls
+        assert not any(name.endswith(".inline") for name in calls)
+
+    def test_c_runtime_without_inlining(self):
+        calls = optimized_calls(LIST_LOOP, {"total"}, inline_runtime=False)
+        assert {"eigen_update", "eigen_get_value", "eigen_list_get"} <= calls
+
+
+@pytest.fixture(scope="module")
+def inline(runtime_library):
+    """The inline definitions, compiled and callable from Python."""
+    # Their out-of-bounds paths call into the C runtime
+    llvm.load_library_permanently(runtime_library)
+    libm = ctypes.util.find_library("m")
+    if libm:
+        llvm.load_library_permanently(libm)
+
+    codegen = LLVMCodeGenerator(history_depth=HISTORY)
+    module = llvm.parse_assembly(codegen.compile(parse("x is 1")))
+    names = {
+        "update": (None, ctypes.c_void_p, ctypes.c_double),
+        "get_value": (ctypes.c_double, ctypes.c_void_p),
+        "list_get": (ctypes.c_double, ctypes.c_void_p, ctypes.c_int64),
+        "list_set": (None, ctypes.c_void_p, ctypes.c_int64, ctypes.c_double),
+        "list_length": (ctypes.c_int64, ctypes.c_void_p),
+    }
+    for name in names:
+        module.get_function(f"eigen_{name}.inline").linkage = llvm.Linkage.external
+    target_machine = llvm.Target.from_default_triple().create_target_machine()
+    engine = llvm.create_mcjit_compiler(module, target_machine)
+    engine.finalize_object()
+    functions = {
+        name: ctypes.CFUNCTYPE(*signature)(
+            engine.get_function_address(f"eigen_{name}.inline")
+        )
+        for name, signature in names.items()
+    }
+    functions["engine"] = engine  # keeps the machine code alive
+    return functions
+
+
+def eigen_value_bytes(ev) -> bytes:
+    """The fields of an EigenValue, without the padding before the history."""
+    fields = 7 * 8 + 7 * 4
+    data = ctypes.string_at(ev, fields + 4 + HISTORY * 8)
+    return data[:fields] + data[fields + 4 :]
+
+
+class TestMatchesRuntime:
+    """The inline functions leave values exactly as the C runtime does."""
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_update(self, lib, inline, seed):
+        rng = random.Random(seed)
+        reference = lib.eigen_create(1.0, HISTORY)
+        tracked = lib.eigen_create(1.0, HISTORY)
+        value = 1.0
+        for _ in range(200):
+            value += rng.choice([0.0, 1e-9, 1.0, -1.0, -value * 2, value * 0.5])
+            lib.eigen_update(reference, value)
+            inline["update"](tracked, value)
+            assert eigen_value_bytes(tracked) == eigen_value_bytes(reference)
+            assert inline["get_value"](tracked) == value
+        lib.eigen_destroy(reference)
+        lib.eigen_destroy(tracked)
+
+    def test_null_values(self, inline):
+        inline["update"](None, 1.0)
+        assert inline["get_value"](None) == 0.0
+        assert inline["list_length"](None) == 0
+
+    def test_list_access(self, lib, inline):
+        lst = lib.eigen_list_create(3)
+        inline["list_set"](lst, 2, 4.5)
+        assert inline["list_get"](lst, 2) == 4.5
+        assert lib.eigen_list_get(lst, 2) == 4.5
+        assert inline["list_length"](lst) == 3
+        lib.eigen_list_destroy(lst)
+
+    @pytest.mark.parametrize("index", [-1, 3, 1 << 40])
+    def test_out_of_bounds_uses_runtime(self, lib, inline, capfd, index):
+        lst = lib.eigen_list_create(3)
+        inline["list_set"](lst, index, 1.0)
+        assert inline["list_get"](lst, index) == 0.0
+        err = capfd.readouterr().err
+        assert err.count("List index out of bounds") == 2
+        lib.eigen_list_destroy(lst)
@@ -0,0 +1,96 @@
+"""
+Tests for the in-process JIT (eigenscript.compiler.codegen.jit).
+"""
+
+import pytest
+
+try:
+    from eigenscript.compiler.codegen import jit
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+FIBONACCI = """
+define fib as:
+    if n < 2:
+        return n
+    else:
+        a is fib of (n - 1)
+        b is fib of (n - 2)
+        return a + b
+
+result is fib of 15
+print of result
+"""
+
+
+def write(directory, name, source):
+    path = directory / name
+    path.write_text(source)
+    return str(path)
+
+
+@pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+class TestJIT:
+    """Programs compiled and run in this process."""
+
+    @pytest.mark.parametrize("opt_level", [0, 2])
+    def test_runs_program(self, runtime, tmp_path, capfd, opt_level):
+        path = write(tmp_path, "fib.eigs", FIBONACCI)
+        assert jit.run_jit(path, opt_level=opt_level) == 0
+        assert float(capfd.readouterr().out.strip()) == 610
+
+    def test_program_is_reusable(self, runtime, tmp_path, capfd):
+        """A loaded program can be run again without recompiling."""
+        program = jit.jit_compile(write(tmp_path, "fib.eigs", FIBONACCI))
+        assert program.run() == 0
+        assert program.run() == 0
+        assert capfd.readouterr().out.split() == ["610.000000"] * 2
+
+    def test_scalar_and_eigenvalue_parameters(self, run):
+        """double(double) functions and EigenValue* functions call each other."""
+        source = """
+define rate as:
+    return why is n
+
+define step as:
+    x is n + 1
+    return x * 2
+
+y is 3
+y is step of y
+print of y
+print of (rate of (what is y))
+"""
+        assert [float(v) for v in run(source)] == [8, 5]
+
+    def test_imported_modules_linked(self, runtime, tmp_path, capfd):
+        """Imported modules are compiled into the same module and initialized."""
+        write(tmp_path, "geo.eigs", "pi is 3\nprint of pi\n")
+        write(tmp_path, "shapes.eigs", "import geo\nsides is 4\nprint of sides\n")
+        path = write(tmp_path, "main.eigs", "import geo\nimport shapes\nprint of 5\n")
+        assert jit.run_jit(path) == 0
+        assert [float(v) for v in capfd.readouterr().out.split()] == [3, 4, 5]
+
+    def test_missing_module(self, runtime, tmp_path):
+        path = write(tmp_path, "main.eigs", "import nowhere\nprint of 1\n")
+        with pytest.raises(ImportError):
+            jit.jit_compile(path)
+
+    def test_requires_runtime(self, tmp_path, monkeypatch):
+        """Without bitcode or a shared library there is nothing to link."""
+        monkeypatch.setattr(jit, "find_runtime_bitcode", lambda: None)
+        monkeypatch.delenv(jit.RUNTIME_LIBRARY_ENV, raising=False)
+        path = write(tmp_path, "main.eigs", "print of 1\n")
+        with pytest.raises(RuntimeError, match=jit.RUNTIME_LIBRARY_ENV):
+            jit.jit_compile(path)
+
+    def test_cli(self, runtime, tmp_path, capfd):
+        from eigenscript.__main__ import main
+
+        path = write(tmp_path, "fib.eigs", FIBONACCI)
+        assert main(["--jit", path]) == 0
+        assert float(capfd.readouterr().out.strip()) == 610
@@ -0,0 +1,179 @@
+"""
+Tests for the compiled list builtins (len, range, append, map, filter,
+reduce), list comprehensions and list slicing: native loops over the
+EigenList data.
+"""
+
+import re
+
+import pytest
+
+from eigenscript.compiler.analysis.observer import ObserverAnalyzer
+from tests.compiler import generate, parse
+
+try:
+    from llvmlite import binding as llvm
+    from eigenscript.compiler.codegen.llvm_backend import (
+        CompilerError,
+        LLVMCodeGenerator,
+    )
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+
+FUNCTIONS = """
+define double as:
+    return n * 2
+
+define positive as:
+    return n > 0
+
+define add as:
+    return n[0] + n[1]
+"""
+
+
+def main_calls(source: str) -> list:
+    main = str(llvm.parse_assembly(generate(source)).get_function("main"))
+    return re.findall(r'call [^@]*@"?([\w.]+)', main)
+
+
+class TestGeneratedCode:
+    def test_list_function_signature(self):
+        statements = parse(FUNCTIONS)
+        analyzer = ObserverAnalyzer()
+        analyzer.analyze(statements)
+        codegen = LLVMCodeGenerator(
+            scalar_functions=analyzer.scalar_functions,
+            list_functions=analyzer.list_functions,
+        )
+        codegen.compile(statements)
+        assert codegen.functions["add"].args[0].type == codegen.eigen_list_ptr
+        assert codegen.functions["double"].args[0].type == codegen.double_type
+
+    def test_map_calls_function_directly(self):
+        calls = main_calls(FUNCTIONS + "xs is [1, 2]\nys is map of [double, xs]\n")
+        assert "double" in calls
+        # Elements are read from the list's data, not through eigen_list_get
+        assert not any(name.startswith("eigen_list_get") for name in calls)
+
+    def test_comprehension_over_range_creates_no_range(self):
+        calls = main_calls("ys is [i * i for i in range of 10]\n")
+        assert calls.count("eigen_list_create") == 1
+
+    def test_lists_in_loops_and_conditionals_verify(self):
+        """Lists created in nested blocks are freed by arenas, not one by one."""
+        source = (
+            "i is 0\n"
+            "loop while i < 3:\n"
+            "    xs is [i, i]\n"
+            "    ys is range of i\n"
+            "    i is i + 1\n"
+            "if i > 1:\n"
+            "    zs is [1]\n"
+            "top is [1, 2]\n"
+        )
+        calls = main_calls(source)
+        assert "eigen_list_destroy" not in calls
+        assert calls[0] == "eigen_arena_enter"
+        assert calls[-1] == "eigen_arena_exit"
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "xs is [1]\nys is map of [undefined, xs]\n",
+            FUNCTIONS + "ys is map of [double, 3]\n",
+            FUNCTIONS + "xs is [1]\nys is map of [add, xs]\n",
+            FUNCTIONS + "xs is [1]\ny is reduce of [double, xs, 0]\n",
+            FUNCTIONS + "xs is [1]\ny is reduce of [add, xs]\n",
+            FUNCTIONS + "y is add of 3\n",
+            'xs is [1]\nappend of [xs, "a"]\n',
+            "y is len of 3\n",
+        ],
+    )
+    def test_errors(self, source):
+        with pytest.raises(CompilerError):
+            generate(source)
+
+
+def run_lists(run, source: str) -> list:
+    """The numbers a program using FUNCTIONS prints."""
+    return [float(line) for line in run(FUNCTIONS + source)]
+
+
+class TestListPrograms:
+    """List programs compiled with the JIT compute what the interpreter does."""
+
+    def test_map_filter_reduce(self, run):
+        source = (
+            "xs is [3, -1, 4, -1, 5]\n"
+            "ys is map of [double, xs]\n"
+            "zs is filter of [positive, xs]\n"
+            "print of ys[4]\n"
+            "print of len of zs\n"
+            "print of zs[2]\n"
+            "print of reduce of [add, xs, 0]\n"
+            "print of reduce of [add, ys, 100]\n"
+        )
+        assert run_lists(run, source) == [10, 3, 5, 10, 120]
+
+    def test_range_len_append(self, run):
+        source = (
+            "r is range of 4\n"
+            "append of [r, 10]\n"
+            "print of len of r\n"
+            "print of r[3]\n"
+            "print of r[4]\n"
+            "print of len of (range of -2)\n"
+        )
+        assert run_lists(run, source) == [5, 3, 10, 0]
+
+    def test_comprehensions(self, run):
+        source = (
+            "xs is [1, 2, 3, 4]\n"
+            "x is 100\n"
+            "ys is [x * 10 for x in xs if x > 2]\n"
+            "print of len of ys\n"
+            "print of ys[1]\n"
+            "print of x\n"
+            "squares is [i * i for i in range of 5]\n"
+            "print of reduce of [add, squares, 0]\n"
+            "none is [v for v in xs if v > 10]\n"
+            "print of len of none\n"
+        )
+        assert run_lists(run, source) == [2, 40, 100, 30, 0]
+
+    def test_slices(self, run):
+        source = (
+            "xs is [1, 2, 3, 4, 5]\n"
+            "a is xs[1:3]\n"
+            "b is xs[-2:]\n"
+            "c is xs[:10]\n"
+            "d is xs[4:1]\n"
+            "print of len of a\n"
+            "print of a[1]\n"
+            "print of b[0]\n"
+            "print of len of c\n"
+            "print of len of d\n"
+        )
+        assert run_lists(run, source) == [2, 3, 4, 5, 0]
+
+    def test_lists_in_function_and_loop(self, run):
+        source = (
+            "define total as:\n"
+            "    return reduce of [add, n, 0]\n"
+            "\n"
+            "i is 0\n"
+            "sum is 0\n"
+            "loop while i < 3:\n"
+            "    row is [x + i for x in range of 4]\n"
+            "    sum is sum + (total of row)\n"
+            "    i is i + 1\n"
+            "print of sum\n"
+        )
+        assert run_lists(run, source) == [30]
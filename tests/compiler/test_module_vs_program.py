@@ -329,3 +329,97 @@ class TestModuleCompilationIntegration:
                 os.remove(temp_file)
             if obj_path and os.path.exists(obj_path):
                 os.remove(obj_path)
+
+
+@pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+class TestParallelModuleCompilation:
+    """Test building the import graph and compiling modules concurrently."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """main imports geo and shapes; shapes imports geo and main (a cycle)."""
+        (tmp_path / "geo.eigs").write_text("pi is 3\n")
+        (tmp_path / "shapes.eigs").write_text("import geo\nimport main\ny is 2\n")
+        (tmp_path / "main.eigs").write_text(
+            "import geo\nimport shapes\nx is 5\nprint of x\n"
+        )
+        return tmp_path
+
+    def test_import_graph_order(self, project):
+        """Dependencies come before their importers, the entry module last."""
+        from eigenscript.compiler.cli.compile import build_import_graph
+        from eigenscript.compiler.analysis.resolver import ModuleResolver
+
+        graph = build_import_graph(
+            str(project / "main.eigs"), ModuleResolver(root_dir=str(project))
+        )
+        names = [os.path.basename(path) for path in graph]
+        assert names == ["geo.eigs", "shapes.eigs", "main.eigs"]
+        assert graph[str(project / "shapes.eigs")].imports == ["geo", "main"]
+
+    def test_import_graph_missing_module(self, project):
+        """An unresolvable import fails the graph."""
+        from eigenscript.compiler.cli.compile import build_import_graph
+        from eigenscript.compiler.analysis.resolver import ModuleResolver
+
+        (project / "main.eigs").write_text("import nowhere\n")
+        resolver = ModuleResolver(root_dir=str(project))
+        assert build_import_graph(str(project / "main.eigs"), resolver) is None
+
+    @pytest.mark.parametrize("jobs", [1, 3])
+    def test_compiles_all_modules(self, project, jobs):
+        """Every module gets an object file, in the pool or in-process."""
+        from eigenscript.compiler.cli.compile import compile_module
+        from eigenscript.compiler.analysis.resolver import ModuleResolver
+
+        compiled = set()
+        obj_path = compile_module(
+            str(project / "main.eigs"),
+            ModuleResolver(root_dir=str(project)),
+            compiled,
+            is_main=True,
+            jobs=jobs,
+        )
+
+        assert obj_path == str(project / "main.o")
+        assert compiled == {
+            str(project / name) for name in ("geo.eigs", "shapes.eigs", "main.eigs")
+        }
+        for name in ("geo.o", "shapes.o", "main.o"):
+            assert (project / name).exists()
+
+    def test_already_compiled_modules_skipped(self, project):
+        """Modules in compiled_objects are not compiled again."""
+        from eigenscript.compiler.cli.compile import compile_module
+        from eigenscript.compiler.analysis.resolver import ModuleResolver
+
+        compiled = {str(project / "geo.eigs")}
+        compile_module(
+            str(project / "main.eigs"),
+            ModuleResolver(root_dir=str(project)),
+            compiled,
+            is_main=True,
+            jobs=1,
+        )
+        assert not (project / "geo.o").exists()
+        assert (project / "main.o").exists()
+
+    def test_failed_dependency(self, project, capsys):
+        """A dependency that fails to compile fails the build."""
+        from eigenscript.compiler.cli.compile import compile_module
+        from eigenscript.compiler.analysis.resolver import ModuleResolver
+
+        (project / "geo.eigs").write_text("x is undefined_name + 1\n")
+        compiled = set()
+        obj_path = compile_module(
+            str(project / "main.eigs"),
+            ModuleResolver(root_dir=str(project)),
+            compiled,
+            is_main=True,
+            jobs=2,
+        )
+        assert obj_path is None
+        assert str(project / "geo.eigs") not in compiled
+        assert "Failed to compile dependency: geo" in capsys.readouterr().out
@@ -0,0 +1,171 @@
+"""
+Tests for parameter classification in the ObserverAnalyzer and the scalar
+calling convention it enables in the LLVM backend.
+"""
+
+import pytest
+
+from eigenscript.compiler.analysis.observer import ObserverAnalyzer
+from tests.compiler import parse
+
+try:
+    from llvmlite import binding as llvm
+    from eigenscript.compiler.codegen.llvm_backend import LLVMCodeGenerator
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+FIBONACCI = """
+define fib as:
+    if n < 2:
+        return n
+    else:
+        a is fib of (n - 1)
+        b is fib of (n - 2)
+        return a + b
+
+result is fib of 20
+print of result
+"""
+
+
+def analyze(source: str) -> ObserverAnalyzer:
+    analyzer = ObserverAnalyzer()
+    analyzer.analyze(parse(source))
+    return analyzer
+
+
+class TestParameterClassification:
+    """Which functions can take their parameter as a raw double."""
+
+    def test_numeric_recursion_is_scalar(self):
+        analyzer = analyze(FIBONACCI)
+        assert analyzer.scalar_functions == {"fib"}
+        assert "n" not in analyzer.observed
+
+    def test_interrogated_parameter(self):
+        analyzer = analyze("define rate as:\n    return why is n\n")
+        assert analyzer.scalar_functions == set()
+        assert "n" in analyzer.observed
+
+    def test_predicate_observes_parameter(self):
+        source = "define check as:\n    if converged:\n        return 1\n    return n\n"
+        assert analyze(source).scalar_functions == set()
+
+    def test_rebinding_to_interrogative(self):
+        source = "define alias as:\n    n is what is n\n    return n\n"
+        assert analyze(source).scalar_functions == set()
+
+    def test_forwarding_propagates(self):
+        """Passing n unchanged to an observing function observes it."""
+        source = """
+define inner as:
+    return why is n
+
+define middle as:
+    return inner of n
+
+define outer as:
+    return middle of n
+
+define fresh as:
+    return inner of (n + 1)
+"""
+        analyzer = analyze(source)
+        assert analyzer.scalar_functions == {"fresh"}
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            "return n[0] + n[1]",
+            "return len of n",
+            "ys is n[1:]\n    return 0",
+            "ys is [x * 2 for x in n]\n    return 0",
+            "return reduce of [add, n, 0]",
+            "return first of n",
+        ],
+    )
+    def test_list_parameter(self, body):
+        source = (
+            "define add as:\n    return n[0] + n[1]\n\n"
+            "define first as:\n    return n[0]\n\n"
+            f"define f as:\n    {body}\n"
+        )
+        analyzer = analyze(source)
+        assert analyzer.list_functions == {"add", "first", "f"}
+        assert analyzer.scalar_functions == set()
+        assert "n" not in analyzer.observed
+
+    def test_arguments_to_scalar_functions_unobserved(self):
+        source = """
+define double as:
+    return n * 2
+
+define rate as:
+    return why is n
+
+x is 5
+y is double of x
+z is 7
+w is rate of z
+"""
+        observed = ObserverAnalyzer().analyze(parse(source))
+        assert "x" not in observed
+        assert "z" in observed
+
+
+@pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+class TestScalarCallingConvention:
+    """Functions with unobserved parameters compile to double(double)."""
+
+    def compile(self, source: str, use_analysis: bool = True) -> llvm.ModuleRef:
+        statements = parse(source)
+        analyzer = ObserverAnalyzer()
+        observed = analyzer.analyze(statements)
+        codegen = LLVMCodeGenerator(
+            observed_variables=observed,
+            scalar_functions=analyzer.scalar_functions if use_analysis else None,
+        )
+        module = llvm.parse_assembly(codegen.compile(statements))
+        module.verify()
+        return module
+
+    def test_fibonacci_is_native_recursion(self):
+        module = self.compile(FIBONACCI)
+        fib = module.get_function("fib")
+        assert [str(arg.type) for arg in fib.arguments] == ["double"]
+        # No EigenValue is built for the recursive calls
+        assert "eigen_init" not in str(fib)
+
+    def test_observed_parameter_keeps_eigenvalue(self):
+        module = self.compile(
+            "define rate as:\n    return why is n\n\ny is rate of 3\n"
+        )
+        rate = module.get_function("rate")
+        assert [str(arg.type) for arg in rate.arguments] != ["double"]
+        assert "eigen_init" in str(module.get_function("main"))
+
+    def test_mixed_calls(self):
+        """Scalar and EigenValue functions call each other."""
+        source = """
+define rate as:
+    return why is n
+
+define step as:
+    x is n + 1
+    return rate of x
+
+y is step of 2
+z is rate of (step of 3)
+"""
+        module = self.compile(source)
+        step = module.get_function("step")
+        assert [str(arg.type) for arg in step.arguments] == ["double"]
+
+    def test_without_analysis_all_parameters_are_eigenvalues(self):
+        module = self.compile(FIBONACCI, use_analysis=False)
+        fib = module.get_function("fib")
+        assert [str(arg.type) for arg in fib.arguments] != ["double"]
@@ -0,0 +1,186 @@
+"""
+Tests for profile-guided optimization: instrumented builds count calls,
+branches and loop iterations into a profile file
+(eigenscript.compiler.codegen.profile), and builds that use the profile
+turn the counts into branch weights, entry counts and inlining hints.
+"""
+
+import re
+
+import pytest
+
+from tests.compiler import generate
+
+try:
+    from eigenscript.compiler.codegen import jit
+    from eigenscript.compiler.codegen.profile import (
+        Instrumentation,
+        Profile,
+        module_tag,
+    )
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+
+PROGRAM = """
+define fib as:
+    if n < 2:
+        return n
+    return (fib of (n - 1)) + (fib of (n - 2))
+
+define never as:
+    return n + 1
+
+i is 0
+total is 0
+loop while i < 10:
+    total is total + (fib of i)
+    i is i + 1
+if total > 1000:
+    print of (never of total)
+print of total
+"""
+
+COUNTS = {
+    "fib.calls": 276,
+    "fib.if0": 276,
+    "fib.if0.then": 144,
+    "never.calls": 0,
+    "main.loop0": 1,
+    "main.loop0.body": 10,
+    "main.if0": 1,
+    "main.if0.then": 0,
+}
+
+
+def function(llvm_ir: str, name: str) -> str:
+    """The definition of a function in printed IR."""
+    match = re.search(rf'define [^@]*@"{name}"\(.*?\n}}', llvm_ir, re.S)
+    return match.group(0)
+
+
+class TestProfileFile:
+    def test_runs_add_up(self, tmp_path):
+        path = tmp_path / "p.eigprof"
+        path.write_text(
+            "module <main>:ab\n3 main.loop0\n1 f.calls\n"
+            "module geo:cd\n2 geo_init.if0\n"
+            "module <main>:ab\n4 main.loop0\n"
+        )
+        profile = Profile.load(str(path))
+        assert profile.module("<main>:ab") == {"main.loop0": 7, "f.calls": 1}
+        assert profile.module("geo:cd") == {"geo_init.if0": 2}
+        assert profile.module("geo:ef") is None
+
+    @pytest.mark.parametrize("text", ["3 main.loop0\n", "module x\nmany f.calls\n"])
+    def test_not_a_profile(self, tmp_path, text):
+        path = tmp_path / "p.eigprof"
+        path.write_text(text)
+        with pytest.raises(ValueError):
+            Profile.load(str(path))
+
+    def test_tag_follows_source(self):
+        assert module_tag(None, "x is 1\n") == module_tag(None, "x is 1\n")
+        assert module_tag(None, "x is 1\n") != module_tag(None, "x is 2\n")
+        assert module_tag("geo", "x is 1\n").startswith("geo:")
+
+
+class TestInstrumentation:
+    def test_counters(self):
+        tag = module_tag(None, PROGRAM)
+        llvm_ir = generate(
+            PROGRAM, instrumentation=Instrumentation(tag, "/tmp/out.eigprof")
+        )
+        keys = re.findall(r'c"([\w.]+)\\00"', llvm_ir)
+        assert sorted(keys) == sorted(COUNTS)
+        assert f'c"{tag}\\00"' in llvm_ir
+        main = function(llvm_ir, "main")
+        assert main.count("eigen_profile_register") == 1
+        assert main.count("eigen_profile_write") == 1
+        assert main.index("eigen_profile_write") < main.index("ret i32 0")
+
+    def test_library_registers_but_does_not_write(self):
+        source = "x is 1\nif x > 0:\n    y is 2\n"
+        llvm_ir = generate(
+            source,
+            module_name="geo",
+            instrumentation=Instrumentation(module_tag("geo", source)),
+        )
+        init = function(llvm_ir, "geo_init")
+        assert "eigen_profile_register" in init
+        assert 'call void @"eigen_profile_write"' not in llvm_ir
+
+    def test_no_counters_by_default(self):
+        llvm_ir = generate(PROGRAM)
+        assert '@"prof' not in llvm_ir
+        assert 'call void @"eigen_profile_register"' not in llvm_ir
+
+
+class TestFeedback:
+    def test_functions(self):
+        llvm_ir = generate(PROGRAM, profile=COUNTS)
+        fib = function(llvm_ir, "fib")
+        assert "inlinehint" in fib.splitlines()[0]
+        never = function(llvm_ir, "never")
+        assert "cold" in never.splitlines()[0]
+        assert '!"function_entry_count", i64 276' in llvm_ir
+
+    def test_branch_weights(self):
+        llvm_ir = generate(PROGRAM, profile=COUNTS)
+        weights = dict(
+            re.findall(r'(!\d+) = !{ !"branch_weights", (i32 \d+, i32 \d+) }', llvm_ir)
+        )
+        fib = function(llvm_ir, "fib")
+        fib_branch = re.search(r'label %"if.end", !prof (!\d+)', fib)
+        assert weights[fib_branch.group(1)] == "i32 145, i32 133"
+        main = function(llvm_ir, "main")
+        loop = re.search(r'label %"loop.end", !prof (!\d+)', main)
+        assert weights[loop.group(1)] == "i32 11, i32 2"
+        rare = re.search(r'label %"if.then", label %"if.end", !prof (!\d+)', main)
+        assert weights[rare.group(1)] == "i32 1, i32 2"
+
+    def test_without_counts(self):
+        llvm_ir = generate(PROGRAM)
+        assert 'branch_weights", i32 145' not in llvm_ir
+        assert "function_entry_count" not in llvm_ir
+
+
+class TestWorkflow:
+    def test_generate_then_use(self, runtime, tmp_path, capfd):
+        shapes_source = "sides is 4\nif sides > 3:\n    print of sides\n"
+        (tmp_path / "shapes.eigs").write_text(shapes_source)
+        main = tmp_path / "main.eigs"
+        main.write_text("import shapes\n" + PROGRAM)
+        profile_path = str(tmp_path / "main.eigprof")
+
+        instrumented = jit.jit_compile(str(main), profile_generate=profile_path)
+        assert instrumented.run() == 0
+        assert instrumented.run() == 0
+        expected = capfd.readouterr().out
+        assert expected.split() == ["4.000000", "88.000000"] * 2
+
+        profile = Profile.load(profile_path)
+        counts = profile.module(module_tag(None, main.read_text()))
+        assert counts["fib.calls"] == 2 * 276
+        assert counts["main.loop0.body"] == 2 * 10
+        shapes = profile.module(module_tag("shapes", shapes_source))
+        assert shapes == {"shapes_init.if0": 2, "shapes_init.if0.then": 2}
+
+        optimized = jit.jit_compile(str(main), profile_use=profile_path)
+        assert optimized.run() == 0
+        assert capfd.readouterr().out.split() == ["4.000000", "88.000000"]
+
+    def test_edited_module_ignores_profile(self, runtime, tmp_path):
+        main = tmp_path / "main.eigs"
+        main.write_text(PROGRAM)
+        profile_path = str(tmp_path / "main.eigprof")
+        jit.jit_compile(str(main), profile_generate=profile_path).run()
+
+        main.write_text(PROGRAM + "print of 1\n")
+        optimized = jit.jit_compile(str(main), profile_use=profile_path)
+        assert "function_entry_count" not in str(optimized.llvm_module)
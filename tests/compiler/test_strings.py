@@ -0,0 +1,153 @@
+"""
+Tests for native strings in the compiled backend: string literals become
+constant EigenStrings, and string operations call the C runtime.
+"""
+
+import pytest
+
+from tests.compiler import generate
+
+try:
+    from eigenscript.compiler.codegen import jit
+    from eigenscript.compiler.codegen.llvm_backend import CompilerError
+
+    COMPILER_AVAILABLE = True
+except ImportError:
+    COMPILER_AVAILABLE = False
+
+pytestmark = pytest.mark.skipif(
+    not COMPILER_AVAILABLE, reason="Compiler dependencies not installed"
+)
+
+
+class TestGeneratedCode:
+    def test_literal_is_constant(self):
+        llvm_ir = generate('s is "héllo"\nprint of s\n')
+        # 6 bytes, 5 characters, NUL-terminated; nothing allocated at run time
+        literal = '{i64 6, i64 5, [7 x i8] c"h\\c3\\a9llo\\00"}'
+        assert f"constant {{i64, i64, [7 x i8]}} {literal}" in llvm_ir
+        assert "eigen_string_create" not in llvm_ir
+        assert 'call void @"eigen_string_print"' in llvm_ir
+
+    def test_operations_call_runtime(self):
+        llvm_ir = generate(
+            's is "a" + "b"\nt is s[0:1]\nif s = t:\n    print of len of s\n'
+        )
+        for name in ("concat", "slice", "equals", "length"):
+            assert f'@"eigen_string_{name}"(' in llvm_ir
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            's is "a" + 1\n',
+            's is "a"\nx is s * 2\n',
+            's is "a"\ns is 3\n',
+            'xs is ["a", 1]\n',
+            'define f as:\n    return n\ny is f of "a"\n',
+            'words is split of "a b"\ny is words[0:1]\n',
+        ],
+    )
+    def test_type_errors(self, source):
+        with pytest.raises(CompilerError):
+            generate(source)
+
+
+class TestStringPrograms:
+    """String programs compiled with the JIT print what the interpreter would."""
+
+    def test_concat_and_print(self, run):
+        source = 'a is "hello"\nb is a + ", " + "world"\nprint of b\nprint of a\n'
+        assert run(source) == ["hello, world", "hello"]
+
+    def test_index_and_slice_count_characters(self, run):
+        source = (
+            's is "naïve café"\n'
+            "print of s[2]\n"
+            "print of s[6:10]\n"
+            "print of s[:5]\n"
+            "print of s[-4:]\n"
+            "print of len of s\n"
+        )
+        assert run(source) == [
+            "ï",
+            "café",
+            "naïve",
+            "café",
+            "10.000000",
+        ]
+
+    def test_index_out_of_bounds(self, runtime, tmp_path, capfd):
+        path = tmp_path / "oob.eigs"
+        path.write_text('s is "abc"\nprint of s[3]\n')
+        assert jit.run_jit(str(path)) == 0
+        captured = capfd.readouterr()
+        assert captured.out == "\n"
+        assert "String index out of bounds: 3 (length: 3)" in captured.err
+
+    def test_upper_lower(self, run):
+        source = 's is "Mixed Case"\nprint of upper of s\nprint of lower of s\n'
+        assert run(source) == ["MIXED CASE", "mixed case"]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Héllo wörld",
+            "straße ﬁnal ΐ",
+            "İstanbul",
+            "ΟΔΥΣΣΕΥΣ, ΣΑΣ. Σ",
+            "Привет Ǆemal",
+        ],
+    )
+    def test_case_conversion_matches_interpreter(self, run, text):
+        source = (
+            f's is "{text}"\n'
+            "u is upper of s\n"
+            "l is lower of s\n"
+            "print of u\n"
+            "print of l\n"
+            "print of len of u\n"
+        )
+        # The interpreter's upper and lower are str.upper and str.lower
+        assert run(source) == [
+            text.upper(),
+            text.lower(),
+            f"{len(text.upper())}.000000",
+        ]
+
+    def test_split_and_join(self, run):
+        source = (
+            'words is split of "  one two\\tthree  "\n'
+            "print of len of words\n"
+            "print of words[1]\n"
+            'print of join of ["-", words]\n'
+            "print of join of words\n"
+            'print of join of ["x", "y"]\n'
+        )
+        assert run(source) == [
+            "3.000000",
+            "two",
+            "one-two-three",
+            "one two three",
+            "x y",
+        ]
+
+    def test_equality_in_conditions(self, run):
+        source = (
+            's is "ab" + "c"\n'
+            'if s = "abc":\n    print of 1\n'
+            'if s != "abc":\n    print of 2\n'
+            'if s != "abd":\n    print of 3\n'
+        )
+        assert run(source) == ["1.000000", "3.000000"]
+
+    def test_strings_in_loops(self, run):
+        source = (
+            's is ""\n'
+            "i is 0\n"
+            "loop while i < 3:\n"
+            '    s is s + "ab"\n'
+            "    i is i + 1\n"
+            "print of s\n"
+            "print of len of s\n"
+        )
+        assert run(source) == ["ababab", "6.000000"]
@@ -396,6 +396,21 @@ class TestMainFunction:
         # Version flag causes SystemExit(0)
         assert excinfo.value.code == 0
 
+    def test_main_startup_report(self, tmp_path, capsys):
+        """--startup-report prints import timings to stderr."""
+        test_file = tmp_path / "test.eigs"
+        test_file.write_text("x is 5\n")
+
+        with patch.object(
+            sys, "argv", ["eigenscript", str(test_file), "--startup-report"]
+        ):
+            exit_code = main()
+
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        assert "Startup Report" in captured.err
+        assert "Startup Report" not in captured.out
+
     def test_main_file_execution(self, tmp_path):
         """Should execute file specified as argument."""
         # Create test file
@@ -700,6 +715,29 @@ print of result
         assert "source_lines:" in captured.out
         assert "tokens:" in captured.out
 
+    def test_benchmark_reports_parse_cache_hit(self, tmp_path, capsys):
+        """A warm run should load the AST from the parse cache."""
+        test_file = tmp_path / "test.eigs"
+        test_file.write_text("x is 5\ny is 10\n")
+
+        assert run_file(str(test_file)) == 0
+        assert (tmp_path / "__eigscache__" / "test.eigsc").exists()
+        capsys.readouterr()
+
+        exit_code = run_file(str(test_file), benchmark=True)
+        captured = capsys.readouterr()
+        assert exit_code == 0
+        assert "parse_cache: hit" in captured.out
+
+    def test_no_cache_flag(self, tmp_path):
+        """--no-cache should not create a cache directory."""
+        test_file = tmp_path / "test.eigs"
+        test_file.write_text("x is 5\n")
+
+        with patch.object(sys, "argv", ["eigenscript", str(test_file), "--no-cache"]):
+            assert main() == 0
+        assert not (tmp_path / "__eigscache__").exists()
+
     def test_benchmark_with_error(self, tmp_path, capsys):
         """Should handle errors gracefully with benchmark enabled."""
         # Create file with error
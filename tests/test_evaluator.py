@@ -68,6 +68,41 @@ class TestEnvironment:
         assert parent.lookup("x") == v1
 
 
+class TestBuiltinEnvironment:
+    """Test suite for the shared read-only builtin scope."""
+
+    def test_interpreters_share_builtin_scope(self):
+        """Interpreters should reference one builtin scope, not copies."""
+        interp1 = Interpreter(dimension=10)
+        interp2 = Interpreter(dimension=10)
+
+        assert interp1.environment.parent is interp2.environment.parent
+        assert interp1.environment.lookup("print") is interp2.environment.lookup(
+            "print"
+        )
+        # Globals start empty; builtins are not copied into them
+        assert len(interp1.environment.bindings) == 0
+
+    def test_builtin_scope_is_read_only(self):
+        """Binding directly into the builtin scope should fail."""
+        interp = Interpreter(dimension=10)
+        builtin_scope = interp.environment.parent
+
+        with pytest.raises(TypeError):
+            builtin_scope.bind("print", LRVMVector([1.0]))
+        with pytest.raises(TypeError):
+            builtin_scope.bindings["print"] = None
+
+    def test_shadowing_builtin_is_per_interpreter(self):
+        """Rebinding a builtin name should not leak into other interpreters."""
+        interp1 = Interpreter(dimension=10)
+        interp1.evaluate(Parser(Tokenizer("max is 3").tokenize()).parse())
+
+        interp2 = Interpreter(dimension=10)
+        assert isinstance(interp1.environment.lookup("max"), LRVMVector)
+        assert not isinstance(interp2.environment.lookup("max"), LRVMVector)
+
+
 class TestInterpreter:
     """Test suite for Interpreter class."""
 
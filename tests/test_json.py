@@ -2,12 +2,15 @@
 Tests for JSON support in EigenScript.
 """
 
+import json
+import os
 import pytest
+import tempfile
 import textwrap
 from eigenscript.lexer import Tokenizer
 from eigenscript.parser import Parser
 from eigenscript.evaluator import Interpreter
-from eigenscript.evaluator.interpreter import EigenList
+from eigenscript.evaluator.interpreter import EigenList, EigenMap
 from eigenscript.builtins import decode_vector
 
 
@@ -114,10 +117,12 @@ class TestJSONParse:
         """
 
         result = run_code(code, interpreter)
-        assert isinstance(result, EigenList)
+        assert isinstance(result, EigenMap)
 
-        # Object is represented as list of [key, value] pairs
-        assert len(result.elements) == 2
+        # Object is represented as a native map keyed by string
+        assert len(result) == 2
+        assert decode_vector(result.get("name"), interpreter.space) == "Alice"
+        assert decode_vector(result.get("age"), interpreter.space) == 30
 
     def test_parse_empty_array(self, interpreter):
         """Test parsing empty JSON array."""
@@ -136,8 +141,8 @@ class TestJSONParse:
         """
 
         result = run_code(code, interpreter)
-        assert isinstance(result, EigenList)
-        assert len(result.elements) == 0
+        assert isinstance(result, EigenMap)
+        assert len(result) == 0
 
     def test_parse_invalid_json(self, interpreter):
         """Test error on invalid JSON."""
@@ -352,3 +357,116 @@ class TestJSONIntegration:
         result = run_code(code, interpreter)
         length = decode_vector(result, interpreter.space)
         assert length == 2
+
+
+class TestJSONLines:
+    """Tests for streaming JSON Lines reading and writing."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    def test_read_records_one_at_a_time(self, interpreter, temp_dir):
+        """Test reading records until the end of the file."""
+        path = os.path.join(temp_dir, "events.jsonl")
+        with open(path, "w") as f:
+            f.write('{"id": 1, "score": 10}\n')
+            f.write("\n")
+            f.write('{"id": 2, "score": 32}\n')
+
+        code = f"""
+        handle is file_open of ["{path}", "r"]
+        total is 0
+        count is 0
+        next is json_read_line of handle
+        loop while next[0]:
+            total is total + next[1]["score"]
+            count is count + 1
+            next is json_read_line of handle
+        file_close of handle
+        [count, total]
+        """
+
+        result = run_code(code, interpreter)
+        assert isinstance(result, EigenList)
+        assert decode_vector(result.elements[0], interpreter.space) == 2
+        assert decode_vector(result.elements[1], interpreter.space) == 42
+
+    def test_read_returns_map(self, interpreter, temp_dir):
+        """Test that object records are parsed into maps."""
+        path = os.path.join(temp_dir, "one.jsonl")
+        with open(path, "w") as f:
+            f.write('{"name": "Alice"}\n')
+
+        code = f"""
+        handle is file_open of ["{path}", "r"]
+        next is json_read_line of handle
+        file_close of handle
+        next[1]
+        """
+
+        result = run_code(code, interpreter)
+        assert isinstance(result, EigenMap)
+        assert decode_vector(result.get("name"), interpreter.space) == "Alice"
+
+    def test_null_record_is_not_end_of_file(self, interpreter, temp_dir):
+        """Test that a null line is read as a record."""
+        path = os.path.join(temp_dir, "nulls.jsonl")
+        with open(path, "w") as f:
+            f.write("1\nnull\n2\n")
+
+        code = f"""
+        handle is file_open of ["{path}", "r"]
+        count is 0
+        next is json_read_line of handle
+        loop while next[0]:
+            count is count + 1
+            next is json_read_line of handle
+        file_close of handle
+        count
+        """
+
+        result = run_code(code, interpreter)
+        assert decode_vector(result, interpreter.space) == 3
+
+    def test_read_invalid_line(self, interpreter, temp_dir):
+        """Test that a malformed record raises an error."""
+        path = os.path.join(temp_dir, "bad.jsonl")
+        with open(path, "w") as f:
+            f.write("{not json}\n")
+
+        code = f"""
+        handle is file_open of ["{path}", "r"]
+        json_read_line of handle
+        """
+
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            run_code(code, interpreter)
+
+    def test_write_records(self, interpreter, temp_dir):
+        """Test writing one compact record per line."""
+        path = os.path.join(temp_dir, "out.jsonl")
+
+        code = f"""
+        handle is file_open of ["{path}", "w"]
+        json_write_line of [handle, dict of [["id", 1], ["tags", ["a", "b"]]]]
+        json_write_line of [handle, [1, 2, 3]]
+        file_close of handle
+        """
+
+        run_code(code, interpreter)
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert lines == ['{"id":1,"tags":["a","b"]}', "[1,2,3]"]
+        assert json.loads(lines[0]) == {"id": 1, "tags": ["a", "b"]}
+
+    def test_write_requires_handle(self, interpreter):
+        """Test that json_write_line rejects non-handle targets."""
+        code = """
+        json_write_line of ["not a handle", 1]
+        """
+
+        with pytest.raises(TypeError, match="valid file handle"):
+            run_code(code, interpreter)
@@ -287,6 +287,96 @@ y is 10"""
         assert tokens[3].type == TokenType.OF
         assert tokens[4].type == TokenType.IDENTIFIER
 
+    def test_negative_number_vs_minus(self):
+        """A '-' directly before a digit starts a negative number."""
+        tokens = Tokenizer("a - 1 -2").tokenize()
+        assert [t.type for t in tokens[:4]] == [
+            TokenType.IDENTIFIER,
+            TokenType.MINUS,
+            TokenType.NUMBER,
+            TokenType.NUMBER,
+        ]
+        assert tokens[3].value == -2
+
+    def test_position_after_multiline_string(self):
+        """Line and column should account for newlines inside strings."""
+        tokens = Tokenizer('s is "a\nb"\nx is 1').tokenize()
+        string = tokens[2]
+        assert string.value == "a\nb"
+        x = tokens[4]
+        assert x.value == "x"
+        assert (x.line, x.column) == (3, 1)
+
+    def test_tab_indentation(self):
+        """A tab should count as four spaces of indentation."""
+        source = "if x:\n\ty is 1\n    z is 2"
+        tokens = Tokenizer(source).tokenize()
+        types = [t.type for t in tokens]
+        assert types.count(TokenType.INDENT) == 1
+        assert types.count(TokenType.DEDENT) == 1
+
+    def test_unicode_identifier(self):
+        """Identifiers may contain non-ASCII letters."""
+        tokens = Tokenizer("café is 1").tokenize()
+        assert tokens[0].type == TokenType.IDENTIFIER
+        assert tokens[0].value == "café"
+
+    def test_unterminated_string(self):
+        """Unterminated strings should raise SyntaxError at their start."""
+        with pytest.raises(SyntaxError, match="line 1, column 6"):
+            Tokenizer('x is "abc').tokenize()
+
+    def test_unexpected_character(self):
+        """Unknown characters should raise SyntaxError with their position."""
+        with pytest.raises(SyntaxError, match="'@' at line 2, column 3"):
+            Tokenizer("x\ny @ 1").tokenize()
+
+    def test_bare_exclamation(self):
+        """A lone '!' should suggest 'not' or '!='."""
+        with pytest.raises(SyntaxError, match="Did you mean"):
+            Tokenizer("x ! y").tokenize()
+
+    def test_large_source(self):
+        """Long generated sources should tokenize with correct positions."""
+        source = "x is 1 + 2\n" * 5000
+        tokens = Tokenizer(source).tokenize()
+        assert len(tokens) == 5000 * 6 + 1
+        last_x = tokens[-7]
+        assert (last_x.value, last_x.line, last_x.column) == ("x", 5000, 1)
+        assert (tokens[-1].line, tokens[-1].column) == (5001, 1)
+
+    def test_token_offsets(self):
+        """Tokens should record their start and end offsets in the source."""
+        source = 'x is "a\\nb"\nloop while y:\n    z'
+        tokens = Tokenizer(source).tokenize()
+        for token in tokens:
+            if token.type in (TokenType.IDENTIFIER, TokenType.STRING):
+                text = source[token.offset : token.end]
+                assert text in ("x", "y", "z", '"a\\nb"')
+        assert tokens[-1].offset == tokens[-1].end == len(source)
+
+    def test_offsets_ignored_by_equality(self):
+        """Hand-built tokens should equal tokenized ones."""
+        tokens = Tokenizer("x").tokenize()
+        assert tokens[0] == Token(TokenType.IDENTIFIER, "x", 1, 1)
+
+    def test_tokenize_region_stops_at_line_start(self):
+        """Region lexing stops at the first unindented line in stops."""
+        source = "a is 1\nif b:\n    c is 2\nd is 3\n"
+        tokenizer = Tokenizer(source)
+        stops = {source.index("c"), source.index("d")}
+        assert tokenizer.tokenize_region(7, 2, stops) == source.index("d")
+        full = Tokenizer(source).tokenize()
+        assert tokenizer.tokens == full[4:14]
+        assert tokenizer.tokens[-1].type == TokenType.DEDENT
+
+    def test_tokenize_region_to_end(self):
+        """Without a stop, region lexing finishes the stream."""
+        source = "a is 1\nb is 2"
+        tokenizer = Tokenizer(source)
+        assert tokenizer.tokenize_region(7, 2) is None
+        assert tokenizer.tokens == Tokenizer(source).tokenize()[4:]
+
 
 class TestToken:
     """Test suite for the Token class."""
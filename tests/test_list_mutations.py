@@ -525,6 +525,110 @@ sorted_list is sort of original
         ]
         assert sorted_values == [1.0, 2.0, 3.0]
 
+    def test_sort_strings(self):
+        """Test sorting a list of strings."""
+        source = """
+words is ["pear", "apple", "fig"]
+sorted_words is sort of words
+"""
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        interpreter = Interpreter()
+        interpreter.evaluate(ast)
+
+        result = interpreter.environment.lookup("sorted_words")
+        values = [
+            decode_vector(elem, interpreter.space, interpreter.metric)
+            for elem in result.elements
+        ]
+        assert values == ["apple", "fig", "pear"]
+
+
+class TestSortByAndTopK:
+    """Test sort_by, nsmallest and nlargest built-in functions."""
+
+    def _run(self, source, name):
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        interpreter = Interpreter()
+        interpreter.evaluate(ast)
+
+        result = interpreter.environment.lookup(name)
+        assert isinstance(result, EigenList)
+        return [
+            decode_vector(elem, interpreter.space, interpreter.metric)
+            for elem in result.elements
+        ]
+
+    def test_sort_by_key_function(self):
+        """Test sorting by a user-defined key."""
+        source = """
+define negate as:
+    return 0 - arg
+
+result is sort_by of [negate, [3, 1, 2]]
+"""
+        assert self._run(source, "result") == [3, 2, 1]
+
+    def test_sort_by_is_stable(self):
+        """Test that elements with equal keys keep their order."""
+        source = """
+define parity as:
+    return arg % 2
+
+result is sort_by of [parity, [5, 2, 3, 4, 1]]
+"""
+        assert self._run(source, "result") == [2, 4, 5, 3, 1]
+
+    def test_sort_by_requires_function(self):
+        """Test that sort_by rejects a non-function key."""
+        source = """
+result is sort_by of [1, [3, 1, 2]]
+"""
+        with pytest.raises(TypeError, match="must be a function"):
+            self._run(source, "result")
+
+    def test_nsmallest(self):
+        """Test selecting the k smallest elements."""
+        source = """
+result is nsmallest of [[5, 1, 4, 2, 3], 2]
+"""
+        assert self._run(source, "result") == [1, 2]
+
+    def test_nlargest(self):
+        """Test selecting the k largest elements."""
+        source = """
+result is nlargest of [[5, 1, 4, 2, 3], 3]
+"""
+        assert self._run(source, "result") == [5, 4, 3]
+
+    def test_topk_count_larger_than_list(self):
+        """Test that k beyond the list length returns every element."""
+        source = """
+result is nlargest of [[2, 7, 1], 10]
+"""
+        assert self._run(source, "result") == [7, 2, 1]
+
+    def test_topk_zero(self):
+        """Test that k of zero returns an empty list."""
+        source = """
+result is nsmallest of [[2, 7, 1], 0]
+"""
+        assert self._run(source, "result") == []
+
+    def test_topk_strings(self):
+        """Test selection on non-numeric keys."""
+        source = """
+result is nsmallest of [["pear", "apple", "fig"], 2]
+"""
+        assert self._run(source, "result") == ["apple", "fig"]
+
 
 class TestAppendPopCombined:
     """Test append and pop operations together."""
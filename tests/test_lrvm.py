@@ -6,7 +6,7 @@ Tests vector operations in semantic space.
 
 import pytest
 import numpy as np
-from eigenscript.semantic.lrvm import LRVMVector, LRVMSpace
+from eigenscript.semantic.lrvm import LRVMVector, LRVMSpace, LazyStringVector
 
 
 class TestLRVMVector:
@@ -302,3 +302,35 @@ class TestLRVMSpace:
         # OF operator should compute metric contraction
         contraction = space.of_operator(x, y, g)
         assert isinstance(contraction, LRVMVector)
+
+
+class TestLazyStringVector:
+    """Test deferred string concatenation."""
+
+    def test_concat_matches_eager_embedding(self):
+        """Lazy strings should embed exactly like eager strings."""
+        space = LRVMSpace(dimension=768)
+        lazy = LazyStringVector.concat(space, space.embed_string("hello"), " world")
+        eager = space.embed_string("hello world")
+        assert lazy.metadata["string_value"] == "hello world"
+        assert np.allclose(lazy.coords, eager.coords)
+
+    def test_concat_defers_join(self):
+        """Appending should not join the pieces until metadata is read."""
+        space = LRVMSpace(dimension=768)
+        s = space.embed_string("")
+        for _ in range(10):
+            s = LazyStringVector.concat(space, s, "ab")
+        assert s._metadata is None
+        assert s._coords is None
+        assert s.length == 20
+        assert s.metadata["string_value"] == "ab" * 10
+
+    def test_concat_shares_pieces(self):
+        """Successive appends should reuse one piece list."""
+        space = LRVMSpace(dimension=768)
+        a = LazyStringVector.concat(space, space.embed_string("a"), "b")
+        b = LazyStringVector.concat(space, a, "c")
+        assert a._pieces is b._pieces
+        assert a.metadata["string_value"] == "ab"
+        assert b.metadata["string_value"] == "abc"
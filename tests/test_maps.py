@@ -0,0 +1,217 @@
+"""
+Tests for the native map (dictionary) type in EigenScript.
+"""
+
+import pytest
+import textwrap
+from eigenscript.lexer import Tokenizer
+from eigenscript.parser import Parser
+from eigenscript.evaluator import Interpreter
+from eigenscript.evaluator.interpreter import EigenList, EigenMap
+from eigenscript.builtins import decode_vector
+
+
+@pytest.fixture
+def interpreter():
+    """Create a fresh interpreter for each test."""
+    return Interpreter()
+
+
+def run_code(code: str, interpreter):
+    """Helper to run EigenScript code."""
+    code = textwrap.dedent(code).strip()
+    tokenizer = Tokenizer(code)
+    tokens = tokenizer.tokenize()
+    parser = Parser(tokens)
+    ast = parser.parse()
+    return interpreter.evaluate(ast)
+
+
+class TestMapConstruction:
+    """Tests for building maps."""
+
+    def test_dict_from_pairs(self, interpreter):
+        """dict builds a map from [key, value] pairs."""
+        code = """
+        dict of [["host", "localhost"], ["port", 8080]]
+        """
+
+        result = run_code(code, interpreter)
+        assert isinstance(result, EigenMap)
+        assert decode_vector(result, interpreter.space) == {
+            "host": "localhost",
+            "port": 8080,
+        }
+
+    def test_empty_dict(self, interpreter):
+        """dict of an empty list gives an empty map."""
+        result = run_code("dict of []", interpreter)
+        assert isinstance(result, EigenMap)
+        assert len(result) == 0
+
+    def test_dict_rejects_malformed_pairs(self, interpreter):
+        """dict requires two-element pairs."""
+        with pytest.raises(TypeError, match="key, value"):
+            run_code('dict of [["a", 1, 2]]', interpreter)
+
+    def test_type_of_map(self, interpreter):
+        """type reports maps as 'map'."""
+        result = run_code("type of (dict of [])", interpreter)
+        assert decode_vector(result, interpreter.space) == "map"
+
+
+class TestMapAccess:
+    """Tests for key lookup and mutation."""
+
+    def test_index_by_string_key(self, interpreter):
+        """Index syntax looks up a key."""
+        code = """
+        config is json_parse of "{\\"name\\": \\"Alice\\", \\"age\\": 30}"
+        config["age"]
+        """
+
+        result = run_code(code, interpreter)
+        assert decode_vector(result, interpreter.space) == 30
+
+    def test_index_by_numeric_key(self, interpreter):
+        """Numeric keys hash to the same slot regardless of int/float form."""
+        code = """
+        m is dict of [[1, "one"], [2, "two"]]
+        m[2]
+        """
+
+        result = run_code(code, interpreter)
+        assert decode_vector(result, interpreter.space) == "two"
+
+    def test_nested_lookup(self, interpreter):
+        """Nested JSON objects can be indexed in sequence."""
+        code = """
+        data is json_parse of "{\\"user\\": {\\"name\\": \\"Bob\\"}}"
+        data["user"]["name"]
+        """
+
+        result = run_code(code, interpreter)
+        assert decode_vector(result, interpreter.space) == "Bob"
+
+    def test_missing_key_raises(self, interpreter):
+        """Looking up a missing key raises KeyError."""
+        code = """
+        m is dict of []
+        m["missing"]
+        """
+
+        with pytest.raises(KeyError, match="missing"):
+            run_code(code, interpreter)
+
+    def test_set_and_has_key(self, interpreter):
+        """set mutates the map in place and has_key sees the new key."""
+        code = """
+        m is dict of []
+        set of [m, "port", 9090]
+        has_key of [m, "port"]
+        """
+
+        result = run_code(code, interpreter)
+        assert decode_vector(result, interpreter.space) == 1
+        m = interpreter.environment.lookup("m")
+        assert decode_vector(m.get("port"), interpreter.space) == 9090
+
+    def test_has_key_false(self, interpreter):
+        """has_key returns 0 for absent keys."""
+        result = run_code('has_key of [dict of [], "x"]', interpreter)
+        assert decode_vector(result, interpreter.space) == 0
+
+    def test_keys_and_values_preserve_order(self, interpreter):
+        """keys and values return lists in insertion order."""
+        code = """
+        m is dict of [["b", 2], ["a", 1]]
+        ks is keys of m
+        vs is values of m
+        """
+
+        run_code(code, interpreter)
+        ks = interpreter.environment.lookup("ks")
+        vs = interpreter.environment.lookup("vs")
+        assert isinstance(ks, EigenList)
+        assert decode_vector(ks, interpreter.space) == ["b", "a"]
+        assert decode_vector(vs, interpreter.space) == [2, 1]
+
+    def test_len_of_map(self, interpreter):
+        """len counts map entries."""
+        result = run_code('len of (dict of [["a", 1], ["b", 2]])', interpreter)
+        assert decode_vector(result, interpreter.space) == 2
+
+    def test_list_key_rejected(self, interpreter):
+        """Lists cannot be used as map keys."""
+        with pytest.raises(TypeError, match="Map keys"):
+            run_code("has_key of [dict of [], [1, 2]]", interpreter)
+
+
+class TestMapJSON:
+    """Tests for JSON conversion of maps."""
+
+    def test_stringify_map(self, interpreter):
+        """Maps stringify directly to JSON objects."""
+        code = """
+        m is dict of [["name", "Alice"], ["age", 30]]
+        json_stringify of m
+        """
+
+        result = run_code(code, interpreter)
+        assert (
+            decode_vector(result, interpreter.space) == '{"name": "Alice", "age": 30}'
+        )
+
+    def test_roundtrip_nested_object(self, interpreter):
+        """Nested objects survive a parse/stringify round trip."""
+        code = """
+        original is "{\\"a\\": {\\"b\\": [1, 2]}, \\"c\\": null}"
+        json_stringify of (json_parse of original)
+        """
+
+        result = run_code(code, interpreter)
+        assert (
+            decode_vector(result, interpreter.space)
+            == '{"a": {"b": [1, 2]}, "c": null}'
+        )
+
+    def test_pair_list_stays_list(self, interpreter):
+        """Lists of pairs are plain lists, not objects."""
+        code = """
+        json_stringify of [["a", 1], ["b", 2]]
+        """
+
+        result = run_code(code, interpreter)
+        assert decode_vector(result, interpreter.space) == '[["a", 1], ["b", 2]]'
+
+
+class TestMapEquality:
+    """Tests for comparing maps and lists of maps."""
+
+    def test_lists_of_maps(self, interpreter):
+        """Lists holding maps compare the maps entry by entry."""
+        code = """
+        m is dict of [["a", 1]]
+        same is dict of [["a", 1]]
+        other is dict of [["a", 2]]
+        results is [[m] = [m], [m] = [same], [m] = [other], [m] != [other], [m] = [1]]
+        """
+
+        run_code(code, interpreter)
+        results = interpreter.environment.lookup("results")
+        flags = [elem.coords[0] for elem in results.elements]
+        assert flags == [1.0, 1.0, 0.0, 1.0, 0.0]
+
+    def test_nested_values(self, interpreter):
+        """Maps holding lists and maps compare them by value."""
+        code = """
+        a is dict of [["id", 1], ["tags", ["x", "y"]], ["meta", dict of [["n", 2]]]]
+        b is json_parse of (json_stringify of a)
+        c is dict of [["id", 1], ["tags", ["x", "z"]], ["meta", dict of [["n", 2]]]]
+        results is [a = b, a = c, a != c]
+        """
+
+        run_code(code, interpreter)
+        results = interpreter.environment.lookup("results")
+        flags = [elem.coords[0] for elem in results.elements]
+        assert flags == [1.0, 0.0, 1.0]
@@ -1,10 +1,15 @@
 """
 Unit tests for EigenScript module system (import statement and member access).
 
-Tests parsing of import statements and member access operations.
+Tests parsing of import statements and member access operations, and
+loading modules in the interpreter.
 """
 
 import pytest
+from eigenscript.__main__ import run_file
+from eigenscript.builtins import decode_vector
+from eigenscript.evaluator import Interpreter
+from eigenscript.evaluator.interpreter import Module, clear_module_cache
 from eigenscript.lexer import Token, TokenType, Tokenizer
 from eigenscript.parser import (
     Parser,
@@ -311,3 +316,87 @@ class TestEdgeCases:
 
         with pytest.raises(SyntaxError):
             parser.parse()
+
+
+class TestInterpreterImports:
+    """Test suite for importing modules in the interpreter."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """A directory with a library module and a fresh module cache."""
+        (tmp_path / "geo.eigs").write_text(
+            "pi is 3.5\n" "loads is [0]\n" "define area as:\n" "    return pi * n * n\n"
+        )
+        clear_module_cache()
+        yield tmp_path
+        clear_module_cache()
+
+    def run(self, root, source):
+        interp = Interpreter(module_root=str(root))
+        interp.evaluate(Parser(Tokenizer(source).tokenize()).parse())
+        return interp
+
+    def value(self, interp, name):
+        return decode_vector(interp.environment.lookup(name), interp.space)
+
+    def test_import_and_call(self, project):
+        """Module members are read and called through member access."""
+        interp = self.run(project, "import geo\nx is geo.pi\ny is geo.area of 2")
+        assert self.value(interp, "x") == 3.5
+        assert self.value(interp, "y") == 14.0
+
+    def test_import_alias(self, project):
+        """An alias binds the module under another name."""
+        interp = self.run(project, "import geo as g\ny is g.area of 1")
+        assert self.value(interp, "y") == 3.5
+        assert isinstance(interp.environment.lookup("g"), Module)
+
+    def test_module_evaluated_once_per_process(self, project):
+        """Every interpreter shares one evaluation of a module."""
+        first = self.run(project, "import geo\nappend of [geo.loads, 1]")
+        second = self.run(project, "import geo\nn is len of geo.loads")
+        assert self.value(second, "n") == 2
+        assert first.environment.lookup("geo") is second.environment.lookup("geo")
+
+    def test_changed_module_reloaded(self, project):
+        """A module whose file changed is evaluated again."""
+        self.run(project, "import geo")
+        (project / "geo.eigs").write_text("pi is 3\n# edited\n")
+        interp = self.run(project, "import geo\nx is geo.pi")
+        assert self.value(interp, "x") == 3
+
+    def test_nested_imports(self, project):
+        """Modules can import other modules."""
+        (project / "shapes.eigs").write_text(
+            "import geo\ndefine disc as:\n    return geo.area of n\n"
+        )
+        interp = self.run(project, "import shapes\ny is shapes.disc of 2")
+        assert self.value(interp, "y") == 14.0
+
+    def test_missing_member(self, project):
+        """Reading a name the module does not define is a NameError."""
+        with pytest.raises(NameError, match="no member 'tau'"):
+            self.run(project, "import geo\nx is geo.tau")
+
+    def test_member_of_non_module(self, project):
+        """Only modules have members."""
+        with pytest.raises(TypeError, match="only modules"):
+            self.run(project, "x is 1\ny is x.pi")
+
+    def test_missing_module(self, project):
+        """Unknown modules raise ImportError."""
+        with pytest.raises(ImportError, match="nowhere"):
+            self.run(project, "import nowhere")
+
+    def test_circular_import(self, project):
+        """A module that imports itself is rejected."""
+        (project / "cycle.eigs").write_text("import cycle\n")
+        with pytest.raises(ImportError, match="Circular import"):
+            self.run(project, "import cycle")
+
+    def test_cli_resolves_next_to_script(self, project, capsys):
+        """The CLI looks for modules in the script's directory."""
+        script = project / "main.eigs"
+        script.write_text("import geo\nprint of (geo.area of 2)\n")
+        assert run_file(str(script), use_cache=False) == 0
+        assert capsys.readouterr().out.strip() == "14"
@@ -0,0 +1,105 @@
+"""
+Tests for the persistent parse cache (.eigsc files).
+"""
+
+import os
+import pytest
+from eigenscript.parser.ast_builder import Program, Assignment
+from eigenscript.parser import cache
+from eigenscript.parser.cache import (
+    CACHE_DIRNAME,
+    cache_path_for,
+    load_cached_program,
+    parse_file,
+    store_cached_program,
+)
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    """Create a small EigenScript source file."""
+    path = tmp_path / "program.eigs"
+    path.write_text("x is 5\ny is x + 1\n")
+    return path
+
+
+class TestCachePath:
+    """Tests for cache file locations."""
+
+    def test_default_location(self, source_file, monkeypatch):
+        """Cache files live in __eigscache__ next to the source."""
+        monkeypatch.delenv("EIGEN_CACHE_DIR", raising=False)
+        path = cache_path_for(str(source_file))
+        assert path == str(source_file.parent / CACHE_DIRNAME / "program.eigsc")
+
+    def test_shared_cache_dir(self, source_file, tmp_path, monkeypatch):
+        """EIGEN_CACHE_DIR collects cache files in one directory."""
+        shared = tmp_path / "shared"
+        monkeypatch.setenv("EIGEN_CACHE_DIR", str(shared))
+        path = cache_path_for(str(source_file))
+        assert os.path.dirname(path) == str(shared)
+        assert path.endswith(".eigsc")
+
+
+class TestParseFile:
+    """Tests for parse_file and cache validation."""
+
+    def test_first_parse_writes_cache(self, source_file):
+        """Parsing a file should create its cache entry."""
+        program = parse_file(str(source_file))
+        assert isinstance(program, Program)
+        assert os.path.exists(cache_path_for(str(source_file)))
+
+    def test_warm_parse_skips_parser(self, source_file, monkeypatch):
+        """A valid cache entry should be used without re-parsing."""
+        parse_file(str(source_file))
+
+        def fail(source):
+            raise AssertionError("source was re-parsed")
+
+        monkeypatch.setattr(cache, "parse_source", fail)
+        program = parse_file(str(source_file))
+        assert isinstance(program.statements[0], Assignment)
+        assert program.statements[0].identifier == "x"
+
+    def test_changed_source_invalidates(self, source_file):
+        """Editing the source should produce a fresh AST."""
+        parse_file(str(source_file))
+        source_file.write_text("z is 1\n")
+        program = parse_file(str(source_file))
+        assert program.statements[0].identifier == "z"
+
+    def test_version_mismatch_invalidates(self, source_file, monkeypatch):
+        """Entries written by another version should be ignored."""
+        source = source_file.read_text()
+        parse_file(str(source_file))
+        monkeypatch.setattr(cache, "_language_version", lambda: b"9.9.9")
+        assert load_cached_program(str(source_file), source) is None
+
+    def test_corrupt_cache_is_ignored(self, source_file):
+        """A damaged cache file should fall back to parsing."""
+        parse_file(str(source_file))
+        with open(cache_path_for(str(source_file)), "wb") as f:
+            f.write(b"EIGC garbage")
+        program = parse_file(str(source_file))
+        assert len(program.statements) == 2
+
+    def test_use_cache_false(self, source_file):
+        """Disabling the cache should not write any files."""
+        parse_file(str(source_file), use_cache=False)
+        assert not os.path.exists(cache_path_for(str(source_file)))
+
+    def test_unwritable_cache_dir(self, source_file, tmp_path):
+        """Failing to write the cache should not fail the parse."""
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        program = parse_file(str(source_file), cache_dir=str(blocker / "cache"))
+        assert isinstance(program, Program)
+
+    def test_store_and_load_roundtrip(self, source_file):
+        """Stored programs should load back with the same structure."""
+        source = source_file.read_text()
+        program = parse_file(str(source_file), use_cache=False)
+        assert store_cached_program(str(source_file), source, program)
+        loaded = load_cached_program(str(source_file), source)
+        assert loaded == program
@@ -17,7 +17,10 @@ from eigenscript.parser import (
     FunctionDef,
     Return,
     Break,
+    BinaryOp,
+    ASTArena,
 )
+from eigenscript.parser.ast_builder import walk
 
 
 class TestParser:
@@ -314,3 +317,263 @@ class TestASTNodes:
         rel = Relation(left=left, right=right)
         assert rel.left == left
         assert rel.right == right
+
+
+class TestSourceSpans:
+    """Test suite for node source spans and slotted nodes."""
+
+    def parse(self, source):
+        return Parser(Tokenizer(source).tokenize()).parse()
+
+    def text(self, source, node):
+        return source[node.span_start : node.span_end]
+
+    def test_statement_spans(self):
+        """Statements should span their source text without the newline."""
+        source = "x is 5\nprint of x\n"
+        program = self.parse(source)
+        assert [self.text(source, s) for s in program.statements] == [
+            "x is 5",
+            "print of x",
+        ]
+
+    def test_expression_spans(self):
+        """Nested expressions should span exactly their own text."""
+        source = "y is (a + 1) * b[2]"
+        expr = self.parse(source).statements[0].expression
+        assert isinstance(expr, BinaryOp)
+        assert self.text(source, expr) == "(a + 1) * b[2]"
+        assert self.text(source, expr.left) == "(a + 1)"
+        assert self.text(source, expr.right) == "b[2]"
+        assert expr.span == (expr.span_start, expr.span_end)
+
+    def test_block_span_excludes_layout(self):
+        """Compound statements should end at their last real token."""
+        source = "if x:\n    y is 1\nelse:\n    y is 2\n\nz is 3"
+        program = self.parse(source)
+        assert isinstance(program.statements[0], Conditional)
+        assert self.text(source, program.statements[0]).endswith("y is 2")
+        assert self.text(source, program.statements[1]) == "z is 3"
+
+    def test_slice_keeps_bounds(self):
+        """Slice bounds must not be confused with the node's span."""
+        source = "t is s[1:3]"
+        slice_node = self.parse(source).statements[0].expression
+        assert slice_node.start.value == 1
+        assert slice_node.end.value == 3
+        assert self.text(source, slice_node) == "s[1:3]"
+
+    def test_nodes_have_no_instance_dict(self):
+        """AST nodes should be slotted."""
+        node = Identifier("x")
+        assert not hasattr(node, "__dict__")
+        with pytest.raises(AttributeError):
+            node.extra = 1
+
+    def test_spans_ignored_by_equality(self):
+        """Hand-built nodes should equal parsed ones."""
+        program = self.parse("x is 5")
+        assert program.statements[0] == Assignment("x", Literal(5, "number"))
+        assert Identifier("x").span == (-1, -1)
+
+
+class TestASTArena:
+    """Test suite for the flat node layout."""
+
+    SOURCE = (
+        "x is 0\n"
+        "loop while x < 3:\n"
+        "    x is x + 1\n"
+        "    y is x * 2\n"
+        "define f as:\n"
+        "    return n + z\n"
+        "if x > 1:\n"
+        "    print of [x, y]\n"
+        "else:\n"
+        "    print of 0\n"
+        "y\n"
+    )
+
+    def arena(self):
+        program = Parser(Tokenizer(self.SOURCE).tokenize()).parse()
+        return program, ASTArena.from_program(program)
+
+    def test_statements_index_top_level_nodes(self):
+        program, arena = self.arena()
+        assert arena.top_level() == program.statements
+        assert all(
+            arena.nodes[i] is stmt
+            for i, stmt in zip(arena.statements, program.statements)
+        )
+
+    def test_subtrees_are_index_ranges(self):
+        """Every subtree should be the contiguous range i..ends[i], in pre-order."""
+        _, arena = self.arena()
+        assert len(arena) == len(arena.kinds) == len(arena.ends)
+        for i, node in enumerate(arena.nodes):
+            assert arena.kind(i) is type(node)
+            subtree = arena.nodes[i : arena.ends[i]]
+            assert subtree[0] is node
+            assert {id(n) for n in walk(node)} == {id(n) for n in subtree}
+        # Top-level statements are siblings
+        for i, j in zip(arena.statements, arena.statements[1:]):
+            assert arena.ends[i] == j
+        assert arena.ends[arena.statements[-1]] == len(arena)
+
+    def test_fields_by_index(self):
+        _, arena = self.arena()
+        loop, _, cond = arena.statements[1], arena.statements[2], arena.statements[3]
+        assert (
+            arena.nodes[arena.child(loop, "condition")] is arena.nodes[loop].condition
+        )
+        assert [arena.nodes[i] for i in arena.block(loop, "body")] == arena.nodes[
+            loop
+        ].body
+        conditional = arena.nodes[cond]
+        assert arena.index_of(conditional) == cond
+        assert [arena.nodes[i] for i in arena.block(cond, "else_block")] == (
+            conditional.else_block
+        )
+        with pytest.raises(KeyError):
+            arena.block(loop, "else_block")
+        with pytest.raises(KeyError):
+            arena.index_of(conditional.condition)
+
+    def test_names_read_skips_function_bodies(self):
+        _, arena = self.arena()
+        reads = arena.names_read(arena.statements)
+        assert reads == {"x": 5, "y": 2, "print": 2}
+        function = arena.statements[2]
+        assert arena.names_read(arena.block(function, "body")) == {"n": 1, "z": 1}
+
+    def test_interpreter_runs_arena(self):
+        """Evaluating an arena should match evaluating its Program."""
+        from eigenscript.evaluator import Interpreter
+
+        program, arena = self.arena()
+        from_program, from_arena = Interpreter(), Interpreter()
+        assert from_arena.evaluate(arena) == from_program.evaluate(program)
+        for name in ("x", "y"):
+            assert from_arena.environment.lookup(name) == (
+                from_program.environment.lookup(name)
+            )
+
+
+class TestIncrementalReparse:
+    """Test suite for Parser.reparse."""
+
+    SOURCE = (
+        "a is 1\n"
+        "define f as:\n"
+        "    return n + 1\n"
+        "\n"
+        "if a > 0:\n"
+        "    b is 2\n"
+        "else:\n"
+        "    b is 3\n"
+        "c is f of a\n"
+        "d is 4\n"
+    )
+
+    def full(self, source):
+        tokens = Tokenizer(source).tokenize()
+        return tokens, Parser(tokens).parse()
+
+    def edit(self, old_source, start, end, text):
+        """Apply an edit incrementally and check it against a full parse."""
+        tokens, program = self.full(old_source)
+        source = old_source[:start] + text + old_source[end:]
+        parser = Parser(tokens)
+        result = parser.reparse(program, source, start, end, start + len(text))
+
+        expected_tokens, expected = self.full(source)
+        assert result == expected
+        assert [
+            (t.type, t.value, t.line, t.column, t.offset, t.end) for t in parser.tokens
+        ] == [
+            (t.type, t.value, t.line, t.column, t.offset, t.end)
+            for t in expected_tokens
+        ]
+        for got, want in zip(result.statements, expected.statements):
+            assert got.span == want.span
+        assert result.span == expected.span
+        return program, result
+
+    def test_edit_reuses_other_statements(self):
+        """Only the edited statement is rebuilt."""
+        start = self.SOURCE.index("b is 3") + 5
+        old, new = self.edit(self.SOURCE, start, start + 1, "30")
+        assert new.statements[2].else_block[0].expression.value == 30
+        assert new.statements[0] is old.statements[0]
+        assert new.statements[1] is old.statements[1]
+        assert new.statements[2] is not old.statements[2]
+        assert new.statements[3] is old.statements[3]
+
+    def test_shifted_statement_spans(self):
+        """Reused statements after the edit move with the text."""
+        source = "x is 1\ny is 2\nz is (y + 1)\n"
+        _, new = self.edit(source, 5, 6, "100")
+        text = source.replace("1", "100", 1)
+        assert text[slice(*new.statements[2].expression.span)] == "(y + 1)"
+
+    def test_inserted_lines_shift_line_numbers(self):
+        """New lines move the line numbers of the tokens after them."""
+        start = self.SOURCE.index("c is")
+        self.edit(self.SOURCE, start, start, "e is 5\nf is 6\n")
+
+    def test_indent_joins_previous_block(self):
+        """Indenting a line moves it into the block above."""
+        start = self.SOURCE.index("c is")
+        _, new = self.edit(self.SOURCE, start, start, "    ")
+        assert len(new.statements) == 4
+        assert len(new.statements[2].else_block) == 2
+
+    def test_dedent_splits_block(self):
+        """Removing indentation turns a block line into a statement."""
+        source = "if a:\n    b is 1\n    c is 2\nd is 3\n"
+        start = source.index("    c")
+        _, new = self.edit(source, start, start + 4, "")
+        assert len(new.statements) == 3
+
+    def test_multiline_string_relexes_past_edit(self):
+        """A string spanning lines is lexed until the stream resyncs."""
+        start = self.SOURCE.index("d is 4") + 5
+        self.edit(self.SOURCE, start, start + 1, '"x\ny"')
+
+    def test_edit_at_end(self):
+        """Appending text parses the new trailing statements."""
+        end = len(self.SOURCE)
+        self.edit(self.SOURCE, end, end, "e is 5\n")
+
+    def test_syntax_error_keeps_previous_parse(self):
+        """A failed reparse leaves the old tree and tokens untouched."""
+        tokens, program = self.full(self.SOURCE)
+        snapshot = [(t.line, t.offset) for t in tokens]
+        start = self.SOURCE.index("b is 2")
+        source = self.SOURCE[:start] + "b is )" + self.SOURCE[start + 6 :]
+
+        parser = Parser(tokens)
+        with pytest.raises(SyntaxError):
+            parser.reparse(program, source, start, start + 6, start + 6)
+        assert parser.tokens is tokens
+        assert [(t.line, t.offset) for t in tokens] == snapshot
+        assert program == self.full(self.SOURCE)[1]
+
+    def test_shifted_vector_elements(self):
+        """Expressions inside vector literals move with the text."""
+        source = "x is 1\nv is (a, b + 1)\n"
+        _, new = self.edit(source, 6, 6, "0")
+        element = new.statements[1].expression.value[1].left
+        assert element.name == "b"
+        assert element.span == (17, 18)
+
+    def test_shift_leaves_previous_tokens(self):
+        """Tokens after the edit are shifted as copies."""
+        tokens, program = self.full(self.SOURCE)
+        snapshot = [(t.line, t.offset, t.end) for t in tokens]
+        start = self.SOURCE.index("c is")
+        source = self.SOURCE[:start] + "e is 5\n" + self.SOURCE[start:]
+
+        parser = Parser(tokens)
+        parser.reparse(program, source, start, start, start + 7)
+        assert [(t.line, t.offset, t.end) for t in tokens] == snapshot
@@ -0,0 +1,167 @@
+"""
+Tests for the persistent session server and its thin client.
+"""
+
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from eigenscript import client
+from eigenscript.server import ScriptPool, decode_request, execute, serve_stream
+
+requires_fork = pytest.mark.skipif(
+    not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"),
+    reason="needs os.fork and Unix sockets",
+)
+
+
+@pytest.fixture
+def script(tmp_path):
+    """A script that prints and then fails on an undefined name."""
+    path = tmp_path / "job.eigs"
+    path.write_text('print of "hello"\nprint of missing\n')
+    return path
+
+
+class TestExecute:
+    """Tests for running a single request."""
+
+    def test_captures_output_and_status(self, script):
+        """Output and the CLI's exit code come back in the response."""
+        response = execute({"argv": [script.name], "cwd": str(script.parent)})
+        assert response["stdout"] == "hello\n"
+        assert "Undefined variable" in response["stderr"]
+        assert response["exit_code"] == 1
+
+    def test_cwd_restored(self, script):
+        """The request's working directory does not leak out."""
+        before = os.getcwd()
+        execute({"argv": [script.name], "cwd": str(script.parent)})
+        assert os.getcwd() == before
+
+    def test_cli_exit(self):
+        """Options that exit (like --version) report their status."""
+        response = execute({"argv": ["--version"]})
+        assert response["exit_code"] == 0
+        assert "EigenScript" in response["stdout"]
+
+    def test_invalid_argv(self):
+        """A malformed argv is an error response, not an exception."""
+        response = execute({"argv": "job.eigs"})
+        assert response["exit_code"] == 1
+        assert "argv" in response["stderr"]
+
+    def test_decode_bad_request(self):
+        """Lines that are not JSON objects get exit code 2."""
+        request, response = decode_request(b"[1, 2]\n")
+        assert request is None
+        assert response["exit_code"] == 2
+
+
+@requires_fork
+class TestServeStream:
+    """Tests for the stdin/stdout protocol."""
+
+    def test_requests_run_in_order(self, script, tmp_path):
+        """Each request line gets one response line."""
+        ok = tmp_path / "ok.eigs"
+        ok.write_text("print of 42\n")
+        lines = [
+            json.dumps({"argv": [str(ok)]}),
+            "not json",
+            json.dumps({"argv": [str(script)]}),
+        ]
+        reader = io.BytesIO(("\n".join(lines) + "\n").encode())
+        writer = io.BytesIO()
+
+        serve_stream(reader, writer, ScriptPool())
+
+        responses = [json.loads(l) for l in writer.getvalue().splitlines()]
+        assert [r["exit_code"] for r in responses] == [0, 2, 1]
+        assert responses[0]["stdout"] == "42\n"
+        assert responses[2]["stdout"] == "hello\n"
+
+
+@requires_fork
+class TestSocketServer:
+    """End-to-end tests with a server process and the thin client."""
+
+    @pytest.fixture
+    def server(self, tmp_path):
+        path = str(tmp_path / "eigen.sock")
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "eigenscript", "--serve", path],
+            stderr=subprocess.PIPE,
+        )
+        deadline = time.time() + 30
+        while not os.path.exists(path):
+            if proc.poll() is not None or time.time() > deadline:
+                proc.kill()
+                pytest.fail("server did not start")
+            time.sleep(0.05)
+        yield path
+        proc.terminate()
+        proc.wait(timeout=30)
+        assert not os.path.exists(path)
+
+    def test_client_request(self, server, script):
+        """The server runs the client's command in the client's cwd."""
+        response = client.send_request(server, [script.name], cwd=str(script.parent))
+        assert response["stdout"] == "hello\n"
+        assert response["exit_code"] == 1
+
+    def test_requests_are_isolated(self, server, tmp_path):
+        """State set by one script is not visible to the next."""
+        first = tmp_path / "first.eigs"
+        first.write_text("leak is 1\n")
+        second = tmp_path / "second.eigs"
+        second.write_text("print of leak\n")
+        assert client.send_request(server, [str(first)])["exit_code"] == 0
+        response = client.send_request(server, [str(second)])
+        assert response["exit_code"] == 1
+        assert "leak" in response["stderr"]
+
+
+class TestClient:
+    """Tests for the thin client."""
+
+    def test_socket_path_from_environment(self, monkeypatch):
+        """EIGEN_SERVER_SOCKET selects the server."""
+        monkeypatch.setenv("EIGEN_SERVER_SOCKET", "/tmp/custom.sock")
+        assert client.default_socket_path() == "/tmp/custom.sock"
+
+    def test_falls_back_without_server(self, script, tmp_path, monkeypatch, capsys):
+        """With no server listening, the script runs locally."""
+        monkeypatch.setenv("EIGEN_SERVER_SOCKET", str(tmp_path / "absent.sock"))
+        assert client.main([str(script)]) == 1
+        assert capsys.readouterr().out == "hello\n"
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+    def test_no_fallback_after_request_sent(
+        self, script, tmp_path, monkeypatch, capsys
+    ):
+        """A server lost mid-request is reported; the script is not rerun."""
+        path = str(tmp_path / "eigen.sock")
+        monkeypatch.setenv("EIGEN_SERVER_SOCKET", path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(path)
+            listener.listen(1)
+
+            def accept_and_drop():
+                conn, _ = listener.accept()
+                with conn, conn.makefile("rb") as reader:
+                    reader.readline()
+
+            thread = threading.Thread(target=accept_and_drop)
+            thread.start()
+            assert client.main([str(script)]) == 1
+            thread.join(timeout=30)
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "closed the connection" in captured.err
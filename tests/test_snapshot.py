@@ -0,0 +1,216 @@
+"""
+Tests for interpreter snapshots (.eigsnap files).
+"""
+
+import pytest
+from eigenscript.builtins import decode_vector
+from eigenscript.evaluator import Interpreter
+from eigenscript.evaluator import snapshot
+from eigenscript.evaluator.interpreter import (
+    EigenList,
+    EigenMap,
+    Function,
+    clear_module_cache,
+)
+from eigenscript.__main__ import run_file
+
+PRELUDE = """
+define square as:
+    return n * n
+
+define make_adder as:
+    base is n
+    define add as:
+        return base + n
+    return add
+
+table is [1, 2, 3]
+squares is [square of x for x in table]
+lookup is dict of [["a", 1], ["b", [4, 5]]]
+greeting is "hello" + " " + "world"
+add_ten is make_adder of 10
+"""
+
+
+@pytest.fixture
+def saved(tmp_path):
+    """Run the prelude and snapshot it."""
+    interp = Interpreter()
+    interp.run(PRELUDE)
+    path = tmp_path / "prelude.eigsnap"
+    interp.save_snapshot(str(path))
+    return interp, path
+
+
+def restore(path, **kwargs) -> Interpreter:
+    interp = Interpreter(**kwargs)
+    interp.load_snapshot(str(path))
+    return interp
+
+
+def value_of(interp, name):
+    return decode_vector(interp.environment.lookup(name), interp.space)
+
+
+class TestRoundTrip:
+    """State survives a save and load."""
+
+    def test_globals_restored(self, saved):
+        """Numbers, strings, lists and maps come back with their values."""
+        original, path = saved
+        interp = restore(path)
+        for name in ("table", "squares", "lookup", "greeting"):
+            assert value_of(interp, name) == value_of(original, name)
+        assert isinstance(interp.environment.lookup("table"), EigenList)
+        assert isinstance(interp.environment.lookup("lookup"), EigenMap)
+
+    def test_functions_callable(self, saved):
+        """Restored functions run in the restoring interpreter."""
+        _, path = saved
+        interp = restore(path)
+        func = interp.environment.lookup("square")
+        assert isinstance(func, Function)
+        assert func.interpreter is interp
+        interp.run("y is square of 7")
+        assert value_of(interp, "y") == 49
+
+    def test_closures_restored(self, saved):
+        """A returned function keeps its captured scope."""
+        _, path = saved
+        interp = restore(path)
+        interp.run("y is add_ten of 5")
+        assert value_of(interp, "y") == 15
+
+    def test_global_scope_shared_with_functions(self, tmp_path):
+        """Functions see globals bound after the restore."""
+        interp = Interpreter()
+        interp.run("define scaled as:\n    return n * factor")
+        path = tmp_path / "s.eigsnap"
+        interp.save_snapshot(str(path))
+
+        fresh = restore(path)
+        fresh.run("factor is 3\ny is scaled of 4")
+        assert value_of(fresh, "y") == 12
+
+    def test_builtins_shared(self, saved):
+        """Builtins are reattached, not copied."""
+        original, path = saved
+        interp = restore(path)
+        assert interp.environment.parent is original.environment.parent
+        interp.run('s is upper of "abc"')
+        assert value_of(interp, "s") == "ABC"
+
+    def test_fs_tracker_restored(self, saved):
+        """The Framework Strength trajectory and its metrics carry over."""
+        original, path = saved
+        interp = restore(path)
+        assert len(interp.fs_tracker.trajectory) == len(original.fs_tracker.trajectory)
+        assert interp.get_framework_strength() == original.get_framework_strength()
+
+    def test_lazy_string_restored(self, tmp_path):
+        """Strings built by concatenation in a loop keep their text."""
+        interp = Interpreter()
+        interp.run(
+            's is ""\ni is 0\nloop while i < 5:\n    s is s + "ab"\n    i is i + 1'
+        )
+        path = tmp_path / "s.eigsnap"
+        interp.save_snapshot(str(path))
+        assert value_of(restore(path), "s") == "ab" * 5
+
+    def test_coordinates_exact(self, saved):
+        """Sparse storage reproduces every coordinate, including -0.0."""
+        original, path = saved
+        original.run("z is 0 - 0.0")
+        original.environment.lookup("z").coords[7] = -0.0
+        original.save_snapshot(str(path))
+        interp = restore(path)
+        for name in ("z", "greeting"):
+            before = original.environment.lookup(name).coords
+            after = interp.environment.lookup(name).coords
+            assert before.tobytes() == after.tobytes()
+
+    def test_snapshot_is_compact(self, saved):
+        """Sparse vectors keep snapshots far below the raw array size."""
+        original, path = saved
+        raw = len(original.fs_tracker.trajectory) * 768 * 8
+        assert path.stat().st_size < raw / 10
+
+
+class TestModules:
+    """Imported modules are referenced, not copied."""
+
+    def test_module_values_reattached(self, tmp_path):
+        (tmp_path / "geo.eigs").write_text("define area as:\n    return n * n * 3\n")
+        clear_module_cache()
+        interp = Interpreter(module_root=str(tmp_path))
+        interp.run("import geo\narea is geo.area")
+        path = tmp_path / "s.eigsnap"
+        interp.save_snapshot(str(path))
+
+        clear_module_cache()
+        fresh = restore(path, module_root=str(tmp_path))
+        module = fresh.environment.lookup("geo")
+        assert fresh.environment.lookup("area").closure is module.environment
+        fresh.run("y is area of 2")
+        assert value_of(fresh, "y") == 12
+        clear_module_cache()
+
+
+class TestErrors:
+    """Snapshots that cannot be written or loaded."""
+
+    def test_open_file_rejected(self, tmp_path):
+        """Open file handles cannot be saved."""
+        data = tmp_path / "data.txt"
+        data.write_text("x")
+        interp = Interpreter()
+        interp.run(f'handle is file_open of ["{data}", "r"]')
+        target = tmp_path / "s.eigsnap"
+        with pytest.raises(ValueError, match="cannot be snapshotted"):
+            interp.save_snapshot(str(target))
+        assert not target.exists()
+        assert list(tmp_path.iterdir()) == [data]
+
+    def test_not_a_snapshot(self, tmp_path):
+        """Other files are rejected."""
+        path = tmp_path / "junk.eigsnap"
+        path.write_bytes(b"not a snapshot at all")
+        with pytest.raises(ValueError, match="Not an EigenScript snapshot"):
+            restore(path)
+
+    def test_version_mismatch(self, saved, monkeypatch):
+        """Snapshots from another EigenScript version are rejected."""
+        _, path = saved
+        monkeypatch.setattr(snapshot, "_language_version", lambda: b"0.0.0")
+        with pytest.raises(ValueError, match="re-create it"):
+            restore(path)
+
+    def test_configuration_mismatch(self, saved):
+        """A snapshot only loads into an interpreter of the same shape."""
+        _, path = saved
+        with pytest.raises(ValueError, match="dimension 768"):
+            restore(path, dimension=64)
+
+    def test_failed_load_leaves_state(self, saved):
+        """A rejected snapshot does not touch the interpreter."""
+        _, path = saved
+        interp = Interpreter(dimension=64)
+        environment = interp.environment
+        with pytest.raises(ValueError):
+            interp.load_snapshot(str(path))
+        assert interp.environment is environment
+
+
+class TestCLI:
+    """The --save-snapshot / --load-snapshot flow."""
+
+    def test_save_then_load(self, tmp_path, capsys):
+        prelude = tmp_path / "prelude.eigs"
+        prelude.write_text("define double as:\n    return n + n\n")
+        script = tmp_path / "main.eigs"
+        script.write_text("print of (double of 21)\n")
+        snap = tmp_path / "prelude.eigsnap"
+
+        assert run_file(str(prelude), save_snapshot=str(snap)) == 0
+        assert run_file(str(script), load_snapshot=str(snap)) == 0
+        assert capsys.readouterr().out.strip() == "42"
@@ -0,0 +1,95 @@
+"""
+Tests for startup import timing and lazy package exports.
+"""
+
+import subprocess
+import sys
+
+import pytest
+from eigenscript.startup import ImportTimer
+
+
+class TestImportTimer:
+    """Tests for ImportTimer."""
+
+    def test_records_new_imports(self):
+        """Modules imported while installed are recorded with their times."""
+        sys.modules.pop("colorsys", None)
+        timer = ImportTimer()
+        timer.install()
+        try:
+            import colorsys  # noqa: F401
+        finally:
+            timer.uninstall()
+
+        names = [r.name for r in timer.records]
+        assert "colorsys" in names
+        record = timer.records[names.index("colorsys")]
+        assert record.depth == 0
+        assert 0 <= record.self_time <= record.cumulative_time
+        assert timer.import_time >= record.cumulative_time
+
+    def test_uninstall_removes_finder(self):
+        """The timer leaves sys.meta_path as it found it."""
+        timer = ImportTimer()
+        timer.install()
+        assert sys.meta_path[0] is timer
+        timer.uninstall()
+        assert timer not in sys.meta_path
+
+    def test_report_format(self):
+        """The report lists totals and the recorded modules."""
+        sys.modules.pop("colorsys", None)
+        timer = ImportTimer()
+        timer.install()
+        import colorsys  # noqa: F401
+
+        timer.uninstall()
+        report = timer.format_report()
+        assert "Startup Report" in report
+        assert "Imports:" in report
+        assert "colorsys" in report
+
+
+class TestLazyPackage:
+    """The package defers heavy imports until they are used."""
+
+    def run_python(self, code: str) -> str:
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+
+    def test_import_does_not_load_numpy(self):
+        """Importing eigenscript and its CLI module does not import numpy."""
+        out = self.run_python(
+            "import sys, eigenscript, eigenscript.__main__; "
+            "print('numpy' in sys.modules)"
+        )
+        assert out == "False"
+
+    def test_interpreter_does_not_load_compiler(self):
+        """Importing the interpreter does not import the compiler package."""
+        out = self.run_python(
+            "import sys, eigenscript.evaluator.interpreter; "
+            "print([m for m in sys.modules if m.startswith('eigenscript.compiler')])"
+        )
+        assert out == "[]"
+
+    def test_lazy_export_resolves(self):
+        """Package-level names import their module on first access."""
+        import eigenscript
+        from eigenscript.evaluator import Interpreter
+
+        assert eigenscript.Interpreter is Interpreter
+        assert "Interpreter" in dir(eigenscript)
+
+    def test_unknown_attribute(self):
+        """Unknown names still raise AttributeError."""
+        import eigenscript
+
+        with pytest.raises(AttributeError):
+            eigenscript.not_a_real_name
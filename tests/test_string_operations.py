@@ -84,6 +84,64 @@ result is "A" + "B" + "C" + "D"
         value = decode_vector(result, interpreter.space, interpreter.metric)
         assert value == "ABCD"
 
+    def test_concatenation_in_loop(self):
+        """Test building a string piece by piece in a loop."""
+        source = """
+text is ""
+i is 0
+loop while i < 50:
+    text is text + "ab"
+    i is i + 1
+"""
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        interpreter = Interpreter()
+        interpreter.evaluate(ast)
+
+        text = interpreter.environment.lookup("text")
+        assert decode_vector(text, interpreter.space, interpreter.metric) == "ab" * 50
+
+    def test_concatenation_branches_keep_prefix(self):
+        """Test that extending one string does not change another."""
+        source = """
+base is "x" + "y"
+left is base + "L"
+right is base + "R"
+"""
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        interpreter = Interpreter()
+        interpreter.evaluate(ast)
+
+        env = interpreter.environment
+        space, metric = interpreter.space, interpreter.metric
+        assert decode_vector(env.lookup("base"), space, metric) == "xy"
+        assert decode_vector(env.lookup("left"), space, metric) == "xyL"
+        assert decode_vector(env.lookup("right"), space, metric) == "xyR"
+
+    def test_concatenated_string_equality(self):
+        """Test that a built string compares equal to a literal."""
+        source = """
+built is "he" + "llo"
+result is built = "hello"
+"""
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        interpreter = Interpreter()
+        interpreter.evaluate(ast)
+
+        result = interpreter.environment.lookup("result")
+        assert decode_vector(result, interpreter.space, interpreter.metric) == 1
+
 
 class TestStringIndexing:
     """Test string indexing operations."""
@@ -322,6 +380,41 @@ result is join of words
         value = decode_vector(result, interpreter.space, interpreter.metric)
         assert value == "hello world"
 
+    def test_join_with_separator(self):
+        """Test join with an explicit separator."""
+        source = """
+words is ["a", "b", "c"]
+result is join of [", ", words]
+"""
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        interpreter = Interpreter()
+        interpreter.evaluate(ast)
+
+        result = interpreter.environment.lookup("result")
+        value = decode_vector(result, interpreter.space, interpreter.metric)
+        assert value == "a, b, c"
+
+    def test_join_with_empty_separator(self):
+        """Test join with an empty separator."""
+        source = """
+result is join of ["", ["x", 1, "y"]]
+"""
+        tokenizer = Tokenizer(source)
+        tokens = tokenizer.tokenize()
+        parser = Parser(tokens)
+        ast = parser.parse()
+
+        interpreter = Interpreter()
+        interpreter.evaluate(ast)
+
+        result = interpreter.environment.lookup("result")
+        value = decode_vector(result, interpreter.space, interpreter.metric)
+        assert value == "x1y"
+
 
 class TestComplexStringOperations:
     """Test complex combinations of string operations."""